@@ -9,11 +9,21 @@ type PrecacheManifestEntry = {
 
 // eslint-disable-next-line @typescript-eslint/no-require-imports
 const nextPWA = require("@ducanh2912/next-pwa");
+// Driver PWA page caches. public/sw-push.js empties them whenever a new
+// service worker activates (they hold HTML/RSC that reference this build's
+// chunks and Server Action IDs) and offline-storage clears them on logout.
+const DRIVER_PAGE_CACHE = "driver-pages";
+const DRIVER_RSC_CACHE = "driver-rsc";
+
 const withPWA = nextPWA.default({
   dest: "public",
   disable: process.env.NODE_ENV === "development",
   register: true,
   skipWaiting: true,
+  // Admin-only public files (page backgrounds, invoice templates, print
+  // logos) stay out of the install-time precache every driver downloads;
+  // back-office pages still pick them up through the runtime image cache.
+  publicExcludes: ["!noprecache/**/*", "!images/**/*", "!templates/**/*"],
   workboxOptions: {
     importScripts: ["/sw-push.js"],
     // หลัง deploy ใหม่ chunk hash เปลี่ยน — ล้าง precache เวอร์ชันเก่าทิ้งอัตโนมัติ
@@ -22,16 +32,47 @@ const withPWA = nextPWA.default({
     cleanupOutdatedCaches: true,
     clientsClaim: true,
     runtimeCaching: [
+      // Content-hashed build output never changes under the same URL, so it
+      // is served from cache and lets /mobile cold-start without signal. Old
+      // hashes age out; a tab still on the previous build keeps its chunks.
+      {
+        urlPattern: /\/_next\/static\/.+\.(?:js|css)$/i,
+        handler: "CacheFirst",
+        options: {
+          cacheName: "next-static-hashed",
+          expiration: { maxEntries: 400, maxAgeSeconds: 30 * 24 * 60 * 60 },
+          cacheableResponse: { statuses: [200] },
+        },
+      },
+      // Driver jobs list/detail RSC payloads: show the last copy at once and
+      // refresh it in the background.
+      {
+        urlPattern: ({ request, url: { pathname }, sameOrigin }: { request: Request; url: URL; sameOrigin: boolean }) =>
+          sameOrigin && request.headers.get("RSC") === "1" && pathname.startsWith("/mobile/jobs"),
+        handler: "StaleWhileRevalidate",
+        options: {
+          cacheName: DRIVER_RSC_CACHE,
+          expiration: { maxEntries: 64, maxAgeSeconds: 24 * 60 * 60 },
+          cacheableResponse: { statuses: [200] },
+        },
+      },
+      // Driver app documents: the network copy carries live job data, so it
+      // wins when it answers within 3 s; otherwise the cached shell loads.
       {
-        urlPattern: /\/_next\/static\/.*\.js$/i,
-        handler: "NetworkOnly",
+        urlPattern: ({ request, url: { pathname }, sameOrigin }: { request: Request; url: URL; sameOrigin: boolean }) =>
+          sameOrigin && request.mode === "navigate" && pathname.startsWith("/mobile"),
+        handler: "NetworkFirst",
         options: {
-          cacheName: "next-static-js-network-only",
+          cacheName: DRIVER_PAGE_CACHE,
+          networkTimeoutSeconds: 3,
+          expiration: { maxEntries: 32, maxAgeSeconds: 7 * 24 * 60 * 60 },
+          cacheableResponse: { statuses: [200] },
         },
       },
       ...nextPWA.runtimeCaching.filter((entry: { options?: { cacheName?: string } }) => (
         entry.options?.cacheName !== "next-static-js-assets" &&
-        entry.options?.cacheName !== "static-js-assets"
+        entry.options?.cacheName !== "static-js-assets" &&
+        entry.options?.cacheName !== "static-style-assets"
       )),
     ],
     // Exclude app chunks from precache. They embed Server Action IDs and must
@@ -7,6 +7,15 @@
 self.addEventListener("install", () => self.skipWaiting());
 self.addEventListener("activate", (event) => event.waitUntil(self.clients.claim()));
 
+// ── Driver page caches are per build: HTML/RSC from the previous deploy
+// references chunks and Server Action IDs the new server no longer has, so a
+// freshly activated worker starts them empty (names match next.config.ts).
+// Hashed /_next/static files keep their own cache and simply age out.
+const DRIVER_PAGE_CACHES = ["driver-pages", "driver-rsc"];
+self.addEventListener("activate", (event) => {
+  event.waitUntil(Promise.all(DRIVER_PAGE_CACHES.map((name) => caches.delete(name))));
+});
+
 self.addEventListener("push", function (event) {
   console.log("[SW] Push Received.");
 
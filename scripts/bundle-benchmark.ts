@@ -0,0 +1,85 @@
+/**
+ * Job bundling benchmark: grid-bucketed clustering vs the old all-pairs scan.
+ *
+ *   npx tsx scripts/bundle-benchmark.ts
+ *   npx tsx scripts/bundle-benchmark.ts --sizes 1000,10000,50000 --radius 5
+ *
+ * Generates seeded random unassigned jobs with pickups spread over a
+ * Bangkok-sized area (~70 × 70 km) and times `clusterWithinRadius` (what
+ * findPotentialBundles now uses). The all-pairs scan it replaced is timed up
+ * to `--naive-max` jobs and both results are checked to be identical.
+ */
+
+import { clusterWithinRadius, haversineKm } from '../src/lib/utils/geo-grid'
+
+type Job = { Job_ID: string; lat: number; lng: number }
+
+function argValue(flag: string, fallback: string) {
+  const i = process.argv.indexOf(flag)
+  return i >= 0 && process.argv[i + 1] ? process.argv[i + 1] : fallback
+}
+
+function randomJobs(count: number, seed: number): Job[] {
+  let state = seed
+  const rand = () => (state = (state * 1103515245 + 12345) % 2147483648) / 2147483648
+  return Array.from({ length: count }, (_, i) => ({
+    Job_ID: `J${i}`,
+    lat: 13.45 + rand() * 0.65,
+    lng: 100.3 + rand() * 0.65,
+  }))
+}
+
+// The pre-grid findPotentialBundles loop
+function naiveBundles(jobs: Job[], radiusKm: number) {
+  const handled = new Set<string>()
+  const bundles: { pivot: string; bundled: string[] }[] = []
+  for (const pivot of jobs) {
+    if (handled.has(pivot.Job_ID)) continue
+    const cluster = jobs.filter(j =>
+      j.Job_ID !== pivot.Job_ID &&
+      !handled.has(j.Job_ID) &&
+      haversineKm(pivot.lat, pivot.lng, j.lat, j.lng) <= radiusKm
+    )
+    if (cluster.length > 0) {
+      bundles.push({ pivot: pivot.Job_ID, bundled: cluster.map(c => c.Job_ID) })
+      handled.add(pivot.Job_ID)
+      cluster.forEach(c => handled.add(c.Job_ID))
+    }
+  }
+  return bundles
+}
+
+function main() {
+  const sizes = argValue('--sizes', '1000,10000,50000').split(',').map(Number)
+  const radiusKm = Number(argValue('--radius', '5'))
+  const naiveMax = Number(argValue('--naive-max', '10000'))
+
+  console.log(`📦 Bundling benchmark — radius ${radiusKm} km`)
+  for (const size of sizes) {
+    const jobs = randomJobs(size, size)
+
+    let started = performance.now()
+    const clusters = clusterWithinRadius(jobs, j => j, radiusKm)
+    const gridMs = performance.now() - started
+
+    let naiveMs: number | null = null
+    let identical: boolean | null = null
+    if (size <= naiveMax) {
+      started = performance.now()
+      const naive = naiveBundles(jobs, radiusKm)
+      naiveMs = performance.now() - started
+      identical = JSON.stringify(naive) === JSON.stringify(clusters.map(c => ({ pivot: c.pivot.Job_ID, bundled: c.members.map(m => m.Job_ID) })))
+    }
+
+    console.log(JSON.stringify({
+      jobs: size,
+      bundles: clusters.length,
+      gridMs: Math.round(gridMs),
+      naiveMs: naiveMs === null ? null : Math.round(naiveMs),
+      identical,
+    }))
+    if (identical === false) process.exitCode = 1
+  }
+}
+
+main()
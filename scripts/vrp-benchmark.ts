@@ -0,0 +1,117 @@
+/**
+ * VRP solver benchmark over Solomon-style instances.
+ *
+ *   npx tsx scripts/vrp-benchmark.ts --instance R101.txt --instance C101.txt
+ *   npx tsx scripts/vrp-benchmark.ts --stops 300 --vehicles 40 --time-limit 5000
+ *
+ * `--instance` reads the standard Solomon text format (VEHICLE NUMBER/CAPACITY,
+ * then CUST NO. XCOORD YCOORD DEMAND READY DUE SERVICE rows, customer 0 = depot).
+ * Without one, a seeded random instance of the same shape is generated:
+ * `--stops` customers in a 100×100 square, demand 5–25, 60-unit windows over a
+ * 480-unit day, `--vehicles` trucks of `--capacity`.
+ *
+ * Travel time = Euclidean distance, as in the published Solomon results.
+ * `--vehicle-cost` adds a fixed cost per truck used to favour fewer vehicles
+ * (Solomon's primary objective); the default 0 minimises distance only.
+ */
+
+import { readFileSync } from 'fs'
+import { basename } from 'path'
+import { solveVrp, toFlatMatrix, type VrpProblem } from '../src/services/vrp-solver'
+
+type Instance = { name: string; problem: VrpProblem }
+
+function argValues(flag: string): string[] {
+  const out: string[] = []
+  process.argv.forEach((arg, i) => { if (arg === flag && process.argv[i + 1]) out.push(process.argv[i + 1]) })
+  return out
+}
+const argNumber = (flag: string, fallback: number) => Number(argValues(flag)[0] ?? fallback)
+
+function buildProblem(points: [number, number][], customers: { demand: number; ready: number; due: number; service: number }[], vehicles: number, capacity: number, horizon: number): VrpProblem {
+  const rows = points.map(a => points.map(b => Math.hypot(a[0] - b[0], a[1] - b[1])))
+  const matrix = toFlatMatrix(rows)
+  return {
+    size: points.length,
+    time: matrix,
+    distance: matrix,
+    stops: customers.map((c, i) => ({
+      id: String(i + 1),
+      node: i + 1,
+      weightKg: c.demand,
+      serviceTime: c.service,
+      windowStart: c.ready,
+      windowEnd: c.due,
+    })),
+    vehicles: Array.from({ length: vehicles }, (_, i) => ({
+      id: `V${i + 1}`,
+      start: 0,
+      maxWeightKg: capacity,
+      shiftEnd: horizon,
+    })),
+  }
+}
+
+function readSolomon(path: string): Instance {
+  const lines = readFileSync(path, 'utf8').split(/\r?\n/).map(l => l.trim().split(/\s+/).filter(Boolean).map(Number))
+  const fleet = lines.find(l => l.length === 2 && l.every(Number.isFinite))
+  const rows = lines.filter(l => l.length === 7 && l.every(Number.isFinite))
+  if (!fleet || rows.length < 2) throw new Error(`${path}: not a Solomon instance`)
+
+  const [depot, ...customers] = rows
+  const points = rows.map(r => [r[1], r[2]] as [number, number])
+  return {
+    name: basename(path).replace(/\.txt$/i, ''),
+    problem: buildProblem(
+      points,
+      customers.map(r => ({ demand: r[3], ready: r[4], due: r[5], service: r[6] })),
+      fleet[0],
+      fleet[1],
+      depot[5]
+    ),
+  }
+}
+
+function randomInstance(stops: number, vehicles: number, capacity: number, seed: number): Instance {
+  let state = seed
+  const rand = () => (state = (state * 1103515245 + 12345) % 2147483648) / 2147483648
+  const points: [number, number][] = [[50, 50]]
+  const customers = Array.from({ length: stops }, () => {
+    points.push([rand() * 100, rand() * 100])
+    const ready = Math.floor(rand() * 360)
+    return { demand: 5 + Math.floor(rand() * 21), ready, due: ready + 60, service: 10 }
+  })
+  return { name: `random-${stops}x${vehicles}`, problem: buildProblem(points, customers, vehicles, capacity, 480) }
+}
+
+function main() {
+  const timeLimitMs = argNumber('--time-limit', 5000)
+  const vehicleCost = argNumber('--vehicle-cost', 0)
+  const paths = argValues('--instance')
+  const instances = paths.length > 0
+    ? paths.map(readSolomon)
+    : [randomInstance(argNumber('--stops', 300), argNumber('--vehicles', 40), argNumber('--capacity', 200), argNumber('--seed', 19))]
+
+  console.log(`🚚 VRP benchmark — time limit ${timeLimitMs} ms, vehicle cost ${vehicleCost}`)
+  let failed = false
+  for (const { name, problem } of instances) {
+    const solution = solveVrp(problem, { timeLimitMs, vehicleCost })
+    const summary = {
+      instance: name,
+      stops: problem.stops.length,
+      vehicles: solution.vehiclesUsed,
+      distance: Number(solution.totalDistance.toFixed(1)),
+      unassigned: solution.unassigned.length,
+      moves: solution.moves,
+      elapsedMs: solution.elapsedMs,
+    }
+    console.log(JSON.stringify(summary))
+    if (solution.unassigned.length > 0) failed = true
+  }
+  if (failed) {
+    console.log('⚠️ Some stops could not be routed within the constraints')
+    process.exitCode = 1
+  }
+}
+
+main()
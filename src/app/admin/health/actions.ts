@@ -35,7 +35,10 @@ export async function getAdminHealthData(branchId?: string, customerId?: string)
     customers = customerRes.data || []
   }
 
-  return { branchId: targetBranchId, customerId, issues, unbilled, branches, customers, isSuper: sessionBranchId === 'All' }
+  const { getMasterQueueStatus } = await import("@/lib/actions/master-sheet-sync")
+  const masterQueue = await getMasterQueueStatus().catch(() => null)
+
+  return { branchId: targetBranchId, customerId, issues, unbilled, branches, customers, isSuper: sessionBranchId === 'All', masterQueue }
 }
 
 export async function syncHealthJobPrice(jobId: string) {
@@ -69,6 +72,14 @@ export async function runVerifyBackfillHistoricalAction(startDate: string, endDa
   return await verifyAndBackfillHistorical(endDate, startDate, customerId)
 }
 
+// Write the MASTER queue now, including jobs that gave up after repeated failures
+export async function flushMasterQueueAction() {
+  await requireAdmin()
+  const { flushMasterSheetQueue, getMasterQueueStatus } = await import("@/lib/actions/master-sheet-sync")
+  const result = await flushMasterSheetQueue({ retryParked: true })
+  return { ...result, status: await getMasterQueueStatus() }
+}
+
 export async function bypassHealthIssueAction(jobId: string, reason?: string) {
   await requireAdmin()
   // Use 'Verified' status to effectively bypass and dismiss from health checks.
@@ -3,7 +3,8 @@
 import { useState, useEffect } from "react"
 import type { ReconcileIssue } from "@/services/billing-reconciliation"
 import type { HealthIssue } from "@/services/operations-health"
-import { syncHealthJobPrice, getAdminHealthData, bypassHealthIssueAction, runMasterBackfillAction, runVerifyBackfillHistoricalAction } from "./actions"
+import { syncHealthJobPrice, getAdminHealthData, bypassHealthIssueAction, runMasterBackfillAction, runVerifyBackfillHistoricalAction, flushMasterQueueAction } from "./actions"
+import type { MasterQueueStatus } from "@/lib/actions/master-sheet-sync"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
@@ -25,6 +26,7 @@ type HealthData = {
   branches: { Branch_ID: string, Branch_Name: string }[]
   customers: { Customer_ID: string, Customer_Name: string }[]
   isSuper: boolean
+  masterQueue: MasterQueueStatus | null
 }
 
 type BackfillMode = 'verified' | 'verify'
@@ -50,6 +52,8 @@ export function HealthClient({ initialData }: { initialData: HealthData }) {
   const [backfillMode, setBackfillMode] = useState<BackfillMode | null>(null)
   const [backfillStartDate, setBackfillStartDate] = useState(`${todayTH.slice(0, 7)}-01`)
   const [backfillEndDate, setBackfillEndDate] = useState(todayTH)
+  const [masterQueue, setMasterQueue] = useState(initialData.masterQueue)
+  const [flushingQueue, setFlushingQueue] = useState(false)
   
   const [branchId, setBranchId] = useState(initialData.branchId)
   const [customerId, setCustomerId] = useState(initialData.customerId || 'All')
@@ -60,6 +64,7 @@ export function HealthClient({ initialData }: { initialData: HealthData }) {
       const data = await getAdminHealthData(bId || branchId, cId || customerId)
       setIssues(data.issues)
       setUnbilled(data.unbilled)
+      setMasterQueue(data.masterQueue)
     } catch {
       toast.error(t('common.toast.error_save'))
     } finally {
@@ -108,10 +113,11 @@ export function HealthClient({ initialData }: { initialData: HealthData }) {
       if (res.success) {
         toast.success(t('common.toast.success_edit'))
         // Surface the MASTER Google Sheet write outcome (was previously silent here)
-        const sync = (res as { sheetSync?: { success: boolean; error?: string; skipped?: boolean } }).sheetSync
+        const sync = (res as { sheetSync?: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } }).sheetSync
         if (sync) {
           if (sync.skipped) toast.info('ข้ามการเขียน Google Sheet (งานนี้อยู่ในชีตแล้ว)')
           else if (!sync.success) toast.error('เขียน Google Sheet ไม่สำเร็จ: ' + (sync.error || 'unknown error'), { duration: 9000 })
+          else if (sync.queued) toast.success('เข้าคิวบันทึกลง MASTER Sheet แล้ว (เขียนลงชีตภายในไม่กี่นาที — งานที่เขียนไม่สำเร็จดูได้ที่หน้า Health)')
           else toast.success('บันทึกลง MASTER Sheet แล้ว')
         }
         setIssues((prev) => prev.filter((i) => i.jobId !== jobId))
@@ -125,6 +131,21 @@ export function HealthClient({ initialData }: { initialData: HealthData }) {
     }
   }
 
+  const handleFlushQueue = async () => {
+    setFlushingQueue(true)
+    try {
+      const res = await flushMasterQueueAction()
+      setMasterQueue(res.status)
+      if (!res.success) toast.error('เขียนคิว MASTER ไม่สำเร็จ: ' + (res.error || 'unknown error'), { duration: 9000 })
+      else if (res.failed) toast.warning(`เขียนเพิ่ม ${res.appended ?? 0} แถว · ไม่สำเร็จ ${res.failed} งาน`)
+      else toast.success(`เขียนคิว MASTER แล้ว ${res.appended ?? 0} แถว`)
+    } catch (e) {
+      toast.error('เขียนคิว MASTER ไม่สำเร็จ: ' + (e instanceof Error ? e.message : String(e)), { duration: 9000 })
+    } finally {
+      setFlushingQueue(false)
+    }
+  }
+
   const handleBackfill = async () => {
     if (!backfillMode) return
     if (!backfillStartDate || !backfillEndDate) {
@@ -333,6 +354,34 @@ export function HealthClient({ initialData }: { initialData: HealthData }) {
         </Card>
       </div>
 
+      {masterQueue && (masterQueue.pending > 0 || masterQueue.failing.length > 0) && (
+        <Card className={masterQueue.failing.length > 0 ? "border-t-4 border-t-destructive" : "border-t-4 border-t-warning"}>
+          <CardHeader className="pb-2 flex flex-row items-center justify-between gap-4">
+            <CardTitle className="text-xs font-bold uppercase tracking-widest opacity-70">
+              คิว MASTER Sheet · รอเขียน {masterQueue.pending} งาน
+              {masterQueue.parked > 0 && ` · หยุดลองซ้ำ ${masterQueue.parked} งาน`}
+            </CardTitle>
+            <Button variant="outline" size="sm" onClick={handleFlushQueue} disabled={flushingQueue} className="font-bold uppercase tracking-widest text-[10px] h-8 px-3">
+              {flushingQueue ? <Loader2 className="w-3 h-3 animate-spin mr-2" /> : <RefreshCcw className="w-3 h-3 mr-2" />}
+              เขียนลงชีตตอนนี้
+            </Button>
+          </CardHeader>
+          {masterQueue.failing.length > 0 && (
+            <CardContent className="p-0 text-foreground">
+              <div className="divide-y text-xs">
+                {masterQueue.failing.map(row => (
+                  <div key={row.job_id} className="px-6 py-2 flex flex-wrap items-center gap-3">
+                    <Link href={`/planning?query=${row.job_id}`} className="font-mono font-bold text-primary hover:underline">{row.job_id}</Link>
+                    <Badge variant="outline" className="text-[10px]">ลอง {row.attempts} ครั้ง</Badge>
+                    <span className="text-muted-foreground">{row.last_error}</span>
+                  </div>
+                ))}
+              </div>
+            </CardContent>
+          )}
+        </Card>
+      )}
+
       <Tabs defaultValue="data-quality" className="w-full">
         <TabsList className="grid w-full grid-cols-2 bg-muted/50 p-1 h-12">
           <TabsTrigger value="data-quality" className="font-bold uppercase tracking-widest text-[10px] data-[state=active]:bg-background data-[state=active]:shadow-sm">
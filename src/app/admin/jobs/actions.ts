@@ -7,7 +7,7 @@ import { getSession } from '@/lib/session'
 
 import { type JobStatus, transitionJobStatus } from "@/services/job-status-machine"
 import { timeTH, dateKeyTH } from "@/lib/utils/date-th"
-import { appendJobToMaster } from "@/lib/actions/master-sheet-sync"
+import { queueJobForMaster } from "@/lib/actions/master-sheet-sync"
 
 const JOB_STATUSES: readonly JobStatus[] = [
   'Draft',
@@ -97,13 +97,13 @@ export async function adminUpdateJobStatus(jobId: string, newStatus: string, not
   }
 
   // Mirror into the MASTER Google Sheet on verification, matching verifyJob().
-  // Dedup lives in appendJobToMaster (ledger check), so we don't gate on
+  // Dedup lives in the queue flush (ledger check), so we don't gate on
   // Job_Status — a force/override path can leave the job Verified without ever
   // writing the row. Surface the outcome instead of swallowing it, so a failed
   // ledger write isn't invisible (this path previously never warned the admin).
-  let sheetSync: { success: boolean; error?: string; skipped?: boolean } | undefined
+  let sheetSync: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } | undefined
   if (newStatus === 'Verified') {
-      sheetSync = await appendJobToMaster(jobId)
+      sheetSync = await queueJobForMaster(jobId)
   }
 
   revalidatePath(`/admin/jobs/${jobId}`)
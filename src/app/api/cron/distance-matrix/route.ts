@@ -0,0 +1,21 @@
+import { NextResponse } from 'next/server'
+import { prefillDistanceMatrix } from '@/lib/ai/distance-matrix'
+
+// Nightly warm-up of the distance matrix cache from Master_Locations and
+// Master_Routes, so the next day's route planning reads cached pairs instead
+// of waiting on OSRM. Each run spends a capped number of OSRM requests and
+// saves what it got; the next night's run continues from the cache table.
+export async function GET(req: Request) {
+    try {
+        const authHeader = req.headers.get('authorization')
+        if (process.env.CRON_SECRET && authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+            return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+        }
+
+        const result = await prefillDistanceMatrix()
+        return NextResponse.json({ status: 'ok', ...result })
+    } catch (error: unknown) {
+        console.error('[CRON distance-matrix] Error:', error)
+        return NextResponse.json({ error: error instanceof Error ? error.message : String(error) }, { status: 500 })
+    }
+}
@@ -0,0 +1,22 @@
+import { NextResponse } from 'next/server'
+import { flushMasterSheetQueue } from '@/lib/actions/master-sheet-sync'
+
+// Writes jobs queued on verification to the MASTER Google Sheet: one append
+// per ledger tab and a single sort, however many jobs were verified. Queued
+// jobs are normally flushed right after verification; this daily run picks up
+// whatever that left behind (failures, instances that stopped mid-flush).
+export async function GET(req: Request) {
+    try {
+        const authHeader = req.headers.get('authorization')
+        if (process.env.CRON_SECRET && authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
+            return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+        }
+
+        const result = await flushMasterSheetQueue()
+        if (!result.success) return NextResponse.json({ error: result.error }, { status: 500 })
+        return NextResponse.json({ status: 'ok', ...result })
+    } catch (error: unknown) {
+        console.error('[CRON master-sheet-sync] Error:', error)
+        return NextResponse.json({ error: error instanceof Error ? error.message : String(error) }, { status: 500 })
+    }
+}
@@ -0,0 +1,70 @@
+import { validateApiKey } from '@/lib/security/api-security'
+import { ingestGPSBatch, type GPSIngestPoint } from '@/lib/gps-ingest'
+import { NextRequest, NextResponse } from 'next/server'
+
+// Upper bound per request; telematics gateways should split larger backlogs
+const MAX_POINTS_PER_REQUEST = 5000
+
+type PointBody = {
+    driver_id?: string
+    lat?: number
+    lng?: number
+    speed?: number
+    job_id?: string | null
+    vehicle_plate?: string | null
+    ts?: string
+}
+
+/**
+ * Batch GPS ingest (v1)
+ * Accepts positions from GPS boxes / telematics gateways in bulk, either for
+ * one driver:   { driver_id, job_id?, vehicle_plate?, points: [{ lat, lng, speed?, ts? }] }
+ * or for many:  { points: [{ driver_id, lat, lng, speed?, job_id?, vehicle_plate?, ts? }] }
+ */
+export async function POST(req: NextRequest) {
+    try {
+        const authHeader = req.headers.get('Authorization')
+
+        try {
+            await validateApiKey(authHeader || '')
+        } catch (authError: unknown) {
+            return NextResponse.json({ error: (authError as Error).message }, { status: 401 })
+        }
+
+        const body = await req.json()
+        const raw: PointBody[] = Array.isArray(body?.points) ? body.points : []
+        if (raw.length === 0) {
+            return NextResponse.json({ error: 'points must be a non-empty array' }, { status: 400 })
+        }
+        if (raw.length > MAX_POINTS_PER_REQUEST) {
+            return NextResponse.json({ error: `At most ${MAX_POINTS_PER_REQUEST} points per request` }, { status: 413 })
+        }
+
+        // Per-point fields win over the batch-level defaults
+        const points: GPSIngestPoint[] = raw.map(p => ({
+            driverId: String(p.driver_id ?? body.driver_id ?? ''),
+            lat: Number(p.lat),
+            lng: Number(p.lng),
+            speed: p.speed ?? null,
+            jobId: p.job_id ?? body.job_id ?? null,
+            vehiclePlate: p.vehicle_plate ?? body.vehicle_plate ?? null,
+            ts: p.ts ?? null,
+        }))
+
+        const result = await ingestGPSBatch(points)
+        if (!result.success) {
+            return NextResponse.json({ error: 'GPS batch could not be stored' }, { status: 500 })
+        }
+
+        return NextResponse.json({
+            success: true,
+            inserted: result.inserted,
+            drivers: result.drivers,
+            rejected: result.rejected
+        })
+
+    } catch (err) {
+        console.error('API Error:', err)
+        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 })
+    }
+}
@@ -24,7 +24,7 @@ export default async function DriversPage(props: Props) {
   const query = (searchParams.query as string) || ''
   
   // Fetch drivers with pagination and search
-  const { data: drivers, count } = await getAllDrivers(page, 12, query, searchParams.branchId as string)
+  const { data: drivers, count, nextCursor, prevCursor } = await getAllDrivers(page, 12, query, searchParams.branchId as string, searchParams.cursor as string)
   
   // Fetch vehicles and subcontractors for the dialogs
   const { data: vehicles } = await getAllVehicles()
@@ -41,6 +41,8 @@ export default async function DriversPage(props: Props) {
         branchId={searchParams.branchId as string}
         createBulkDrivers={createBulkDrivers}
         isAdminUser={isUserAdmin}
+        nextCursor={nextCursor}
+        prevCursor={prevCursor}
       />
     </DashboardLayout>
   )
@@ -64,6 +64,8 @@ interface HistoryClientProps {
   status: string
   query: string
   limit: number
+  nextCursor?: string | null
+  prevCursor?: string | null
 }
 
 export function HistoryClient({ 
@@ -83,7 +85,9 @@ export function HistoryClient({
   dateTo,
   status,
   query,
-  limit
+  limit,
+  nextCursor,
+  prevCursor
 }: HistoryClientProps) {
   const { t } = useLanguage()
   const colorFor = useCustomerColor()
@@ -184,6 +188,7 @@ export function HistoryClient({
       else params.delete('to')
 
       params.set('page', '1')
+      params.delete('cursor')
       router.push(`${pathname}?${params.toString()}`)
     }, 600)
 
@@ -594,7 +599,7 @@ export function HistoryClient({
           </div>
           
           <div className="p-6 border-t border-border/5 bg-muted/30">
-             <Pagination totalItems={count || 0} limit={limit} />
+             <Pagination totalItems={count || 0} limit={limit} nextCursor={nextCursor} prevCursor={prevCursor} />
           </div>
       </div>
     </>
@@ -26,6 +26,7 @@ export default async function JobHistoryPage(props: Props) {
   const dateTo = (searchParams.to as string) || ''
   const status = (searchParams.status as string) || ''
   const overdueOnly = searchParams.overdue === '1' || searchParams.overdue === 'true'
+  const cursor = (searchParams.cursor as string) || ''
 
   // Read customer from URL param first, fallback to cookie (persists across navigation)
   const cookieStore = await cookies()
@@ -38,7 +39,7 @@ export default async function JobHistoryPage(props: Props) {
   const isAdminUser = await isAdmin()
 
   const [jobsResult, stats, creationData, hasPriceView, hasDeletePermission, hasExportPermission] = await Promise.all([
-    getAllJobs(page, limit, query, status, dateFrom, dateTo, currentBranchId, customerId, overdueOnly),
+    getAllJobs(page, limit, query, status, dateFrom, dateTo, currentBranchId, customerId, overdueOnly, cursor),
     getJobStatsSummary(query, dateFrom, dateTo, currentBranchId, customerId),
     getJobCreationData(currentBranchId),
     hasPermission('job_price_view'),
@@ -51,7 +52,7 @@ export default async function JobHistoryPage(props: Props) {
   // Customers can always download their own mission report
   const canExport = isAdminUser || hasExportPermission || customerMode
 
-  const { data: jobs, count } = jobsResult
+  const { data: jobs, count, nextCursor, prevCursor } = jobsResult
   const { drivers, vehicles, customers, routes, subcontractors } = creationData
 
   return (
@@ -74,6 +75,8 @@ export default async function JobHistoryPage(props: Props) {
         status={status}
         query={query}
         limit={limit}
+        nextCursor={nextCursor}
+        prevCursor={prevCursor}
       />
       
       <div className="mt-12 text-center mb-20">
@@ -19,6 +19,7 @@ import html2canvas from "html2canvas"
 import { analyzePODImage, AIAnalysisResult } from "@/lib/utils/ai-verification"
 import { saveJobOffline, blobToB64 } from "@/lib/utils/offline-storage"
 import { withTimeout } from "@/lib/utils/with-timeout"
+import { uploadPodFiles } from "@/lib/utils/direct-upload"
 import { QuantityStepper } from "@/components/mobile/quantity-stepper"
 import { notifyTrackingStateChanged } from "@/lib/tracking-state"
 
@@ -134,6 +135,8 @@ export default function JobCompletePage() {
 
     try {
         const formData = new FormData()
+        let reportFile: File | null = null
+        let floorClimbFile: File | null = null
 
         // 1. Capture Report (Heavy Task)
         if (reportRef.current && job) {
@@ -173,7 +176,7 @@ export default function JobCompletePage() {
                 return null
             })
             if (reportBlob && reportBlob.size > 5000) {
-                formData.append("pod_report", reportBlob, isContainer ? `Container_Delivery_Report_${params.id}.jpg` : `POD_Report_${params.id}.jpg`)
+                reportFile = new File([reportBlob], isContainer ? `Container_Delivery_Report_${params.id}.jpg` : `POD_Report_${params.id}.jpg`, { type: 'image/jpeg' })
             } else {
                 console.error("[POD report] blob missing/too small:", reportBlob?.size)
             }
@@ -191,7 +194,7 @@ export default function JobCompletePage() {
                     })
                     const fcBlob = await new Promise<Blob | null>(resolve => fcCanvas.toBlob(resolve, 'image/jpeg', 0.85))
                     if (fcBlob && fcBlob.size > 1000) {
-                        formData.append("floor_climb_report", fcBlob, `Floor_Climb_Report_${params.id}.jpg`)
+                        floorClimbFile = new File([fcBlob], `Floor_Climb_Report_${params.id}.jpg`, { type: 'image/jpeg' })
                     } else {
                         console.error("[FloorClimb] blob missing/too small:", fcBlob?.size)
                         toast.error("สร้างใบขึ้นชั้นไม่สำเร็จ (ภาพว่าง)")
@@ -213,10 +216,26 @@ export default function JobCompletePage() {
         // let the off-screen report DOM unmount.
         setLoading(true)
 
-        // 2. Photos & Signature
-        photos.forEach((photo, index) => formData.append(`photo_${index}`, photo))
-        formData.append("photo_count", photos.length.toString())
-        formData.append("signature", signature, "signature.png")
+        // 2. Photos, signature & reports go straight to storage (already
+        // uploaded files are skipped on a retry); the action only gets URLs.
+        // If direct upload is unavailable they ride along in the form as before.
+        const uploadedUrls = await withTimeout(
+            uploadPodFiles(params.id, { photos, signature, report: reportFile, floorClimb: floorClimbFile }),
+            90000,
+            'POD direct upload'
+        ).catch((err) => {
+            console.warn("[POD direct upload] falling back to form upload:", err)
+            return null
+        })
+        if (uploadedUrls) {
+            formData.append("uploaded_urls", JSON.stringify(uploadedUrls))
+        } else {
+            if (reportFile) formData.append("pod_report", reportFile)
+            if (floorClimbFile) formData.append("floor_climb_report", floorClimbFile)
+            photos.forEach((photo, index) => formData.append(`photo_${index}`, photo))
+            formData.append("photo_count", photos.length.toString())
+            formData.append("signature", signature, "signature.png")
+        }
         if (loadedQty) formData.append("loaded_qty", loadedQty)
         // จุดลงย่อยที่ลูกค้าแจ้งแบ่งหน้างาน (เช่น โกดัง) → server จะเพิ่มเป็นจุดส่งใหม่
         if (extraServiceData?.subDrops && extraServiceData.subDrops.length > 0) {
@@ -333,7 +352,7 @@ export default function JobCompletePage() {
 
   if (completed) {
       return (
-          <div className="min-h-full bg-slate-950 flex flex-col items-center justify-center p-6 text-center space-y-4 animate-in zoom-in duration-300">
+          <div className="min-h-full bg-slate-950 flex flex-col items-center justify-center p-6 text-center space-y-4 animate-in zoom-in duration-300" data-testid="pod-completed">
               <div className="w-20 h-20 bg-emerald-500/20 rounded-full flex items-center justify-center text-emerald-500">
                   <CheckCircle size={48} />
               </div>
@@ -517,6 +536,7 @@ export default function JobCompletePage() {
             <Button 
                 onClick={handleSubmit}
                 disabled={loading}
+                data-testid="pod-submit"
                 className="w-full h-16 bg-gradient-to-r from-blue-600 via-indigo-600 to-blue-700 shadow-blue-500/30 text-white font-black text-lg shadow-xl transition-all duration-300 rounded-2xl active:scale-95"
             >
                 {isContainer ? "ยืนยันการคืนตู้" : "ยืนยันการส่งงาน"}
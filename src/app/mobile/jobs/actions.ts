@@ -97,15 +97,34 @@ export async function verifyStairClimbing(sensorLogs: Array<{ pressure: number;
 
 import { transitionJobStatus } from "@/services/job-status-machine"
 
+type StatusUpdateOptions = {
+  incentiveClaimed?: boolean;
+  sensorLogs?: Array<{ pressure: number; steps_upward?: number; timestamp: number }>;
+}
+
 export async function updateJobStatus(
   jobId: string, 
   status: string, 
   driverId?: string,
-  options?: {
-    incentiveClaimed?: boolean;
-    sensorLogs?: Array<{ pressure: number; steps_upward?: number; timestamp: number }>;
-  }
+  options?: StatusUpdateOptions
 ) {
+  const result = await applyJobStatus(jobId, status, driverId, options)
+  if (result.success) {
+    revalidatePath(`/mobile/jobs/${jobId}`)
+    revalidatePath('/mobile/jobs')
+    revalidatePath('/monitoring') 
+  }
+  return result
+}
+
+// Transition plus sensor/CO2 bookkeeping, without revalidating — shared by
+// updateJobStatus and the batched offline replay.
+async function applyJobStatus(
+  jobId: string,
+  status: string,
+  driverId?: string,
+  options?: StatusUpdateOptions
+): Promise<{ success: boolean; message?: string }> {
   try {
     const supabase = createAdminClient()
 
@@ -175,10 +194,6 @@ export async function updateJobStatus(
     // chokepoint for every status change), so it's no longer triggered here to
     // avoid double-notifying.
 
-    revalidatePath(`/mobile/jobs/${jobId}`)
-    revalidatePath('/mobile/jobs')
-    revalidatePath('/monitoring') 
-    
     return { success: true, message: 'Status updated successfully' }
   } catch (err) {
     return { success: false, message: err instanceof Error ? err.message : "Internal Server Error" }
@@ -186,12 +201,74 @@ export async function updateJobStatus(
 }
 
 import { getJobById } from "@/lib/supabase/jobs"
+import { mapWithConcurrency } from "@/lib/utils/concurrency"
 
 export async function getJobDetails(jobId: string) {
     const job = await getJobById(jobId)
     return job
 }
 
+const REPLAY_JOB_CONCURRENCY = 8
+
+/**
+ * Replay a driver's queued offline work in one round trip.
+ *
+ * `statuses` may cover many jobs; each job's transitions run in the order
+ * given and stop at the first rejection (later steps would fail the state
+ * machine anyway; they get no result and stay queued), while different jobs
+ * run side by side. `proofJobIds`
+ * returns which jobs already have a POD / pickup proof on the server so the
+ * client can drop redundant queued uploads without a lookup per item.
+ */
+export async function replayOfflineUpdates(
+    statuses: { id: string; jobId: string; status: string; driverId?: string }[],
+    proofJobIds: string[] = []
+) {
+    const byJob = new Map<string, typeof statuses>()
+    for (const update of statuses) {
+        const steps = byJob.get(update.jobId)
+        if (steps) steps.push(update)
+        else byJob.set(update.jobId, [update])
+    }
+
+    const results: { id: string; success: boolean; message?: string }[] = []
+    const changedJobs: string[] = []
+    await mapWithConcurrency([...byJob.entries()], REPLAY_JOB_CONCURRENCY, async ([jobId, steps]) => {
+        for (const step of steps) {
+            const result = await applyJobStatus(jobId, step.status, step.driverId)
+            results.push({ id: step.id, success: result.success, message: result.message })
+            if (!result.success) break
+            changedJobs.push(jobId)
+        }
+    })
+
+    const proofs: Record<string, { pod: boolean; pickup: boolean }> = {}
+    const ids = [...new Set(proofJobIds)]
+    if (ids.length > 0) {
+        const supabase = createAdminClient()
+        for (let i = 0; i < ids.length; i += 200) {
+            const { data } = await supabase
+                .from('Jobs_Main')
+                .select('Job_ID, Photo_Proof_Url, Signature_Url, Pickup_Photo_Url, Pickup_Signature_Url')
+                .in('Job_ID', ids.slice(i, i + 200))
+            for (const row of data || []) {
+                proofs[row.Job_ID] = {
+                    pod: !!(row.Photo_Proof_Url || row.Signature_Url),
+                    pickup: !!(row.Pickup_Photo_Url || row.Pickup_Signature_Url),
+                }
+            }
+        }
+    }
+
+    if (changedJobs.length > 0) {
+        new Set(changedJobs).forEach(jobId => revalidatePath(`/mobile/jobs/${jobId}`))
+        revalidatePath('/mobile/jobs')
+        revalidatePath('/monitoring')
+    }
+
+    return { results, proofs }
+}
+
 export async function createSOSAlert(params: { type: string, lat: number, lng: number, message: string }) {
     try {
         const supabase = createAdminClient()
@@ -91,6 +91,8 @@ export default function MobileSettingsPage() {
         <div className="mt-8">
             <form action={async () => {
                 const { logoutDriver } = await import("@/lib/actions/auth-actions")
+                const { clearDriverPageCache } = await import("@/lib/utils/offline-storage")
+                await clearDriverPageCache()
                 await logoutDriver()
             }}>
                 <Button type="submit" variant="outline" className="w-full border-red-500/30 text-red-400 hover:bg-red-500/10 hover:text-red-300 h-12">
@@ -10,13 +10,18 @@ import { getDangerZones } from '@/lib/supabase/danger-zones'
 import { MonitoringCommandCenter } from '@/components/monitoring/monitoring-command-center'
 import type { DriverWithGPS } from '@/components/monitoring/monitoring-command-center'
 import { getCustomerId, isCustomer } from '@/lib/permissions'
+import { getIdentity } from '@/lib/identity'
+import { fleetChannelName } from '@/lib/location-store'
 
 
 export default async function MonitoringPage() {
-  const [customerMode, customerId] = await Promise.all([
+  const [customerMode, customerId, identity] = await Promise.all([
       isCustomer(),
-      getCustomerId()
+      getCustomerId(),
+      getIdentity()
   ])
+  // Customers only poll their own scope; staff also get their branch's live deltas
+  const fleetChannel = customerMode ? null : fleetChannelName(identity.branchId)
 
   const [pendingJobs, assignedJobs, confirmedJobs, acceptedJobs, pickedUpJobs, inProgressJobs, inTransitJobs, arrivedJobs, sosJobs, failedJobs, activeDrivers, chatContacts, healthAlerts, heatmapJobs, zones] = await Promise.all([
     getJobsByStatus('Pending'),
@@ -64,6 +69,7 @@ export default async function MonitoringPage() {
             initialHealthAlerts={healthAlerts}
             heatmapJobs={mapHeatmapJobs}
             dangerZones={dangerZones}
+            fleetChannel={fleetChannel}
         />
     </DashboardLayout>
   )
@@ -13,9 +13,13 @@ import { getCustomerId, getUserId, isCustomer, isSuperAdmin, isAdmin } from '@/l
 import { sanitizeJobData } from '@/lib/supabase/utils'
 import { getFuelPriceNumber, getSuggestedRate } from '@/lib/actions/fuel-actions'
 import { optimizeRoute, RoutePoint } from '@/lib/ai/route-optimizer'
-import { appendJobToMaster } from '@/lib/actions/master-sheet-sync'
+import { queueJobForMaster } from '@/lib/actions/master-sheet-sync'
 import { getSession } from '@/lib/session'
 import { resolveDistanceKm } from '@/lib/ai/distance'
+import { getDistanceMatrix } from '@/lib/ai/distance-matrix'
+import { solveVrp } from '@/services/vrp-solver'
+import { collectHeaders, readAliased, resolveHeaders, type HeaderPlan } from '@/lib/utils/job-import-headers'
+import type { ImportChunk } from '@/lib/utils/import-progress'
 
 export type JobFormData = {
   Job_ID: string
@@ -370,7 +374,7 @@ async function autoSaveOriginDestinations(branchId: string | null, originsJson?:
 export async function createBulkJobs(
     jobs: Partial<JobFormData>[], 
     effectiveBranchId: string | null = null,
-    options: { shouldGroup?: boolean, isDraft?: boolean } = {}
+    options: { shouldGroup?: boolean, isDraft?: boolean, chunk?: ImportChunk } = {}
 ) {
   const isAdminUser = await isAdmin()
   const supabase = isAdminUser ? await createAdminClient() : await createClient()
@@ -409,66 +413,15 @@ export async function createBulkJobs(
       .filter((entry): entry is readonly [string, { Route_Name?: string | null; Origin?: string | null; Destination?: string | null; Origin_Lat?: number | null; Origin_Lon?: number | null; Dest_Lat?: number | null; Dest_Lon?: number | null; Distance_KM?: number | null }] => Boolean(entry[0]))
   )
 
-  // Helper to normalize keys
-  const normalizeData = (row: Partial<JobFormData>) => {
-    const normalized: Record<string, unknown> = {}
-    const getValue = (keys: string[]) => {
-      const rowKeys = Object.keys(row)
-      for (const key of keys) {
-        const foundKey = rowKeys.find(k => k.toLowerCase().replace(/\s+/g, '_') === key.toLowerCase().replace(/\s+/g, '_'))
-        const rowAsRecord = row as Record<string, unknown>
-        if (foundKey && rowAsRecord[foundKey] !== undefined && rowAsRecord[foundKey] !== null) {
-          return rowAsRecord[foundKey]
-        }
-      }
-      return undefined
-    }
-
-    normalized.Job_ID = getValue(['Job_ID', 'id', 'รหัสงาน'])
-    normalized.Plan_Date = getValue(['Plan_Date', 'date', 'วันที่แผน', 'วันที่'])
-    normalized.Delivery_Date = getValue(['Delivery_Date', 'delivery_date', 'วันจัดส่ง', 'วันที่จัดส่ง', 'วันส่ง'])
-    normalized.Customer_ID = getValue(['Customer_ID', 'cust_id', 'รหัสลูกค้า'])
-    normalized.Customer_Name = getValue(['Customer_Name', 'customer', 'ลูกค้า', 'ชื่อลูกค้า'])
-    normalized.Route_Name = getValue(['Route_Name', 'route', 'เส้นทาง'])
-    normalized.Driver_ID = getValue(['Driver_ID', 'driver', 'รหัสคนขับ'])
-    normalized.Vehicle_Plate = getValue(['Vehicle_Plate', 'plate', 'ทะเบียนรถ', 'ทะเบียน'])
-    normalized.Vehicle_Type = getValue(['Vehicle_Type', 'vehicle_type', 'ประเภทรถ', 'ชนิดรถ'])
-    normalized.Weight_Kg = getValue(['Weight_Kg', 'weight', 'น้ำหนัก', 'น้ำหนักสินค้า'])
-    normalized.Volume_Cbm = getValue(['Volume_Cbm', 'volume', 'ปริมาตร', 'คิว'])
-    normalized.Price_Cust_Total = getValue(['Price_Cust_Total', 'price', 'รายได้', 'ราคาขาย', 'ราคาลูกค้า'])
-    normalized.Cost_Driver_Total = getValue(['Cost_Driver_Total', 'cost', 'ต้นทุน', 'ค่ารถ', 'จ่ายคนขับ', 'ค่าเที่ยว'])
-    normalized.Notes = getValue(['Notes', 'remark', 'หมายเหตุ'])
-    normalized.Ref_No = getValue(['Ref_No', 'so', 'do', 'เลขที่อ้างอิง'])
-    normalized.Branch_ID = getValue(['Branch_ID', 'branch', 'สาขา'])
-    normalized.Job_Status = getValue(['Job_Status', 'status', 'สถานะ'])
-    
-    normalized.Origin_Location = getValue(['Origin_Location', 'origin', 'ต้นทาง', 'รับที่'])
-    normalized.Dest_Location = getValue(['Dest_Location', 'destination', 'ปลายทาง', 'ส่งที่'])
-    normalized.Est_Distance_KM = getValue(['Est_Distance_KM', 'distance', 'km', 'ระยะทาง', 'กิโลเมตร'])
-    normalized.Pickup_Lat = getValue(['pickup_lat', 'origin_lat', 'lat_start', 'ละติจูดต้นทาง', 'lat_ต้นทาง'])
-    normalized.Pickup_Lon = getValue(['pickup_lon', 'origin_lon', 'lon_start', 'ลองติจูดต้นทาง', 'lon_ต้นทาง'])
-    normalized.Delivery_Lat = getValue(['delivery_lat', 'dest_lat', 'lat_end', 'ละติจูดปลายทาง', 'lat_ปลายทาง'])
-    normalized.Delivery_Lon = getValue(['delivery_lon', 'dest_lon', 'lon_end', 'ลองติจูดปลายทาง', 'lon_ปลายทาง'])
-    normalized.Show_Price_To_Driver = getValue(['Show_Price_To_Driver', 'show_price', 'การแสดงรายได้'])
-    normalized.Round = getValue(['Round', 'trip', 'รอบ', 'เที่ยว', 'รอบวิ่ง', 'ลำดับรอบ'])
-    
-    // Container Fields
-    normalized.job_type = getValue(['job_type', 'ประเภทงาน'])
-    normalized.chassis_plate = getValue(['chassis_plate', 'ทะเบียนหาง', 'หางลาก'])
-    normalized.container_no = getValue(['container_no', 'หมายเลขตู้', 'เลขตู้'])
-    normalized.seal_no = getValue(['seal_no', 'หมายเลขซีล', 'เลขซีล'])
-    normalized.container_size = getValue(['container_size', 'ขนาดตู้'])
-    normalized.shipping_line = getValue(['shipping_line', 'สายเรือ'])
-    normalized.vessel_voyage = getValue(['vessel_voyage', 'เรือ/เที่ยว'])
-    normalized.lfd_demurrage = getValue(['lfd_demurrage', 'LFD Demurrage'])
-    normalized.lfd_detention = getValue(['lfd_detention', 'LFD Detention'])
-    normalized.target_temperature = getValue(['target_temperature', 'อุณหภูมิเป้าหมาย'])
+  // Helper to normalize keys. Header aliases are resolved once per upload
+  // (see resolveHeaders); each row is then read through the resolved plan.
+  const normalizeData = (row: Partial<JobFormData>, plan: HeaderPlan) => {
+    const normalized = readAliased(row, plan)
 
     // Multi-Origin & Destination Detection
     const origins: { name: string, lat: number | null, lng: number | null }[] = []
     const destinations: { name: string, lat: number | null, lng: number | null }[] = []
-    const rowKeys = Object.keys(row)
-    
+
     // Parse fallback from Route_Name if Origin/Dest Location fields are missing
     const rawRouteName = normalized.Route_Name as string
     if (rawRouteName) {
@@ -500,16 +453,7 @@ export async function createBulkJobs(
         }
     }
 
-    const additionalOriginKeys = rowKeys.filter(k => {
-        const nk = k.toLowerCase().replace(/\s+/g, '')
-        return (nk.startsWith('ต้นทาง') || nk.startsWith('origin')) && 
-               /\d+/.test(nk) && 
-               !nk.includes('lat') && !nk.includes('lon')
-    }).sort((a, b) => {
-        const numA = parseInt(a.match(/\d+/)?.[0] || '0')
-        const numB = parseInt(b.match(/\d+/)?.[0] || '0')
-        return numA - numB
-    })
+    const additionalOriginKeys = plan.extraOrigins
 
     additionalOriginKeys.forEach(key => {
         const val = (row as Record<string, unknown>)[key]
@@ -548,16 +492,7 @@ export async function createBulkJobs(
             }
         }
 
-        const additionalDestKeys = rowKeys.filter(k => {
-            const nk = k.toLowerCase().replace(/\s+/g, '')
-            return (nk.startsWith('ปลายทาง') || nk.startsWith('destination') || nk.startsWith('dest')) && 
-                   /\d+/.test(nk) && 
-                   !nk.includes('lat') && !nk.includes('lon')
-        }).sort((a, b) => {
-            const numA = parseInt(a.match(/\d+/)?.[0] || '0')
-            const numB = parseInt(b.match(/\d+/)?.[0] || '0')
-            return numA - numB
-        })
+        const additionalDestKeys = plan.extraDestinations
 
         additionalDestKeys.forEach(key => {
             const val = (row as Record<string, unknown>)[key]
@@ -667,9 +602,17 @@ export async function createBulkJobs(
   }
 
   const sourceRows = options.shouldGroup ? groupMasterSheetRows(jobs) : jobs
+  const headerPlan = resolveHeaders(collectHeaders(sourceRows))
 
-  const cleanData = sourceRows.map(j => {
-    const data = normalizeData(j)
+  // Chunked imports may re-send a chunk after a dropped connection. Rows
+  // without a Job_ID get an ID derived from their sheet position so the
+  // re-sent rows hit the duplicate check below instead of being inserted twice.
+  const fallbackJobId = (index: number) => options.chunk
+    ? `JOB-${options.chunk.importId}-${options.chunk.offset + index + 1}`
+    : `JOB-${Date.now().toString().slice(-6)}-${Math.floor(Math.random()*1000)}`
+
+  const cleanData = sourceRows.map((j, index) => {
+    const data = normalizeData(j, headerPlan)
     const driverId = data.Driver_ID as string
     const vehiclePlate = data.Vehicle_Plate as string
     
@@ -690,7 +633,7 @@ export async function createBulkJobs(
     }
 
     const sanitized = sanitizeJobData({
-      Job_ID: cleanId(data.Job_ID) || `JOB-${Date.now().toString().slice(-6)}-${Math.floor(Math.random()*1000)}`,
+      Job_ID: cleanId(data.Job_ID) || fallbackJobId(index),
       Branch_ID: (data.Branch_ID as string) || effectiveBranchId,
       Plan_Date: normalizeDate(data.Plan_Date) || todayTH(),
       // เดิม Delivery_Date ตกหล่น (ไม่ถูกบันทึก) → งานที่สร้างจากหน้าวางแผนวันจัดส่งหาย
@@ -787,6 +730,8 @@ export async function createBulkJobs(
   }))
 
   if (finalizedData.length === 0) {
+     // A chunk of invalid rows should not stop the rest of a chunked import
+     if (options.chunk) return { success: true, message: 'ไม่พบข้อมูลที่ถูกต้องในชุดนี้', imported: 0 }
      return { success: false, message: 'ไม่พบข้อมูลที่ถูกต้อง (ต้องระบุชื่อลูกค้า)' }
   }
 
@@ -809,12 +754,20 @@ export async function createBulkJobs(
     .in('Job_ID', incomingIds)
 
   const existingIds = new Set((existingJobs || []).map((j: { Job_ID: string }) => j.Job_ID))
-  const duplicateIds = incomingIds.filter((id): id is string => !!id && existingIds.has(id))
+
+  // A re-sent chunk finds its own position-derived IDs already saved: those
+  // rows landed on the first attempt, so they are neither updated nor
+  // announced again.
+  const chunkPrefix = options.chunk ? `JOB-${options.chunk.importId}-` : null
+  const alreadyImported = new Set(chunkPrefix ? Array.from(existingIds).filter(id => id.startsWith(chunkPrefix)) : [])
+  const freshData = finalizedData.filter(j => !alreadyImported.has(j.Job_ID as string))
+  const duplicateIds = incomingIds.filter((id): id is string => !!id && existingIds.has(id) && !alreadyImported.has(id))
 
   const newJobs = jobsMainData.filter(j => !existingIds.has(j.Job_ID as string))
-  const updateJobs = jobsMainData.filter(j => existingIds.has(j.Job_ID as string))
+  const updateJobs = jobsMainData.filter(j => existingIds.has(j.Job_ID as string) && !alreadyImported.has(j.Job_ID as string))
 
-  // Insert new jobs only (no silent overwrite)
+  // Insert new jobs only (no silent overwrite). One INSERT statement, so a
+  // chunk of an import either lands completely or not at all.
   if (newJobs.length > 0) {
     const { error: insertErr } = await supabase.from('Jobs_Main').insert(newJobs)
     if (insertErr) return { success: false, message: `Failed to import: ${insertErr.message}` }
@@ -832,11 +785,11 @@ export async function createBulkJobs(
   }
 
   // Save Container Data for each job (if applicable)
-  await Promise.allSettled(finalizedData.map(j => handleContainerData(supabase, j.Job_ID!, j as JobFormData)))
+  await Promise.allSettled(freshData.map(j => handleContainerData(supabase, j.Job_ID!, j as JobFormData)))
 
   // Auto-save locations from the batch
   const locationsToSave: { name: string, lat: number, lng: number }[] = []
-  finalizedData.forEach(j => {
+  freshData.forEach(j => {
       if (j.Origin_Location && j.Pickup_Lat && j.Pickup_Lon) {
           locationsToSave.push({ name: j.Origin_Location, lat: j.Pickup_Lat, lng: j.Pickup_Lon })
       }
@@ -854,7 +807,7 @@ export async function createBulkJobs(
   // (ชื่อที่มีอยู่แล้วถูกข้าม; ที่ใหม่ถูก flag Is_Incomplete ให้แอดมินตามเติมผ่าน getAdminAlerts)
   try {
     const importNames: string[] = []
-    finalizedData.forEach(j => {
+    freshData.forEach(j => {
       if (j.Origin_Location) importNames.push(j.Origin_Location as string)
       if (j.Dest_Location) importNames.push(j.Dest_Location as string)
     })
@@ -865,7 +818,7 @@ export async function createBulkJobs(
   // Audit: Log any backdated job entries
   const today = new Date()
   today.setHours(0, 0, 0, 0)
-  const backdatedJobs = finalizedData.filter(j => {
+  const backdatedJobs = freshData.filter(j => {
     if (!j.Plan_Date) return false
     const planDate = new Date(j.Plan_Date)
     planDate.setHours(0, 0, 0, 0)
@@ -902,7 +855,7 @@ export async function createBulkJobs(
 
       const notiPromises: Promise<unknown>[] = []
       
-      finalizedData.forEach(j => {
+      freshData.forEach(j => {
           if (j.Driver_ID) {
               assignedDrivers.add(j.Driver_ID)
               // Only notify about the first job for this driver in this batch to avoid spam
@@ -916,9 +869,9 @@ export async function createBulkJobs(
           }
       })
 
-      if (hasMarketplaceJob && finalizedData.some(j => j.Job_Status !== 'Draft')) {
+      if (hasMarketplaceJob && freshData.some(j => j.Job_Status !== 'Draft')) {
           // Broadcast once for the whole batch
-          const batchCount = finalizedData.filter(j => !j.Driver_ID).length
+          const batchCount = freshData.filter(j => !j.Driver_ID).length
           const broadcastMsg = batchCount > 1 
             ? `${batchCount} งานใหม่!` 
             : sampleJobId
@@ -946,6 +899,7 @@ export async function createBulkJobs(
   return {
     success: true,
     message: `นำเข้าสำเร็จ ${finalizedData.length} งาน${dateStr}${dupNote}`,
+    imported: finalizedData.length,
     duplicateIds: duplicateIds.length > 0 ? duplicateIds : undefined
   }
 }
@@ -1095,11 +1049,11 @@ export async function updateJob(jobId: string, data: Partial<JobFormData>) {
   })
 
   // Mirror into the MASTER Google Sheet when this edit set the job to 'Verified'.
-  // Dedup lives in appendJobToMaster (ledger check), so it's safe to call every
+  // Dedup lives in the queue flush (ledger check), so it's safe to call every
   // time — matching verifyJob() and adminUpdateJobStatus().
-  let sheetSync: { success: boolean; error?: string; skipped?: boolean } | undefined
+  let sheetSync: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } | undefined
   if (verifiedViaStatus) {
-    sheetSync = await appendJobToMaster(jobId)
+    sheetSync = await queueJobForMaster(jobId)
   }
 
   return { success: true, message: 'Job updated successfully', sheetSync }
@@ -1462,3 +1416,119 @@ export async function publishAllDrafts(date: string, branchId?: string) {
         return { success: false, error: { message: e instanceof Error ? e.message : "Internal Server Error" } }
     }
 }
+
+// Planning defaults: minutes at each drop and length of a truck's day
+const VRP_SERVICE_MINUTES = 15
+const VRP_SHIFT_MINUTES = 10 * 60
+
+/**
+ * Auto-plan: split a day's unassigned jobs across the branch's active trucks
+ * with the in-process VRP solver (capacity in kg/cbm, vehicle type, shift
+ * length). Travel times come from the cached distance matrix, straight-line
+ * estimates for pairs not cached yet, so planning never waits on OSRM.
+ * Returns the proposed routes only; nothing is saved.
+ */
+export async function planVehicleRoutes(input: {
+    date: string
+    depot: { lat: number; lng: number }
+    branchId?: string
+    jobIds?: string[]
+    timeLimitMs?: number
+}) {
+    try {
+        if (!(await isAdmin())) return { success: false, error: 'Unauthorized' }
+        const isSuper = await isSuperAdmin()
+        const userBranchId = await getUserBranchId()
+        const branchId = isSuper ? (input.branchId || userBranchId) : userBranchId
+        const supabase = createAdminClient()
+
+        let jobsQuery = supabase
+            .from('Jobs_Main')
+            .select('Job_ID, Customer_Name, Delivery_Lat, Delivery_Lon, Weight_Kg, Volume_Cbm, Vehicle_Type')
+        if (input.jobIds?.length) {
+            jobsQuery = jobsQuery.in('Job_ID', input.jobIds)
+        } else {
+            jobsQuery = jobsQuery.eq('Plan_Date', input.date).eq('Job_Status', 'New').is('Vehicle_Plate', null)
+        }
+        if (branchId && branchId !== 'All') {
+            jobsQuery = jobsQuery.eq('Branch_ID', branchId)
+        }
+
+        const [{ data: jobs, error }, vehicles] = await Promise.all([
+            jobsQuery,
+            getAllVehiclesFromTable(branchId || undefined),
+        ])
+        if (error) return { success: false, error: error.message }
+        if (input.jobIds?.length) {
+            // The branch filter drops other branches' jobs; refuse rather than plan a partial set
+            const found = new Set((jobs || []).map(j => j.Job_ID))
+            const outside = input.jobIds.filter(id => !found.has(id))
+            if (outside.length > 0) {
+                return { success: false, error: `Jobs not found in your branch: ${outside.slice(0, 10).join(', ')}` }
+            }
+        }
+
+        const routable = (jobs || []).filter(j => j.Delivery_Lat && j.Delivery_Lon)
+        const skipped = (jobs || []).filter(j => !j.Delivery_Lat || !j.Delivery_Lon).map(j => j.Job_ID)
+        const fleet = vehicles.filter(v => !v.Active_Status || v.Active_Status === 'Active')
+        if (routable.length === 0 || fleet.length === 0) {
+            return { success: true, routes: [], unassigned: routable.map(j => j.Job_ID), skipped, estimated: false, elapsedMs: 0 }
+        }
+
+        // Node 0 is the depot, node i + 1 is routable[i]
+        const points = [input.depot, ...routable.map(j => ({ lat: Number(j.Delivery_Lat), lng: Number(j.Delivery_Lon) }))]
+        const matrix = await getDistanceMatrix(points, { useOsrm: false })
+        const size = points.length
+        const minutes = new Float64Array(size * size)
+        const km = new Float64Array(size * size)
+        for (let i = 0; i < size; i++) {
+            for (let j = 0; j < size; j++) {
+                minutes[i * size + j] = matrix.durations[i][j] / 60
+                km[i * size + j] = matrix.distances[i][j] / 1000
+            }
+        }
+
+        const solution = solveVrp({
+            size,
+            time: minutes,
+            distance: km,
+            stops: routable.map((j, i) => ({
+                id: j.Job_ID,
+                node: i + 1,
+                weightKg: j.Weight_Kg,
+                volumeCbm: j.Volume_Cbm,
+                serviceTime: VRP_SERVICE_MINUTES,
+                vehicleType: j.Vehicle_Type,
+            })),
+            vehicles: fleet.map(v => ({
+                id: v.Vehicle_Plate,
+                start: 0,
+                maxWeightKg: v.Max_Weight_kg,
+                maxVolumeCbm: v.Max_Volume_cbm,
+                vehicleType: v.Vehicle_Type,
+                shiftEnd: VRP_SHIFT_MINUTES,
+            })),
+        }, { timeLimitMs: Math.min(input.timeLimitMs ?? 5000, 20000) })
+
+        const typeOf = new Map(fleet.map(v => [v.Vehicle_Plate, v.Vehicle_Type]))
+        return {
+            success: true,
+            routes: solution.routes.map(r => ({
+                Vehicle_Plate: r.vehicleId,
+                Vehicle_Type: typeOf.get(r.vehicleId) || null,
+                jobIds: r.stopIds,
+                durationMinutes: Math.round(r.time),
+                distanceKm: Math.round(r.distance * 10) / 10,
+                weightKg: r.weightKg,
+                volumeCbm: r.volumeCbm,
+            })),
+            unassigned: solution.unassigned,
+            skipped,
+            estimated: matrix.estimated,
+            elapsedMs: solution.elapsedMs,
+        }
+    } catch (e) {
+        console.error('[Actions] planVehicleRoutes error:', e)
+        return { success: false, error: e instanceof Error ? e.message : 'Internal Server Error' }
+    }
+}
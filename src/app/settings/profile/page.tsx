@@ -137,6 +137,7 @@ export default function AdminProfilePage() {
                 <div className="space-y-3">
                     <Label className="text-base font-bold font-black text-muted-foreground uppercase tracking-[0.4em] mb-2 block ml-4">{t('settings_pages.profile.first_name')}</Label>
                     <Input 
+                        data-testid="profile-first-name"
                         value={formData.First_Name || ""}
                         onChange={(e) => setFormData({...formData, First_Name: e.target.value})}
                         className="h-16 rounded-2xl bg-background border-border text-foreground placeholder:text-muted-foreground px-8 focus-visible:ring-primary/40 focus:border-primary/50 transition-all text-xl font-black uppercase tracking-widest shadow-inner italic"
@@ -146,6 +147,7 @@ export default function AdminProfilePage() {
                 <div className="space-y-3">
                     <Label className="text-base font-bold font-black text-muted-foreground uppercase tracking-[0.4em] mb-2 block ml-4">{t('settings_pages.profile.last_name')}</Label>
                     <Input 
+                        data-testid="profile-last-name"
                         value={formData.Last_Name || ""}
                         onChange={(e) => setFormData({...formData, Last_Name: e.target.value})}
                         className="h-16 rounded-2xl bg-background border-border text-foreground placeholder:text-muted-foreground px-8 focus-visible:ring-primary/40 focus:border-primary/50 transition-all text-xl font-black uppercase tracking-widest shadow-inner italic"
@@ -158,6 +160,7 @@ export default function AdminProfilePage() {
                 <Label className="text-base font-bold font-black text-muted-foreground uppercase tracking-[0.4em] mb-2 block ml-4">{t('settings_pages.profile.email')}</Label>
                 <div className="relative group/input">
                     <Input 
+                        data-testid="profile-email"
                         value={formData.Email || ""}
                         onChange={(e) => setFormData({...formData, Email: e.target.value})}
                         className="h-16 rounded-2xl bg-background border-border text-foreground placeholder:text-muted-foreground px-8 focus-visible:ring-primary/40 focus:border-primary/50 transition-all text-xl font-black uppercase tracking-widest shadow-inner italic"
@@ -190,6 +193,7 @@ export default function AdminProfilePage() {
 
             <div className="mt-16 flex justify-end relative z-10">
                 <PremiumButton 
+                    data-testid="profile-save"
                     onClick={handleSave} 
                     disabled={saving} 
                     className="h-20 px-12 rounded-[2rem] gap-4 shadow-[0_20px_50px_rgba(255,30,133,0.3)] hover:scale-105 transition-all text-base tracking-[0.2em]"
@@ -224,6 +224,7 @@ export default function SettingsPage() {
               </div>
 
               <PremiumButton 
+                  data-testid="settings-edit-profile"
                   className="h-12 px-6 rounded-xl gap-3 shadow-sm"
                   onClick={() => handleNavigate("/settings/profile")}
               >
@@ -24,6 +24,46 @@ import { ExcelImport } from "@/components/ui/excel-import"
 import { PremiumButton } from "@/components/ui/premium-button"
 import { isAdmin } from "@/lib/permissions"
 
+const VEHICLE_PAGE_SIZE = 100
+
+function toVehicle(v: Partial<Vehicle>): Vehicle {
+  return {
+    Vehicle_Plate: v.Vehicle_Plate || "",
+    Vehicle_Type: v.Vehicle_Type ?? null,
+    Brand: v.Brand ?? null,
+    Model: v.Model ?? null,
+    Year: v.Year ?? null,
+    Color: v.Color ?? null,
+    Engine_No: v.Engine_No ?? null,
+    Chassis_No: v.Chassis_No ?? null,
+    Max_Weight_kg: v.Max_Weight_kg ?? null,
+    Max_Volume_cbm: v.Max_Volume_cbm ?? null,
+    Tank_Capacity: v.Tank_Capacity ?? null,
+    Insurance_Company: v.Insurance_Company ?? null,
+    Insurance_Expiry: v.Insurance_Expiry ?? null,
+    Tax_Expiry: v.Tax_Expiry ?? null,
+    Act_Expiry: v.Act_Expiry ?? null,
+    Current_Mileage: v.Current_Mileage ?? null,
+    Last_Service_Date: v.Last_Service_Date ?? null,
+    Next_Service_Mileage: v.Next_Service_Mileage ?? null,
+    Cargo_Insurance_Expiry: v.Cargo_Insurance_Expiry ?? null,
+    Cargo_Insurance_Company: v.Cargo_Insurance_Company ?? null,
+    Tire_Change_Date: v.Tire_Change_Date ?? null,
+    Tire_Change_Odometer: v.Tire_Change_Odometer ?? null,
+    Tire_Next_Change_Mileage: v.Tire_Next_Change_Mileage ?? null,
+    Driver_ID: v.Driver_ID ?? null,
+    Branch_ID: v.Branch_ID ?? null,
+    Active_Status: v.Active_Status ?? null,
+    Notes: v.Notes ?? null,
+    Sub_ID: v.Sub_ID ?? null,
+    Owner_Type: v.Owner_Type ?? null,
+    Preferred_Zone: v.Preferred_Zone ?? null,
+    Primary_Driver_Name: v.Primary_Driver_Name ?? null,
+    is_chassis: v.is_chassis ?? null,
+    Customer_ID: v.Customer_ID ?? null,
+  } satisfies Vehicle
+}
+
 export default function VehiclesPage() {
   const [vehicles, setVehicles] = useState<Vehicle[]>([])
   const [loading, setLoading] = useState(true)
@@ -32,57 +72,41 @@ export default function VehiclesPage() {
   const { selectedBranch } = useBranch()
   const { t } = useLanguage()
   const [refreshTrigger, setRefreshTrigger] = useState(0)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [pagesLoaded, setPagesLoaded] = useState(1)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     async function loadVehicles() {
       setLoading(true)
       const [data, adminStatus] = await Promise.all([
-        getAllVehicles(1, 100, "", selectedBranch),
+        getAllVehicles(1, VEHICLE_PAGE_SIZE, "", selectedBranch),
         isAdmin()
       ])
       setVehicles((data.data || [])
         .filter((v) => Boolean(v.Vehicle_Plate))
-        .map((v) => ({
-          Vehicle_Plate: v.Vehicle_Plate || "",
-          Vehicle_Type: v.Vehicle_Type ?? null,
-          Brand: v.Brand ?? null,
-          Model: v.Model ?? null,
-          Year: v.Year ?? null,
-          Color: v.Color ?? null,
-          Engine_No: v.Engine_No ?? null,
-          Chassis_No: v.Chassis_No ?? null,
-          Max_Weight_kg: v.Max_Weight_kg ?? null,
-          Max_Volume_cbm: v.Max_Volume_cbm ?? null,
-          Tank_Capacity: v.Tank_Capacity ?? null,
-          Insurance_Company: v.Insurance_Company ?? null,
-          Insurance_Expiry: v.Insurance_Expiry ?? null,
-          Tax_Expiry: v.Tax_Expiry ?? null,
-          Act_Expiry: v.Act_Expiry ?? null,
-          Current_Mileage: v.Current_Mileage ?? null,
-          Last_Service_Date: v.Last_Service_Date ?? null,
-          Next_Service_Mileage: v.Next_Service_Mileage ?? null,
-          Cargo_Insurance_Expiry: v.Cargo_Insurance_Expiry ?? null,
-          Cargo_Insurance_Company: v.Cargo_Insurance_Company ?? null,
-          Tire_Change_Date: v.Tire_Change_Date ?? null,
-          Tire_Change_Odometer: v.Tire_Change_Odometer ?? null,
-          Tire_Next_Change_Mileage: v.Tire_Next_Change_Mileage ?? null,
-          Driver_ID: v.Driver_ID ?? null,
-          Branch_ID: v.Branch_ID ?? null,
-          Active_Status: v.Active_Status ?? null,
-          Notes: v.Notes ?? null,
-          Sub_ID: v.Sub_ID ?? null,
-          Owner_Type: v.Owner_Type ?? null,
-          Preferred_Zone: v.Preferred_Zone ?? null,
-          Primary_Driver_Name: v.Primary_Driver_Name ?? null,
-          is_chassis: v.is_chassis ?? null,
-          Customer_ID: v.Customer_ID ?? null,
-        } satisfies Vehicle)))
+        .map(toVehicle))
+      setNextCursor(data.nextCursor ?? null)
+      setPagesLoaded(1)
       setIsAdminUser(adminStatus)
       setLoading(false)
     }
     loadVehicles()
   }, [selectedBranch, refreshTrigger])
 
+  // Next keyset page after the last plate shown; no offset scan however far in
+  async function loadMore() {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    const data = await getAllVehicles(pagesLoaded + 1, VEHICLE_PAGE_SIZE, "", selectedBranch, nextCursor)
+    setVehicles(prev => [...prev, ...(data.data || [])
+      .filter((v) => Boolean(v.Vehicle_Plate))
+      .map(toVehicle)])
+    setNextCursor(data.nextCursor ?? null)
+    setPagesLoaded(prev => prev + 1)
+    setLoadingMore(false)
+  }
+
   const filteredVehicles = vehicles.filter(v => 
     (v.Vehicle_Plate || "").toLowerCase().includes(searchQuery.toLowerCase()) ||
     (v.Vehicle_Type || "").toLowerCase().includes(searchQuery.toLowerCase())
@@ -229,6 +253,19 @@ export default function VehiclesPage() {
                 ))
             )}
         </div>
+
+        {!loading && nextCursor && (
+            <div className="flex justify-center">
+                <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    data-testid="vehicles-load-more"
+                    className="flex items-center h-11 gap-2 px-6 bg-background border border-border rounded-xl text-muted-foreground hover:text-foreground hover:bg-muted/60 transition-all font-semibold text-sm disabled:opacity-50"
+                >
+                    {loadingMore ? t('common.loading') : t('common.load_more')}
+                </button>
+            </div>
+        )}
       </div>
     </DashboardLayout>
   )
@@ -102,12 +102,14 @@ export function AdminJobActions({ jobId, currentStatus }: Props) {
       if (result.success) {
         toast.success("Job status updated")
         // Surface the MASTER Google Sheet write outcome (only set when Verified)
-        const sync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean } }).sheetSync
+        const sync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } }).sheetSync
         if (sync) {
           if (sync.skipped) {
             toast.info('ข้ามการเขียน Google Sheet (งานนี้อยู่ในชีตแล้ว)')
           } else if (!sync.success) {
             toast.error('เขียน Google Sheet ไม่สำเร็จ: ' + (sync.error || 'unknown error'), { duration: 9000 })
+          } else if (sync.queued) {
+            toast.success('เข้าคิวบันทึกลง MASTER Sheet แล้ว (เขียนลงชีตภายในไม่กี่นาที — งานที่เขียนไม่สำเร็จดูได้ที่หน้า Health)')
           } else {
             toast.success('บันทึกลง MASTER Sheet แล้ว')
           }
@@ -108,19 +108,19 @@ export function DailySummary({ stats, driverStats, biddingCount, sosCount, fleet
                             <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
                                 <div className="p-4 bg-muted/30 rounded-2xl border border-border">
                                     <p className="text-xs font-bold text-muted-foreground uppercase mb-1">{t('common.all')}</p>
-                                    <p className="text-2xl font-black">{stats.total}</p>
+                                    <p className="text-2xl font-black" data-testid="daily-summary-total">{stats.total}</p>
                                 </div>
                                 <div className="p-4 bg-emerald-50/50 dark:bg-emerald-500/5 rounded-2xl border border-emerald-500/20">
                                     <p className="text-xs font-bold text-emerald-600 dark:text-emerald-400 uppercase mb-1">{t('jobs.status_delivered')}</p>
-                                    <p className="text-2xl font-black text-emerald-600 dark:text-emerald-400">{stats.delivered}</p>
+                                    <p className="text-2xl font-black text-emerald-600 dark:text-emerald-400" data-testid="daily-summary-delivered">{stats.delivered}</p>
                                 </div>
                                 <div className="p-4 bg-blue-50/50 dark:bg-blue-500/5 rounded-2xl border border-blue-500/20">
                                     <p className="text-xs font-bold text-blue-600 dark:text-blue-400 uppercase mb-1">{t('dashboard.activity.active')}</p>
-                                    <p className="text-2xl font-black text-blue-600 dark:text-blue-400">{stats.inProgress}</p>
+                                    <p className="text-2xl font-black text-blue-600 dark:text-blue-400" data-testid="daily-summary-in-progress">{stats.inProgress}</p>
                                 </div>
                                 <div className="p-4 bg-primary/5 rounded-2xl border border-primary/20">
                                     <p className="text-xs font-bold text-primary uppercase mb-1">ยอดสินค้า</p>
-                                    <p className="text-2xl font-black text-primary">{(stats.totalQty || 0).toLocaleString()}</p>
+                                    <p className="text-2xl font-black text-primary" data-testid="daily-summary-qty">{(stats.totalQty || 0).toLocaleString()}</p>
                                 </div>
                             </div>
                         </div>
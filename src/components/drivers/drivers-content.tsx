@@ -26,6 +26,8 @@ type DriversContentProps = {
   branchId?: string
   createBulkDrivers?: (data: Partial<Driver>[]) => Promise<{ success: boolean; message: string }>
   isAdminUser?: boolean
+  nextCursor?: string | null
+  prevCursor?: string | null
 }
 
 export function DriversContent({ 
@@ -37,7 +39,9 @@ export function DriversContent({
     userId, 
     branchId, 
     createBulkDrivers,
-    isAdminUser = false 
+    isAdminUser = false,
+    nextCursor,
+    prevCursor
 }: DriversContentProps) {
   const { t } = useLanguage()
   const router = useRouter()
@@ -65,6 +69,7 @@ export function DriversContent({
         params.delete("q")
       }
       params.set("page", "1")
+      params.delete("cursor")
       router.push(`${pathname}?${params.toString()}`)
     }, 400)
 
@@ -300,7 +305,7 @@ export function DriversContent({
       )}
       
       <div className="flex justify-center mt-8">
-        <Pagination totalItems={count || 0} limit={12} />
+        <Pagination totalItems={count || 0} limit={12} nextCursor={nextCursor} prevCursor={prevCursor} />
       </div>
     </div>
   )
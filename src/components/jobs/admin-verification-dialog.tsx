@@ -34,12 +34,14 @@ export function AdminVerificationDialog({ job, open, onOpenChange }: AdminVerifi
       if (result.success) {
         toast.success(status === 'Verified' ? t('verification.toast_verified') : t('verification.toast_rejected'))
         // Surface the MASTER Google Sheet write outcome (best-effort ledger sync)
-        const sync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean } }).sheetSync
+        const sync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } }).sheetSync
         if (status === 'Verified' && sync) {
           if (sync.skipped) {
             toast.info('ข้ามการเขียน Google Sheet (งานนี้อยู่ในชีตแล้ว)')
           } else if (!sync.success) {
             toast.error('เขียน Google Sheet ไม่สำเร็จ: ' + (sync.error || 'unknown error'), { duration: 9000 })
+          } else if (sync.queued) {
+            toast.success('เข้าคิวบันทึกลง MASTER Sheet แล้ว (เขียนลงชีตภายในไม่กี่นาที — งานที่เขียนไม่สำเร็จดูได้ที่หน้า Health)')
           } else {
             toast.success('บันทึกลง MASTER Sheet แล้ว')
           }
@@ -22,6 +22,7 @@ export function HistoryStatusFilter({ initialValue }: { initialValue: string })
       params.set("status", value)
     }
     params.set("page", "1") // Reset to first page on filter change
+    params.delete("cursor")
     router.push(`?${params.toString()}`)
   }
 
@@ -289,6 +289,7 @@ export function Sidebar({ collapsed = false, onToggle, onCustomerResolved }: Sid
 
   return (
     <motion.aside
+      data-testid="sidebar"
       initial={{ x: -240 }}
       animate={{ x: 0, width: collapsed ? 80 : 240 }}
       transition={{ duration: 0.5, ease: [0.4, 0, 0.2, 1] }}
@@ -412,6 +413,7 @@ function SidebarItem({ item, collapsed, pathname, t }: { item: NavItem, collapse
         <Link
             href={item.href}
             prefetch={true}
+            data-testid="sidebar-link"
             className="block group relative"
             title={collapsed ? label : undefined}
             aria-label={label}
@@ -100,6 +100,9 @@ const initIcons = () => {
     }
 }
 
+// Fired on window each time a driver marker receives a new position.
+export const MARKER_MOVED_EVENT = 'tms:marker-moved'
+
 export type DriverLocation = {
   id: string
   name: string
@@ -487,6 +490,12 @@ function MovingMarker({ driver, onShowRoute }: { driver: DriverLocation, onShowR
     const duration = 2000 // Smooth 2 second interpolation
     const startTime = performance.now()
 
+    // Announce the new target so the GPS load observer (testsprite_tests/perf)
+    // can time position send -> marker update. No listener, no cost.
+    window.dispatchEvent(new CustomEvent(MARKER_MOVED_EVENT, {
+      detail: { id: driver.id, lat: driver.lat, lng: driver.lng },
+    }))
+
     if (startPos[0] !== targetPos[0] || startPos[1] !== targetPos[1]) {
         const y = Math.sin((targetPos[1] - startPos[1]) * (Math.PI / 180)) * Math.cos(targetPos[0] * (Math.PI / 180))
         const x = Math.cos(startPos[0] * (Math.PI / 180)) * Math.sin(targetPos[0] * (Math.PI / 180)) -
@@ -518,7 +527,7 @@ function MovingMarker({ driver, onShowRoute }: { driver: DriverLocation, onShowR
       isMounted = false
       cancelAnimationFrame(animationFrame)
     }
-  }, [driver.lat, driver.lng])
+  }, [driver.id, driver.lat, driver.lng])
 
   const isSpeeding = (driver.speed || 0) * 3.6 > 90;
   // Live trucks are highlighted; trucks that haven't reported recently fade to
@@ -2,7 +2,7 @@
 
 import { useState, useRef, useEffect } from "react"
 import { Camera, X, Plus } from "lucide-react"
-import { compressImage } from "@/lib/utils/image-compression"
+import { compressImageOffThread } from "@/lib/utils/image-compression"
 
 type Props = {
   onImagesChange: (files: File[]) => void
@@ -28,14 +28,16 @@ export function CameraInput({ onImagesChange, maxImages = 5 }: Props) {
     const allowedCount = maxImages - files.length
     const toProcess = rawFiles.slice(0, allowedCount)
 
-    // Compress one at a time. Compressing in parallel decodes every full-size
-    // photo at once, which spikes memory and crashes the page on iOS Safari.
+    // Compress one at a time (in a worker where supported). Compressing in
+    // parallel decodes every full-size photo at once, which spikes memory and
+    // crashes the page on iOS Safari.
     const compressedFiles: File[] = []
     for (const file of toProcess) {
         try {
-            const blob = await compressImage(file, 1280, 1280, 0.7)
-            compressedFiles.push(new File([blob], file.name, {
-                type: 'image/jpeg',
+            const blob = await compressImageOffThread(file, 1280, 1280, 0.7)
+            const ext = blob.type === 'image/webp' ? 'webp' : 'jpg'
+            compressedFiles.push(new File([blob], file.name.replace(/\.[^.]*$/, '') + '.' + ext, {
+                type: blob.type || 'image/jpeg',
                 lastModified: Date.now(),
             }))
         } catch {
@@ -97,6 +99,7 @@ export function CameraInput({ onImagesChange, maxImages = 5 }: Props) {
         accept="image/*"
         multiple
         className="hidden" 
+        data-testid="camera-input-gallery"
         ref={galleryInputRef}
         onChange={handleFileChange}
       />
@@ -7,6 +7,7 @@ import { Button } from "@/components/ui/button"
 import Link from "next/link"
 import { Avatar, AvatarFallback, AvatarImage } from "@/components/ui/avatar"
 import { logoutDriver } from "@/lib/actions/auth-actions"
+import { clearDriverPageCache } from "@/lib/utils/offline-storage"
 import { cn } from "@/lib/utils"
 
 interface ProfileContentProps {
@@ -218,6 +219,7 @@ export function ProfileContent({ session, score, unreadChatCount = 0 }: ProfileC
   const handleLogout = async () => {
     // Clear session recovery data
     localStorage.removeItem("logis_driver_session_v1")
+    await clearDriverPageCache()
     await logoutDriver()
   }
 
@@ -69,7 +69,7 @@ export const SignaturePad = memo(({ onSave }: Props) => {
 
   return (
     <div className="space-y-3" onClick={(e) => e.stopPropagation()}>
-      <div className="border-4 border-slate-700 rounded-3xl bg-white overflow-hidden touch-none relative min-h-[14rem] shadow-2xl ring-1 ring-white/10">
+      <div className="border-4 border-slate-700 rounded-3xl bg-white overflow-hidden touch-none relative min-h-[14rem] shadow-2xl ring-1 ring-white/10" data-testid="signature-pad">
         <SignatureCanvas
           ref={sigCanvas}
           penColor="black"
@@ -21,7 +21,8 @@ import { SafetyScoreBadge } from "./safety-score-badge"
 import { useLanguage } from "@/components/providers/language-provider"
 import { useCustomer } from "@/components/providers/customer-provider"
 import { useRealtime } from "@/hooks/useRealtime"
-import { getActiveFleetStatus } from "@/lib/supabase/gps"
+import { getFleetPositionChanges } from "@/lib/supabase/gps"
+import { createClient } from "@/utils/supabase/client"
 import { RealtimeIndicator } from "@/components/ui/realtime-indicator"
 import { toast } from "sonner"
 import { calculateSafetyScore } from "@/services/safety-scoring"
@@ -63,8 +64,12 @@ interface MonitoringCommandCenterProps {
     initialHealthAlerts?: any[]
     heatmapJobs?: any[]
     dangerZones?: { id?: string; name: string; coordinates: [number, number][] }[]
+    /** Broadcast channel announcing position changes in this user's branch; none for customers. */
+    fleetChannel?: string | null
 }
 
+type PositionDelta = { Driver_ID: string; Latitude: number | null; Longitude: number | null; Speed?: number | null; Last_Update: string | null }
+
 export function MonitoringCommandCenter({
     initialJobs,
     initialDrivers,
@@ -72,7 +77,8 @@ export function MonitoringCommandCenter({
     allDrivers = [],
     initialHealthAlerts = [],
     heatmapJobs = [],
-    dangerZones = []
+    dangerZones = [],
+    fleetChannel = null
 }: MonitoringCommandCenterProps) {
     const { t } = useLanguage()
     const { selectedCustomer, customers } = useCustomer()
@@ -152,28 +158,69 @@ export function MonitoringCommandCenter({
         return map
     }, [jobs])
 
-    // Polling fallback for live positions. gps_logs realtime is gated by RLS
-    // (anon can't SELECT it), so we also pull the latest fleet positions from the
-    // server (service role) every 20s. This is what keeps the map fresh now that
-    // the driver app writes GPS straight into Supabase.
+    // Live positions. gps_logs realtime is gated by RLS (anon can't SELECT it),
+    // so positions also come from the server's in-memory location store: a 20s
+    // poll fetches only what changed in this user's scope since the last one
+    // (which also catches fixes the driver app writes straight into Supabase),
+    // and the branch broadcast channel, which carries no positions itself,
+    // triggers the same poll early when the ingest API receives new fixes.
+    // A reset carries the whole scope, so pins missing from it are dropped.
+    const applyPositions = (locations: PositionDelta[], removed: string[] = [], reset = false) => {
+        if (locations.length === 0 && removed.length === 0 && !reset) return
+        const byId = new Map(locations.map(l => [l.Driver_ID, l]))
+        const gone = new Set(removed)
+        setDrivers(prev => prev.map(d => {
+            if (gone.has(d.Driver_ID) || (reset && !byId.has(d.Driver_ID) && d.Latitude != null)) return { ...d, Latitude: null, Longitude: null }
+            const f = byId.get(d.Driver_ID)
+            if (f && f.Latitude != null && f.Longitude != null) {
+                return { ...d, Latitude: f.Latitude, Longitude: f.Longitude, Speed: f.Speed ?? d.Speed, Last_Update: f.Last_Update ?? d.Last_Update }
+            }
+            return d
+        }))
+    }
+
     useEffect(() => {
         let alive = true
+        let since: { version?: number } = {}
+        let polling = false
+        let lastPoll = 0
+        let pending: ReturnType<typeof setTimeout> | null = null
         const poll = async () => {
+            if (polling) return
+            polling = true
+            lastPoll = Date.now()
             try {
-                const fleet = await getActiveFleetStatus()
-                if (!alive || !Array.isArray(fleet)) return
-                setDrivers(prev => prev.map(d => {
-                    const f = fleet.find((x: { Driver_ID?: string }) => x.Driver_ID === d.Driver_ID)
-                    if (f && f.Latitude != null && f.Longitude != null) {
-                        return { ...d, Latitude: f.Latitude as number, Longitude: f.Longitude as number, Last_Update: (f.Last_Update ?? d.Last_Update) as string | null }
-                    }
-                    return d
-                }))
-            } catch { /* ignore transient poll errors */ }
+                const changes = await getFleetPositionChanges(since)
+                if (!alive || !changes) return
+                // version 0: the store has not loaded yet, so its empty reset means nothing
+                if (changes.version === 0) return
+                since = { version: changes.version }
+                applyPositions(changes.locations, changes.removed, changes.reset)
+            } catch { /* ignore transient poll errors */ } finally {
+                polling = false
+            }
+        }
+        // At most one nudged poll every 2s, however busy the branch is
+        const nudge = (version?: number) => {
+            if (pending || (since.version != null && version != null && version <= since.version)) return
+            pending = setTimeout(() => { pending = null; poll() }, Math.max(0, lastPoll + 2000 - Date.now()))
         }
         const id = setInterval(poll, 20000)
-        return () => { alive = false; clearInterval(id) }
-    }, [])
+
+        const supabase = fleetChannel ? createClient() : null
+        const channel = supabase
+            ?.channel(fleetChannel!)
+            .on('broadcast', { event: 'positions' }, ({ payload }) => {
+                nudge(payload?.version)
+            })
+            .subscribe()
+        return () => {
+            alive = false
+            clearInterval(id)
+            if (pending) clearTimeout(pending)
+            if (supabase && channel) supabase.removeChannel(channel)
+        }
+    }, [fleetChannel])
 
     // Real-time: gps_logs
     useRealtime('gps_logs', (payload) => {
@@ -1098,7 +1098,7 @@ export function JobDialog({
 
     setLoading(true)
 
-    let sheetSync: { success: boolean; error?: string; skipped?: boolean } | undefined
+    let sheetSync: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } | undefined
     try {
       // Job ID Handling: Manual or Auto-gen
       const effectiveJobId = formData.Job_ID.trim() || generateJobId()
@@ -1175,7 +1175,7 @@ export function JobDialog({
         if (!job?.Job_ID) throw new Error(t('jobs.dialog.error'))
         const result = await updateJob(job.Job_ID, updateData)
         if (!result.success) throw new Error(result.message)
-        sheetSync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean } }).sheetSync
+        sheetSync = (result as { sheetSync?: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } }).sheetSync
       }
       
       if (stayOpen) {
@@ -1207,6 +1207,8 @@ export function JobDialog({
           toast.info('ข้ามการเขียน Google Sheet (งานนี้อยู่ในชีตแล้ว)')
         } else if (!sheetSync.success) {
           toast.error('เขียน Google Sheet ไม่สำเร็จ: ' + (sheetSync.error || 'unknown error'), { duration: 9000 })
+        } else if (sheetSync.queued) {
+          toast.success('เข้าคิวบันทึกลง MASTER Sheet แล้ว (เขียนลงชีตภายในไม่กี่นาที — งานที่เขียนไม่สำเร็จดูได้ที่หน้า Health)')
         } else {
           toast.success('บันทึกลง MASTER Sheet แล้ว')
         }
@@ -1243,6 +1245,7 @@ export function JobDialog({
     <Dialog open={show} onOpenChange={setShow}>
       {trigger && <DialogTrigger asChild>{trigger}</DialogTrigger>}
       <DialogContent 
+        data-testid="job-dialog"
         className="max-w-7xl max-h-[95vh] overflow-y-auto bg-background border-border text-foreground"
         onPointerDownOutside={(e) => e.preventDefault()}
         onEscapeKeyDown={(e) => e.preventDefault()}
@@ -1273,6 +1276,7 @@ export function JobDialog({
             <button
               key={tab.id}
               type="button"
+              data-testid={`job-dialog-tab-${tab.id}`}
               onClick={() => setActiveTab(tab.id)}
               className={`flex-1 flex items-center justify-center gap-2 px-3 py-2 rounded-md text-xl font-black transition-colors ${
                 activeTab === tab.id 
@@ -1327,6 +1331,7 @@ export function JobDialog({
                 <div className="space-y-2">
                   <Label className="text-xl font-black text-primary/80 uppercase tracking-normal">{t('jobs.dialog.job_id')}</Label>
                   <Input
+                    data-testid="job-dialog-job-id"
                     value={formData.Job_ID}
                     onChange={(e) => setFormData({ ...formData, Job_ID: e.target.value })}
                     placeholder={t('jobs.dialog.job_id_placeholder')}
@@ -1399,6 +1404,7 @@ export function JobDialog({
                   </Label>
                   <Input
                     type="date"
+                    data-testid="job-dialog-plan-date"
                     value={formData.Plan_Date}
                     onChange={(e) => setFormData({ ...formData, Plan_Date: e.target.value })}
                     required
@@ -1445,7 +1451,7 @@ export function JobDialog({
               )}
 
               <div className="grid grid-cols-1 gap-10">
-                <div className="space-y-4">
+                <div className="space-y-4" data-testid="job-dialog-customer">
                   <Label className="flex items-center gap-2 text-2xl font-black text-primary uppercase tracking-normal">
                     <Building2 className="w-6 h-6 text-primary" /> {t('jobs.dialog.customer')}
                   </Label>
@@ -1470,6 +1476,7 @@ export function JobDialog({
                             <Package className="w-5 h-5" /> {t('jobs.dialog.cargo_type')}
                         </Label>
                         <Input
+                            data-testid="job-dialog-cargo-type"
                             value={formData.Cargo_Type}
                             onChange={(e) => setFormData({ ...formData, Cargo_Type: e.target.value })}
                             placeholder={t('jobs.dialog.cargo_type_placeholder')}
@@ -1757,7 +1764,7 @@ export function JobDialog({
                         </Button>
                         </div>
                         {origins.map((origin, index) => (
-                        <div key={index} className="grid grid-cols-12 gap-2 p-3 bg-muted/30 rounded-lg">
+                        <div key={index} data-testid={`job-dialog-origin-${index}`} className="grid grid-cols-12 gap-2 p-3 bg-muted/30 rounded-lg">
                             <div className="col-span-1 flex items-center justify-center text-muted-foreground">
                                 {index + 1}
                             </div>
@@ -1839,6 +1846,7 @@ export function JobDialog({
                                 type="button" 
                                 size="sm" 
                                 variant="outline" 
+                                data-testid="job-dialog-optimize-route"
                                 onClick={handleOptimizeRoute}
                                 disabled={loading || destinations.length < 2}
                                 className="border-emerald-500/30 text-emerald-600 hover:bg-emerald-500/10"
@@ -1851,7 +1859,7 @@ export function JobDialog({
                         </div>
                         </div>
                         {destinations.map((dest, index) => (
-                        <div key={index} className="grid grid-cols-12 gap-2 p-3 bg-muted/30 rounded-lg">
+                        <div key={index} data-testid={`job-dialog-destination-${index}`} className="grid grid-cols-12 gap-2 p-3 bg-muted/30 rounded-lg">
                             <div className="col-span-1 flex items-center justify-center text-muted-foreground">
                                 {index + 1}
                             </div>
@@ -2767,6 +2775,7 @@ export function JobDialog({
                 <Button 
                     type="button" 
                     variant="outline" 
+                    data-testid="job-dialog-cancel"
                     onClick={() => setShow(false)} 
                     className="border-border hover:bg-muted text-muted-foreground hover:text-foreground text-xl h-14 px-8 font-bold"
                 >
@@ -2789,6 +2798,7 @@ export function JobDialog({
                     type="button" 
                     variant="outline"
                     disabled={loading}
+                    data-testid="job-dialog-save-draft"
                     onClick={() => handleSubmit(undefined, false, 'Draft')}
                     className="border-amber-500/30 text-amber-600 hover:bg-amber-500/10 bg-amber-500/5 text-xl h-14 px-8 font-bold"
                   >
@@ -2798,6 +2808,7 @@ export function JobDialog({
                 )}
                 <Button 
                     type="submit" 
+                    data-testid="job-dialog-submit"
                     disabled={loading} 
                     className="bg-primary hover:bg-primary/90 text-white text-xl h-14 px-12 font-black shadow-lg uppercase tracking-normal"
                 >
@@ -2810,6 +2821,7 @@ export function JobDialog({
                     <Button
                         type="button"
                         variant="link"
+                        data-testid="job-dialog-next"
                         onClick={handleNextTab}
                         className="text-primary font-black text-xl flex items-center gap-2 hover:no-underline group"
                     >
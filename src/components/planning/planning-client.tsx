@@ -37,6 +37,8 @@ import { RealtimeIndicator } from "@/components/ui/realtime-indicator"
 import { useLanguage } from "@/components/providers/language-provider"
 import { useCustomer } from "@/components/providers/customer-provider"
 import { ExcelImport } from "@/components/ui/excel-import"
+import { importJobStarts } from "@/lib/utils/job-import-headers"
+import type { ImportChunk } from "@/lib/utils/import-progress"
 import { PremiumButton } from "../ui/premium-button"
 
 interface PlanningClientProps {
@@ -60,12 +62,16 @@ interface PlanningClientProps {
     canDelete: boolean
     canCreate: boolean
     canAssign: boolean
-    createBulkJobs: (data: Partial<JobFormData>[], effectiveBranchId?: string | null, options?: { shouldGroup?: boolean }) => Promise<{ success: boolean; message: string }>
+    createBulkJobs: (data: Partial<JobFormData>[], effectiveBranchId?: string | null, options?: { shouldGroup?: boolean; isDraft?: boolean; chunk?: ImportChunk }) => Promise<{ success: boolean; message: string; imported?: number }>
     publishAllDrafts: (date: string, branchId?: string) => Promise<{ success: boolean, error?: any, jobsCount?: number }>
     branchId: string
     selectedDate: string
 }
 
+// Rows per createBulkJobs call for large imports; keeps each server action
+// well under the 10mb body limit and its own timeout.
+const BULK_IMPORT_CHUNK_SIZE = 500
+
 const container = {
     hidden: { opacity: 0 },
     show: {
@@ -402,6 +408,7 @@ export function PlanningClient({
                 <div className="flex flex-wrap items-center gap-3">
                     <div className="flex bg-muted/50 p-1 rounded-xl border border-border/10 shadow-inner">
                         <button
+                            data-testid="planning-view-list"
                             onClick={() => setView('list')}
                             className={cn(
                                 "flex items-center gap-2 px-4 py-1.5 rounded-lg text-xs font-black uppercase tracking-widest transition-all",
@@ -412,6 +419,7 @@ export function PlanningClient({
                             {t('planning.list_view')}
                         </button>
                         <button
+                            data-testid="planning-view-kanban"
                             onClick={() => setView('kanban')}
                             className={cn(
                                 "flex items-center gap-2 px-4 py-1.5 rounded-lg text-xs font-black uppercase tracking-widest transition-all",
@@ -422,6 +430,7 @@ export function PlanningClient({
                             {t('planning.kanban_view')}
                         </button>
                         <button
+                            data-testid="planning-view-requests"
                             onClick={() => setView('requests')}
                             className={cn(
                                 "flex items-center gap-2 px-4 py-1.5 rounded-lg text-xs font-black uppercase tracking-widest transition-all relative",
@@ -444,6 +453,7 @@ export function PlanningClient({
                         </div>
                         <input 
                             type="text" 
+                            data-testid="planning-search"
                             placeholder={t('common.search') || "Search Jobs..."}
                             value={searchQuery}
                             onChange={(e) => setSearchQuery(e.target.value)}
@@ -468,6 +478,7 @@ export function PlanningClient({
                         </button>
                         <input 
                             type="date" 
+                            data-testid="planning-date"
                             value={selectedDate}
                             onChange={(e) => handleDateChange(e.target.value)}
                             className="bg-transparent border-none text-xs font-bold text-primary px-2 focus:ring-0 cursor-pointer"
@@ -494,7 +505,7 @@ export function PlanningClient({
                             )}
                             <ExcelImport 
                                 trigger={
-                                    <PremiumButton variant="outline" className="h-11 px-5 rounded-xl border-border/10 hover:border-primary/50 text-muted-foreground gap-2 text-xs font-black uppercase tracking-widest">
+                                    <PremiumButton data-testid="planning-import" variant="outline" className="h-11 px-5 rounded-xl border-border/10 hover:border-primary/50 text-muted-foreground gap-2 text-xs font-black uppercase tracking-widest">
                                         <FileSpreadsheet size={16} /> {t('common.tactical.bulk_import') || 'Import'}
                                     </PremiumButton>
                                 }
@@ -502,6 +513,8 @@ export function PlanningClient({
                                 onImport={(data, options) => createBulkJobs(data, branchId === 'All' ? null : branchId, options)}
                                 groupingLabel="รวมหลายดรอปเป็นงานเดียว (แถวรองใส่แค่ปลายทาง)"
                                 showDraftOption={true}
+                                chunkSize={BULK_IMPORT_CHUNK_SIZE}
+                                splitRule={importJobStarts}
                                 customTemplateButton={
                                     <div className="flex items-center gap-3 bg-muted/30 p-2 rounded-2xl border border-border/10">
                                         <select 
@@ -535,7 +548,7 @@ export function PlanningClient({
                                 canAssign={canAssign}
                                 canDelete={canDelete}
                                 trigger={
-                                    <button className="flex items-center gap-2 bg-primary text-foreground px-6 py-2.5 h-11 rounded-xl font-black text-xs uppercase tracking-widest hover:brightness-110 transition-all shadow-lg active:scale-95 group whitespace-nowrap">
+                                    <button data-testid="planning-new-job" className="flex items-center gap-2 bg-primary text-foreground px-6 py-2.5 h-11 rounded-xl font-black text-xs uppercase tracking-widest hover:brightness-110 transition-all shadow-lg active:scale-95 group whitespace-nowrap">
                                         <Plus size={16} className="group-hover:rotate-90 transition-transform duration-300" strokeWidth={3} />
                                         {t('planning.new_job')}
                                     </button>
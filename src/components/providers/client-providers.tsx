@@ -34,6 +34,12 @@ export function ClientProviders({ children }: ClientProvidersProps) {
     }
   }, []);
 
+  // Hydration marker for the E2E suite (testsprite_tests/runner/actions.py),
+  // which waits on it instead of sleeping a fixed time after navigation.
+  React.useEffect(() => {
+    document.documentElement.dataset.hydrated = "true"
+  }, []);
+
   return (
     <ThemeProvider
       attribute="class"
@@ -21,17 +21,37 @@ import { Upload, FileSpreadsheet, Loader2, Download, AlertCircle, CheckCircle2 }
 import { read, utils, writeFile } from "xlsx"
 import { motion, AnimatePresence } from "framer-motion"
 import { useLanguage } from "@/components/providers/language-provider"
+import {
+  clearImportProgress,
+  importFingerprint,
+  loadImportProgress,
+  newImportId,
+  saveImportProgress,
+  splitImportChunks,
+  waitForOnline,
+  type ImportChunk,
+  type ImportProgress,
+} from "@/lib/utils/import-progress"
+
+type ImportOptions = { shouldGroup?: boolean; isDraft?: boolean; chunk?: ImportChunk }
+type ImportResult = { success: boolean; message: string; error?: string; imported?: number }
+
+const CHUNK_RETRIES = 4
 
 interface ExcelImportProps {
   trigger: React.ReactNode
   title: string
   description?: string
-  onImport: (data: Record<string, unknown>[], options?: { shouldGroup?: boolean; isDraft?: boolean }) => Promise<{ success: boolean; message: string; error?: string }>;
+  onImport: (data: Record<string, unknown>[], options?: ImportOptions) => Promise<ImportResult>;
   templateData?: Record<string, unknown>[]
   templateFilename?: string
   groupingLabel?: string
   showDraftOption?: boolean
   customTemplateButton?: React.ReactNode
+  /** Send sheets larger than this in chunks (resumable); unset = one call. */
+  chunkSize?: number
+  /** With grouping on, builds (once per sheet) the rule chunks may split before. */
+  splitRule?: (rows: Record<string, unknown>[]) => (row: Record<string, unknown>) => boolean
 }
 
 export function ExcelImport({
@@ -44,6 +64,8 @@ export function ExcelImport({
   groupingLabel,
   showDraftOption = false,
   customTemplateButton,
+  chunkSize,
+  splitRule,
 }: ExcelImportProps) {
   const { t } = useLanguage()
   const router = useRouter()
@@ -54,6 +76,8 @@ export function ExcelImport({
   const [error, setError] = useState<string | null>(null)
   const [shouldGroup, setShouldGroup] = useState(true)
   const [isDraft, setIsDraft] = useState(false)
+  const [progress, setProgress] = useState<{ done: number; total: number; rows: number } | null>(null)
+  const [resumable, setResumable] = useState<ImportProgress | null>(null)
   const fileInputRef = useRef<HTMLInputElement>(null)
 
   const effectiveDescription = description || t('common.import.description')
@@ -64,6 +88,8 @@ export function ExcelImport({
 
     setFile(selectedFile)
     setError(null)
+    setProgress(null)
+    setResumable(chunkSize ? loadImportProgress(importFingerprint(selectedFile)) : null)
     setLoading(true)
 
     try {
@@ -101,26 +127,82 @@ export function ExcelImport({
     })
   }
 
+  const finishImport = (message?: string) => {
+    setOpen(false)
+    setFile(null)
+    setPreviewData([])
+    setProgress(null)
+    setResumable(null)
+    toast.success(message || t('common.import.success'))
+    router.refresh()
+  }
+
+  // One chunk, retried with backoff; while the browser is offline it waits
+  // for the connection instead of burning retries.
+  const sendChunk = async (rows: Record<string, unknown>[], options: ImportOptions) => {
+    for (let attempt = 0; ; attempt++) {
+      try {
+        return await onImport(rows, options)
+      } catch (err) {
+        if (attempt + 1 >= CHUNK_RETRIES) throw err
+        await waitForOnline()
+        await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** attempt))
+      }
+    }
+  }
+
+  const importInChunks = async (selectedFile: File, size: number) => {
+    const key = importFingerprint(selectedFile)
+    const optionsKey = `${shouldGroup}:${isDraft}`
+    const chunks = splitImportChunks(previewData, size, shouldGroup && splitRule ? splitRule(previewData) : undefined)
+
+    let state = loadImportProgress(key)
+    if (!state || state.options !== optionsKey || state.chunkSize !== size || state.totalChunks !== chunks.length) {
+      state = { importId: newImportId(), nextChunk: 0, totalChunks: chunks.length, chunkSize: size, rows: 0, options: optionsKey }
+    }
+    setProgress({ done: state.nextChunk, total: chunks.length, rows: state.rows })
+
+    for (let i = state.nextChunk; i < chunks.length; i++) {
+      const chunk: ImportChunk = { importId: state.importId, offset: chunks[i].offset, index: i, total: chunks.length }
+      const result = await sendChunk(chunks[i].rows, { shouldGroup, isDraft, chunk })
+      if (!result.success) {
+        saveImportProgress(key, state)
+        setResumable(state)
+        return result
+      }
+      state = { ...state, nextChunk: i + 1, rows: state.rows + (result.imported ?? chunks[i].rows.length) }
+      saveImportProgress(key, state)
+      setProgress({ done: i + 1, total: chunks.length, rows: state.rows })
+    }
+
+    clearImportProgress(key)
+    return {
+      success: true,
+      message: t('common.import.chunked_done').replace('{{count}}', String(state.rows)),
+    }
+  }
+
   const handleImport = async () => {
-    if (!previewData.length) return
+    if (!previewData.length || !file) return
 
     setLoading(true)
     setError(null)
+    const chunkRows = chunkSize && previewData.length > chunkSize ? chunkSize : 0
 
     try {
-      const result = await onImport(previewData, { shouldGroup, isDraft })
+      const result = chunkRows
+        ? await importInChunks(file, chunkRows)
+        : await onImport(previewData, { shouldGroup, isDraft })
       if (result.success) {
-        setOpen(false)
-        setFile(null)
-        setPreviewData([])
-        toast.success(result.message || t('common.import.success'))
-        router.refresh()
+        finishImport(result.message)
       } else {
         Logger.error("Excel import failed:", result.error)
         toast.error(result.message || t('common.import.failed'))
       }
     } catch {
-      setError(t('common.import.failed'))
+      // Chunked imports keep their progress; pressing import again resumes.
+      setResumable(chunkRows ? loadImportProgress(importFingerprint(file)) : null)
+      setError(t(chunkRows ? 'common.import.interrupted' : 'common.import.failed'))
     } finally {
       setLoading(false)
     }
@@ -137,7 +219,7 @@ export function ExcelImport({
   return (
     <Dialog open={open} onOpenChange={setOpen}>
       <DialogTrigger asChild>{trigger}</DialogTrigger>
-      <DialogContent className="max-w-[95vw] sm:max-w-xl max-h-[95vh] flex flex-col bg-card border-border/10 text-foreground rounded-[2rem] p-0 overflow-hidden shadow-2xl">
+      <DialogContent data-testid="excel-import" className="max-w-[95vw] sm:max-w-xl max-h-[95vh] flex flex-col bg-card border-border/10 text-foreground rounded-[2rem] p-0 overflow-hidden shadow-2xl">
         <div className="flex-1 overflow-y-auto p-8 pb-4 space-y-6 custom-scrollbar">
           <DialogHeader>
             <DialogTitle className="text-xl font-black tracking-tight flex items-center gap-3">
@@ -182,6 +264,7 @@ export function ExcelImport({
               <input
                 ref={fileInputRef}
                 type="file"
+                data-testid="excel-import-file"
                 accept=".xlsx, .xls"
                 className="hidden"
                 onChange={handleFileChange}
@@ -243,10 +326,41 @@ export function ExcelImport({
               )}
             </AnimatePresence>
 
+            {progress && (
+              <div
+                data-testid="excel-import-progress"
+                data-done={progress.done}
+                data-total={progress.total}
+                className="space-y-2"
+              >
+                <div className="h-2 rounded-full bg-muted/50 overflow-hidden">
+                  <div
+                    className="h-full bg-emerald-500 transition-all"
+                    style={{ width: `${Math.round((progress.done / progress.total) * 100)}%` }}
+                  />
+                </div>
+                <p className="text-sm font-bold text-muted-foreground">
+                  {t('common.import.progress')
+                    .replace('{{done}}', String(progress.done))
+                    .replace('{{total}}', String(progress.total))
+                    .replace('{{rows}}', String(progress.rows))}
+                </p>
+              </div>
+            )}
+
+            {!progress && resumable && resumable.nextChunk > 0 && (
+              <p data-testid="excel-import-resume" className="text-sm font-bold text-amber-600">
+                {t('common.import.resume')
+                  .replace('{{done}}', String(resumable.nextChunk))
+                  .replace('{{total}}', String(resumable.totalChunks))}
+              </p>
+            )}
+
             {groupingLabel && (
               <div className="flex items-center gap-3 p-4 rounded-2xl bg-primary/5 border border-primary/10">
                 <Checkbox 
                   id="group-so" 
+                  data-testid="excel-import-group"
                   checked={shouldGroup} 
                   onCheckedChange={(checked) => setShouldGroup(!!checked)}
                   className="w-5 h-5 rounded-lg border-primary/20 data-[state=checked]:bg-primary"
@@ -266,6 +380,7 @@ export function ExcelImport({
               <div className="flex items-center gap-3 p-4 rounded-2xl bg-amber-500/5 border border-amber-500/10">
                 <Checkbox 
                   id="import-draft" 
+                  data-testid="excel-import-draft"
                   checked={isDraft} 
                   onCheckedChange={(checked) => setIsDraft(!!checked)}
                   className="w-5 h-5 rounded-lg border-amber-500/20 data-[state=checked]:bg-amber-500"
@@ -317,6 +432,7 @@ export function ExcelImport({
 
         <DialogFooter className="p-8 pt-0 flex gap-3 flex-shrink-0">
           <Button 
+            data-testid="excel-import-cancel"
             variant="ghost" 
             onClick={() => setOpen(false)}
             className="flex-1 h-12 rounded-2xl border border-border/5 text-muted-foreground hover:text-foreground hover:bg-muted/50 font-bold transition-all"
@@ -324,6 +440,7 @@ export function ExcelImport({
             {t('common.cancel')}
           </Button>
           <Button
+            data-testid="excel-import-submit"
             onClick={handleImport}
             disabled={!file || loading || previewData.length === 0}
             className="flex-1 h-12 rounded-2xl bg-emerald-600 hover:bg-emerald-500 text-foreground font-black shadow-lg shadow-emerald-900/20 transition-all active:scale-95 disabled:opacity-50"
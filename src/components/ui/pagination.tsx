@@ -8,22 +8,34 @@ import { usePathname, useSearchParams } from "next/navigation"
 interface PaginationProps {
   totalItems: number
   limit?: number
+  /** Keyset tokens from the list API; prev/next links carry them as `cursor`
+   *  so neighbouring pages skip the offset. Page numbers remain the fallback. */
+  nextCursor?: string | null
+  prevCursor?: string | null
 }
 
-export function Pagination({ totalItems, limit = 50 }: PaginationProps) {
+export function Pagination({ totalItems, limit = 50, nextCursor, prevCursor }: PaginationProps) {
   const pathname = usePathname()
   const searchParams = useSearchParams()
 
   const currentPage = Number(searchParams.get("page")) || 1
   const totalPages = Math.ceil(totalItems / limit)
 
-  const createPageURL = (pageNumber: number | string) => {
+  const createPageURL = (pageNumber: number | string, cursor?: string | null) => {
     const params = new URLSearchParams(searchParams.toString())
     params.set("page", pageNumber.toString())
+    // Page 1 needs no cursor; elsewhere a missing token falls back to the offset
+    if (cursor && Number(pageNumber) > 1) params.set("cursor", cursor)
+    else params.delete("cursor")
     return `${pathname}?${params.toString()}`
   }
 
-  if (totalPages <= 1) return null
+  const cursorMode = nextCursor !== undefined || prevCursor !== undefined
+  // Estimated counts can be off on deep lists; the cursor knows if more rows exist
+  const hasNext = cursorMode ? !!nextCursor : currentPage < totalPages
+  const hasPrev = currentPage > 1
+
+  if (totalPages <= 1 && !hasNext && !hasPrev) return null
 
   return (
     <div className="flex items-center justify-between mt-4 text-lg font-bold font-medium text-muted-foreground">
@@ -35,26 +47,26 @@ export function Pagination({ totalItems, limit = 50 }: PaginationProps) {
           variant="outline"
           size="sm"
           className="h-8 w-8 p-0 bg-muted/50 border-border/5 hover:bg-muted/80 text-muted-foreground"
-          disabled={currentPage <= 1}
+          disabled={!hasPrev}
           asChild
         >
-          <Link href={currentPage <= 1 ? "#" : createPageURL(currentPage - 1)} aria-disabled={currentPage <= 1}>
+          <Link href={!hasPrev ? "#" : createPageURL(currentPage - 1, prevCursor)} aria-disabled={!hasPrev}>
             <ChevronLeft size={16} />
           </Link>
         </Button>
         
         <span className="text-muted-foreground font-black px-2">
-          {currentPage} <span className="text-muted-foreground font-medium">/</span> {totalPages}
+          {currentPage} <span className="text-muted-foreground font-medium">/</span> {Math.max(totalPages, currentPage)}
         </span>
         
         <Button
           variant="outline"
           size="sm"
           className="h-8 w-8 p-0 bg-muted/50 border-border/5 hover:bg-muted/80 text-muted-foreground"
-          disabled={currentPage >= totalPages}
+          disabled={!hasNext}
           asChild
         >
-          <Link href={currentPage >= totalPages ? "#" : createPageURL(currentPage + 1)} aria-disabled={currentPage >= totalPages}>
+          <Link href={!hasNext ? "#" : createPageURL(currentPage + 1, nextCursor)} aria-disabled={!hasNext}>
             <ChevronRight size={16} />
           </Link>
         </Button>
@@ -38,6 +38,7 @@ export function SearchInput({ placeholder = "Search...", className, ...props }:
       }
       // Reset page to 1 ONLY when search changes
       params.set("page", "1")
+      params.delete("cursor")
 
       router.push(`${pathname}?${params.toString()}`)
     }, 500)
@@ -60,6 +61,7 @@ export function SearchInput({ placeholder = "Search...", className, ...props }:
               params.delete("q")
             }
             params.set("page", "1")
+            params.delete("cursor")
             router.push(`${pathname}?${params.toString()}`)
           }
         }}
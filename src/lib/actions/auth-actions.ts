@@ -4,6 +4,7 @@ import { createAdminClient } from "@/utils/supabase/server"
 import { getSession } from "@/lib/session"
 import { redirect } from "next/navigation"
 import { hashPassword, verifyPassword, isHashed } from "@/lib/password"
+import { forgetDriver } from "@/lib/location-store"
 
 import { getDriverSession } from "@/lib/auth-utils"
 export { getDriverSession }
@@ -237,6 +238,12 @@ export async function logoutDriver() {
         .from("driver_latest_locations")
         .delete()
         .eq("driver_id", driverId)
+      forgetDriver(driverId)
+      // Other server instances drop the pin when they next read this table
+      const { error: logoutError } = await supabase
+        .from("driver_location_logouts")
+        .upsert({ driver_id: driverId, logged_out_at: new Date().toISOString() })
+      if (logoutError) console.warn("[Auth] driver_location_logouts write failed:", logoutError.message)
 
       // Remove push subscriptions so the server stops sending notifications
       // (e.g. job assignments) to a logged-out device. Re-subscribes on next login.
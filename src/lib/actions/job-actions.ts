@@ -8,7 +8,7 @@ import { getSession } from '@/lib/session'
 
 import { transitionJobStatus } from "@/services/job-status-machine"
 import { requireAdmin } from "@/services/permission-guards"
-import { appendJobToMaster } from "@/lib/actions/master-sheet-sync"
+import { queueJobForMaster } from "@/lib/actions/master-sheet-sync"
 
 export async function verifyJob(
   jobId: string, 
@@ -64,14 +64,14 @@ export async function verifyJob(
     revalidatePath('/pod')
 
     // Mirror into the MASTER Google Sheet on verification. Dedup is handled by
-    // appendJobToMaster itself (skips when the Job_ID is already in the ledger),
+    // the queue flush (skips when the Job_ID is already in the ledger),
     // so we must NOT gate on Job_Status here: a job can be Job_Status='Verified'
     // yet never written to the sheet (e.g. an earlier write failed, or the
     // status was set via a bulk/override path). Best-effort — never block
     // verification, but return the outcome so a failed ledger write isn't silent.
-    let sheetSync: { success: boolean; error?: string; skipped?: boolean } | undefined
+    let sheetSync: { success: boolean; error?: string; skipped?: boolean; queued?: boolean } | undefined
     if (status === 'Verified') {
-      sheetSync = await appendJobToMaster(jobId)
+      sheetSync = await queueJobForMaster(jobId)
     }
 
     return { success: true, sheetSync }
@@ -1,5 +1,6 @@
 import 'server-only'
 
+import { after } from 'next/server'
 import { createAdminClient } from '@/utils/supabase/server'
 import { getSheetsClient } from '@/lib/google-sheets'
 import { getFuelPriceNumber } from '@/lib/actions/fuel-actions'
@@ -91,6 +92,19 @@ const FALLBACK_ORDER = [
 
 type SheetsClient = ReturnType<typeof getSheetsClient>
 
+function quoteTab(title: string): string {
+  return `'${title.replace(/'/g, "''")}'`
+}
+
+// The header is the row (within the first three) that holds วันที่; ledger
+// tabs with a title block above it start lower down.
+function headerFromRows(rows: unknown[][]): { order: string[]; headerRow: number } {
+  const foundIndex = rows.slice(0, 3).findIndex(r => (r || []).some(c => String(c).trim() === 'วันที่'))
+  if (foundIndex < 0) return { order: FALLBACK_ORDER, headerRow: 1 }
+  const headers = (rows[foundIndex] || []).map(h => String(h || '').trim())
+  return { order: headers.length > 0 ? headers : FALLBACK_ORDER, headerRow: foundIndex + 1 }
+}
+
 // Resolve the tab name (accepting a gid) and read the header row once, so a
 // batch backfill doesn't repeat this per row.
 async function resolveOrder(sheets: SheetsClient, tabOverride?: string): Promise<{ qtab: string; order: string[]; headerRow: number }> {
@@ -103,20 +117,38 @@ async function resolveOrder(sheets: SheetsClient, tabOverride?: string): Promise
       if (t) tabName = t
     } catch { /* keep TAB as-is */ }
   }
-  const qtab = `'${tabName.replace(/'/g, "''")}'`
+  const qtab = quoteTab(tabName)
 
-  let headers: string[] = []
-  let headerRow = 1
   try {
     const head = await sheets.spreadsheets.values.get({ spreadsheetId: SHEET_ID, range: `${qtab}!A1:BZ3` })
-    const rows = head.data.values || []
-    const foundIndex = rows.findIndex(r => (r || []).some(c => String(c).trim() === 'วันที่'))
-    const found = foundIndex >= 0 ? rows[foundIndex] : undefined
-    if (foundIndex >= 0) headerRow = foundIndex + 1
-    headers = (found || []).map(h => String(h || '').trim())
-  } catch { /* fall back to fixed order */ }
+    return { qtab, ...headerFromRows(head.data.values || []) }
+  } catch {
+    return { qtab, order: FALLBACK_ORDER, headerRow: 1 } // fall back to fixed order
+  }
+}
+
+type TabSnapshot = { title: string; qtab: string; order: string[]; headerRow: number; rows: unknown[][] }
 
-  return { qtab, order: headers.length > 0 ? headers : FALLBACK_ORDER, headerRow }
+/**
+ * Read several tabs in one values.batchGet. Tabs listed in `full` come back
+ * with every data row; the rest with just their header, which is all an
+ * append needs when the tab's Job_IDs are already indexed.
+ */
+async function readTabs(sheets: SheetsClient, titles: string[], full: Set<string>): Promise<Map<string, TabSnapshot>> {
+  const snapshots = new Map<string, TabSnapshot>()
+  if (titles.length === 0) return snapshots
+  const res = await sheets.spreadsheets.values.batchGet({
+    spreadsheetId: SHEET_ID,
+    ranges: titles.map(t => `${quoteTab(t)}!${full.has(t) ? 'A1:BZ' : 'A1:BZ3'}`),
+    valueRenderOption: 'FORMATTED_VALUE',
+  })
+  const valueRanges = res.data.valueRanges || []
+  titles.forEach((title, i) => {
+    const values = (valueRanges[i]?.values || []) as unknown[][]
+    const { order, headerRow } = headerFromRows(values)
+    snapshots.set(title, { title, qtab: quoteTab(title), order, headerRow, rows: full.has(title) ? values.slice(headerRow) : [] })
+  })
+  return snapshots
 }
 
 function normalizeSheetDate(value: unknown): string | null {
@@ -184,38 +216,29 @@ function columnLetter(index: number): string {
 }
 
 /**
- * Read identifiers already present in the ledger. Older rows have no Job_ID,
- * so retain a per-date count for those rows; this lets a one-time migration
- * continue after the last complete legacy date without duplicating it.
+ * Identifiers already present in a tab's data rows. Older rows have no
+ * Job_ID, so retain a per-date count for those rows; this lets a one-time
+ * migration continue after the last complete legacy date without duplicating it.
  */
-async function readLedgerState(
-  sheets: SheetsClient,
-  qtab: string,
-  order: string[],
-  headerRow: number
-): Promise<{
+function ledgerState(tab: TabSnapshot): {
   jobIds: Set<string>
   legacyRowsByDate: Map<string, number>
   legacyFingerprints: Map<string, number>
   legacyRows: LegacyLedgerRow[]
-}> {
+} {
+  const { order, headerRow } = tab
   const dateIndex = order.indexOf('วันที่')
   const jobIdIndex = order.indexOf('รหัสสร้างงาน')
   if (dateIndex < 0 || jobIdIndex < 0) {
     throw new Error('MASTER sheet must contain วันที่ and รหัสสร้างงาน columns')
   }
 
-  const existing = await sheets.spreadsheets.values.get({
-    spreadsheetId: SHEET_ID,
-    range: `${qtab}!A${headerRow + 1}:BZ`,
-    valueRenderOption: 'FORMATTED_VALUE',
-  })
   const jobIds = new Set<string>()
   const legacyRowsByDate = new Map<string, number>()
   const legacyFingerprints = new Map<string, number>()
   const legacyRows: LegacyLedgerRow[] = []
   const valueAt = (row: unknown[], header: string) => row[order.indexOf(header)]
-  for (const [offset, row] of (existing.data.values || []).entries()) {
+  for (const [offset, row] of tab.rows.entries()) {
     const jobId = String(row[jobIdIndex] || '').trim()
     if (jobId) {
       jobIds.add(jobId)
@@ -246,10 +269,10 @@ async function fillLegacyJobIds(
   qtab: string,
   order: string[],
   jobs: MasterJob[],
-  ledger: Awaited<ReturnType<typeof readLedgerState>>
-): Promise<number> {
+  ledger: ReturnType<typeof ledgerState>
+): Promise<string[]> {
   const jobIdIndex = order.indexOf('รหัสสร้างงาน')
-  if (jobIdIndex < 0 || ledger.legacyRows.length === 0) return 0
+  if (jobIdIndex < 0 || ledger.legacyRows.length === 0) return []
 
   const availableByFingerprint = new Map<string, string[]>()
   for (const job of jobs) {
@@ -279,7 +302,7 @@ async function fillLegacyJobIds(
       },
     })
   }
-  return updates.length
+  return updates.map(u => u.values[0][0])
 }
 
 function jobsMissingFromLedger(
@@ -521,6 +544,60 @@ export function getJobTabName(
   return TAB
 }
 
+type SortTarget = { sheetId: number; order: string[]; headerRow: number }
+
+// Date (วันที่) then customer (ลูกค้า), below the header row.
+function sortRequest({ sheetId, order, headerRow }: SortTarget) {
+  const dateColIndex = order.indexOf('วันที่') >= 0 ? order.indexOf('วันที่') : 0
+  const custColIndex = order.indexOf('ลูกค้า') >= 0 ? order.indexOf('ลูกค้า') : 3
+  return {
+    sortRange: {
+      range: {
+        sheetId,
+        startRowIndex: headerRow, // Skip header row
+        startColumnIndex: 0,
+        endColumnIndex: order.length,
+      },
+      sortSpecs: [
+        { dimensionIndex: dateColIndex, sortOrder: 'ASCENDING' },
+        { dimensionIndex: custColIndex, sortOrder: 'ASCENDING' },
+      ],
+    },
+  }
+}
+
+// Sort every listed tab in a single spreadsheets.batchUpdate. Best-effort:
+// an unsorted ledger is still correct, so a failure is only logged.
+async function sortTabs(sheets: SheetsClient, targets: SortTarget[]): Promise<void> {
+  if (targets.length === 0) return
+  try {
+    await sheets.spreadsheets.batchUpdate({
+      spreadsheetId: SHEET_ID,
+      requestBody: { requests: targets.map(sortRequest) },
+    })
+  } catch (err) {
+    console.warn(`[MASTER_SHEET] Auto-sort of ${targets.length} tab(s) warning:`, err)
+  }
+}
+
+type SheetMeta = { title: string; sheetId: number }
+
+async function readSheetMeta(sheets: SheetsClient): Promise<SheetMeta[]> {
+  const meta = await sheets.spreadsheets.get({ spreadsheetId: SHEET_ID, fields: 'sheets.properties(sheetId,title)' })
+  return (meta.data.sheets || [])
+    .map(s => ({ title: s.properties?.title || '', sheetId: s.properties?.sheetId ?? -1 }))
+    .filter(s => s.title && s.sheetId >= 0)
+}
+
+// getJobTabName falls back to TAB, which may be configured as a gid.
+function tabTitle(name: string, meta: SheetMeta[]): string | undefined {
+  const gidMatch = name.match(/^(?:gid=)?(\d+)$/)
+  const found = gidMatch
+    ? meta.find(s => String(s.sheetId) === gidMatch[1])
+    : meta.find(s => s.title === name)
+  return found?.title
+}
+
 /**
  * Sort range in a Google Sheet tab by Date (Col 1) ascending and Customer (Col 4) ascending.
  */
@@ -529,109 +606,342 @@ export async function sortSheetTab(
   tabName: string
 ): Promise<void> {
   try {
-    const meta = await sheets.spreadsheets.get({
-      spreadsheetId: SHEET_ID,
-      fields: 'sheets.properties(sheetId,title)',
-    })
-    const sheetProp = meta.data.sheets?.find(
-      (s: { properties?: { title?: string | null; sheetId?: number | null } | null }) => s.properties?.title === tabName
-    )?.properties
-    if (!sheetProp || sheetProp.sheetId === undefined) return
-
-    const sheetId = sheetProp.sheetId
+    const sheetProp = (await readSheetMeta(sheets)).find(s => s.title === tabName)
+    if (!sheetProp) return
     const { order, headerRow } = await resolveOrder(sheets, tabName)
+    await sortTabs(sheets, [{ sheetId: sheetProp.sheetId, order, headerRow }])
+  } catch (err) {
+    console.warn(`[MASTER_SHEET] Auto-sort tab '${tabName}' warning:`, err)
+  }
+}
 
-    const dateColIndex = order.indexOf('วันที่') >= 0 ? order.indexOf('วันที่') : 0
-    const custColIndex = order.indexOf('ลูกค้า') >= 0 ? order.indexOf('ลูกค้า') : 3
+async function fuelForDate(cache: Map<string, number | ''>, dateKey: string): Promise<number | ''> {
+  let fuel = cache.get(dateKey)
+  if (fuel === undefined) {
+    try { fuel = (await getFuelPriceNumber(dateKey || undefined)) ?? '' } catch { fuel = '' }
+    cache.set(dateKey, fuel)
+  }
+  return fuel
+}
 
-    await sheets.spreadsheets.batchUpdate({
-      spreadsheetId: SHEET_ID,
-      requestBody: {
-        requests: [
-          {
-            sortRange: {
-              range: {
-                sheetId: sheetId,
-                startRowIndex: headerRow, // Skip header row
-                startColumnIndex: 0,
-                endColumnIndex: order.length,
-              },
-              sortSpecs: [
-                {
-                  dimensionIndex: dateColIndex,
-                  sortOrder: 'ASCENDING',
-                },
-                {
-                  dimensionIndex: custColIndex,
-                  sortOrder: 'ASCENDING',
-                },
-              ],
-            },
-          },
-        ],
-      },
+// Ledger rows for `jobs`, laid out in the tab's header order.
+async function ledgerRows(jobs: MasterJob[], order: string[], fuelCache: Map<string, number | ''>): Promise<(string | number)[][]> {
+  const rows: (string | number)[][] = []
+  for (const job of jobs) {
+    const fuel = await fuelForDate(fuelCache, String(job.Plan_Date || '').slice(0, 10))
+    // One row per drop (multi-drop → main row + one row per extra destination).
+    for (const byName of buildRowsForJob(job, fuel)) {
+      rows.push(order.map(h => byName[h] ?? ''))
+    }
+  }
+  return rows
+}
+
+// ───────────────────────────────────────────────────────────────────────────
+// Queued sync. Verifying a job only queues it (master_sheet_queue); the
+// /api/cron/master-sheet-sync flush writes the whole queue per tab, using the
+// Job_IDs each tab is known to hold (master_sheet_index) instead of reading
+// the full tab every time. A month-end close of hundreds of jobs costs one
+// metadata read, one batchGet, one append per tab and one sort batchUpdate.
+// ───────────────────────────────────────────────────────────────────────────
+
+// How long a tab's indexed Job_IDs are trusted before the flush re-reads the
+// tab, picking up rows added or deleted by hand in the sheet.
+const INDEX_TTL_MS = 6 * 60 * 60 * 1000
+// A flush that died mid-way releases its claimed queue rows after this long.
+const CLAIM_TIMEOUT_MS = 10 * 60 * 1000
+const QUEUE_PAGE = 1000
+const IN_CHUNK = 200
+// Flushes a queued job may fail before it stays parked with its last_error
+// (e.g. a customer with no MASTER tab) instead of being retried every run.
+const MAX_ATTEMPTS = 5
+
+type SheetSyncResult = { success: boolean; error?: string; skipped?: boolean; queued?: boolean }
+
+// Flush started by a request on this instance; requests that queue more jobs
+// while it runs ask it for one more pass instead of starting their own.
+let flushing: Promise<void> | null = null
+let flushAgain = false
+
+/**
+ * Flush the queue once the current response has been sent (next/server
+ * `after`), so a verified job reaches the sheet within seconds rather than at
+ * the daily cron. Outside a request there is no `after`; the job then waits
+ * for the cron or a manual flush from /admin/health.
+ */
+function flushSoon() {
+  try {
+    after(() => {
+      if (flushing) {
+        flushAgain = true
+        return flushing
+      }
+      flushing = (async () => {
+        do {
+          flushAgain = false
+          const result = await flushMasterSheetQueue()
+          if (!result.success) console.warn('[MASTER_SHEET] flush after queueing failed:', result.error)
+        } while (flushAgain)
+      })().finally(() => { flushing = null })
+      return flushing
     })
-    console.log(`[MASTER_SHEET] Auto-sorted tab '${tabName}' chronologically by Date and Customer.`)
   } catch (err) {
-    console.warn(`[MASTER_SHEET] Auto-sort tab '${tabName}' warning:`, err)
+    console.warn('[MASTER_SHEET] no request scope, leaving the job for the next flush:', err)
+  }
+}
+
+/**
+ * Queue a verified job for the MASTER Google Sheet. The row is written by a
+ * flush (flushMasterSheetQueue) started right after the response, which skips
+ * jobs already in the ledger. Best-effort: returns {success,error} and never
+ * throws.
+ */
+export async function queueJobForMaster(jobId: string): Promise<SheetSyncResult> {
+  try {
+    const supabase = createAdminClient()
+    // Re-queuing keeps the job's place in the queue but gives it fresh attempts
+    const { error } = await supabase
+      .from('master_sheet_queue')
+      .upsert({ job_id: jobId, attempts: 0, last_error: null }, { onConflict: 'job_id' })
+    if (error) return { success: false, error: error.message }
+    flushSoon()
+    return { success: true, queued: true }
+  } catch (err) {
+    const msg = err instanceof Error ? err.message : 'Unknown error'
+    console.error('[MASTER_SHEET] queue failed:', msg)
+    return { success: false, error: msg }
+  }
+}
+
+export type MasterQueueStatus = {
+  /** Jobs waiting to be written, including ones that failed before. */
+  pending: number
+  /** Jobs that reached MAX_ATTEMPTS; only a manual flush retries them. */
+  parked: number
+  /** Most recent failures, newest first. */
+  failing: { job_id: string; attempts: number; last_error: string; queued_at: string }[]
+}
+
+/** What is still in master_sheet_queue, for the admin health page. */
+export async function getMasterQueueStatus(): Promise<MasterQueueStatus> {
+  const supabase = createAdminClient()
+  const [pending, parked, failing] = await Promise.all([
+    supabase.from('master_sheet_queue').select('job_id', { count: 'exact', head: true }),
+    supabase.from('master_sheet_queue').select('job_id', { count: 'exact', head: true }).gte('attempts', MAX_ATTEMPTS),
+    supabase
+      .from('master_sheet_queue')
+      .select('job_id, attempts, last_error, queued_at')
+      .not('last_error', 'is', null)
+      .order('queued_at', { ascending: false })
+      .limit(50),
+  ])
+  return {
+    pending: pending.count || 0,
+    parked: parked.count || 0,
+    failing: (failing.data || []) as MasterQueueStatus['failing'],
   }
 }
 
 /**
- * Append one verified job as a row to the MASTER tab of the Google Sheet.
- * Best-effort: returns {success,error} and never throws.
+ * Write every queued job to its ledger tab: one append per tab, then a single
+ * sort of all touched tabs. Jobs that fail stay queued with last_error set
+ * and are retried on later flushes, up to MAX_ATTEMPTS times; `retryParked`
+ * (the manual flush) gives jobs past that limit another round.
  */
-export async function appendJobToMaster(jobId: string): Promise<{ success: boolean; error?: string; skipped?: boolean }> {
+export async function flushMasterSheetQueue({ retryParked = false } = {}): Promise<{
+  success: boolean
+  jobs?: number
+  appended?: number
+  skipped?: number
+  failed?: number
+  /** Failed jobs that reached MAX_ATTEMPTS and will not be retried. */
+  parked?: number
+  tabs?: number
+  error?: string
+}> {
   try {
     const supabase = createAdminClient()
-    const { data: job, error } = await supabase.from('Jobs_Main').select('*').eq('Job_ID', jobId).single()
-    if (error || !job) return { success: false, error: 'Job not found' }
+    const now = new Date()
+    const claimable = `claimed_at.is.null,claimed_at.lt.${new Date(now.getTime() - CLAIM_TIMEOUT_MS).toISOString()}`
 
-    // Test/QA jobs (TILOG demo) never go to any ledger tab.
-    if (isTestCustomer(job)) return { success: true, skipped: true }
+    if (retryParked) {
+      const { error } = await supabase.from('master_sheet_queue').update({ attempts: 0 }).gte('attempts', MAX_ATTEMPTS)
+      if (error) return { success: false, error: error.message }
+    }
 
-    let fuel: number | '' = ''
-    try { fuel = (await getFuelPriceNumber(String(job.Plan_Date || '').slice(0, 10) || undefined)) ?? '' } catch { fuel = '' }
+    const { data: waiting, error: waitingError } = await supabase
+      .from('master_sheet_queue')
+      .select('job_id, attempts')
+      .or(claimable)
+      .lt('attempts', MAX_ATTEMPTS)
+      .order('queued_at', { ascending: true })
+      .limit(QUEUE_PAGE)
+    if (waitingError) return { success: false, error: waitingError.message }
+    if (!waiting || waiting.length === 0) return { success: true, jobs: 0, appended: 0, skipped: 0, failed: 0, tabs: 0 }
+    const attempts = new Map(waiting.map(r => [r.job_id as string, Number(r.attempts) || 0]))
+
+    // Claim in the same filter so an overlapping flush can't take the same rows.
+    const claimed: string[] = []
+    for (let i = 0; i < waiting.length; i += IN_CHUNK) {
+      const { data, error } = await supabase
+        .from('master_sheet_queue')
+        .update({ claimed_at: now.toISOString() })
+        .in('job_id', waiting.slice(i, i + IN_CHUNK).map(r => r.job_id))
+        .or(claimable)
+        .lt('attempts', MAX_ATTEMPTS)
+        .select('job_id')
+      if (error) return { success: false, error: error.message }
+      claimed.push(...(data || []).map(r => r.job_id as string))
+    }
+
+    const jobs: MasterJob[] = []
+    for (let i = 0; i < claimed.length; i += IN_CHUNK) {
+      const { data, error } = await supabase.from('Jobs_Main').select('*').in('Job_ID', claimed.slice(i, i + IN_CHUNK))
+      if (error) return { success: false, error: error.message }
+      jobs.push(...(data || []))
+    }
+
+    const found = new Set(jobs.map(j => String(j.Job_ID)))
+    const done = new Set(claimed.filter(id => !found.has(id))) // deleted since queued
+    const failures = new Map<string, string>()
+    let skipped = done.size
 
-    const rowObjects = buildRowsForJob(job, fuel)
     const sheets = getSheetsClient()
+    const meta = await readSheetMeta(sheets)
+    const titles = meta.map(s => s.title)
+
+    const jobsByTab = new Map<string, MasterJob[]>()
+    for (const job of jobs) {
+      const jobId = String(job.Job_ID)
+      if (isTestCustomer(job)) { // TILOG demo jobs never hit a ledger tab
+        done.add(jobId)
+        skipped++
+        continue
+      }
+      const title = tabTitle(getJobTabName(job, titles), meta)
+      if (!title) {
+        failures.set(jobId, 'MASTER tab not found')
+        continue
+      }
+      if (!jobsByTab.has(title)) jobsByTab.set(title, [])
+      jobsByTab.get(title)!.push(job)
+    }
+
+    const tabNames = [...jobsByTab.keys()]
+    const { data: indexRows, error: indexError } = tabNames.length > 0
+      ? await supabase.from('master_sheet_index').select('tab, job_ids, indexed_at').in('tab', tabNames)
+      : { data: [], error: null }
+    if (indexError) return { success: false, error: indexError.message }
+    const freshAfter = now.getTime() - INDEX_TTL_MS
+    const index = new Map<string, { jobIds: Set<string>; indexedAt: string }>()
+    for (const row of indexRows || []) {
+      if (new Date(row.indexed_at).getTime() > freshAfter) {
+        index.set(row.tab, { jobIds: new Set(row.job_ids || []), indexedAt: row.indexed_at })
+      }
+    }
+
+    const stale = new Set(tabNames.filter(t => !index.has(t)))
+    const snapshots = await readTabs(sheets, tabNames, stale)
+    for (const title of stale) {
+      index.set(title, { jobIds: ledgerState(snapshots.get(title)!).jobIds, indexedAt: now.toISOString() })
+    }
+
+    const fuelCache = new Map<string, number | ''>()
+    const sortTargets: SortTarget[] = []
+    const indexSaved = new Set<string>()
+    let appended = 0
+    for (const [title, tabJobs] of jobsByTab.entries()) {
+      const snapshot = snapshots.get(title)!
+      const { jobIds } = index.get(title)!
+      const missing = tabJobs.filter(job => !jobIds.has(String(job.Job_ID)))
+      for (const job of tabJobs) {
+        if (jobIds.has(String(job.Job_ID))) { done.add(String(job.Job_ID)); skipped++ }
+      }
+      if (missing.length === 0) continue
 
-    let tabOverride = TAB
-    if (job.Customer_Name || job.Customer_ID) {
       try {
-        const meta = await sheets.spreadsheets.get({ spreadsheetId: SHEET_ID, fields: 'sheets.properties(title)' })
-        const existingTabs = meta.data.sheets?.map(s => s.properties?.title || '') || []
-        tabOverride = getJobTabName(job, existingTabs)
-      } catch (e) {
-        console.warn('[MASTER_SHEET] failed to fetch sheet metadata, using default tab:', e)
+        const rows = await ledgerRows(missing, snapshot.order, fuelCache)
+        await sheets.spreadsheets.values.append({
+          spreadsheetId: SHEET_ID,
+          range: `${snapshot.qtab}!A:BZ`,
+          valueInputOption: 'USER_ENTERED',
+          insertDataOption: 'INSERT_ROWS',
+          requestBody: { values: rows },
+        })
+        appended += rows.length
+        for (const job of missing) {
+          jobIds.add(String(job.Job_ID))
+          done.add(String(job.Job_ID))
+        }
+        sortTargets.push({ sheetId: meta.find(s => s.title === title)!.sheetId, order: snapshot.order, headerRow: snapshot.headerRow })
+        // Index the tab as soon as its rows are in: if a later tab or the
+        // dequeue fails, the retried jobs are skipped rather than appended twice.
+        await saveLedgerIndex(new Map([[title, jobIds]]), index.get(title)!.indexedAt)
+        indexSaved.add(title)
+      } catch (err) {
+        const msg = err instanceof Error ? err.message : 'Unknown error'
+        console.error(`[MASTER_SHEET] append to '${title}' failed:`, msg)
+        for (const job of missing) failures.set(String(job.Job_ID), msg)
       }
     }
 
-    const { qtab, order, headerRow } = await resolveOrder(sheets, tabOverride)
-    const ledger = await readLedgerState(sheets, qtab, order, headerRow)
-    if (ledger.jobIds.has(jobId)) return { success: true, skipped: true }
-    // One row per drop (multi-drop → main row + one row per extra destination).
-    const values = rowObjects.map(byName => order.map(h => byName[h] ?? ''))
+    // Tabs re-read above but not appended to still carry a fresh index
+    await saveLedgerIndex(
+      new Map([...stale].filter(title => !indexSaved.has(title)).map(title => [title, index.get(title)!.jobIds])),
+      now.toISOString()
+    )
 
-    await sheets.spreadsheets.values.append({
-      spreadsheetId: SHEET_ID,
-      range: `${qtab}!A:BZ`,
-      valueInputOption: 'USER_ENTERED',
-      insertDataOption: 'INSERT_ROWS',
-      requestBody: { values },
-    })
+    await sortTabs(sheets, sortTargets)
 
-    // Auto-sort the tab chronologically by Date & Customer
-    await sortSheetTab(sheets, tabOverride)
+    const doneIds = [...done]
+    for (let i = 0; i < doneIds.length; i += IN_CHUNK) {
+      await supabase.from('master_sheet_queue').delete().in('job_id', doneIds.slice(i, i + IN_CHUNK))
+    }
+    // Release failures grouped by (error, attempt count) so each group is one update
+    const failedBy = new Map<string, { msg: string; attempt: number; ids: string[] }>()
+    const parked: string[] = []
+    for (const [jobId, msg] of failures.entries()) {
+      const attempt = (attempts.get(jobId) || 0) + 1
+      if (attempt >= MAX_ATTEMPTS) parked.push(jobId)
+      const key = `${attempt}:${msg}`
+      if (!failedBy.has(key)) failedBy.set(key, { msg, attempt, ids: [] })
+      failedBy.get(key)!.ids.push(jobId)
+    }
+    for (const { msg, attempt, ids } of failedBy.values()) {
+      for (let i = 0; i < ids.length; i += IN_CHUNK) {
+        await supabase
+          .from('master_sheet_queue')
+          .update({ claimed_at: null, last_error: msg, attempts: attempt })
+          .in('job_id', ids.slice(i, i + IN_CHUNK))
+      }
+    }
+    if (parked.length > 0) {
+      console.error(`[MASTER_SHEET] giving up on ${parked.length} job(s) after ${MAX_ATTEMPTS} attempts:`, parked.slice(0, 20).join(', '))
+    }
 
-    return { success: true }
+    return { success: true, jobs: claimed.length, appended, skipped, failed: failures.size, parked: parked.length, tabs: sortTargets.length }
   } catch (err) {
     const msg = err instanceof Error ? err.message : 'Unknown error'
-    console.error('[MASTER_SHEET] append failed:', msg)
+    console.error('[MASTER_SHEET] queue flush failed:', msg)
     return { success: false, error: msg }
   }
 }
 
+/**
+ * Record the Job_IDs each tab is known to hold, so the next queue flush
+ * trusts them instead of re-reading those tabs. `indexedAt` is when the tab
+ * itself was last read (default: now).
+ */
+async function saveLedgerIndex(entries: Map<string, Set<string>>, indexedAt?: string): Promise<void> {
+  if (entries.size === 0) return
+  const now = new Date().toISOString()
+  const { error } = await createAdminClient().from('master_sheet_index').upsert(
+    [...entries.entries()].map(([tab, jobIds]) => ({ tab, job_ids: [...jobIds], indexed_at: indexedAt || now, updated_at: now })),
+    { onConflict: 'tab' }
+  )
+  if (error) console.warn('[MASTER_SHEET] saving the ledger index failed:', error.message)
+}
+
 // Job statuses that represent finished/delivered work (eligible for the
 // historical verification backfill). Cancelled/Draft/in-progress are excluded.
 const DONE_STATUSES = ['Completed', 'Complete', 'Delivered', 'Finished', 'Closed', 'Billed', 'Paid', 'Verified']
@@ -706,28 +1016,36 @@ export async function verifyAndBackfillHistorical(
     const sheets = getSheetsClient()
     
     // Fetch all existing tabs from Google Sheets to group properly
-    const meta = await sheets.spreadsheets.get({ spreadsheetId: SHEET_ID, fields: 'sheets.properties(title)' })
-    const existingTabs = meta.data.sheets?.map(s => s.properties?.title || '') || []
+    const meta = await readSheetMeta(sheets)
+    const existingTabs = meta.map(s => s.title)
 
     const jobsByTab = new Map<string, MasterJob[]>()
     for (const job of jobs) {
       if (isTestCustomer(job)) continue // TILOG demo jobs never hit a ledger tab
-      const tabName = getJobTabName(job, existingTabs)
+      const name = getJobTabName(job, existingTabs)
+      const tabName = tabTitle(name, meta) ?? name
       if (!jobsByTab.has(tabName)) {
         jobsByTab.set(tabName, [])
       }
       jobsByTab.get(tabName)!.push(job)
     }
 
+    // Every tab's rows in one batchGet rather than a full read per tab.
+    const tabNames = [...jobsByTab.keys()]
+    const snapshots = await readTabs(sheets, tabNames, new Set(tabNames))
+
     const fuelCache = new Map<string, number | ''>()
+    const indexed = new Map<string, Set<string>>()
+    const sortTargets: SortTarget[] = []
     let totalAppended = 0
     let totalJobIdsFilled = 0
 
     for (const [tabName, tabJobs] of jobsByTab.entries()) {
-      const { qtab, order, headerRow } = await resolveOrder(sheets, tabName)
-      const ledger = await readLedgerState(sheets, qtab, order, headerRow)
-      const jobIdsFilled = await fillLegacyJobIds(sheets, qtab, order, tabJobs, ledger)
-      totalJobIdsFilled += jobIdsFilled
+      const snapshot = snapshots.get(tabName)!
+      const { qtab, order } = snapshot
+      const ledger = ledgerState(snapshot)
+      const filledIds = await fillLegacyJobIds(sheets, qtab, order, tabJobs, ledger)
+      totalJobIdsFilled += filledIds.length
 
       const missingJobs = jobsMissingFromLedger(
         tabJobs,
@@ -736,19 +1054,7 @@ export async function verifyAndBackfillHistorical(
         ledger.legacyFingerprints
       )
 
-      const rows: (string | number)[][] = []
-      for (const job of missingJobs) {
-        const dateKey = String(job.Plan_Date || '').slice(0, 10)
-        let fuel = fuelCache.get(dateKey)
-        if (fuel === undefined) {
-          try { fuel = (await getFuelPriceNumber(dateKey || undefined)) ?? '' } catch { fuel = '' }
-          fuelCache.set(dateKey, fuel)
-        }
-        for (const byName of buildRowsForJob(job, fuel as number | '')) {
-          rows.push(order.map(h => byName[h] ?? ''))
-        }
-      }
-
+      const rows = await ledgerRows(missingJobs, order, fuelCache)
       for (let i = 0; i < rows.length; i += 500) {
         await sheets.spreadsheets.values.append({
           spreadsheetId: SHEET_ID,
@@ -759,13 +1065,18 @@ export async function verifyAndBackfillHistorical(
         })
       }
       totalAppended += rows.length
+      indexed.set(tabName, new Set([...ledger.jobIds, ...filledIds, ...missingJobs.map(j => String(j.Job_ID || '')).filter(Boolean)]))
 
-      // Auto-sort the tab chronologically by Date & Customer after backfill
-      if (rows.length > 0) {
-        await sortSheetTab(sheets, tabName)
+      const sheetId = meta.find(s => s.title === tabName)?.sheetId
+      if (rows.length > 0 && sheetId !== undefined) {
+        sortTargets.push({ sheetId, order, headerRow: snapshot.headerRow })
       }
     }
 
+    // Auto-sort the touched tabs chronologically by Date & Customer, in one call
+    await sortTabs(sheets, sortTargets)
+    await saveLedgerIndex(indexed)
+
     // Mark verification only after the ledger write succeeds. If a database
     // update fails, a rerun sees the Job_ID in the sheet and safely retries the
     // status update without appending the row again.
@@ -835,28 +1146,35 @@ export async function backfillMasterSheet(
     const sheets = getSheetsClient()
     
     // Fetch all existing tabs from Google Sheets to group properly
-    const meta = await sheets.spreadsheets.get({ spreadsheetId: SHEET_ID, fields: 'sheets.properties(title)' })
-    const existingTabs = meta.data.sheets?.map(s => s.properties?.title || '') || []
+    const meta = await readSheetMeta(sheets)
+    const existingTabs = meta.map(s => s.title)
 
     const jobsByTab = new Map<string, MasterJob[]>()
     for (const job of jobs) {
       if (isTestCustomer(job)) continue // TILOG demo jobs never hit a ledger tab
-      const tabName = getJobTabName(job, existingTabs)
+      const name = getJobTabName(job, existingTabs)
+      const tabName = tabTitle(name, meta) ?? name
       if (!jobsByTab.has(tabName)) {
         jobsByTab.set(tabName, [])
       }
       jobsByTab.get(tabName)!.push(job)
     }
 
+    // Every tab's rows in one batchGet rather than a full read per tab.
+    const tabNames = [...jobsByTab.keys()]
+    const snapshots = await readTabs(sheets, tabNames, new Set(tabNames))
+
     const fuelCache = new Map<string, number | ''>()
+    const indexed = new Map<string, Set<string>>()
     let totalAppended = 0
     let totalJobIdsFilled = 0
 
     for (const [tabName, tabJobs] of jobsByTab.entries()) {
-      const { qtab, order, headerRow } = await resolveOrder(sheets, tabName)
-      const ledger = await readLedgerState(sheets, qtab, order, headerRow)
-      const jobIdsFilled = await fillLegacyJobIds(sheets, qtab, order, tabJobs, ledger)
-      totalJobIdsFilled += jobIdsFilled
+      const snapshot = snapshots.get(tabName)!
+      const { qtab, order } = snapshot
+      const ledger = ledgerState(snapshot)
+      const filledIds = await fillLegacyJobIds(sheets, qtab, order, tabJobs, ledger)
+      totalJobIdsFilled += filledIds.length
 
       const missingJobs = jobsMissingFromLedger(
         tabJobs,
@@ -865,19 +1183,7 @@ export async function backfillMasterSheet(
         ledger.legacyFingerprints
       )
 
-      const rows: (string | number)[][] = []
-      for (const job of missingJobs) {
-        const dateKey = String(job.Plan_Date || '').slice(0, 10)
-        let fuel = fuelCache.get(dateKey)
-        if (fuel === undefined) {
-          try { fuel = (await getFuelPriceNumber(dateKey || undefined)) ?? '' } catch { fuel = '' }
-          fuelCache.set(dateKey, fuel)
-        }
-        for (const byName of buildRowsForJob(job, fuel as number | '')) {
-          rows.push(order.map(h => byName[h] ?? ''))
-        }
-      }
-
+      const rows = await ledgerRows(missingJobs, order, fuelCache)
       for (let i = 0; i < rows.length; i += 500) {
         await sheets.spreadsheets.values.append({
           spreadsheetId: SHEET_ID,
@@ -888,8 +1194,11 @@ export async function backfillMasterSheet(
         })
       }
       totalAppended += rows.length
+      indexed.set(tabName, new Set([...ledger.jobIds, ...filledIds, ...missingJobs.map(j => String(j.Job_ID || '')).filter(Boolean)]))
     }
 
+    await saveLedgerIndex(indexed)
+
     return { success: true, count: totalAppended, jobIdsFilled: totalJobIdsFilled }
   } catch (err) {
     const msg = err instanceof Error ? err.message : 'Unknown error'
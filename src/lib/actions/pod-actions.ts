@@ -8,6 +8,7 @@ import { calculateJobCO2 } from "@/app/mobile/jobs/actions"
 import { transitionJobStatus } from "@/services/job-status-machine"
 import { calculateJobPrice } from "@/services/pricing-engine"
 import { timeTH } from "@/lib/utils/date-th"
+import { requireDriverOwnJob } from "@/services/permission-guards"
 import type { SupabaseClient } from "@supabase/supabase-js"
 
 /**
@@ -23,18 +24,103 @@ function updateNotesWithQty(currentNotes: string, qty: number): string {
     return `${cleanNotes} ${qtyRemark}`
 }
 
+// Same bucket uploadFileToSupabase writes to
+const ASSETS_BUCKET = "company-assets"
+
+const POD_UPLOAD_FOLDERS = {
+    photo: 'Job_Photos',
+    signature: 'Signatures',
+    report: 'Reports',
+    floor_climb: 'Job_Photos',
+} as const
+
+export type PodUploadKind = keyof typeof POD_UPLOAD_FOLDERS
+
+const UPLOAD_EXTENSIONS: Record<string, string> = {
+    'image/webp': 'webp',
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+}
+
+const cleanStorageName = (name: string) => name.replace(/[^a-zA-Z0-9.\-_]/g, '_')
+
+/**
+ * Signed upload targets for a POD's files, so the phone uploads straight to
+ * storage and submitJobPOD only receives the resulting URLs. One target per
+ * entry in `files`, in the same order.
+ */
+export async function createPodUploadTargets(jobId: string, files: { kind: PodUploadKind; contentType: string }[]) {
+  jobId = decodeURIComponent(jobId)
+  try {
+    const supabase = createAdminClient()
+    const { data: job } = await supabase
+        .from("Jobs_Main")
+        .select("Driver_ID")
+        .eq("Job_ID", jobId)
+        .single()
+    if (!job) return { error: "ไม่พบงาน" }
+    await requireDriverOwnJob(job.Driver_ID)
+
+    const timestamp = Date.now()
+    const bucket = supabase.storage.from(ASSETS_BUCKET)
+    const targets = await Promise.all(files.map(async (file, i) => {
+        const folder = POD_UPLOAD_FOLDERS[file.kind]
+        if (!folder) throw new Error(`Unknown upload kind: ${file.kind}`)
+        const ext = UPLOAD_EXTENSIONS[file.contentType] || 'jpg'
+        const path = `${folder}/${cleanStorageName(`${jobId}_${timestamp}_${file.kind}_${i}.${ext}`)}`
+        const { data, error } = await bucket.createSignedUploadUrl(path, { upsert: true })
+        if (error || !data) throw error || new Error(`Could not sign upload for ${path}`)
+        return { path, token: data.token, publicUrl: bucket.getPublicUrl(path).data.publicUrl }
+    }))
+    return { success: true, targets }
+  } catch (error) {
+    return { error: error instanceof Error ? error.message : "Could not prepare upload" }
+  }
+}
+
+type UploadedPodUrls = { photos: string[]; signature: string | null; report: string | null; floorClimb: string | null }
+
+/**
+ * URLs from a direct upload (createPodUploadTargets). Only public URLs of this
+ * job's files in our bucket are accepted; anything else is ignored.
+ */
+function readUploadedUrls(raw: FormDataEntryValue | null, supabase: SupabaseClient, jobId: string): UploadedPodUrls {
+    const none: UploadedPodUrls = { photos: [], signature: null, report: null, floorClimb: null }
+    if (typeof raw !== 'string' || !raw) return none
+    const base = supabase.storage.from(ASSETS_BUCKET).getPublicUrl('').data.publicUrl.replace(/\/$/, '')
+    const prefix = cleanStorageName(`${jobId}_`)
+    const valid = (url: unknown): url is string => {
+        if (typeof url !== 'string' || !url.startsWith(`${base}/`)) return false
+        const [folder, name, ...rest] = url.slice(base.length + 1).split('/')
+        return rest.length === 0 && Object.values(POD_UPLOAD_FOLDERS).includes(folder as never) && !!name?.startsWith(prefix)
+    }
+    try {
+        const parsed = JSON.parse(raw) as Partial<Record<keyof UploadedPodUrls, unknown>>
+        return {
+            photos: Array.isArray(parsed.photos) ? parsed.photos.filter(valid) : [],
+            signature: valid(parsed.signature) ? parsed.signature : null,
+            report: valid(parsed.report) ? parsed.report : null,
+            floorClimb: valid(parsed.floorClimb) ? parsed.floorClimb : null,
+        }
+    } catch {
+        return none
+    }
+}
+
 export async function submitJobPOD(jobId: string, formData: FormData) {
   jobId = decodeURIComponent(jobId)
   const supabase = createAdminClient()
 
   const photoFile = formData.get("photo") as File
   const signatureFile = formData.get("signature") as File
+  // Files the phone already put in storage; the form then carries no blobs
+  const uploaded = readUploadedUrls(formData.get("uploaded_urls"), supabase, jobId)
   
   const hasLegacyPhoto = !!photoFile && photoFile.size > 0
   const hasNewPhoto = !!formData.get("photo_0")
-  const hasPhotos = hasLegacyPhoto || hasNewPhoto
+  const hasPhotos = hasLegacyPhoto || hasNewPhoto || uploaded.photos.length > 0
   
-  const hasSignature = !!signatureFile && signatureFile.size > 0
+  const hasSignature = (!!signatureFile && signatureFile.size > 0) || !!uploaded.signature
 
   if (!hasPhotos) {
       return { error: "ไม่พบรูปถ่ายสินค้า (กรุณาลองถ่ายใหม่)" }
@@ -60,9 +146,9 @@ export async function submitJobPOD(jobId: string, formData: FormData) {
     const uploadPromises: Promise<string | null>[] = []
     
     const podReportFile = formData.get("pod_report") as File
-    let podReportUrl = null
+    let podReportUrl = uploaded.report
     
-    if (podReportFile && podReportFile.size > 0) {
+    if (!podReportUrl && podReportFile && podReportFile.size > 0) {
         try {
             const reportName = `${jobId}_${timestamp}_REPORT.jpg`
             podReportUrl = await uploadWithRename(podReportFile, reportName, 'Reports')
@@ -85,15 +171,15 @@ export async function submitJobPOD(jobId: string, formData: FormData) {
     }
 
     const [signatureUrl, ...rawPhotoUrls] = await Promise.all([
-      uploadWithRename(signatureFile, `${jobId}_${timestamp}_sig.png`, 'Signatures'),
+      uploaded.signature ?? uploadWithRename(signatureFile, `${jobId}_${timestamp}_sig.png`, 'Signatures'),
       ...uploadPromises
     ])
 
-    const photoUrls = rawPhotoUrls.filter((u): u is string => Boolean(u))
+    const photoUrls = [...uploaded.photos, ...rawPhotoUrls.filter((u): u is string => Boolean(u))]
 
     const floorClimbReportFile = formData.get("floor_climb_report") as File
-    let floorClimbReportUrl = null
-    if (floorClimbReportFile && floorClimbReportFile.size > 0) {
+    let floorClimbReportUrl = uploaded.floorClimb
+    if (!floorClimbReportUrl && floorClimbReportFile && floorClimbReportFile.size > 0) {
         try {
             const fcName = `${jobId}_${timestamp}_FLOOR_CLIMB.jpg`
             const buffer = Buffer.from(await floorClimbReportFile.arrayBuffer())
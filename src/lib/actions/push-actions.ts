@@ -8,6 +8,7 @@ import { sendTelegramAlert } from '@/lib/integrations/telegram'
 import * as admin from 'firebase-admin'
 import { join } from 'path'
 import { readFileSync } from 'fs'
+import { dispatchPush, type PushTarget, type PushTransport } from '@/services/push-dispatcher'
 
 // Initialize Firebase Admin for Native Push (FCM)
 if (!admin.apps.length) {
@@ -136,6 +137,55 @@ async function sendWebPush(sub: { Endpoint: string; Keys_P256dh: string; Keys_Au
     }
 }
 
+function fcmMessage(payload: PushPayload) {
+    return {
+        notification: { title: payload.title, body: payload.body },
+        data: {
+            url: payload.url || '/mobile/jobs',
+            type: payload.type || 'general',
+            tag: payload.tag || ''
+        },
+        android: {
+            notification: {
+                sound: 'default',
+                channelId: 'tms-notifications',
+                priority: 'high' as const,
+                vibrateTimingsMillis: [0, 300, 100, 300, 100, 400],
+            }
+        },
+    }
+}
+
+function pushTarget(sub: PushSubscriptionRow): PushTarget {
+    return sub.Keys_Auth === 'FCM'
+        ? { kind: 'fcm', endpoint: sub.Endpoint }
+        : { kind: 'web', endpoint: sub.Endpoint, p256dh: sub.Keys_P256dh, auth: sub.Keys_Auth }
+}
+
+// FCM multicast + Web Push, for the fan-out dispatcher.
+function pushTransport(payload: PushPayload): PushTransport {
+    return {
+        async sendFcmMulticast(tokens) {
+            const res = await admin.messaging().sendEachForMulticast({ ...fcmMessage(payload), tokens })
+            return res.responses.map(r => r.success
+                ? { success: true }
+                : { success: false, code: r.error?.code, error: r.error?.message })
+        },
+        sendWebPush(target) {
+            return sendWebPush({ Endpoint: target.endpoint, Keys_P256dh: target.p256dh, Keys_Auth: target.auth }, payload)
+        },
+    }
+}
+
+// Drop subscriptions the push service reported as gone, in one delete per chunk.
+async function pruneSubscriptions(endpoints: string[]) {
+    const supabase = await createAdminClient()
+    for (let i = 0; i < endpoints.length; i += 200) {
+        await supabase.from('Push_Subscriptions').delete().in('Endpoint', endpoints.slice(i, i + 200))
+    }
+    console.log(`[PUSH] Pruned ${endpoints.length} expired subscription(s)`)
+}
+
 // ─────────────────────────────────────────────
 // Save Driver Push Subscription
 // ─────────────────────────────────────────────
@@ -441,49 +491,43 @@ export async function notifyMarketplaceNewJob(jobId: string, customerName: strin
  */
 export async function broadcastPushToDrivers(payload: PushPayload) {
     const supabase = await createAdminClient()
-    const { data: subs, error } = await supabase
-        .from('Push_Subscriptions')
-        .select('*')
-        .not('Driver_ID', 'is', null)
 
-    if (error || !subs || subs.length === 0) return { success: false, reason: 'no_subscriptions' }
+    // PostgREST caps a response at 1000 rows; page so a large fleet is reached in full.
+    const PAGE = 1000
+    const subs: PushSubscriptionRow[] = []
+    for (let from = 0; ; from += PAGE) {
+        const { data, error } = await supabase
+            .from('Push_Subscriptions')
+            .select('Endpoint, Keys_P256dh, Keys_Auth, Driver_ID')
+            .not('Driver_ID', 'is', null)
+            .order('Endpoint', { ascending: true })
+            .range(from, from + PAGE - 1)
+        if (error) return { success: false, reason: 'no_subscriptions' }
+        subs.push(...(data || []))
+        if (!data || data.length < PAGE) break
+    }
+
+    if (subs.length === 0) return { success: false, reason: 'no_subscriptions' }
 
     console.log(`[PUSH] Broadcasting to ${subs.length} driver(s)`)
 
-    const results = await Promise.allSettled(
-        subs.map(async (sub: PushSubscriptionRow) => {
-            // FCM
-            if (sub.Keys_Auth === 'FCM') {
-                try {
-                    await admin.messaging().send({
-                        notification: { title: payload.title, body: payload.body },
-                        data: { 
-                            url: payload.url || '/mobile/jobs', 
-                            type: payload.type || 'general',
-                            tag: payload.tag || ''
-                        },
-                        android: {
-                            notification: {
-                                sound: 'default',
-                                channelId: 'tms-notifications',
-                                priority: 'high',
-                                vibrateTimingsMillis: [0, 300, 100, 300, 100, 400],
-                            }
-                        },
-                        token: sub.Endpoint
-                    })
-                    return { success: true }
-                } catch (err) {
-                    return { success: false }
-                }
-            }
-            // Web Push
-            return await sendWebPush(sub, { ...payload, url: payload.url || '/mobile/jobs' })
-        })
+    const report = await dispatchPush(
+        subs.map(pushTarget),
+        pushTransport({ ...payload, url: payload.url || '/mobile/jobs' }),
+        { prune: pruneSubscriptions }
     )
 
-    const successCount = results.filter(r => r.status === 'fulfilled' && (r.value as { success: boolean })?.success).length
-    return { success: successCount > 0 }
+    for (const batch of report.batches) {
+        console.log(`[PUSH] ${batch.kind} batch: ${batch.sent}/${batch.size} sent, ${batch.dead} pruned, ${batch.ms}ms`)
+    }
+
+    return {
+        success: report.sent > 0,
+        sent: report.sent,
+        failed: report.failed,
+        pruned: report.dead.length,
+        batches: report.batches,
+    }
 }
 
 
@@ -5,6 +5,9 @@ import { getLatestDriverLocations } from '@/lib/supabase/gps'
 import { getAllDriversFromTable } from '@/lib/supabase/drivers'
 import { transitionJobStatus } from "@/services/job-status-machine"
 import { todayTH } from "@/lib/utils/date-th"
+import { solveVrp } from "@/services/vrp-solver"
+import { clusterWithinRadius } from "@/lib/utils/geo-grid"
+import { getIdentity } from "@/lib/identity"
 
 // ============================================================
 // AI Auto-Assign Engine — TMS 2026
@@ -186,76 +189,77 @@ export async function getNearbyUnassignedJobs(pivotJob: {
 }, radiusKm = 10): Promise<Array<{ Job_ID: string; Customer_Name: string | null; Route_Name: string | null; Pickup_Lat: number | null; Pickup_Lon: number | null; Plan_Date: string | null }>> {
     try {
         const supabase = await createClient()
+        const { branchId } = await getIdentity()
 
-        // 1. Get all unassigned jobs
-        const { data: jobs } = await supabase
+        // 1. Unassigned jobs in the caller's branch whose pickup falls in the
+        //    radius' bounding box (served by idx_jobs_main_unassigned_pickup)
+        const dLat = radiusKm / 111.32
+        const dLon = radiusKm / (111.32 * Math.max(Math.cos(pivotJob.Pickup_Lat * Math.PI / 180), 0.01))
+        let query = supabase
             .from('Jobs_Main')
             .select('Job_ID, Customer_Name, Route_Name, Pickup_Lat, Pickup_Lon, Plan_Date')
             .eq('Job_Status', 'New')
             .is('Driver_ID', null)
             .neq('Job_ID', pivotJob.Job_ID)
+            .gte('Pickup_Lat', pivotJob.Pickup_Lat - dLat)
+            .lte('Pickup_Lat', pivotJob.Pickup_Lat + dLat)
+            .gte('Pickup_Lon', pivotJob.Pickup_Lon - dLon)
+            .lte('Pickup_Lon', pivotJob.Pickup_Lon + dLon)
+
+        if (branchId && branchId !== 'All') {
+            query = query.eq('Branch_ID', branchId)
+        }
 
+        const { data: jobs } = await query
         if (!jobs) return []
 
-        // 2. Filter by distance
-        const nearby = jobs.filter(job => {
-            if (!job.Pickup_Lat || !job.Pickup_Lon) return false
-            const distance = haversineKm(
-                pivotJob.Pickup_Lat, 
-                pivotJob.Pickup_Lon, 
-                job.Pickup_Lat, 
-                job.Pickup_Lon
-            )
-            return distance <= radiusKm
-        })
-
-        return nearby
+        // 2. Trim the box corners to the actual radius
+        return jobs.filter(job =>
+            job.Pickup_Lat && job.Pickup_Lon &&
+            haversineKm(pivotJob.Pickup_Lat, pivotJob.Pickup_Lon, job.Pickup_Lat, job.Pickup_Lon) <= radiusKm
+        )
     } catch {
         return []
     }
 }
 
 // ============================================================
-// Route Optimization: Sort jobs for shortest delivery path (TSP Greedy)
+// Route Optimization: Sort jobs for shortest delivery path
+// (open single-vehicle route from the start point, in-process VRP solver)
 // ============================================================
 export async function getOptimizedJobSequence<T extends { Delivery_Lat?: number | null; Delivery_Lon?: number | null }>(
     startLat: number, 
     startLon: number, 
     jobs: T[]
 ): Promise<T[]> {
-    const unvisited = [...jobs]
-    const optimized: T[] = []
-    let currentLat = startLat
-    let currentLon = startLon
-
-    while (unvisited.length > 0) {
-        let nearestIdx = -1
-        let minDistance = Infinity
-
-        for (let i = 0; i < unvisited.length; i++) {
-            const job = unvisited[i]
-            if (job.Delivery_Lat && job.Delivery_Lon) {
-                const dist = haversineKm(currentLat, currentLon, job.Delivery_Lat, job.Delivery_Lon)
-                if (dist < minDistance) {
-                    minDistance = dist
-                    nearestIdx = i
-                }
-            }
-        }
-
-        if (nearestIdx === -1) {
-            // No valid coordinates left, push remaining and break
-            optimized.push(...unvisited)
-            break
+    // Jobs without coordinates keep their order at the end
+    const located = jobs.filter(j => j.Delivery_Lat && j.Delivery_Lon)
+    const unlocated = jobs.filter(j => !j.Delivery_Lat || !j.Delivery_Lon)
+    if (located.length < 2) return [...located, ...unlocated]
+
+    const points = [{ lat: startLat, lon: startLon }, ...located.map(j => ({ lat: j.Delivery_Lat!, lon: j.Delivery_Lon! }))]
+    const size = points.length
+    const time = new Float64Array(size * size)
+    for (let i = 0; i < size; i++) {
+        for (let j = 0; j < size; j++) {
+            if (i !== j) time[i * size + j] = haversineKm(points[i].lat, points[i].lon, points[j].lat, points[j].lon)
         }
-
-        const [nearestJob] = unvisited.splice(nearestIdx, 1)
-        optimized.push(nearestJob)
-        currentLat = nearestJob.Delivery_Lat!
-        currentLon = nearestJob.Delivery_Lon!
     }
 
-    return optimized
+    const { routes, unassigned } = solveVrp({
+        size,
+        time,
+        stops: located.map((_, i) => ({ id: String(i), node: i + 1 })),
+        vehicles: [{ id: 'route', start: 0, end: null }],
+    }, { timeLimitMs: 500 })
+
+    // Anything the solver could not place still goes out, after the route and
+    // in its original order
+    return [
+        ...(routes[0]?.stopIds || []).map(id => located[Number(id)]),
+        ...unassigned.map(Number).sort((a, b) => a - b).map(i => located[i]),
+        ...unlocated,
+    ]
 }
 
 // ============================================================
@@ -264,47 +268,40 @@ export async function getOptimizedJobSequence<T extends { Delivery_Lat?: number
 export async function findPotentialBundles(branchId?: string, radiusKm = 5): Promise<Array<{ pivot: string; bundled: string[]; total_saved_km: number }>> {
     try {
         const supabase = await createClient()
-        
-        let query = supabase
-            .from('Jobs_Main')
-            .select('Job_ID, Pickup_Lat, Pickup_Lon, Delivery_Lat, Delivery_Lon, Vehicle_Type')
-            .eq('Job_Status', 'New')
-            .is('Driver_ID', null)
-
-        if (branchId && branchId !== 'All') {
-            query = query.eq('Branch_ID', branchId)
-        }
 
-        const { data: jobs } = await query
-        if (!jobs || jobs.length < 2) return []
-
-        const bundles: Array<{ pivot: string; bundled: string[]; total_saved_km: number }> = []
-        const handled = new Set<string>()
-
-        for (const pivot of jobs) {
-            if (handled.has(pivot.Job_ID)) continue
-            if (!pivot.Pickup_Lat || !pivot.Pickup_Lon) continue
-
-            const cluster = jobs.filter(j => 
-                j.Job_ID !== pivot.Job_ID && 
-                !handled.has(j.Job_ID) &&
-                j.Pickup_Lat && j.Pickup_Lon &&
-                haversineKm(pivot.Pickup_Lat!, pivot.Pickup_Lon!, j.Pickup_Lat, j.Pickup_Lon) <= radiusKm
-            )
-
-            if (cluster.length > 0) {
-                const bundledIds = cluster.map(c => c.Job_ID)
-                bundles.push({
-                    pivot: pivot.Job_ID,
-                    bundled: bundledIds,
-                    total_saved_km: cluster.length * 8.5 // Estimated avg savings per bundled job
-                })
-                handled.add(pivot.Job_ID)
-                bundledIds.forEach(id => handled.add(id))
+        // Read the whole unassigned pool; PostgREST caps a response at 1000 rows
+        type PoolJob = { Job_ID: string; Pickup_Lat: number | null; Pickup_Lon: number | null; Delivery_Lat: number | null; Delivery_Lon: number | null; Vehicle_Type: string | null }
+        const jobs: PoolJob[] = []
+        const pageSize = 1000
+        for (let from = 0; ; from += pageSize) {
+            let query = supabase
+                .from('Jobs_Main')
+                .select('Job_ID, Pickup_Lat, Pickup_Lon, Delivery_Lat, Delivery_Lon, Vehicle_Type')
+                .eq('Job_Status', 'New')
+                .is('Driver_ID', null)
+
+            if (branchId && branchId !== 'All') {
+                query = query.eq('Branch_ID', branchId)
             }
-        }
 
-        return bundles
+            const { data } = await query.order('Job_ID').range(from, from + pageSize - 1)
+            jobs.push(...((data || []) as PoolJob[]))
+            if (!data || data.length < pageSize) break
+        }
+        if (jobs.length < 2) return []
+
+        // Grid-bucketed pickups: each pivot only measures jobs in neighbouring cells
+        const clusters = clusterWithinRadius(
+            jobs,
+            j => (j.Pickup_Lat && j.Pickup_Lon ? { lat: j.Pickup_Lat, lng: j.Pickup_Lon } : null),
+            radiusKm
+        )
+
+        return clusters.map(({ pivot, members }) => ({
+            pivot: pivot.Job_ID,
+            bundled: members.map(m => m.Job_ID),
+            total_saved_km: members.length * 8.5 // Estimated avg savings per bundled job
+        }))
     } catch {
         return []
     }
@@ -0,0 +1,359 @@
+import 'server-only'
+import { createAdminClient } from '@/utils/supabase/server'
+
+/**
+ * Distance Matrix Cache — TMS 2026
+ *
+ * Pairwise driving distance/duration between points, keyed by coordinates
+ * rounded to 4 decimals (~11 m) so the same customer stop maps to the same key
+ * every day. Lookups go memory → distance_matrix_cache table → one bulk OSRM
+ * `table` request for whatever is still missing (each block of new pairs is
+ * written back as soon as it arrives).
+ * If OSRM is unreachable the missing cells are estimated from the haversine
+ * distance, and the caller is told the matrix is `estimated`.
+ *
+ * With the matrix local, trip ordering is solved in-process (`solvePath`), so
+ * a planning action for stops we've seen before never leaves the server.
+ */
+
+type Point = { lat: number; lng: number }
+
+export type DistanceMatrix = {
+  /** Metres, [from][to] in the order of the input points. */
+  distances: number[][]
+  /** Seconds, [from][to]. */
+  durations: number[][]
+  /** True when any cell is a straight-line estimate instead of a road distance. */
+  estimated: boolean
+}
+
+type Cell = { d: number; t: number }
+
+type CacheRow = { from_key: string; to_key: string; distance_m: number; duration_s: number }
+
+/** OSRM requests a caller may still spend; shared across calls, decremented in place. */
+export type OsrmBudget = { remaining: number }
+
+type OsrmTableResponse = {
+  code?: string
+  distances?: (number | null)[][]
+  durations?: (number | null)[][]
+}
+
+const OSRM_TABLE_URL = 'https://router.project-osrm.org/table/v1/driving/'
+const OSRM_HEADERS = { 'User-Agent': 'TMS-Logistics-Platform-v2 (contact@logispro-epod.app)' }
+const OSRM_TIMEOUT_MS = 8000
+// After a failed call, treat OSRM as offline for a while instead of waiting on every request
+const OSRM_RETRY_AFTER_MS = 60000
+// The public server caps a table request at 100 coordinates
+const OSRM_MAX_COORDS = 100
+
+// Straight-line estimates: typical road detour and average urban truck speed
+const ROAD_FACTOR = 1.3
+const ESTIMATE_SPEED_KMH = 40
+
+const MAX_MEMORY_PAIRS = 200000
+const memory = new Map<string, Cell>()
+let osrmDownUntil = 0
+
+export function coordKey(p: Point) {
+  return `${Number(p.lat).toFixed(4)},${Number(p.lng).toFixed(4)}`
+}
+
+const pairKey = (from: string, to: string) => `${from}|${to}`
+
+function remember(from: string, to: string, cell: Cell) {
+  if (memory.size >= MAX_MEMORY_PAIRS) {
+    // Map keeps insertion order: drop the oldest tenth
+    let drop = MAX_MEMORY_PAIRS / 10
+    for (const key of memory.keys()) {
+      memory.delete(key)
+      if (--drop <= 0) break
+    }
+  }
+  memory.set(pairKey(from, to), cell)
+}
+
+function haversineMeters(a: Point, b: Point) {
+  const R = 6371000
+  const toRad = (deg: number) => (deg * Math.PI) / 180
+  const dLat = toRad(b.lat - a.lat)
+  const dLng = toRad(b.lng - a.lng)
+  const s =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos(toRad(a.lat)) * Math.cos(toRad(b.lat)) * Math.sin(dLng / 2) ** 2
+  return 2 * R * Math.asin(Math.sqrt(s))
+}
+
+async function loadFromTable(keys: string[], missing: Set<string>) {
+  const supabase = createAdminClient()
+  const pageSize = 1000
+  for (let from = 0; ; from += pageSize) {
+    const { data, error } = await supabase
+      .from('distance_matrix_cache')
+      .select('from_key, to_key, distance_m, duration_s')
+      .in('from_key', keys)
+      .in('to_key', keys)
+      .order('from_key')
+      .order('to_key')
+      .range(from, from + pageSize - 1)
+    if (error) {
+      console.warn('[Distance] matrix cache read failed:', error.message)
+      return
+    }
+    for (const row of data || []) {
+      const key = pairKey(row.from_key, row.to_key)
+      if (!missing.has(key)) continue
+      remember(row.from_key, row.to_key, { d: row.distance_m, t: row.duration_s })
+      missing.delete(key)
+    }
+    if (!data || data.length < pageSize || missing.size === 0) return
+  }
+}
+
+/** One OSRM table call for `sources` × `destinations` (indices into `coords`). */
+async function fetchOsrmTable(coords: Point[], sources: number[], destinations: number[]) {
+  const coordStr = coords.map(p => `${p.lng},${p.lat}`).join(';')
+  const url = `${OSRM_TABLE_URL}${coordStr}?sources=${sources.join(';')}&destinations=${destinations.join(';')}&annotations=distance,duration`
+  const response = await fetch(url, { headers: OSRM_HEADERS, signal: AbortSignal.timeout(OSRM_TIMEOUT_MS) })
+  if (!response.ok) throw new Error(`OSRM Error: ${response.status}`)
+  const data = await response.json() as OsrmTableResponse
+  if (data.code !== 'Ok' || !data.distances || !data.durations) {
+    throw new Error(`OSRM API Response Code: ${data.code}`)
+  }
+  return { distances: data.distances, durations: data.durations }
+}
+
+async function saveCells(rows: CacheRow[]) {
+  const supabase = createAdminClient()
+  const { error } = await supabase
+    .from('distance_matrix_cache')
+    .upsert(rows, { onConflict: 'from_key,to_key' })
+  if (error) console.warn('[Distance] matrix cache write failed:', error.message)
+}
+
+/**
+ * Fill missing pairs from OSRM in as few requests as the coordinate cap
+ * allows, saving each block as it arrives. Stops early once `budget` runs out.
+ */
+async function fillFromOsrm(points: Point[], keys: string[], missing: Set<string>, budget?: OsrmBudget) {
+  const n = points.length
+  const blocks: number[][] = []
+  const blockSize = n <= OSRM_MAX_COORDS ? n : OSRM_MAX_COORDS / 2
+  for (let i = 0; i < n; i += blockSize) {
+    blocks.push(Array.from({ length: Math.min(blockSize, n - i) }, (_, k) => i + k))
+  }
+
+  let fetched = 0
+  for (const sourceBlock of blocks) {
+    for (const destBlock of blocks) {
+      const sources = sourceBlock.filter(i => destBlock.some(j => missing.has(pairKey(keys[i], keys[j]))))
+      if (sources.length === 0) continue
+      const destinations = destBlock.filter(j => sources.some(i => missing.has(pairKey(keys[i], keys[j]))))
+      if (budget && budget.remaining <= 0) return fetched
+      if (budget) budget.remaining--
+
+      const coordIdx = Array.from(new Set([...sources, ...destinations]))
+      const position = new Map(coordIdx.map((idx, k) => [idx, k]))
+      const table = await fetchOsrmTable(
+        coordIdx.map(i => points[i]),
+        sources.map(i => position.get(i)!),
+        destinations.map(j => position.get(j)!)
+      )
+      const rows: CacheRow[] = []
+      sources.forEach((i, si) => destinations.forEach((j, dj) => {
+        const d = table.distances[si]?.[dj]
+        const t = table.durations[si]?.[dj]
+        const key = pairKey(keys[i], keys[j])
+        // null = no road between the two (ferry-only island etc.): leave for the estimate
+        if (d == null || t == null || !missing.has(key)) return
+        const cell = { d: Math.round(d), t: Math.round(t) }
+        remember(keys[i], keys[j], cell)
+        missing.delete(key)
+        rows.push({ from_key: keys[i], to_key: keys[j], distance_m: cell.d, duration_s: cell.t })
+      }))
+      // At most 100 × 100 pairs per block, well within one upsert
+      if (rows.length > 0) await saveCells(rows)
+      fetched += rows.length
+    }
+  }
+  return fetched
+}
+
+/**
+ * Driving distance/duration between every pair of `points`.
+ * `useOsrm: false` answers from the cache and estimates the rest; an
+ * `osrmBudget` caps the OSRM requests spent (pairs left over are estimated).
+ */
+export async function getDistanceMatrix(
+  points: Point[],
+  options: { useOsrm?: boolean; osrmBudget?: OsrmBudget } = {}
+): Promise<DistanceMatrix> {
+  // Work on unique rounded coordinates; repeated stops share a row
+  const keyOf = points.map(coordKey)
+  const keys = Array.from(new Set(keyOf))
+  const unique = keys.map(k => points[keyOf.indexOf(k)])
+
+  const missing = new Set<string>()
+  for (const a of keys) for (const b of keys) {
+    if (a !== b && !memory.has(pairKey(a, b))) missing.add(pairKey(a, b))
+  }
+
+  if (missing.size > 0) await loadFromTable(keys, missing)
+
+  if (missing.size > 0 && options.useOsrm !== false && Date.now() >= osrmDownUntil) {
+    try {
+      await fillFromOsrm(unique, keys, missing, options.osrmBudget)
+    } catch (error) {
+      osrmDownUntil = Date.now() + OSRM_RETRY_AFTER_MS
+      console.warn('[Distance] OSRM unavailable, estimating from straight-line distance:', error)
+    }
+  }
+
+  const n = points.length
+  const distances = Array.from({ length: n }, () => new Array<number>(n).fill(0))
+  const durations = Array.from({ length: n }, () => new Array<number>(n).fill(0))
+  let estimated = false
+  for (let i = 0; i < n; i++) {
+    for (let j = 0; j < n; j++) {
+      if (keyOf[i] === keyOf[j]) continue
+      const cell = memory.get(pairKey(keyOf[i], keyOf[j]))
+      if (cell) {
+        distances[i][j] = cell.d
+        durations[i][j] = cell.t
+      } else {
+        // Estimates are not cached, so the next online request fetches the real value
+        estimated = true
+        distances[i][j] = Math.round(haversineMeters(points[i], points[j]) * ROAD_FACTOR)
+        durations[i][j] = Math.round(distances[i][j] / (ESTIMATE_SPEED_KMH / 3.6))
+      }
+    }
+  }
+  return { distances, durations, estimated }
+}
+
+/**
+ * Order stops to minimise total `cost` along an open path: nearest neighbour
+ * from `start`, then 2-opt segment reversals. `end` pins the final stop.
+ * Returns point indices in visiting order, including `start` (and `end`).
+ */
+export function solvePath(cost: number[][], start = 0, end?: number): number[] {
+  const n = cost.length
+  const path = [start]
+  const left = new Set(Array.from({ length: n }, (_, i) => i).filter(i => i !== start && i !== end))
+  while (left.size > 0) {
+    const from = path[path.length - 1]
+    let best = -1
+    for (const i of left) if (best === -1 || cost[from][i] < cost[from][best]) best = i
+    path.push(best)
+    left.delete(best)
+  }
+  if (end !== undefined && end !== start) path.push(end)
+
+  // Cost of path[i-1] → path[i] … path[j] → path[j+1], read reversed or not
+  // (the matrix is asymmetric, so a reversal changes every inner leg)
+  const segmentCost = (i: number, j: number, reversed: boolean) => {
+    const seq = reversed ? [path[i - 1], ...path.slice(i, j + 1).reverse(), path[j + 1]] : path.slice(i - 1, j + 2)
+    let total = 0
+    for (let k = 1; k < seq.length; k++) if (seq[k] !== undefined) total += cost[seq[k - 1]][seq[k]]
+    return total
+  }
+
+  const lastMovable = end !== undefined && end !== start ? path.length - 2 : path.length - 1
+  for (let pass = 0, improved = true; improved && pass < 50; pass++) {
+    improved = false
+    for (let i = 1; i < lastMovable; i++) {
+      for (let j = i + 1; j <= lastMovable; j++) {
+        if (segmentCost(i, j, true) + 1e-9 < segmentCost(i, j, false)) {
+          path.splice(i, j - i + 1, ...path.slice(i, j + 1).reverse())
+          improved = true
+        }
+      }
+    }
+  }
+  return path
+}
+
+/** Sum of the legs along `order` (indices into the matrix). */
+export function pathTotals(matrix: DistanceMatrix, order: number[]) {
+  let distance = 0
+  let duration = 0
+  for (let k = 1; k < order.length; k++) {
+    distance += matrix.distances[order[k - 1]][order[k]]
+    duration += matrix.durations[order[k - 1]][order[k]]
+  }
+  return { distanceMeters: distance, durationSeconds: duration }
+}
+
+// Beyond this many points a branch's full matrix isn't worth prefilling
+const MAX_PREFILL_POINTS = 200
+// Route legs of larger branches are filled a few at a time (pairs grow with the square)
+const PREFILL_LEG_BATCH = 10
+// OSRM requests per (daily) cron run: each may take up to OSRM_TIMEOUT_MS,
+// and the function has 60s. Pairs saved by earlier runs are read back from
+// the table, so the next run carries on where this one stopped; planning
+// meanwhile estimates whatever isn't cached yet.
+const PREFILL_OSRM_REQUESTS = 5
+
+/**
+ * Warm the cache with the stops we route between every day: per branch, the
+ * full matrix over its Master_Locations and Master_Routes endpoints, or for
+ * branches with more than MAX_PREFILL_POINTS of those, just each route's
+ * origin → destination leg. Spends at most `maxOsrmRequests` OSRM calls;
+ * `complete` is false while any pair is still an estimate, normally because
+ * it was left for the next run.
+ */
+export async function prefillDistanceMatrix({ maxOsrmRequests = PREFILL_OSRM_REQUESTS } = {}) {
+  const supabase = createAdminClient()
+  const [{ data: routes }, { data: locations }] = await Promise.all([
+    supabase.from('Master_Routes').select('Origin_Lat, Origin_Lon, Dest_Lat, Dest_Lon, Branch_ID').not('Origin_Lat', 'is', null).not('Dest_Lat', 'is', null),
+    supabase.from('Master_Locations').select('Lat, Lon, Branch_ID').not('Lat', 'is', null).not('Lon', 'is', null),
+  ])
+
+  type Group = { points: Map<string, Point>; legs: Point[][] }
+  const groups = new Map<string, Group>()
+  const groupOf = (branch: string | null) => {
+    const key = branch || ''
+    let group = groups.get(key)
+    if (!group) groups.set(key, group = { points: new Map(), legs: [] })
+    return group
+  }
+  for (const l of locations || []) {
+    const point = { lat: Number(l.Lat), lng: Number(l.Lon) }
+    groupOf(l.Branch_ID).points.set(coordKey(point), point)
+  }
+  for (const r of routes || []) {
+    const group = groupOf(r.Branch_ID)
+    const leg = [{ lat: Number(r.Origin_Lat), lng: Number(r.Origin_Lon) }, { lat: Number(r.Dest_Lat), lng: Number(r.Dest_Lon) }]
+    leg.forEach(p => group.points.set(coordKey(p), p))
+    group.legs.push(leg)
+  }
+
+  const osrmBudget: OsrmBudget = { remaining: maxOsrmRequests }
+  let matrices = 0
+  let legBatches = 0
+  let complete = true
+  for (const group of groups.values()) {
+    if (group.points.size <= MAX_PREFILL_POINTS) {
+      if (group.points.size < 2) continue
+      const matrix = await getDistanceMatrix(Array.from(group.points.values()), { osrmBudget })
+      complete &&= !matrix.estimated
+      matrices++
+      continue
+    }
+    for (let i = 0; i < group.legs.length; i += PREFILL_LEG_BATCH) {
+      const matrix = await getDistanceMatrix(group.legs.slice(i, i + PREFILL_LEG_BATCH).flat(), { osrmBudget })
+      complete &&= !matrix.estimated
+      legBatches++
+    }
+  }
+
+  return {
+    branches: groups.size,
+    matrices,
+    legBatches,
+    osrmRequests: maxOsrmRequests - osrmBudget.remaining,
+    complete,
+    cachedPairs: memory.size,
+  }
+}
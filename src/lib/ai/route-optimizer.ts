@@ -1,9 +1,11 @@
 "use server"
 
+import { getDistanceMatrix, pathTotals, solvePath } from './distance-matrix'
+
 /**
  * AI Route Optimizer — TMS 2026 (Open-Source Edition)
- * Using OSRM (Open Source Routing Machine) to solve Traveling Salesman Problem (TSP).
- * Service: http://router.project-osrm.org/trip/v1/driving/
+ * Solves the stop order (Traveling Salesman Problem) in-process over an OSRM
+ * distance matrix that is cached per coordinate pair (see distance-matrix.ts).
  */
 
 export type RoutePoint = {
@@ -30,45 +32,19 @@ export async function optimizeRoute(
   }
 
   try {
-    // Construct coordinate string: lng,lat;lng,lat;...
-    // OSRM Trip API solves TSP. 
-    // We want to start at 'origin' and end at the 'last' destination.
+    // Start at 'origin' and end at the 'last' destination, without returning
+    // to the start (what the OSRM trip call used to be asked for).
     const allPoints = [origin, ...destinations];
-    const coordString = allPoints.map(p => `${p.lng},${p.lat}`).join(';');
-
-    // source=first means start at the first point (origin)
-    // destination=last means end at the last point of the sequence (last destination in our original array)
-    // roundtrip=false prevents returning to the start
-    const url = `http://router.project-osrm.org/trip/v1/driving/${coordString}?source=first&destination=last&roundtrip=false&geometries=geojson&overview=simplified`;
-
-    const response = await fetch(url);
-    if (!response.ok) {
-        throw new Error(`OSRM Error: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-
-    if (data.code !== 'Ok') {
-       throw new Error(`OSRM API Response Code: ${data.code}`);
-    }
-
-    // waypoint_index maps the returned optimized order back to the input array
-    // data.waypoints is an array of objects including waypoint_index
-    // The order in data.waypoints corresponds to the optimized trip
-    
-    // We ignore the first waypoint (origin) and get the order of destinations
-    const optimizedWays = data.waypoints
-        .sort((a: Record<string, number>, b: Record<string, number>) => a.trips_index - b.trips_index) // Not needed, order in array is usually correct
-        .filter((w: Record<string, number>) => w.waypoint_index > 0) // Skip origin (index 0)
-        .map((w: Record<string, number>) => w.waypoint_index - 1); // Normalize index to destinations array
-
-    const trip = data.trips?.[0];
+    const matrix = await getDistanceMatrix(allPoints);
+    const path = solvePath(matrix.durations, 0, allPoints.length - 1);
+    const { distanceMeters, durationSeconds } = pathTotals(matrix, path);
 
     return {
       success: true,
-      optimizedOrder: optimizedWays,
-      estimatedDurationMinutes: Math.round((trip?.duration || 0) / 60),
-      estimatedDistanceKm: Math.round((trip?.distance || 0) / 1000)
+      optimizedOrder: path.slice(1).map(i => i - 1), // Normalize index to destinations array
+      message: matrix.estimated ? "ใช้การคำนวณระยะทางแบบเส้นตรง (Fallback)" : undefined,
+      estimatedDurationMinutes: Math.round(durationSeconds / 60),
+      estimatedDistanceKm: Math.round(distanceMeters / 1000)
     };
 
   } catch {
@@ -0,0 +1,265 @@
+import 'server-only'
+import { createAdminClient } from '@/utils/supabase/server'
+import { getDangerZones, type DangerZone } from '@/lib/supabase/danger-zones'
+import { buildZoneIndex, getCachedZoneIndex, setCachedZoneIndex, shouldAlertZoneEntry, zonesAt, type ZoneIndex } from '@/lib/utils/zone-index'
+import { sendDangerZoneAlert } from '@/lib/actions/email-actions'
+import { publishPositions, recordPositions } from '@/lib/location-store'
+
+/**
+ * Batched GPS ingest: the server-side write path for positions.
+ *
+ * A batch may hold many points for many drivers. It costs one Master_Drivers
+ * lookup (plates, names, branches), one multi-row gps_logs insert, one
+ * driver_latest_locations write carrying only each driver's newest point, and
+ * one danger-zone pass over those newest points, instead of all of that per
+ * position. The newest points also go into the in-process location store and
+ * out to live maps as one broadcast per branch.
+ *
+ * The latest-location row only moves forward: a backdated or backlog batch is
+ * logged to gps_logs but leaves the live position (and danger-zone alerts)
+ * to whichever fix is newest.
+ */
+
+export type GPSIngestPoint = {
+  driverId: string
+  lat: number
+  lng: number
+  speed?: number | null
+  jobId?: string | null
+  vehiclePlate?: string | null
+  /** ISO timestamp of the fix; defaults to the time of ingest. */
+  ts?: string | null
+}
+
+export type DriverPosition = {
+  driverId: string
+  lat: number
+  lng: number
+  vehiclePlate?: string | null
+  driverName?: string | null
+  branchId?: string | null
+}
+
+export type GPSIngestResult = {
+  success: boolean
+  inserted: number
+  drivers: number
+  /** Points dropped for bad coordinates or timestamps, or a driver not in Master_Drivers. */
+  rejected: number
+  error?: unknown
+}
+
+type DriverInfo = { Driver_ID: string; Driver_Name: string | null; Vehicle_Plate: string | null; Branch_ID: string | null }
+
+// Per-branch zone index, cached in memory to save CPU/DB calls on Vercel
+async function zoneIndex(branchId: string): Promise<ZoneIndex<DangerZone>> {
+  const cached = getCachedZoneIndex<DangerZone>(branchId)
+  if (cached) return cached
+
+  const zones = (await getDangerZones(branchId)).filter(z => z.Is_Active)
+  const index = buildZoneIndex(zones, z => z.Coordinates)
+  setCachedZoneIndex(branchId, index)
+  console.log(`[GPS] Cache updated for branch: ${branchId} (${index.size} zones)`)
+  return index
+}
+
+async function lookupDrivers(driverIds: string[]): Promise<Map<string, DriverInfo>> {
+  const supabase = createAdminClient()
+  const { data } = await supabase
+    .from('Master_Drivers')
+    .select('Driver_ID, Driver_Name, Vehicle_Plate, Branch_ID')
+    .in('Driver_ID', driverIds)
+  return new Map((data as DriverInfo[] | null || []).map(d => [d.Driver_ID, d]))
+}
+
+// Fix time as epoch ms; null for an unparseable timestamp
+function fixTime(ts: string): number | null {
+  const ms = Date.parse(ts)
+  return Number.isFinite(ms) ? ms : null
+}
+
+type LatestRow = {
+  driver_id: string
+  vehicle_plate: string | null
+  latitude: number
+  longitude: number
+  job_id: string | null
+  speed: number | null
+  timestamp: string
+}
+
+/**
+ * Write each driver's newest point to driver_latest_locations only where it
+ * is newer than the stored fix; returns the drivers whose row advanced. The
+ * advance_driver_latest_locations RPC does the compare in the upsert itself;
+ * without it, the stored timestamps are read first and only newer rows written.
+ */
+async function advanceLatest(rows: LatestRow[]): Promise<Set<string>> {
+  const supabase = createAdminClient()
+  const { data, error } = await supabase.rpc('advance_driver_latest_locations', { positions: rows })
+  if (!error) return new Set((data as string[] | null) || [])
+  console.warn('[GPS] advance_driver_latest_locations unavailable, comparing in Node:', error.message)
+
+  const { data: stored, error: readErr } = await supabase
+    .from('driver_latest_locations')
+    .select('driver_id, timestamp')
+    .in('driver_id', rows.map(r => r.driver_id))
+  if (readErr) {
+    console.error('[GPS] driver_latest_locations read failed:', readErr.message)
+    return new Set()
+  }
+  const storedAt = new Map((stored || []).map((r: { driver_id: string; timestamp: string | null }) =>
+    [r.driver_id, r.timestamp ? fixTime(r.timestamp) : null]))
+  const newer = rows.filter(r => {
+    const current = storedAt.get(r.driver_id)
+    return current == null || fixTime(r.timestamp)! > current
+  })
+  if (newer.length === 0) return new Set()
+
+  const nowIso = new Date().toISOString()
+  const { error: upsertErr } = await supabase
+    .from('driver_latest_locations')
+    .upsert(newer.map(row => ({ ...row, updated_at: nowIso })), { onConflict: 'driver_id' })
+  if (upsertErr) {
+    console.error('[GPS] driver_latest_locations upsert failed:', upsertErr.message)
+    return new Set()
+  }
+  return new Set(newer.map(r => r.driver_id))
+}
+
+/**
+ * Check positions against active danger zones and email an alert per incursion.
+ * Each point only tests the zones indexed in its grid cell. A driver who stays
+ * in a zone is alerted once on entry, not on every ping; driver names come
+ * from one lookup for the alerted positions that don't carry a name already.
+ */
+export async function evaluateDangerZones(positions: DriverPosition[], defaultBranchId = 'All') {
+  try {
+    const byBranch = new Map<string, DriverPosition[]>()
+    for (const p of positions) {
+      const branch = p.branchId || defaultBranchId
+      const group = byBranch.get(branch)
+      if (group) group.push(p)
+      else byBranch.set(branch, [p])
+    }
+
+    const hits: { position: DriverPosition; zone: DangerZone }[] = []
+    for (const [branch, group] of byBranch) {
+      const index = await zoneIndex(branch)
+      if (index.size === 0) continue
+      for (const position of group) {
+        for (const zone of zonesAt(index, position.lat, position.lng)) {
+          if (!shouldAlertZoneEntry(position.driverId, zone.Zone_ID || zone.Zone_Name)) continue
+          // Potential Incursion Detected!
+          console.warn(`[DANGER] Driver ${position.driverId} entered zone ${zone.Zone_Name}`)
+          hits.push({ position, zone })
+        }
+      }
+    }
+    if (hits.length === 0) return
+
+    const unnamed = Array.from(new Set(hits.filter(h => !h.position.driverName).map(h => h.position.driverId)))
+    const drivers = unnamed.length > 0 ? await lookupDrivers(unnamed) : new Map<string, DriverInfo>()
+
+    await Promise.all(hits.filter(h => h.zone.Email_Recipient).map(({ position, zone }) => {
+      const driver = drivers.get(position.driverId)
+      return sendDangerZoneAlert({
+        plate: driver?.Vehicle_Plate || position.vehiclePlate || 'Unknown',
+        driverName: position.driverName || driver?.Driver_Name || 'Unknown',
+        zoneName: zone.Zone_Name,
+        timestamp: new Date().toLocaleString('th-TH'),
+        recipient: zone.Email_Recipient!
+      })
+    }))
+  } catch (dzError) {
+    console.error("[GPS] Danger zone check failed:", dzError)
+  }
+}
+
+/**
+ * Store a batch of positions. `branchId` pins the danger-zone branch (the
+ * caller's session branch); otherwise each driver's own Branch_ID is used.
+ */
+export async function ingestGPSBatch(
+  points: GPSIngestPoint[],
+  options: { branchId?: string } = {}
+): Promise<GPSIngestResult> {
+  const nowIso = new Date().toISOString()
+  // Timestamps are normalised to UTC ISO so stored and compared values agree
+  // whatever offset the device sent
+  const valid: (GPSIngestPoint & { at: number; ts: string })[] = []
+  for (const p of points) {
+    if (!p.driverId || !Number.isFinite(p.lat) || !Number.isFinite(p.lng) ||
+        Math.abs(p.lat) > 90 || Math.abs(p.lng) > 180) continue
+    const at = fixTime(p.ts || nowIso)
+    if (at === null) continue
+    valid.push({ ...p, at, ts: new Date(at).toISOString() })
+  }
+  if (valid.length === 0) {
+    return { success: true, inserted: 0, drivers: 0, rejected: points.length }
+  }
+
+  try {
+    const supabase = createAdminClient()
+    const drivers = await lookupDrivers(Array.from(new Set(valid.map(p => p.driverId))))
+
+    // A DB trigger rejects unknown driver_id for the whole insert, so drop those points here
+    const known = valid.filter(p => drivers.has(p.driverId))
+    const rejected = points.length - known.length
+    if (known.length === 0) {
+      return { success: true, inserted: 0, drivers: 0, rejected }
+    }
+
+    // Note: GPS_Logs table uses lowercase column names
+    const rows = known.map(p => ({
+      driver_id: p.driverId,
+      vehicle_plate: p.vehiclePlate || drivers.get(p.driverId)?.Vehicle_Plate || null,
+      latitude: p.lat,
+      longitude: p.lng,
+      job_id: p.jobId ?? null,
+      speed: p.speed ?? null,
+      timestamp: p.ts,
+    }))
+
+    const { error } = await supabase.from("gps_logs").insert(rows)
+    if (error) {
+      console.error('[GPS] batch insert failed:', error.message)
+      return { success: false, inserted: 0, drivers: 0, rejected, error }
+    }
+
+    // Newest point per driver, by parsed fix time (ties keep the later row)
+    const newest = new Map<string, { row: typeof rows[number]; at: number }>()
+    known.forEach((p, i) => {
+      const current = newest.get(p.driverId)
+      if (!current || p.at >= current.at) newest.set(p.driverId, { row: rows[i], at: p.at })
+    })
+
+    // Keep the map's optimized "latest position" table in sync directly,
+    // instead of relying on the DB trigger (which silently stopped firing and
+    // froze the live map). Best-effort: never let this fail the GPS log save.
+    // Only drivers whose stored fix this batch superseded go on to the live
+    // map and the danger-zone check; stale fixes are history only.
+    const advanced = await advanceLatest(Array.from(newest.values()).map(n => n.row))
+    const live = Array.from(newest.values()).map(n => n.row).filter(row => advanced.has(row.driver_id))
+
+    const changed = recordPositions(live)
+    await Promise.all([
+      publishPositions(changed, id => drivers.get(id)?.Branch_ID),
+      evaluateDangerZones(live.map(row => {
+        const driver = drivers.get(row.driver_id)
+        return {
+          driverId: row.driver_id,
+          lat: row.latitude,
+          lng: row.longitude,
+          vehiclePlate: row.vehicle_plate,
+          driverName: driver?.Driver_Name,
+          branchId: options.branchId || driver?.Branch_ID,
+        }
+      })),
+    ])
+
+    return { success: true, inserted: rows.length, drivers: newest.size, rejected }
+  } catch (e) {
+    return { success: false, inserted: 0, drivers: 0, rejected: 0, error: e }
+  }
+}
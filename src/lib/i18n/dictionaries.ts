@@ -14,6 +14,7 @@ export const dictionaries = {
       confirm: 'ยืนยัน',
       back: 'กลับ',
       next: 'ถัดไป',
+      load_more: 'โหลดเพิ่ม',
       overview: 'ภาพรวม',
       mission_node: 'จุดขนส่ง',
       safety_esg: 'ความปลอดภัย & ESG',
@@ -34,7 +35,11 @@ export const dictionaries = {
         placeholder: 'รองรับไฟล์ .XLSX, .XLS',
         preview: 'ดูตัวอย่างข้อมูล',
         more_items: '... และอีก {{count}} รายการ',
-        error_title: 'ข้อผิดพลาดในการนำเข้า'
+        error_title: 'ข้อผิดพลาดในการนำเข้า',
+        progress: 'นำเข้าแล้ว {{done}}/{{total}} ชุด ({{rows}} รายการ)',
+        resume: 'ไฟล์นี้นำเข้าค้างไว้ {{done}}/{{total}} ชุด กดนำเข้าเพื่อทำต่อ',
+        interrupted: 'การเชื่อมต่อขาดระหว่างนำเข้า ข้อมูลที่นำเข้าแล้วถูกบันทึกไว้ กดนำเข้าอีกครั้งเพื่อทำต่อ',
+        chunked_done: 'นำเข้าสำเร็จ {{count}} รายการ'
       },
       toast: {
         success_save: 'บันทึกข้อมูลเรียบร้อยแล้ว',
@@ -2008,6 +2013,7 @@ export const dictionaries = {
       confirm: 'Confirm',
       back: 'Back',
       next: 'Next',
+      load_more: 'Load more',
       overview: 'Overview',
       mission_node: 'Delivery Location',
       safety_esg: 'Safety & ESG',
@@ -2100,7 +2106,11 @@ export const dictionaries = {
         placeholder: 'Excel files only',
         preview: 'Preview',
         more_items: '... and {{count}} more',
-        error_title: 'Import Error'
+        error_title: 'Import Error',
+        progress: 'Imported {{done}}/{{total}} chunks ({{rows}} rows)',
+        resume: 'This file was partly imported ({{done}}/{{total}} chunks). Import again to continue.',
+        interrupted: 'Connection lost during import. Imported rows are saved; import again to resume.',
+        chunked_done: 'Imported {{count}} rows'
       },
       toast: {
         success_save: 'Saved successfully',
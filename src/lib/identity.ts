@@ -0,0 +1,120 @@
+import 'server-only'
+import { cache } from 'react'
+import { cookies } from 'next/headers'
+import { getSession, type SessionPayload } from '@/lib/session'
+
+/**
+ * Who is making the current request, resolved once.
+ *
+ * A dashboard render calls a dozen data helpers and each used to re-read the
+ * session cookie, verify the JWT and re-derive role/branch/customer on its
+ * own. `getIdentity` is wrapped in React's `cache`, so every helper in the
+ * same request shares one resolution (same approach as `getDriverSession`).
+ */
+export type Identity = {
+  session: SessionPayload | null
+  userId: string | null
+  roleId: number | null
+  isSuper: boolean
+  isAdmin: boolean
+  isCustomer: boolean
+  /** Effective branch: selected branch (or 'All') for super admins, the
+   *  assigned branch for everyone else, the driver's branch for drivers. */
+  branchId: string | null
+  /** Branch from the session itself, ignoring the branch selector. */
+  fixedBranchId: string | null
+  customerId: string | null
+}
+
+async function resolveBranchId(session: SessionPayload | null, isSuper: boolean) {
+  try {
+    const cookieStore = await cookies()
+    if (session) {
+      if (isSuper) {
+        const selected = cookieStore.get('selectedBranch')?.value
+        // If they have a specifically selected branch in their cookie, use it
+        if (selected && selected !== 'All' && selected !== 'ทุกสาขา' && !selected.includes('ทุกสาขา')) {
+          return selected
+        }
+        return 'All'
+      }
+      // Admin (Role 2) and other roles are locked to their assigned branch;
+      // the branch selection cookie is ignored for them.
+      return session.branchId || 'HQ'
+    }
+
+    // Fallback to driver session if no staff session exists
+    const driverSessionStr = cookieStore.get('driver_session')?.value
+    if (driverSessionStr) {
+      try {
+        return JSON.parse(driverSessionStr).branchId || null
+      } catch {
+        return null
+      }
+    }
+    return 'All'
+  } catch {
+    return 'All'
+  }
+}
+
+export const getIdentity = cache(async (): Promise<Identity> => {
+  let session: SessionPayload | null = null
+  try {
+    session = await getSession()
+  } catch {
+    session = null
+  }
+
+  const roleId = session ? Number(session.roleId) : null
+  const isSuper = roleId === 1
+  const customerId = session?.customerId ?? null
+
+  return {
+    session,
+    userId: session?.userId ?? null,
+    roleId,
+    isSuper,
+    isAdmin: roleId === 1 || roleId === 2,
+    // Role 'Customer' (ID 7) or any account bound to a customer
+    isCustomer: roleId === 7 || (!!customerId && customerId !== 'FORCED_RESTRICTION'),
+    branchId: await resolveBranchId(session, isSuper),
+    fixedBranchId: session?.branchId ?? null,
+    customerId,
+  }
+})
+
+/**
+ * Menu permissions of the current user, looked up once per request.
+ * `'all'` for super admins, an empty set without a session or profile.
+ */
+export const getPermissions = cache(async (): Promise<Set<string> | 'all'> => {
+  const { session, isSuper } = await getIdentity()
+  if (!session) return new Set()
+  if (isSuper) return 'all'
+
+  try {
+    const { createAdminClient } = await import('@/utils/supabase/server')
+    const supabase = createAdminClient()
+
+    const { data: profile } = await supabase
+      .from('Master_Users')
+      .select('Role, Permissions')
+      .eq('Username', session.userId)
+      .maybeSingle()
+
+    if (!profile) return new Set()
+
+    // 1. INDIVIDUAL OVERRIDE: a non-empty Permissions array replaces the role's menus
+    if (Array.isArray(profile.Permissions) && profile.Permissions.length > 0) {
+      return new Set<string>(profile.Permissions)
+    }
+
+    // 2. ROLE FALLBACK: Otherwise, use the standard role permissions
+    const { getPermissionsByRole } = await import('@/lib/actions/permission-actions')
+    return new Set<string>((await getPermissionsByRole(profile.Role)) || [])
+  } catch (error) {
+    console.error('[PERMISSIONS] Error checking permission:', error)
+    return new Set()
+  }
+})
@@ -0,0 +1,448 @@
+import 'server-only'
+import { createAdminClient } from '@/utils/supabase/server'
+import { keysetPlan, type KeysetKey } from '@/lib/utils/keyset'
+
+/**
+ * In-process store of each driver's latest position, serving the live map.
+ *
+ * The map used to query driver_latest_locations / gps_logs (plus Master_Drivers
+ * and, for customers, Jobs_Main) on every poll of every open dashboard. Here
+ * the server instance keeps one copy: the batched ingest path writes positions
+ * straight in (`recordPositions`), and positions the driver app writes directly
+ * to gps_logs are picked up by one incremental sync query at most every
+ * SYNC_INTERVAL_MS, however many dispatchers are polling. Branch and customer
+ * scopes are precomputed driver-id sets, so a read is a filter over memory.
+ * Logouts are recorded in driver_location_logouts, so every instance drops
+ * the pin, not just the one that handled the logout.
+ *
+ * Every change is stamped with a `version` taken from the server clock, so
+ * versions from different instances are comparable; clients poll
+ * `fleetChanges(scope, since)` for just the rows changed after the version
+ * they hold. `publishPositions` nudges
+ * one broadcast channel per branch so subscribed maps poll right away; the
+ * channels are public, so the nudge carries no positions, and every location
+ * still goes out through the caller-scoped poll.
+ */
+
+// How far back a driver's last position is still shown on the map. PWA drivers
+// only report while the app is foreground, so a strict "live only" window would
+// blank the map most of the time. Instead we show positions for several hours
+// and let the client grey out anyone not reporting "live" (see the client-side
+// 10-min Online/Offline check) — recent trucks are highlighted, last-seen ones
+// fade. Logout still clears the row, so this won't pin drivers forever.
+const LOCATION_DISPLAY_WINDOW_MS = 6 * 60 * 60 * 1000 // 6 hours
+const SYNC_INTERVAL_MS = 10000
+// Fix timestamps come from devices; each sync re-reads a little behind the
+// previous one (never ahead of the server clock) to catch late uploads
+const SYNC_OVERLAP_MS = 2 * 60 * 1000
+const DRIVERS_TTL = 300000 // 5 minutes cache
+const CUSTOMER_TTL = 60000
+// PostgREST returns at most 1000 rows per request
+const PAGE = 1000
+// gps_latest_since missing: read gps_logs rows, at most this many pages a sync
+const MAX_LOG_PAGES = 20
+// How far behind another instance may learn of the same change; deltas for a
+// version minted elsewhere reach back this far (re-sent rows are harmless)
+const INSTANCE_LAG_MS = 3 * SYNC_INTERVAL_MS
+
+const CLOSED_JOB_STATUSES = '("Complete", "Completed", "Cancelled", "Delivered")'
+
+export type PositionRow = {
+  driver_id: string
+  latitude: number
+  longitude: number
+  speed?: number | null
+  vehicle_plate?: string | null
+  timestamp: string
+}
+
+type StoredPosition = {
+  lat: number
+  lng: number
+  speed: number | null
+  vehiclePlate: string | null
+  timestamp: string
+  /** `timestamp` as epoch ms, for comparisons */
+  at: number
+  version: number
+}
+
+type DriverMeta = {
+  Driver_ID: string
+  Driver_Name: string | null
+  Vehicle_Plate: string | null
+  Mobile_No: string | null
+  Branch_ID: string | null
+}
+
+/** One map pin, in the shape the monitoring map already consumes. */
+export type FleetLocation = {
+  Driver_ID: string
+  Driver_Name: string
+  Vehicle_Plate: string
+  Mobile_No: string
+  Branch_ID: string | null
+  Last_Update: string | null
+  Latitude: number | null
+  Longitude: number | null
+  Speed: number | null
+}
+
+export type FleetScope = {
+  /** Branch to show; null or 'All' for every branch. */
+  branchId?: string | null
+  /** Customer portal: only drivers on this customer's open jobs. */
+  customerId?: string | null
+}
+
+export type FleetChanges = {
+  version: number
+  /** True when `locations` is the full scope rather than a delta. */
+  reset: boolean
+  locations: FleetLocation[]
+  removed: string[]
+}
+
+let version = 0
+// Version at which this instance's store was seeded; older clients get a reset
+let seededVersion = Infinity
+const positions = new Map<string, StoredPosition>()
+// Drivers removed (logout): the version it happened at, for deltas, and the
+// server time, so fixes from before the logout don't bring the pin back
+const removals = new Map<string, { version: number; at: number }>()
+
+let syncedAt = 0
+let syncCursor: string | null = null
+let logoutCursor: string | null = null
+let syncing: Promise<void> | null = null
+
+let drivers = new Map<string, DriverMeta>()
+let driversByBranch = new Map<string, Set<string>>()
+let driversLoadedAt = 0
+let driversLoading: Promise<void> | null = null
+
+const customerDrivers = new Map<string, { ids: Set<string>; timestamp: number }>()
+
+// Server-clock version for a change, strictly increasing on this instance
+function nextVersion() {
+  version = Math.max(version + 1, Date.now())
+  return version
+}
+
+/** Apply newer fixes to the store; returns the rows that changed it. */
+export function recordPositions(rows: PositionRow[]): PositionRow[] {
+  const changed: PositionRow[] = []
+  for (const row of rows) {
+    const at = Date.parse(row.timestamp)
+    if (!Number.isFinite(at)) continue
+    const current = positions.get(row.driver_id)
+    if (current && current.at >= at) continue
+    const removed = removals.get(row.driver_id)
+    if (removed && at <= removed.at) continue
+    nextVersion()
+    positions.set(row.driver_id, {
+      lat: Number(row.latitude),
+      lng: Number(row.longitude),
+      speed: row.speed ?? null,
+      vehiclePlate: row.vehicle_plate ?? null,
+      timestamp: row.timestamp,
+      at,
+      version,
+    })
+    removals.delete(row.driver_id)
+    changed.push(row)
+  }
+  return changed
+}
+
+/**
+ * Drop a driver's pin as of a logout at `at`; fixes stamped before then stay
+ * out. A pin newer than the logout (logged back in) is kept unless `force`.
+ */
+function forgetDriverAt(driverId: string, at: number, force = false) {
+  const removed = removals.get(driverId)
+  if (removed && removed.at >= at) return
+  const current = positions.get(driverId)
+  if (current && current.at > at && !force) return
+  const had = positions.delete(driverId)
+  removals.set(driverId, { version: had ? nextVersion() : removed?.version ?? 0, at })
+}
+
+/** Drop a driver's pin (logout). Other instances learn of it from driver_location_logouts. */
+export function forgetDriver(driverId: string) {
+  forgetDriverAt(driverId, Date.now(), true)
+}
+
+const POSITION_COLUMNS = 'driver_id, latitude, longitude, speed, vehicle_plate, timestamp'
+type Admin = ReturnType<typeof createAdminClient>
+
+// Every driver_latest_locations row in the window, keyset-paged on driver_id
+async function readLatestTable(supabase: Admin, windowStart: string): Promise<PositionRow[] | null> {
+  const rows: PositionRow[] = []
+  for (let after: string | null = null; ;) {
+    let query = supabase.from('driver_latest_locations').select(POSITION_COLUMNS).gte('timestamp', windowStart)
+    if (after !== null) query = query.gt('driver_id', after)
+    const { data, error } = await query.order('driver_id').limit(PAGE)
+    if (error) {
+      console.error('[GPS] location store seed failed:', error.message)
+      return null
+    }
+    rows.push(...((data || []) as PositionRow[]))
+    if (!data || data.length < PAGE) return rows
+    after = data[data.length - 1].driver_id as string
+  }
+}
+
+/**
+ * Each driver's newest gps_logs fix stamped at or after `since`. The
+ * gps_latest_since RPC returns one row per driver (keyset-paged on driver_id);
+ * without it, raw rows are keyset-paged in (timestamp, log_id) order, up to
+ * MAX_LOG_PAGES. `through` is set when that cap stopped the read early: the
+ * timestamp the next sync must continue from.
+ */
+async function readLogsSince(supabase: Admin, since: string): Promise<{ rows: PositionRow[]; through: string | null } | null> {
+  const rows: PositionRow[] = []
+  for (let after: string | null = null; ;) {
+    let query = supabase.rpc('gps_latest_since', { since })
+    if (after !== null) query = query.gt('driver_id', after)
+    const { data, error } = await query.order('driver_id').limit(PAGE)
+    if (error) {
+      if (after === null) break
+      console.error('[GPS] location store sync failed:', error.message)
+      return null
+    }
+    rows.push(...((data || []) as PositionRow[]))
+    if (!data || data.length < PAGE) return { rows, through: null }
+    after = (data[data.length - 1] as PositionRow).driver_id
+  }
+
+  console.warn('[GPS] gps_latest_since unavailable, paging gps_logs')
+  const keys: KeysetKey[] = [{ column: 'timestamp', ascending: true }, { column: 'log_id', ascending: true }]
+  let last: { timestamp: string; log_id: string } | null = null
+  for (let pages = 0; pages < MAX_LOG_PAGES; pages++) {
+    const plan = keysetPlan(keys, last ? { values: [last.timestamp, last.log_id], direction: 'next' } : null)
+    let query = supabase.from('gps_logs').select(`log_id, ${POSITION_COLUMNS}`).gte('timestamp', since)
+    for (const order of plan.orders) query = query.order(order.column, { ascending: order.ascending })
+    for (const f of plan.filters) query = query.filter(f.column, f.operator, f.value)
+    if (plan.or) query = query.or(plan.or)
+    const { data, error } = await query.limit(PAGE)
+    if (error) {
+      console.error('[GPS] location store sync failed:', error.message)
+      return null
+    }
+    rows.push(...((data || []) as PositionRow[]))
+    if (!data || data.length < PAGE) return { rows, through: null }
+    last = data[data.length - 1] as { timestamp: string; log_id: string }
+  }
+  return { rows, through: last!.timestamp }
+}
+
+// Logouts handled by any instance since the last check, keyset-paged
+async function applyLogouts(supabase: Admin, windowStart: string) {
+  const since = logoutCursor && logoutCursor > windowStart ? logoutCursor : windowStart
+  const keys: KeysetKey[] = [{ column: 'logged_out_at', ascending: true }, { column: 'driver_id', ascending: true }]
+  let last: { logged_out_at: string; driver_id: string } | null = null
+  for (;;) {
+    const plan = keysetPlan(keys, last ? { values: [last.logged_out_at, last.driver_id], direction: 'next' } : null)
+    let query = supabase.from('driver_location_logouts').select('driver_id, logged_out_at').gte('logged_out_at', since)
+    for (const order of plan.orders) query = query.order(order.column, { ascending: order.ascending })
+    for (const f of plan.filters) query = query.filter(f.column, f.operator, f.value)
+    if (plan.or) query = query.or(plan.or)
+    const { data, error } = await query.limit(PAGE)
+    if (error) {
+      console.warn('[GPS] driver_location_logouts read failed:', error.message)
+      return
+    }
+    for (const row of data || []) forgetDriverAt(row.driver_id, Date.parse(row.logged_out_at))
+    if (data?.length) last = data[data.length - 1]
+    if (!data || data.length < PAGE) break
+  }
+  // Logout times come from app servers' clocks; re-read a little behind
+  const newest = last ? Math.min(Date.parse(last.logged_out_at), Date.now()) : Date.now()
+  const next = new Date(newest - SYNC_OVERLAP_MS).toISOString()
+  if (!logoutCursor || next > logoutCursor) logoutCursor = next
+}
+
+async function sync() {
+  const supabase = createAdminClient()
+  const startedAt = Date.now()
+  const windowStart = new Date(startedAt - LOCATION_DISPLAY_WINDOW_MS).toISOString()
+
+  // First load: seed from the one-row-per-driver table (logout deletes a
+  // driver's row there), not by replaying hours of gps_logs
+  if (!syncCursor) {
+    const seed = await readLatestTable(supabase, windowStart)
+    if (!seed) return
+    recordPositions(seed)
+    await applyLogouts(supabase, windowStart)
+    seededVersion = nextVersion()
+    syncCursor = new Date(startedAt - SYNC_OVERLAP_MS).toISOString()
+    return
+  }
+
+  const [logs] = await Promise.all([
+    readLogsSince(supabase, syncCursor > windowStart ? syncCursor : windowStart),
+    applyLogouts(supabase, windowStart),
+  ])
+  if (!logs) return
+  recordPositions(logs.rows)
+
+  if (logs.through) {
+    // Capped read: carry on from the last row read
+    syncCursor = logs.through
+    return
+  }
+  // Advance behind the newest fix read, but never past the server clock: a
+  // device running fast would otherwise park the cursor in the future
+  const newest = logs.rows.reduce((max, row) => Math.max(max, Date.parse(row.timestamp) || 0), 0)
+  const next = Math.min(newest || startedAt, startedAt) - SYNC_OVERLAP_MS
+  if (next > Date.parse(syncCursor)) syncCursor = new Date(next).toISOString()
+}
+
+async function loadDrivers() {
+  const supabase = createAdminClient()
+  const { data, error } = await supabase
+    .from('Master_Drivers')
+    .select('Driver_ID, Driver_Name, Vehicle_Plate, Mobile_No, Branch_ID')
+  if (error) {
+    console.error('[GPS] location store driver load failed:', error.message)
+    return
+  }
+  const nextDrivers = new Map<string, DriverMeta>()
+  const nextByBranch = new Map<string, Set<string>>()
+  for (const d of (data || []) as DriverMeta[]) {
+    nextDrivers.set(d.Driver_ID, d)
+    const branch = d.Branch_ID || ''
+    const ids = nextByBranch.get(branch)
+    if (ids) ids.add(d.Driver_ID)
+    else nextByBranch.set(branch, new Set([d.Driver_ID]))
+  }
+  drivers = nextDrivers
+  driversByBranch = nextByBranch
+  driversLoadedAt = Date.now()
+}
+
+/** Refresh positions and driver metadata when stale; concurrent callers share one refresh. */
+async function ensureFresh() {
+  const now = Date.now()
+  if (now - syncedAt >= SYNC_INTERVAL_MS && !syncing) {
+    syncedAt = now
+    syncing = sync().finally(() => { syncing = null })
+  }
+  if (now - driversLoadedAt >= DRIVERS_TTL && !driversLoading) {
+    driversLoading = loadDrivers().finally(() => { driversLoading = null })
+  }
+  // Only the first load has to be awaited; later refreshes serve the current copy
+  if (!syncCursor && syncing) await syncing
+  if (driversLoadedAt === 0 && driversLoading) await driversLoading
+}
+
+async function customerDriverIds(customerId: string): Promise<Set<string>> {
+  const cached = customerDrivers.get(customerId)
+  if (cached && Date.now() - cached.timestamp < CUSTOMER_TTL) return cached.ids
+
+  const supabase = createAdminClient()
+  const { data: activeJobs } = await supabase
+    .from('Jobs_Main')
+    .select('Driver_ID')
+    .eq('Customer_ID', customerId)
+    .not('Driver_ID', 'is', null)
+    .not('Job_Status', 'in', CLOSED_JOB_STATUSES)
+  const ids = new Set((activeJobs || []).map((j: { Driver_ID: string }) => j.Driver_ID))
+  customerDrivers.set(customerId, { ids, timestamp: Date.now() })
+  return ids
+}
+
+/** Driver ids visible in `scope`; null means every known driver. */
+async function scopeDriverIds(scope: FleetScope): Promise<Set<string> | null> {
+  const byCustomer = scope.customerId ? await customerDriverIds(scope.customerId) : null
+  const branch = scope.branchId && scope.branchId !== 'All' ? scope.branchId : null
+  if (!branch) return byCustomer
+
+  const byBranch = driversByBranch.get(branch) || new Set<string>()
+  if (!byCustomer) return byBranch
+  return new Set(Array.from(byCustomer).filter(id => byBranch.has(id)))
+}
+
+function toLocation(driverId: string, position: StoredPosition): FleetLocation | null {
+  const meta = drivers.get(driverId)
+  if (!meta) return null
+  return {
+    Driver_ID: driverId,
+    Driver_Name: meta.Driver_Name || 'Unknown',
+    Vehicle_Plate: meta.Vehicle_Plate || position.vehiclePlate || '-',
+    Mobile_No: meta.Mobile_No || '',
+    Branch_ID: meta.Branch_ID,
+    Last_Update: position.timestamp || null,
+    Latitude: position.lat ?? null,
+    Longitude: position.lng ?? null,
+    Speed: position.speed,
+  }
+}
+
+function collect(ids: Set<string> | null, sinceVersion: number): FleetLocation[] {
+  const windowStart = Date.now() - LOCATION_DISPLAY_WINDOW_MS
+  const out: FleetLocation[] = []
+  const visit = (driverId: string, position: StoredPosition | undefined) => {
+    if (!position || position.version <= sinceVersion || position.at < windowStart) return
+    const location = toLocation(driverId, position)
+    if (location) out.push(location)
+  }
+  // Walk whichever side is smaller
+  if (ids && ids.size < positions.size) ids.forEach(id => visit(id, positions.get(id)))
+  else positions.forEach((position, id) => { if (!ids || ids.has(id)) visit(id, position) })
+  return out
+}
+
+/** Every driver in `scope` who reported within the display window. */
+export async function fleetSnapshot(scope: FleetScope): Promise<FleetLocation[]> {
+  await ensureFresh()
+  const ids = await scopeDriverIds(scope)
+  return collect(ids, 0)
+}
+
+/**
+ * What changed in `scope` since a client's `version`. The version may have
+ * been minted by another instance, so the delta reaches back INSTANCE_LAG_MS
+ * further; only a client without a version, or one older than this store's
+ * seed, gets the full scope.
+ */
+export async function fleetChanges(scope: FleetScope, since: { version?: number }): Promise<FleetChanges> {
+  await ensureFresh()
+  const ids = await scopeDriverIds(scope)
+  const reset = !since.version || since.version < seededVersion
+  const sinceVersion = reset ? 0 : since.version! - INSTANCE_LAG_MS
+  const removed = reset
+    ? []
+    : Array.from(removals).filter(([id, r]) => r.version > sinceVersion && (!ids || ids.has(id))).map(([id]) => id)
+  return { version, reset, locations: collect(ids, sinceVersion), removed }
+}
+
+/** Broadcast channel announcing position changes in one branch ('All' gets every branch). */
+export function fleetChannelName(branchId?: string | null) {
+  return `fleet-positions:${branchId || 'All'}`
+}
+
+/**
+ * Tell subscribed maps that positions changed: one message per branch touched
+ * plus one on the 'All' channel. Anyone with the anon key can join these
+ * channels, so the message holds no driver data; maps answer it with a scoped
+ * `fleetChanges` poll. Best-effort; the regular poll covers missed messages.
+ */
+export async function publishPositions(rows: PositionRow[], branchOf: (driverId: string) => string | null | undefined) {
+  if (rows.length === 0) return
+  const names = new Set([fleetChannelName('All')])
+  for (const row of rows) names.add(fleetChannelName(branchOf(row.driver_id)))
+
+  const supabase = createAdminClient()
+  await Promise.all(Array.from(names).map(async name => {
+    const channel = supabase.channel(name)
+    try {
+      await channel.httpSend('positions', { version })
+    } catch (err) {
+      console.error(`[GPS] broadcast to ${name} failed:`, err)
+    } finally {
+      supabase.removeChannel(channel)
+    }
+  }))
+}
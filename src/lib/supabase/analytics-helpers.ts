@@ -2,8 +2,8 @@
 // Note: No "use server" here — this is consumed by server action files
 
 import { createAdminClient } from '@/utils/supabase/server'
-import { getUserBranchId, isSuperAdmin } from "@/lib/permissions"
-import { getSession } from "@/lib/session"
+import { cache } from "react"
+import { getIdentity } from "@/lib/identity"
 
 export type FinancialJob = {
     Price_Cust_Total: number;
@@ -75,9 +75,16 @@ export async function getBranchPlates(branchId: string) {
     return (data || []).map((v: { Vehicle_Plate?: string | null }) => v.Vehicle_Plate).filter(Boolean) as string[]
 }
 
+// Master_Branches for name -> ID resolution, fetched at most once per request
+const getBranchDirectory = cache(async () => {
+    const supabase = await createAdminClient()
+    const { data } = await supabase.from('Master_Branches').select('Branch_ID, Branch_Name')
+    return (data || []) as { Branch_Name: string, Branch_ID: string }[]
+})
+
 // Common helper to resolve branch filtering
 export async function getEffectiveBranchId(branchId?: string) {
-    const session = await getSession().catch(() => null)
+    const { session, branchId: userBranchId, isSuper } = await getIdentity()
     
     // If there is NO active session (e.g. server-to-server, LINE webhook, or Cron job)
     if (!session) {
@@ -89,8 +96,7 @@ export async function getEffectiveBranchId(branchId?: string) {
         const isName = branchId.length > 4 || branchId.includes(' ')
         if (isName) {
             try {
-                const supabase = await createAdminClient()
-                const { data: branches } = await supabase.from('Master_Branches').select('Branch_ID, Branch_Name')
+                const branches = await getBranchDirectory()
                 if (branches) {
                     const match = branches.find((b: { Branch_Name: string, Branch_ID: string }) => 
                         b.Branch_Name.trim().toLowerCase() === branchId.trim().toLowerCase() ||
@@ -105,9 +111,6 @@ export async function getEffectiveBranchId(branchId?: string) {
         return branchId.trim().toUpperCase()
     }
 
-    const userBranchId = await getUserBranchId()
-    const isSuper = await isSuperAdmin()
-    
     // STRICT ISOLATION: Non-SuperAdmins are HARD LOCKED to their userBranchId
     if (!isSuper) {
         if (!userBranchId || userBranchId.toLowerCase() === 'all') return 'RESTRICTED_ACCESS'
@@ -126,8 +129,7 @@ export async function getEffectiveBranchId(branchId?: string) {
     
     if (isName) {
         try {
-            const supabase = await createAdminClient()
-            const { data: branches } = await supabase.from('Master_Branches').select('Branch_ID, Branch_Name')
+            const branches = await getBranchDirectory()
             
             if (branches) {
                 // Find by name (case-insensitive, trimmed)
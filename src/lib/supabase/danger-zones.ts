@@ -2,6 +2,7 @@
 
 import { createAdminClient } from "@/utils/supabase/server"
 import { getUserBranchId } from "@/lib/permissions"
+import { invalidateZoneIndexes } from "@/lib/utils/zone-index"
 
 export type DangerZone = {
     Zone_ID?: string;
@@ -71,6 +72,7 @@ export async function upsertDangerZone(zone: Partial<DangerZone>) {
         .single()
 
     if (error) throw error
+    invalidateZoneIndexes()
     return data ? fromRow(data) : null
 }
 
@@ -82,5 +84,6 @@ export async function deleteDangerZone(zoneId: string) {
         .eq('zone_id', zoneId)
 
     if (error) throw error
+    invalidateZoneIndexes()
     return true
 }
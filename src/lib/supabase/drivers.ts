@@ -3,6 +3,7 @@
 import { createClient, createAdminClient } from '@/utils/supabase/server'
 import { getUserBranchId, isSuperAdmin, isAdmin } from "@/lib/permissions"
 import { todayTH } from "@/lib/utils/date-th"
+import { decodeCursor, keysetPage, keysetPlan, type KeysetKey } from "@/lib/utils/keyset"
 
 // Type matching actual Supabase schema
 export type Driver = {
@@ -198,8 +199,10 @@ export async function getActiveDrivers() {
   }
 }
 
+const DRIVER_LIST_KEYS: KeysetKey[] = [{ column: 'Driver_ID', ascending: true }]
+
 // Alias for planning page compatibility
-export async function getAllDrivers(page?: number, limit?: number, query?: string, providedBranchId?: string) {
+export async function getAllDrivers(page?: number, limit?: number, query?: string, providedBranchId?: string, cursor?: string): Promise<{ data: Driver[], count: number, nextCursor?: string | null, prevCursor?: string | null }> {
   try {
     const isSuper = await isSuperAdmin()
     const isAdminUser = await isAdmin()
@@ -207,7 +210,7 @@ export async function getAllDrivers(page?: number, limit?: number, query?: strin
     const branchId = isSuper ? (providedBranchId || actualBranchId) : actualBranchId
     const supabase = (isSuper || isAdminUser) ? await createAdminClient() : await createClient()
     
-    let queryBuilder = supabase.from('Master_Drivers').select('*', { count: 'exact' })
+    let queryBuilder = supabase.from('Master_Drivers').select('*', { count: 'estimated' })
     
     if (branchId && branchId !== 'All' && !isSuper) {
         queryBuilder = queryBuilder.eq('Branch_ID', branchId)
@@ -221,15 +224,24 @@ export async function getAllDrivers(page?: number, limit?: number, query?: strin
       queryBuilder = queryBuilder.or(`Driver_Name.ilike.%${query}%,Mobile_No.ilike.%${query}%,Driver_ID.ilike.%${query}%,Vehicle_Plate.ilike.%${query}%`)
     }
     
-    if (page && limit) {
-      const from = (page - 1) * limit
-      const to = from + limit - 1
-      queryBuilder = queryBuilder.range(from, to)
+    if (!page || !limit) {
+      const { data, error, count } = await queryBuilder
+      if (error) return { data: [], count: 0 }
+      return { data: data || [], count: count || 0 }
     }
-    
-    const { data, error, count } = await queryBuilder
+
+    // Keyset pages on Driver_ID; page numbers stay as the entry point
+    const plan = keysetPlan(DRIVER_LIST_KEYS, decodeCursor(cursor, DRIVER_LIST_KEYS))
+    for (const order of plan.orders) queryBuilder = queryBuilder.order(order.column, { ascending: order.ascending })
+    for (const f of plan.filters) queryBuilder = queryBuilder.filter(f.column, f.operator, f.value)
+
+    const from = (page - 1) * limit
+    const { data, error, count } = plan.cursor
+      ? await queryBuilder.limit(limit + 1)
+      : await queryBuilder.range(from, from + limit)
     if (error) return { data: [], count: 0 }
-    return { data: data || [], count: count || 0 }
+    const { rows, nextCursor, prevCursor } = keysetPage(DRIVER_LIST_KEYS, (data || []) as Driver[], limit, plan, page > 1)
+    return { data: rows, count: count || 0, nextCursor, prevCursor }
   } catch {
     return { data: [], count: 0 }
   }
@@ -1,7 +1,7 @@
 "use server"
 
 import { createAdminClient } from '@/utils/supabase/server'
-import { isSuperAdmin, getCustomerId, isCustomer } from "@/lib/permissions"
+import { getIdentity } from "@/lib/identity"
 import {
     REVENUE_STATUSES,
     PIPELINE_STATUSES,
@@ -29,7 +29,7 @@ async function getDefaultWTWPerKm(): Promise<number> {
 // 1. Unified Executive Dashboard (Ultra-Performance via RPC)
 export async function getExecutiveDashboardUnified(branchId?: string, startDate?: string, endDate?: string, customerNames?: string[], providedCustomerId?: string | null) {
     const supabase = await createAdminClient()
-    const customerId = await getCustomerId()
+    const { customerId, isCustomer: isCust } = await getIdentity()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
 
     const { start: currentStart, end: currentEnd } = getThaiMonthBoundaries()
@@ -43,7 +43,6 @@ export async function getExecutiveDashboardUnified(branchId?: string, startDate?
     const sDatePrev = formatDateSafe(prevStart)!
     const eDatePrev = formatDateSafe(prevEnd)!
 
-    const isCust = await isCustomer()
     // Safety: If customer role but no customerId, they shouldn't see anything
     const finalCustomerId = customerId || providedCustomerId || null
     const isRestricted = isCust && !customerId
@@ -456,7 +455,7 @@ export async function getExecutiveDashboardUnified(branchId?: string, startDate?
 // 2. Optimized getFinancialStats using the RPC
 export async function getFinancialStats(startDate?: string, endDate?: string, branchId?: string) {
   const supabase = await createAdminClient()
-  const customerId = await getCustomerId()
+  const { customerId } = await getIdentity()
   const effectiveBranchId = await getEffectiveBranchId(branchId)
 
   const sDate = formatDateSafe(startDate) || formatDateSafe(new Date(new Date().getFullYear(), new Date().getMonth(), 1))
@@ -575,7 +574,7 @@ export async function getFinancialStats(startDate?: string, endDate?: string, br
 
 export async function getJobCountSummary(startDate?: string, endDate?: string, branchId?: string) {
     const supabase = await createAdminClient()
-    const customerId = await getCustomerId()
+    const { customerId } = await getIdentity()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
 
     const sDate = formatDateSafe(startDate) || formatDateSafe(new Date(new Date().getFullYear(), new Date().getMonth(), 1))
@@ -656,7 +655,7 @@ export async function getJobCountSummary(startDate?: string, endDate?: string, b
 
 export async function getVehicleUtilizationSummary(startDate?: string, endDate?: string, branchId?: string) {
     const supabase = await createAdminClient()
-    const customerId = await getCustomerId()
+    const { customerId } = await getIdentity()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
 
     const sDate = formatDateSafe(startDate) || formatDateSafe(new Date(new Date().getFullYear(), new Date().getMonth(), 1))
@@ -732,7 +731,7 @@ export async function getRevenueTrend(startDate?: string, endDate?: string, bran
     const start = formatDateSafe(startDate) || formatDateSafe(subDays(new Date(), 30))
     const end = formatDateSafe(endDate) || formatDateSafe(new Date())
     const effectiveBranchId = await getEffectiveBranchId(branchId)
-    const customerId = await getCustomerId()
+    const { customerId } = await getIdentity()
 
     const { data, error } = await supabase.rpc('get_executive_summary', {
         start_date: start,
@@ -789,7 +788,7 @@ export async function getJobStatusDistribution(startDate?: string, endDate?: str
     try {
         const supabase = await createAdminClient()
         const effectiveBranchId = await getEffectiveBranchId(branchId)
-        const customerId = await getCustomerId()
+        const { customerId } = await getIdentity()
         const sDate = formatDateSafe(startDate) || '2000-01-01'
         const eDate = formatDateSafe(endDate) || '2099-12-31'
 
@@ -836,14 +835,14 @@ export async function getJobStatusDistribution(startDate?: string, endDate?: str
 export async function getTopCustomers(startDate?: string, endDate?: string, branchId?: string) {
     const supabase = await createAdminClient()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
-    const customerId = await getCustomerId()
+    const { customerId, isCustomer } = await getIdentity()
 
     let query = supabase
         .from('Jobs_Main')
         .select('Customer_Name, Price_Cust_Total')
         .in('Job_Status', REVENUE_STATUSES)
     
-    const isCust = await getCustomerId() || await isCustomer()
+    const isCust = customerId || isCustomer
     
     if (customerId) query = query.eq('Customer_ID', customerId)
     else if (isCust) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
@@ -868,7 +867,7 @@ export async function getTopCustomers(startDate?: string, endDate?: string, bran
 }
 
 export async function getBranchPerformance(startDate?: string, endDate?: string) {
-    const isAdmin = await isSuperAdmin()
+    const { isSuper: isAdmin } = await getIdentity()
     if (!isAdmin) return []
     const supabase = await createAdminClient()
     const { data: branches } = await supabase.from('Master_Branches').select('Branch_ID, Branch_Name')
@@ -971,7 +970,7 @@ export async function getExecutiveEfficiencyScores(branchId?: string) {
 
 export async function getDetailedProfitability(startDate?: string, endDate?: string, branchId?: string) {
     const supabase = await createAdminClient()
-    const customerId = await getCustomerId()
+    const { customerId, isCustomer } = await getIdentity()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
     const sDate = formatDateSafe(startDate)
     const eDate = formatDateSafe(endDate)
@@ -979,7 +978,7 @@ export async function getDetailedProfitability(startDate?: string, endDate?: str
     let query = supabase.from('Jobs_Main').select('Job_ID, Customer_Name, Route_Name, Price_Cust_Total, Cost_Driver_Total, Price_Cust_Extra, Cost_Driver_Extra, Plan_Date').in('Job_Status', REVENUE_STATUSES).order('Plan_Date', { ascending: false }).limit(50)
     
     if (customerId) query = query.eq('Customer_ID', customerId)
-    else if (await isCustomer()) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
+    else if (isCustomer) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
     else if (effectiveBranchId) query = query.eq('Branch_ID', effectiveBranchId)
 
     if (sDate) query = query.gte('Plan_Date', sDate)
@@ -1071,14 +1070,14 @@ export async function getRevenueForecast(branchId?: string): Promise<{ month: st
 
 export async function getVehicleProfitability(startDate?: string, endDate?: string, branchId?: string) {
     const supabase = await createAdminClient()
-    const customerId = await getCustomerId()
+    const { customerId, isCustomer } = await getIdentity()
     const effectiveBranchId = await getEffectiveBranchId(branchId)
     const sDate = formatDateSafe(startDate); const eDate = formatDateSafe(endDate)
 
     let query = supabase.from('Jobs_Main').select('Vehicle_Plate, Price_Cust_Total, Cost_Driver_Total, Est_Distance_KM').in('Job_Status', REVENUE_STATUSES)
     
     if (customerId) query = query.eq('Customer_ID', customerId)
-    else if (await isCustomer()) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
+    else if (isCustomer) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
     else if (effectiveBranchId) query = query.eq('Branch_ID', effectiveBranchId)
 
     if (sDate) query = query.gte('Plan_Date', sDate)
@@ -1109,7 +1108,7 @@ export async function getVehicleProfitability(startDate?: string, endDate?: stri
 
 export async function getProfitHeatmapData(startDate?: string, endDate?: string, branchId?: string, customerId?: string | null) {
     const supabase = await createAdminClient()
-    const loggedInCustomerId = await getCustomerId()
+    const { customerId: loggedInCustomerId, isCustomer } = await getIdentity()
     const finalCustomerId = customerId || loggedInCustomerId
     const effectiveBranchId = await getEffectiveBranchId(branchId)
     
@@ -1127,7 +1126,7 @@ export async function getProfitHeatmapData(startDate?: string, endDate?: string,
         .in('Job_Status', REVENUE_STATUSES)
     
     if (finalCustomerId) query = query.eq('Customer_ID', finalCustomerId)
-    else if (await isCustomer()) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
+    else if (isCustomer) query = query.eq('Customer_ID', 'RESTRICTED_ACCESS')
     
     if (effectiveBranchId) query = query.eq('Branch_ID', effectiveBranchId)
 
@@ -1,26 +1,9 @@
 "use server";
 
 import { createClient, createAdminClient } from "@/utils/supabase/server";
-import { getUserBranchId, isSuperAdmin, isAdmin, getCustomerId } from "@/lib/permissions";
-import { getDangerZones } from "./danger-zones";
-import { isPointInPolygon } from "@/lib/utils";
-import { sendDangerZoneAlert } from "../actions/email-actions";
-import { type DangerZone } from "./danger-zones";
-
-// Simple in-memory cache to save CPU/DB calls on Vercel
-const globalZoneCache: Record<string, { zones: DangerZone[], timestamp: number }> = {};
-const ZONE_CACHE_TTL = 300000; // 5 minutes cache
-
-// How far back a driver's last position is still shown on the map. PWA drivers
-// only report while the app is foreground, so a strict "live only" window would
-// blank the map most of the time. Instead we show positions for several hours
-// and let the client grey out anyone not reporting "live" (see the client-side
-// 10-min Online/Offline check) — recent trucks are highlighted, last-seen ones
-// fade. Logout still clears the row, so this won't pin drivers forever.
-const LOCATION_DISPLAY_WINDOW_MINUTES = 360; // 6 hours
-function locationDisplayThreshold() {
-  return new Date(Date.now() - LOCATION_DISPLAY_WINDOW_MINUTES * 60 * 1000).toISOString();
-}
+import { getIdentity } from "@/lib/identity";
+import { evaluateDangerZones, ingestGPSBatch } from "@/lib/gps-ingest";
+import { fleetChanges, fleetSnapshot, type FleetChanges, type FleetScope } from "@/lib/location-store";
 
 // Type matching actual Supabase schema (ProperCase columns!)
 export type GPSLog = {
@@ -34,7 +17,8 @@ export type GPSLog = {
   Speed?: number;
 };
 
-// บันทึกพิกัด GPS
+// บันทึกพิกัด GPS (single point; batches go through ingestGPSBatch /
+// POST /api/external/v1/gps)
 export async function saveGPSLog(data: {
   driverId: string;
   vehiclePlate?: string;
@@ -44,63 +28,12 @@ export async function saveGPSLog(data: {
   speed?: number;
 }) {
   try {
-    const supabase = await createAdminClient();
-    let plate = data.vehiclePlate;
-
-    // Auto-fill vehicle plate if missing
-    if (!plate) {
-        const { data: driver } = await supabase
-            .from('Master_Drivers')
-            .select('Vehicle_Plate')
-            .eq('Driver_ID', data.driverId)
-            .single();
-        if (driver?.Vehicle_Plate) plate = driver.Vehicle_Plate;
-    }
-
-    // Note: GPS_Logs table uses lowercase column names
-    const { error } = await supabase
-      .from("gps_logs") 
-      .insert({
-        driver_id: data.driverId,
-        vehicle_plate: plate,
-        latitude: data.lat,
-        longitude: data.lng,
-        job_id: data.jobId,
-        speed: data.speed,
-      });
-
-    if (error) {
-      console.error('[DEBUG] saveGPSLog error:', JSON.stringify(error, null, 2))
-      return { success: false, error };
+    const branchId = (await getIdentity()).branchId || 'All';
+    const result = await ingestGPSBatch([data], { branchId });
+    if (!result.success) {
+      console.error('[DEBUG] saveGPSLog error:', JSON.stringify(result.error, null, 2))
+      return { success: false, error: result.error };
     }
-
-    // Keep the map's optimized "latest position" table in sync directly,
-    // instead of relying on the DB trigger (which silently stopped firing and
-    // froze the live map). Best-effort: never let this fail the GPS log save.
-    {
-      const nowIso = new Date().toISOString()
-      const { error: latestErr } = await supabase
-        .from("driver_latest_locations")
-        .upsert({
-          driver_id: data.driverId,
-          vehicle_plate: plate,
-          latitude: data.lat,
-          longitude: data.lng,
-          speed: data.speed,
-          job_id: data.jobId,
-          timestamp: nowIso,
-          updated_at: nowIso,
-        }, { onConflict: "driver_id" })
-      if (latestErr) {
-        console.error('[GPS] driver_latest_locations upsert failed:', latestErr.message)
-      }
-    }
-
-    // --- DANGER ZONE CHECK ---
-    await checkDangerZones(data.driverId, data.lat, data.lng, data.vehiclePlate);
-    // -------------------------
-
-
     return { success: true };
   } catch (e) {
     return { success: false, error: e };
@@ -109,9 +42,8 @@ export async function saveGPSLog(data: {
 
 /**
  * Evaluate a single position against active danger zones and email an alert if
- * the driver has entered one. Extracted from saveGPSLog so the direct-to-Supabase
- * batch path (which bypasses this server) can still trigger zone alerts by
- * calling this once per flush instead of per GPS point.
+ * the driver has entered one. The direct-to-Supabase batch path (which bypasses
+ * this server) calls this once per flush instead of per GPS point.
  */
 export async function checkDangerZones(
   driverId: string,
@@ -119,149 +51,23 @@ export async function checkDangerZones(
   lng: number,
   vehiclePlate?: string,
 ) {
-  try {
-    const supabase = await createAdminClient();
-    const branchId = await getUserBranchId() || 'All';
-    const now = Date.now();
-
-    let activeZones: DangerZone[] = [];
-
-    // Use cache if available and not expired
-    if (globalZoneCache[branchId] && (now - globalZoneCache[branchId].timestamp < ZONE_CACHE_TTL)) {
-        activeZones = globalZoneCache[branchId].zones;
-    } else {
-        const zones = await getDangerZones(branchId);
-        activeZones = zones.filter((z: { Is_Active: boolean }) => z.Is_Active);
-        globalZoneCache[branchId] = { zones: activeZones, timestamp: now };
-        console.log(`[GPS] Cache updated for branch: ${branchId} (${activeZones.length} zones)`);
-    }
-
-    if (activeZones.length > 0) {
-        for (const zone of activeZones) {
-            if (isPointInPolygon([lat, lng], zone.Coordinates)) {
-                // Potential Incursion Detected!
-                console.warn(`[DANGER] Driver ${driverId} entered zone ${zone.Zone_Name}`);
-
-                // Fetch driver details for email
-                const { data: driver } = await supabase
-                    .from('Master_Drivers')
-                    .select('Driver_Name, Vehicle_Plate')
-                    .eq('Driver_ID', driverId)
-                    .single();
+  const branchId = (await getIdentity()).branchId || 'All';
+  await evaluateDangerZones([{ driverId, lat, lng, vehiclePlate }], branchId);
+}
 
-                if (zone.Email_Recipient) {
-                    await sendDangerZoneAlert({
-                        plate: driver?.Vehicle_Plate || vehiclePlate || 'Unknown',
-                        driverName: driver?.Driver_Name || 'Unknown',
-                        zoneName: zone.Zone_Name,
-                        timestamp: new Date().toLocaleString('th-TH'),
-                        recipient: zone.Email_Recipient
-                    });
-                }
-            }
-        }
-    }
-  } catch (dzError) {
-    console.error("[GPS] Danger zone check failed:", dzError);
-  }
+// The caller's live-map scope; the snapshot and its delta polls must agree
+async function callerFleetScope(): Promise<FleetScope> {
+  const { isSuper, branchId, customerId } = await getIdentity();
+  // Super Admin bypass: sees every branch
+  return { branchId: isSuper ? null : branchId, customerId };
 }
 
 // ดึงตำแหน่งล่าสุดของ Driver ทุกคน (สำหรับแสดงบน Map)
+// Served from the in-process location store (src/lib/location-store.ts).
 export async function getLatestDriverLocations() {
   try {
-    const isSuper = await isSuperAdmin();
-    const isRegularAdmin = await isAdmin();
-    const customerId = await getCustomerId();
-    const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient();
-
-    const branchId = await getUserBranchId();
-
-    // Query from the optimized Latest Locations table.
-    // Only return positions reported recently, so drivers who logged out or
-    // closed the app stop appearing pinned at their last location forever.
-    let query = supabase
-      .from("driver_latest_locations")
-      .select(`
-        *,
-        Master_Drivers!inner ( Driver_Name, Branch_ID )
-      `)
-      .gte("timestamp", locationDisplayThreshold());
-
-    // Super Admin bypass: If 'All' or no branch selected, show all
-    if (branchId && branchId !== "All" && !isSuper) {
-       query = query.eq('Master_Drivers.Branch_ID', branchId);
-    }
-
-    const { data, error } = await query;
-
-    if (error || !data) {
-      // FALLBACK logic if table doesn't exist yet
-      const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000).toISOString();
-      let fallbackQuery = supabase
-        .from("gps_logs")
-        .select(`*, Master_Drivers!inner ( Driver_Name, Branch_ID )`)
-        .gte("timestamp", oneHourAgo);
-
-      if (branchId && branchId !== "All" && !isSuper) {
-         fallbackQuery = fallbackQuery.eq('Master_Drivers.Branch_ID', branchId);
-      }
-
-      const { data: fallbackData, error: fallbackError } = await fallbackQuery
-        .order("timestamp", { ascending: false })
-        .limit(2000);
-
-      if (fallbackError) return [];
-
-      const latestLocations = new Map<string, any>();
-      fallbackData?.forEach((log: any) => {
-        const driverId = log.driver_id || log.Driver_ID;
-        if (!latestLocations.has(driverId)) {
-          latestLocations.set(driverId, {
-            ...log,
-            Driver_ID: driverId,
-            Driver_Name: log.Master_Drivers?.Driver_Name || "Unknown Driver",
-            Latitude: log.latitude || log.Latitude,
-            Longitude: log.longitude || log.Longitude,
-            Timestamp: log.timestamp || log.Timestamp,
-          });
-        }
-      });
-      
-      const logs = Array.from(latestLocations.values());
-      if (customerId) {
-        const { data: activeJobs } = await supabase.from("Jobs_Main").select("Driver_ID")
-          .eq("Customer_ID", customerId)
-          .not("Driver_ID", "is", null)
-          .not("Job_Status", "in", '("Complete", "Completed", "Cancelled", "Delivered")');
-        const activeDriverIds = new Set(activeJobs?.map((j: { Driver_ID: string }) => j.Driver_ID) || []);
-        return logs.filter((l) => activeDriverIds.has(l.Driver_ID));
-      }
-      return logs;
-    }
-
-    const logs = (data || []).map((log: any) => ({
-      ...log,
-      Driver_ID: log.Driver_ID || log.driver_id,
-      Driver_Name: log.Master_Drivers?.Driver_Name || "Unknown Driver",
-      Latitude: log.Latitude ?? log.latitude ?? null,
-      Longitude: log.Longitude ?? log.longitude ?? null,
-      Timestamp: log.Timestamp || log.timestamp || null,
-    }));
-
-    if (customerId) {
-      // For customers, further security filter: only show locations of drivers on their active jobs
-      const { data: activeJobs } = await supabase
-        .from("Jobs_Main")
-        .select("Driver_ID")
-        .eq("Customer_ID", customerId)
-        .not("Driver_ID", "is", null)
-        .not("Job_Status", "in", '("Complete", "Completed", "Cancelled", "Delivered")');
-
-      const activeDriverIds = new Set(activeJobs?.map((j: { Driver_ID: string }) => j.Driver_ID) || []);
-      return logs.filter((l) => activeDriverIds.has(l.Driver_ID));
-    }
-
-    return logs;
+    const locations = await fleetSnapshot(await callerFleetScope());
+    return locations.map((l) => ({ ...l, Timestamp: l.Last_Update }));
   } catch (err) {
     console.error('[GPS] getLatestDriverLocations exception:', err);
     return [];
@@ -271,9 +77,7 @@ export async function getLatestDriverLocations() {
 // ดึงประวัติการเดินทางของ Driver ตามวันที่ (สำหรับแสดงเส้นทาง)
 export async function getDriverRouteForDate(driverId: string, date: string) {
   try {
-    const isSuper = await isSuperAdmin();
-    const isRegularAdmin = await isAdmin();
-    const customerId = await getCustomerId();
+    const { isSuper, isAdmin: isRegularAdmin, customerId } = await getIdentity();
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient();
 
     // Create Start and End timestamps for the day
@@ -311,76 +115,31 @@ export async function getDriverRouteForDate(driverId: string, date: string) {
 
 export async function getActiveFleetStatus(branchId?: string | null, customerId?: string | null) {
   try {
-    const isSuper = await isSuperAdmin();
-    const supabase = await createAdminClient();
-    const sessionBranchId = await getUserBranchId();
+    const { isSuper, branchId: sessionBranchId } = await getIdentity();
     const effectiveBranchId = isSuper ? (branchId || sessionBranchId) : sessionBranchId;
 
-    // 1. Resolve which drivers we care about (branch scope, or a customer's
-    //    active-job drivers).
-    let driversQuery = supabase
-      .from("Master_Drivers")
-      .select("Driver_ID, Driver_Name, Vehicle_Plate, Mobile_No, Branch_ID");
-
-    if (effectiveBranchId && effectiveBranchId !== "All") {
-      driversQuery = driversQuery.eq("Branch_ID", effectiveBranchId);
-    }
-
-    if (customerId) {
-      const { data: activeJobs } = await supabase
-        .from("Jobs_Main")
-        .select("Driver_ID")
-        .eq("Customer_ID", customerId)
-        .not("Driver_ID", "is", null)
-        .not("Job_Status", "in", '("Complete", "Completed", "Cancelled", "Delivered")');
-      const activeDriverIds = Array.from(new Set(activeJobs?.map((j: { Driver_ID: string }) => j.Driver_ID) || []));
-      if (activeDriverIds.length === 0) return [];
-      driversQuery = driversQuery.in("Driver_ID", activeDriverIds);
-    }
-
-    const { data: drivers } = await driversQuery;
-    if (!drivers || drivers.length === 0) return [];
-
-    // 2. Latest position comes straight from gps_logs — the client writes there
-    //    reliably, whereas driver_latest_locations is RLS-gated for the anon
-    //    key and cannot be refreshed from the device. Only drivers who reported
-    //    within the display window are returned (logged-out trucks drop off).
-    const driverIds = drivers.map((d: { Driver_ID: string }) => d.Driver_ID);
-    const { data: recentLogs } = await supabase
-      .from("gps_logs")
-      .select("driver_id, latitude, longitude, timestamp")
-      .in("driver_id", driverIds)
-      .gte("timestamp", locationDisplayThreshold())
-      .order("timestamp", { ascending: false })
-      .limit(5000);
-
-    const latestByDriver = new Map<string, { latitude?: number; longitude?: number; timestamp?: string }>();
-    recentLogs?.forEach((log: { driver_id: string; latitude?: number; longitude?: number; timestamp?: string }) => {
-      if (!latestByDriver.has(log.driver_id)) latestByDriver.set(log.driver_id, log);
-    });
-
-    return drivers
-      .map((d: { Driver_ID: string; Driver_Name?: string; Vehicle_Plate?: string; Mobile_No?: string }) => {
-        const log = latestByDriver.get(d.Driver_ID);
-        if (!log) return null;
-        return {
-          Driver_ID: d.Driver_ID,
-          Driver_Name: d.Driver_Name || "Unknown",
-          Vehicle_Plate: d.Vehicle_Plate || "-",
-          Mobile_No: d.Mobile_No || "",
-          Last_Update: log.timestamp || null,
-          Latitude: log.latitude ?? null,
-          Longitude: log.longitude ?? null,
-        };
-      })
-      .filter((x): x is NonNullable<typeof x> => x !== null);
-
+    // Branch scope, or a customer's active-job drivers; only drivers who
+    // reported within the display window are returned.
+    return await fleetSnapshot({ branchId: effectiveBranchId, customerId });
   } catch (err) {
     console.error('[GPS] getActiveFleetStatus exception:', err);
     return [];
   }
 }
 
+/**
+ * Live-map poll: positions changed since the version the client holds, in the
+ * caller's own scope. Pass back `version` from the previous result.
+ */
+export async function getFleetPositionChanges(since: { version?: number } = {}): Promise<FleetChanges | null> {
+  try {
+    return await fleetChanges(await callerFleetScope(), since);
+  } catch (err) {
+    console.error('[GPS] getFleetPositionChanges exception:', err);
+    return null;
+  }
+}
+
 export async function getVehicleRouteHistory(plate: string, startDate: string, endDate: string) {
     try {
         const supabase = await createAdminClient();
@@ -1,10 +1,12 @@
 "use server"
 
 import { createClient, createAdminClient } from '@/utils/supabase/server'
+import type { SupabaseClient } from '@supabase/supabase-js'
 import { logActivity } from '@/lib/supabase/logs'
 import { getDriverSession } from '@/lib/auth-utils'
-import { getUserBranchId, isSuperAdmin, isAdmin, getCustomerId } from "@/lib/permissions"
+import { getIdentity } from "@/lib/identity"
 import { todayTH } from "@/lib/utils/date-th"
+import { decodeCursor, keysetPage, keysetPlan, type KeysetKey } from "@/lib/utils/keyset"
  
 export type JobAssignment = {
   Vehicle_Type: string
@@ -123,10 +125,7 @@ export type Job = {
 // ดึงงานตามวันที่ (Default: วันนี้)
 export async function getTodayJobs(date?: string, branchId?: string): Promise<Job[]> {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
-    const customerId = await getCustomerId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
     
     // Use provided date or today in Bangkok time
@@ -172,9 +171,7 @@ export async function getTodayJobs(date?: string, branchId?: string): Promise<Jo
 
 export async function getLiveActiveJobs(branchId?: string, customerId?: string | null): Promise<Job[]> {
     try {
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
-        const userBranchId = await getUserBranchId()
+        const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId } = await getIdentity()
         const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
         
         let query = supabase
@@ -207,10 +204,7 @@ export async function getLiveActiveJobs(branchId?: string, customerId?: string |
 // ดึงงานตามสถานะ
 export async function getJobsByStatus(status: string): Promise<Job[]> {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const branchId = await getUserBranchId()
-    const customerId = await getCustomerId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId, customerId } = await getIdentity()
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
 
     let dbQuery = supabase
@@ -258,6 +252,13 @@ function parseCustomerIds(value?: string | null): string[] {
     .filter(s => s.length > 0 && s !== 'All')
 }
 
+// Job list order; Job_ID breaks ties between jobs created in the same instant
+const JOB_LIST_KEYS: KeysetKey[] = [
+  { column: 'Plan_Date', ascending: false, nullable: true },
+  { column: 'Created_At', ascending: false, nullable: true },
+  { column: 'Job_ID', ascending: false },
+]
+
 export async function getAllJobs(
   page = 1,
   limit = 50,
@@ -267,67 +268,49 @@ export async function getAllJobs(
   endDate = '', // Add endDate parameter
   providedBranchId = '',
   providedCustomerId = '',
-  overdueOnly = false
-): Promise<{ data: Job[], count: number }> {
+  overdueOnly = false,
+  cursor = ''
+): Promise<{ data: Job[], count: number, nextCursor?: string | null, prevCursor?: string | null }> {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
     const branchId = (isSuper || isRegularAdmin) ? (providedBranchId || userBranchId) : userBranchId
-    const customerId = await getCustomerId()
     const supabase = (isSuper || isRegularAdmin || customerId) ? createAdminClient() : await createClient()
     
     const offset = (page - 1) * limit
-    
-    let dbQuery = supabase
-      .from('Jobs_Main')
-      .select('*, container:jobs_container(*)', { count: 'exact' })
-      .neq('Job_Status', 'Draft') // UI REFINEMENT: Hide Drafts from History (They belong in Planning)
-    
+
+    // Scope shared by the list, the ranked search and its count
+    let filterCustomerIds: string[] | null = null
+    let filterBranchId: string | null = null
     if (customerId) {
-        dbQuery = dbQuery.eq('Customer_ID', customerId)
+        filterCustomerIds = [customerId]
     } else {
         // STRICT ISOLATION: Apply customer filter first if specific customer(s)
         // are selected. providedCustomerId may be a single id or a comma-separated
         // list (multi-select) — one → eq, many → in.
         const custIds = parseCustomerIds(providedCustomerId)
         if (custIds.length > 0) {
-            dbQuery = custIds.length === 1
-                ? dbQuery.eq('Customer_ID', custIds[0])
-                : dbQuery.in('Customer_ID', custIds)
+            filterCustomerIds = custIds
         } else if (!isSuper) {
             // No customer selected — enforce branch isolation for non-super admins
             if (branchId && branchId !== 'All') {
-                dbQuery = dbQuery.eq('Branch_ID', branchId)
+                filterBranchId = branchId
             } else {
                 return { data: [], count: 0 }
             }
         } else if (branchId && branchId !== 'All') {
             // Super admin with a specific branch selected
-            dbQuery = dbQuery.eq('Branch_ID', branchId)
+            filterBranchId = branchId
         }
     }
 
-    if (startDate) {
-      dbQuery = dbQuery.gte('Plan_Date', startDate)
-    }
-    if (endDate) {
-      dbQuery = dbQuery.lte('Plan_Date', endDate)
-    }
-
-    dbQuery = dbQuery
-      .order('Plan_Date', { ascending: false })
-      .order('Created_At', { ascending: false })
-    if (query) {
-      dbQuery = dbQuery.or(`Job_ID.ilike.%${query}%,Customer_Name.ilike.%${query}%,Route_Name.ilike.%${query}%,Notes.ilike.%${query}%`)
-    }
-
+    // UI REFINEMENT: Hide Drafts from History (They belong in Planning)
+    let excludedStatuses = ['Draft']
+    let statuses: string[] | null = null
+    let deliveryBefore: string | null = null
     if (overdueOnly) {
       // Jobs past their delivery date that are still not delivered/closed.
-      const excluded = ['Completed', 'Complete', 'Delivered', 'Verified', 'Billed', 'Paid', 'Cancelled', 'Failed', 'Draft', 'Requested']
-      dbQuery = dbQuery
-        .lt('Delivery_Date', todayTH())
-        .not('Job_Status', 'in', `(${excluded.map(s => `"${s}"`).join(',')})`)
+      excludedStatuses = ['Completed', 'Complete', 'Delivered', 'Verified', 'Billed', 'Paid', 'Cancelled', 'Failed', 'Draft', 'Requested']
+      deliveryBefore = todayTH()
     } else if (status) {
       // จับคู่ค่าจาก dropdown กับสถานะจริงใน DB (บางป้ายครอบหลายสถานะ)
       // เดิมใช้ eq ตรงตัวเลยกรองไม่ได้ ยกเว้น 'New' ที่บังเอิญตรง
@@ -341,77 +324,217 @@ export async function getAllJobs(
         'Failed': ['Failed'],
         'Cancelled': ['Cancelled'],
       }
-      const group = STATUS_GROUPS[status] || [status]
-      dbQuery = dbQuery.in('Job_Status', group)
+      statuses = STATUS_GROUPS[status] || [status]
     }
 
-    const { data, count } = await dbQuery.range(offset, offset + limit - 1)
+    // 'estimated' counts exactly up to the API row cap and switches to the
+    // planner's estimate beyond it, so deep result sets don't pay for a full count.
+    const scoped = (columns: string, options: { count: 'estimated', head?: boolean }) => {
+      let dbQuery = supabase
+        .from('Jobs_Main')
+        .select(columns, options)
+        .not('Job_Status', 'in', `(${excludedStatuses.map(s => `"${s}"`).join(',')})`)
+      if (filterCustomerIds) {
+        dbQuery = filterCustomerIds.length === 1
+          ? dbQuery.eq('Customer_ID', filterCustomerIds[0])
+          : dbQuery.in('Customer_ID', filterCustomerIds)
+      }
+      if (filterBranchId) dbQuery = dbQuery.eq('Branch_ID', filterBranchId)
+      if (startDate) dbQuery = dbQuery.gte('Plan_Date', startDate)
+      if (endDate) dbQuery = dbQuery.lte('Plan_Date', endDate)
+      if (statuses) dbQuery = dbQuery.in('Job_Status', statuses)
+      if (deliveryBefore) dbQuery = dbQuery.lt('Delivery_Date', deliveryBefore)
+      return dbQuery
+    }
+
+    if (query) {
+      // Ranked trigram search (search_jobs RPC, see
+      // supabase/migrations/20261018_jobs_search_trgm.sql); the count runs
+      // alongside on the same trigram indexes.
+      const [ranked, counted] = await Promise.all([
+        supabase
+          .rpc('search_jobs', {
+            q: query,
+            start_date: startDate || null,
+            end_date: endDate || null,
+            filter_branch_id: filterBranchId,
+            filter_customer_ids: filterCustomerIds,
+            statuses,
+            exclude_statuses: excludedStatuses,
+            delivery_before: deliveryBefore,
+            page_limit: limit,
+            page_offset: offset,
+          })
+          .select('*, container:jobs_container(*)'),
+        scoped('Job_ID', { count: 'estimated', head: true })
+          .or(`Job_ID.ilike.%${query}%,Customer_Name.ilike.%${query}%,Route_Name.ilike.%${query}%,Notes.ilike.%${query}%`)
+      ])
+
+      if (!ranked.error) {
+        return { data: (ranked.data || []) as unknown as Job[], count: counted.count || 0 }
+      }
+      console.warn('[getAllJobs] search_jobs unavailable, falling back to ilike:', ranked.error.message)
+    }
+
+    if (query) {
+      const { data, count } = await scoped('*, container:jobs_container(*)', { count: 'estimated' })
+        .or(`Job_ID.ilike.%${query}%,Customer_Name.ilike.%${query}%,Route_Name.ilike.%${query}%,Notes.ilike.%${query}%`)
+        .order('Plan_Date', { ascending: false })
+        .order('Created_At', { ascending: false })
+        .range(offset, offset + limit - 1)
+      return { data: (data || []) as unknown as Job[], count: count || 0 }
+    }
+
+    // Keyset pages: a cursor continues from the row it names, so page 500
+    // costs the same as page 1. Without one (direct page links) fall back to
+    // the offset and mint cursors for the pages around it.
+    const plan = keysetPlan(JOB_LIST_KEYS, decodeCursor(cursor, JOB_LIST_KEYS))
+    let dbQuery = scoped('*, container:jobs_container(*)', { count: 'estimated' })
+    for (const order of plan.orders) dbQuery = dbQuery.order(order.column, { ascending: order.ascending })
+    for (const f of plan.filters) dbQuery = dbQuery.filter(f.column, f.operator, f.value)
+    if (plan.or) dbQuery = dbQuery.or(plan.or)
+
+    const { data, count } = plan.cursor
+      ? await dbQuery.limit(limit + 1)
+      : await dbQuery.range(offset, offset + limit)
     
     if (data === null) {
       return { data: [], count: 0 }
     }
     
-    return { data: data || [], count: count || 0 }
+    const { rows, nextCursor, prevCursor } = keysetPage(JOB_LIST_KEYS, data as unknown as Job[], limit, plan, page > 1)
+    return { data: rows, count: count || 0, nextCursor, prevCursor }
   } catch {
     return { data: [], count: 0 }
   }
 }
 
+type JobCountFilters = {
+  startDate?: string | null
+  endDate?: string | null
+  branchId?: string | null
+  /** Also count jobs with Branch_ID 'All' or unset (shared drafts). */
+  includeSharedBranches?: boolean
+  customerIds?: string[] | null
+  customerNames?: string[] | null
+  search?: string | null
+}
+
+type JobStatusCount = {
+  job_status: string | null
+  jobs: number
+  loaded_qty: number
+  with_photo: number
+  with_signature: number
+}
+
+// Per-status counters computed in Postgres (job_status_counts RPC, see
+// supabase/migrations/20261018_job_status_counts.sql): one row per status
+// instead of every matching job, and no PostgREST row cap truncating the totals.
+// Falls back to scanning rows if the function isn't installed yet.
+async function countJobsByStatus(
+  supabase: SupabaseClient,
+  filters: JobCountFilters
+): Promise<JobStatusCount[]> {
+  const { data, error } = await supabase.rpc('job_status_counts', {
+    start_date: filters.startDate || null,
+    end_date: filters.endDate || null,
+    filter_branch_id: filters.branchId || null,
+    include_shared_branches: !!filters.includeSharedBranches,
+    filter_customer_ids: filters.customerIds?.length ? filters.customerIds : null,
+    filter_customer_names: filters.customerNames?.length ? filters.customerNames : null,
+    search: filters.search || null,
+  })
+  if (!error && data) {
+    return (data as JobStatusCount[]).map(r => ({
+      job_status: r.job_status,
+      jobs: Number(r.jobs) || 0,
+      loaded_qty: Number(r.loaded_qty) || 0,
+      with_photo: Number(r.with_photo) || 0,
+      with_signature: Number(r.with_signature) || 0,
+    }))
+  }
+  console.warn('[countJobsByStatus] RPC unavailable, scanning rows:', error?.message)
+
+  let dbQuery = supabase
+    .from('Jobs_Main')
+    .select('Job_Status, Loaded_Qty, Photo_Proof_Url, Signature_Url, Pickup_Photo_Url, Pickup_Signature_Url')
+  if (filters.startDate) dbQuery = dbQuery.gte('Plan_Date', filters.startDate)
+  if (filters.endDate) dbQuery = dbQuery.lte('Plan_Date', filters.endDate)
+  if (filters.branchId) {
+    dbQuery = filters.includeSharedBranches
+      ? dbQuery.or(`Branch_ID.eq.${filters.branchId},Branch_ID.eq.All,Branch_ID.is.null`)
+      : dbQuery.eq('Branch_ID', filters.branchId)
+  }
+  if (filters.customerIds?.length) dbQuery = dbQuery.in('Customer_ID', filters.customerIds)
+  if (filters.customerNames?.length) dbQuery = dbQuery.in('Customer_Name', filters.customerNames)
+  if (filters.search) {
+    dbQuery = dbQuery.or(`Job_ID.ilike.%${filters.search}%,Customer_Name.ilike.%${filters.search}%,Route_Name.ilike.%${filters.search}%`)
+  }
+
+  const { data: rows } = await dbQuery
+  const byStatus = new Map<string | null, JobStatusCount>()
+  for (const j of (rows || []) as Partial<Job>[]) {
+    const status = j.Job_Status ?? null
+    let entry = byStatus.get(status)
+    if (!entry) {
+      entry = { job_status: status, jobs: 0, loaded_qty: 0, with_photo: 0, with_signature: 0 }
+      byStatus.set(status, entry)
+    }
+    entry.jobs++
+    entry.loaded_qty += Number(j.Loaded_Qty) || 0
+    if (j.Photo_Proof_Url || j.Pickup_Photo_Url) entry.with_photo++
+    if (j.Signature_Url || j.Pickup_Signature_Url) entry.with_signature++
+  }
+  return Array.from(byStatus.values())
+}
+
+// Sum of jobs whose status is in `statuses`
+function sumJobs(counts: JobStatusCount[], statuses: string[]) {
+  return counts.reduce((sum, c) => sum + (statuses.includes(c.job_status || '') ? c.jobs : 0), 0)
+}
+
 // นับสถิติงานตามช่วงเวลา (Default: วันนี้)
 export async function getTodayJobStats(branchId?: string, startDate?: string, endDate?: string, customerNames?: string[], customerId?: string | null) {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
-    const loggedInCustomerId = await getCustomerId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId: loggedInCustomerId } = await getIdentity()
     const finalCustomerId = customerId || loggedInCustomerId
     const supabase = (isSuper || isRegularAdmin || finalCustomerId) ? await createAdminClient() : await createClient()
     const today = new Date().toLocaleDateString('en-CA', { timeZone: 'Asia/Bangkok' })
-    
-    let dbQuery = supabase
-      .from('Jobs_Main')
-      .select('Job_Status, Loaded_Qty')
 
-    if (startDate && endDate) {
-        dbQuery = dbQuery.gte('Plan_Date', startDate).lte('Plan_Date', endDate)
-    } else {
-        dbQuery = dbQuery.eq('Plan_Date', today)
-    }
+    const filters: JobCountFilters = (startDate && endDate)
+      ? { startDate, endDate }
+      : { startDate: today, endDate: today }
 
     if (finalCustomerId) {
-        dbQuery = dbQuery.eq('Customer_ID', finalCustomerId)
+        filters.customerIds = [finalCustomerId]
     } else {
         // STRICT ISOLATION: Non-SuperAdmins MUST be filtered by their branch (but can see unassigned 'null' or global 'All' drafts/jobs)
         if (!isSuper) {
             if (userBranchId && userBranchId !== 'All') {
-                dbQuery = dbQuery.or(`Branch_ID.eq.${userBranchId},Branch_ID.eq.All,Branch_ID.is.null`)
+                filters.branchId = userBranchId
+                filters.includeSharedBranches = true
             } else {
                 return { total: 0, delivered: 0, inProgress: 0, pending: 0, totalQty: 0 }
             }
         } else if (branchId && branchId !== 'All') {
             // SuperAdmin can filter by specific branch
-            dbQuery = dbQuery.eq('Branch_ID', branchId)
+            filters.branchId = branchId
         }
 
         if (customerNames && customerNames.length > 0) {
-            dbQuery = dbQuery.in('Customer_Name', customerNames)
+            filters.customerNames = customerNames
         }
     }
-    
-    const { data } = await dbQuery
-    
-    if (data === null) {
-      return { total: 0, delivered: 0, inProgress: 0, pending: 0, totalQty: 0 }
-    }
-    
-    const jobs = data || []
+
+    const counts = await countJobsByStatus(supabase, filters)
     return {
-      total: jobs.length,
-      delivered: jobs.filter((j: Partial<Job>) => j.Job_Status === 'Delivered' || j.Job_Status === 'Completed' || j.Job_Status === 'Verified').length,
-      inProgress: jobs.filter((j: Partial<Job>) => j.Job_Status === 'In Transit' || j.Job_Status === 'In Progress' || j.Job_Status === 'Arrived Pickup' || j.Job_Status === 'Arrived Dropoff').length,
-      pending: jobs.filter((j: Partial<Job>) => j.Job_Status === 'New' || j.Job_Status === 'Assigned' || j.Job_Status === 'Requested' || j.Job_Status === 'Pending').length,
-      sos: jobs.filter((j: Partial<Job>) => j.Job_Status === 'SOS').length,
-      totalQty: jobs.reduce((sum: number, j: Partial<Job>) => sum + (Number(j.Loaded_Qty) || 0), 0)
+      total: counts.reduce((sum, c) => sum + c.jobs, 0),
+      delivered: sumJobs(counts, ['Delivered', 'Completed', 'Verified']),
+      inProgress: sumJobs(counts, ['In Transit', 'In Progress', 'Arrived Pickup', 'Arrived Dropoff']),
+      pending: sumJobs(counts, ['New', 'Assigned', 'Requested', 'Pending']),
+      sos: sumJobs(counts, ['SOS']),
+      totalQty: counts.reduce((sum, c) => sum + c.loaded_qty, 0)
     }
   } catch {
     return { total: 0, delivered: 0, inProgress: 0, pending: 0, totalQty: 0 }
@@ -420,56 +543,40 @@ export async function getTodayJobStats(branchId?: string, startDate?: string, en
 
 export async function getJobStatsSummary(query = '', startDate = '', endDate = '', providedBranchId = '', providedCustomerId = '') {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
     const branchId = (isSuper || isRegularAdmin) ? (providedBranchId || userBranchId) : userBranchId
-    const customerId = await getCustomerId()
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
-    
-    let dbQuery = supabase
-      .from('Jobs_Main')
-      .select('Job_Status, Photo_Proof_Url, Signature_Url, Pickup_Photo_Url, Pickup_Signature_Url')
-    
+
+    const filters: JobCountFilters = { startDate, endDate, search: query }
+
     if (customerId) {
-        dbQuery = dbQuery.eq('Customer_ID', customerId)
+        filters.customerIds = [customerId]
     } else {
         // STRICT ISOLATION: specific customer(s) selected → filter to them.
         // providedCustomerId may be a comma-separated multi-select list.
         const custIds = parseCustomerIds(providedCustomerId)
         if (custIds.length > 0) {
-            dbQuery = custIds.length === 1
-                ? dbQuery.eq('Customer_ID', custIds[0])
-                : dbQuery.in('Customer_ID', custIds)
+            filters.customerIds = custIds
         } else if (!isSuper) {
             // No customer selected — enforce branch isolation for non-super admins
             if (branchId && branchId !== 'All') {
-                dbQuery = dbQuery.eq('Branch_ID', branchId)
+                filters.branchId = branchId
             } else {
                 return { success: 0, failed: 0, cancelled: 0, total: 0, withPhoto: 0, withSignature: 0 }
             }
         } else if (branchId && branchId !== 'All') {
-            dbQuery = dbQuery.eq('Branch_ID', branchId)
+            filters.branchId = branchId
         }
     }
 
-    if (startDate) dbQuery = dbQuery.gte('Plan_Date', startDate)
-    if (endDate) dbQuery = dbQuery.lte('Plan_Date', endDate)
-    if (query) {
-      dbQuery = dbQuery.or(`Job_ID.ilike.%${query}%,Customer_Name.ilike.%${query}%,Route_Name.ilike.%${query}%`)
-    }
-
-    const { data } = await dbQuery
-    
-    if (!data) return { success: 0, failed: 0, cancelled: 0, total: 0, withPhoto: 0, withSignature: 0 }
-    
+    const counts = await countJobsByStatus(supabase, filters)
     return {
-      total: data.length,
-      success: data.filter((j: Partial<Job>) => ['Delivered', 'Complete', 'Completed', 'Verified'].includes(j.Job_Status || '')).length,
-      failed: data.filter((j: Partial<Job>) => j.Job_Status === 'Failed').length,
-      cancelled: data.filter((j: Partial<Job>) => j.Job_Status === 'Cancelled').length,
-      withPhoto: data.filter((j: Partial<Job>) => j.Photo_Proof_Url || j.Pickup_Photo_Url).length,
-      withSignature: data.filter((j: Partial<Job>) => j.Signature_Url || j.Pickup_Signature_Url).length
+      total: counts.reduce((sum, c) => sum + c.jobs, 0),
+      success: sumJobs(counts, ['Delivered', 'Complete', 'Completed', 'Verified']),
+      failed: sumJobs(counts, ['Failed']),
+      cancelled: sumJobs(counts, ['Cancelled']),
+      withPhoto: counts.reduce((sum, c) => sum + c.with_photo, 0),
+      withSignature: counts.reduce((sum, c) => sum + c.with_signature, 0)
     }
   } catch {
     return { success: 0, failed: 0, cancelled: 0, total: 0, withPhoto: 0, withSignature: 0 }
@@ -480,10 +587,7 @@ export async function getJobStatsSummary(query = '', startDate = '', endDate = '
 // ยอดเงินวันนี้ (Estimated)
 export async function getTodayFinancials(branchId?: string) {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
-    const customerId = await getCustomerId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
     const today = todayTH()
 
@@ -529,8 +633,7 @@ export async function getDriverJobs(
   try {
     // USE admin client for driver-specific queries to bypass RLS 
     // since drivers use custom cookie auth, not Supabase Auth
-    const branchId = await getUserBranchId()
-    const isAdmin = await isSuperAdmin()
+    const { branchId, isSuper: isAdmin } = await getIdentity()
     const supabase = createAdminClient()
     
     let query = supabase
@@ -590,10 +693,7 @@ export async function getJobById(jobId: string): Promise<Job | null> {
     try {
         const decodedJobId = decodeURIComponent(jobId)
         const driverSession = await getDriverSession()
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
-        const branchId = await getUserBranchId()
-        const customerId = await getCustomerId()
+        const { isSuper, isAdmin: isRegularAdmin, branchId, customerId } = await getIdentity()
         
         // Use admin client if it's a driver or authorized user
         const supabase = (isSuper || isRegularAdmin || customerId || driverSession) ? createAdminClient() : await createClient()
@@ -708,10 +808,7 @@ async function enrichJobWithCustomerData(job: Job): Promise<Job> {
 // สถิติยอดจัดส่งย้อนหลัง 7 วัน
 export async function getWeeklyJobStats(branchId?: string) {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const userBranchId = await getUserBranchId()
-    const customerId = await getCustomerId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
     const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
     
     const today = new Date()
@@ -775,36 +872,27 @@ export async function getWeeklyJobStats(branchId?: string) {
 // สัดส่วนสถานะงาน (ทั้งหมด)
 export async function getJobStatusDistribution(branchId?: string) {
     try {
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
-        const userBranchId = await getUserBranchId()
-        const customerId = await getCustomerId()
+        const { isSuper, isAdmin: isRegularAdmin, branchId: userBranchId, customerId } = await getIdentity()
         const supabase = (isSuper || isRegularAdmin || customerId) ? await createAdminClient() : await createClient()
 
-        let dbQuery = supabase
-            .from('Jobs_Main')
-            .select('Job_Status')
+        const filters: JobCountFilters = {}
 
         if (customerId) {
-            dbQuery = dbQuery.eq('Customer_ID', customerId)
+            filters.customerIds = [customerId]
         } else {
             const effectiveBranchId = branchId || userBranchId
             if (effectiveBranchId && effectiveBranchId !== 'All') {
-                dbQuery = dbQuery.eq('Branch_ID', effectiveBranchId)
+                filters.branchId = effectiveBranchId
             } else if (!isSuper && !isRegularAdmin && !userBranchId) {
                 return []
             }
         }
 
-        const { data } = await dbQuery
-
-        if (!data) return []
-
         const statusCounts: Record<string, number> = {}
-        data?.forEach((job: Partial<Job>) => {
-            const status = job.Job_Status || 'Unknown'
-            statusCounts[status] = (statusCounts[status] || 0) + 1
-        })
+        for (const c of await countJobsByStatus(supabase, filters)) {
+            const status = c.job_status || 'Unknown'
+            statusCounts[status] = (statusCounts[status] || 0) + c.jobs
+        }
 
         // Map colors for common statuses
         const result = Object.entries(statusCounts).map(([name, value]) => ({
@@ -839,8 +927,7 @@ import { sanitizeJobData } from './utils'
 // สร้างงานใหม่
 export async function createJob(jobData: Partial<Job>) {
     try {
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
+        const { isSuper, isAdmin: isRegularAdmin } = await getIdentity()
         const supabase = (isSuper || isRegularAdmin) ? await createAdminClient() : await createClient()
         
         // Generate Job ID (Format: JOB-YYYYMMDD-XXXX)
@@ -848,7 +935,7 @@ export async function createJob(jobData: Partial<Job>) {
         const randomSuffix = Math.floor(Math.random() * 10000).toString().padStart(4, '0')
         const newJobId = `JOB-${dateStr}-${randomSuffix}`
 
-        const branchId = await getUserBranchId() || 'HQ'
+        const branchId = (await getIdentity()).branchId || 'HQ'
         let custTotal = Number(jobData.Price_Cust_Total) || 0
 
         let requiresIncentiveCheck = jobData.Requires_Incentive_Check || false
@@ -916,10 +1003,9 @@ export async function createJob(jobData: Partial<Job>) {
 // ดึงรายชื่อคนขับทั้งหมด (จากประวัติงาน)
 export async function getAllDrivers() {
     try {
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
+        const { isSuper, isAdmin: isRegularAdmin } = await getIdentity()
         const supabase = (isSuper || isRegularAdmin) ? await createAdminClient() : await createClient()
-        const branchId = await getUserBranchId()
+        const { branchId } = await getIdentity()
 
         let query = supabase
             .from('Jobs_Main')
@@ -957,10 +1043,9 @@ export async function getAllDrivers() {
 // ดึงรายชื่อรถทั้งหมด
 export async function getAllVehicles() {
     try {
-        const isSuper = await isSuperAdmin()
-        const isRegularAdmin = await isAdmin()
+        const { isSuper, isAdmin: isRegularAdmin } = await getIdentity()
         const supabase = (isSuper || isRegularAdmin) ? await createAdminClient() : await createClient()
-        const branchId = await getUserBranchId()
+        const { branchId } = await getIdentity()
 
         let query = supabase
             .from('Jobs_Main')
@@ -1002,10 +1087,7 @@ export async function getJobsForBilling(
     mode: 'customer' | 'driver' = 'customer'
 ): Promise<Job[]> {
     try {
-        const isSuper = await isSuperAdmin()
-        const _isRegularAdmin = await isAdmin()
-        const branchId = await getUserBranchId()
-        const sessionCustomerId = await getCustomerId()
+        const { isSuper, isAdmin: _isRegularAdmin, branchId, customerId: sessionCustomerId } = await getIdentity()
         const customerId = explicitCustomerId || sessionCustomerId
         
         // Billing, invoicing, and payout registries are highly privileged, administrative actions.
@@ -1222,9 +1304,7 @@ import { getSuggestedRate } from "@/lib/actions/fuel-actions"
 // Get billable jobs (Complete/Delivered and NOT yet invoiced)
 export async function getBillableJobs(customerId?: string, startDate?: string, endDate?: string) {
   try {
-    const isSuper = await isSuperAdmin()
-    const isRegularAdmin = await isAdmin()
-    const branchId = await getUserBranchId()
+    const { isSuper, isAdmin: isRegularAdmin, branchId } = await getIdentity()
     const supabase = (isSuper || isRegularAdmin) ? await createAdminClient() : await createClient()
 
     let dbQuery = supabase
@@ -1321,7 +1401,7 @@ export async function getMarketplaceJobs(providedBranchId?: string, customerId?:
   try {
     // Use Admin Client to bypass branch RLS so we can show global bidding pool
     const supabase = createAdminClient()
-    const loggedInCustomerId = await getCustomerId()
+    const { customerId: loggedInCustomerId } = await getIdentity()
     const finalCustomerId = customerId || loggedInCustomerId
 
     let dbQuery = supabase
@@ -1360,10 +1440,9 @@ export async function getMarketplaceJobs(providedBranchId?: string, customerId?:
 // ดึงการขอรถที่รอดำเนินการ (Requested) ทั้งหมด โดยไม่จำกัดวันที่
 export async function getRequestedJobs(providedBranchId?: string): Promise<Job[]> {
     try {
-        const isSuper = await isSuperAdmin()
+        const { isSuper } = await getIdentity()
         const supabase = createAdminClient()
-        const userBranchId = await getUserBranchId()
-        const customerId = await getCustomerId()
+        const { branchId: userBranchId, customerId } = await getIdentity()
         const branchId = providedBranchId && providedBranchId !== 'All' ? providedBranchId : userBranchId
 
         let dbQuery = supabase
@@ -2,6 +2,7 @@
 
 import { createClient, createAdminClient } from '@/utils/supabase/server'
 import { getUserBranchId, isSuperAdmin, isAdmin } from "@/lib/permissions"
+import { decodeCursor, keysetPage, keysetPlan, type KeysetKey } from "@/lib/utils/keyset"
 
 // Type matching actual Supabase schema (PascalCase columns!)
 export type Vehicle = {
@@ -171,9 +172,11 @@ export async function deleteVehicle(plate: string) {
   }
 }
 
+const VEHICLE_LIST_KEYS: KeysetKey[] = [{ column: 'Vehicle_Plate', ascending: true }]
+
 // Alias for planning page compatibility - returns { data: vehicles }
 // Also supports pagination for /vehicles page
-export async function getAllVehicles(page?: number, limit?: number, query?: string, providedBranchId?: string) {
+export async function getAllVehicles(page?: number, limit?: number, query?: string, providedBranchId?: string, cursor?: string) {
   try {
     const isSuper = await isSuperAdmin()
     const isAdminUser = await isAdmin()
@@ -186,14 +189,14 @@ export async function getAllVehicles(page?: number, limit?: number, query?: stri
     
     console.log(`[DB] Fetching Vehicles: Client=${clientType}, BranchID=${branchId}, Page=${page}`)
 
-    let queryBuilder = supabase.from('Master_Vehicles').select('*', { count: 'exact' })
+    let queryBuilder = supabase.from('Master_Vehicles').select('*', { count: 'estimated' })
     
     // STRICT ISOLATION
     if (!isSuper) {
         if (branchId && branchId !== 'All') {
             queryBuilder = queryBuilder.eq('Branch_ID', branchId)
         } else {
-            return { data: [], count: 0 }
+            return { data: [], count: 0, nextCursor: null, prevCursor: null }
         }
     } else if (providedBranchId && providedBranchId !== 'All') {
         queryBuilder = queryBuilder.eq('Branch_ID', providedBranchId)
@@ -203,17 +206,27 @@ export async function getAllVehicles(page?: number, limit?: number, query?: stri
       queryBuilder = queryBuilder.or(`Vehicle_Plate.ilike.%${query}%,Brand.ilike.%${query}%,Model.ilike.%${query}%`)
     }
     
+    // Keyset pages on Vehicle_Plate; page numbers stay as the entry point
+    const plan = keysetPlan(VEHICLE_LIST_KEYS, decodeCursor(cursor, VEHICLE_LIST_KEYS))
     if (page && limit) {
+      for (const order of plan.orders) queryBuilder = queryBuilder.order(order.column, { ascending: order.ascending })
+      for (const f of plan.filters) queryBuilder = queryBuilder.filter(f.column, f.operator, f.value)
       const from = (page - 1) * limit
-      const to = from + limit - 1
-      queryBuilder = queryBuilder.range(from, to)
+      queryBuilder = plan.cursor ? queryBuilder.limit(limit + 1) : queryBuilder.range(from, from + limit)
     }
     
-    const { data, error, count } = await queryBuilder
+    const { data: fetched, error, count } = await queryBuilder
     
     if (error) {
       console.error(`[DB] Vehicle Fetch Error:`, error.message, error.code)
-      return { data: [], count: 0 }
+      return { data: [], count: 0, nextCursor: null, prevCursor: null }
+    }
+
+    let data = fetched
+    let nextCursor: string | null = null
+    let prevCursor: string | null = null
+    if (page && limit) {
+      ({ rows: data, nextCursor, prevCursor } = keysetPage(VEHICLE_LIST_KEYS, fetched || [], limit, plan, page > 1))
     }
 
     // Manual Driver Mapping (since PGRST relationship may not be defined)
@@ -241,10 +254,10 @@ export async function getAllVehicles(page?: number, limit?: number, query?: stri
       Primary_Driver_Name: driverMap.get(v.Driver_ID || '') || null
     }))
     
-    return { data: mappedData, count: count || 0 }
+    return { data: mappedData, count: count || 0, nextCursor, prevCursor }
   } catch (err) {
     console.error(`[DB] Critical Failure in getAllVehicles:`, err)
-    return { data: [], count: 0 }
+    return { data: [], count: 0, nextCursor: null, prevCursor: null }
   }
 }
 
@@ -0,0 +1,23 @@
+/**
+ * Run `fn` over `items` with at most `limit` calls in flight.
+ *
+ * Results come back in input order. A rejected call rejects the whole map,
+ * so callers that want per-item outcomes should catch inside `fn`.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length)
+  let next = 0
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++
+      results[index] = await fn(items[index], index)
+    }
+  }
+  const workers = Math.max(1, Math.min(limit, items.length))
+  await Promise.all(Array.from({ length: workers }, worker))
+  return results
+}
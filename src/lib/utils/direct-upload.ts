@@ -0,0 +1,75 @@
+"use client"
+
+import { createClient } from "@/utils/supabase/client"
+import { createPodUploadTargets, type PodUploadKind } from "@/lib/actions/pod-actions"
+import { mapWithConcurrency } from "@/lib/utils/concurrency"
+
+const ASSETS_BUCKET = 'company-assets'
+const UPLOAD_CONCURRENCY = 3
+const UPLOAD_ATTEMPTS = 3
+
+// Blob -> public URL of its finished upload. Pressing submit again after a
+// dropped connection re-sends only the files that did not make it.
+const finished = new WeakMap<Blob, string>()
+
+export type PodFiles = {
+    photos: Blob[]
+    signature: Blob
+    report?: Blob | null
+    floorClimb?: Blob | null
+}
+
+export type PodFileUrls = {
+    photos: string[]
+    signature: string
+    report: string | null
+    floorClimb: string | null
+}
+
+/**
+ * Uploads a POD's photos, signature and reports straight to storage through
+ * signed upload URLs, a few at a time with retries, and returns their public
+ * URLs for submitJobPOD's `uploaded_urls` field. Throws when the targets
+ * cannot be issued or a file still fails after its retries.
+ */
+export async function uploadPodFiles(jobId: string, files: PodFiles): Promise<PodFileUrls> {
+    const entries: { kind: PodUploadKind; blob: Blob }[] = [
+        ...files.photos.map(blob => ({ kind: 'photo' as const, blob })),
+        { kind: 'signature', blob: files.signature },
+    ]
+    if (files.report) entries.push({ kind: 'report', blob: files.report })
+    if (files.floorClimb) entries.push({ kind: 'floor_climb', blob: files.floorClimb })
+
+    const todo = entries.filter(entry => !finished.has(entry.blob))
+    if (todo.length > 0) {
+        const signed = await createPodUploadTargets(
+            jobId,
+            todo.map(entry => ({ kind: entry.kind, contentType: entry.blob.type || 'image/jpeg' }))
+        )
+        if ('error' in signed) throw new Error(signed.error)
+        const targets = signed.targets
+
+        const bucket = createClient().storage.from(ASSETS_BUCKET)
+        await mapWithConcurrency(todo, UPLOAD_CONCURRENCY, async (entry, i) => {
+            const target = targets[i]
+            for (let attempt = 1; ; attempt++) {
+                const { error } = await bucket.uploadToSignedUrl(target.path, target.token, entry.blob, {
+                    contentType: entry.blob.type || 'image/jpeg',
+                    upsert: true,
+                })
+                if (!error) break
+                if (attempt >= UPLOAD_ATTEMPTS) throw error
+                await new Promise(resolve => setTimeout(resolve, 500 * 2 ** attempt))
+            }
+            finished.set(entry.blob, target.publicUrl)
+        })
+    }
+
+    const urlOf = (blob: Blob) => finished.get(blob) as string
+    return {
+        photos: files.photos.map(urlOf),
+        signature: urlOf(files.signature),
+        report: files.report ? urlOf(files.report) : null,
+        floorClimb: files.floorClimb ? urlOf(files.floorClimb) : null,
+    }
+}
@@ -0,0 +1,114 @@
+/**
+ * Fixed-size lat/lng grid for radius queries over many points.
+ *
+ * Building the grid buckets every item once; `withinRadius` then reads only
+ * the cells that overlap the search circle (3×3 around the point when the
+ * cell size matches the radius) instead of measuring against every item.
+ * `clusterWithinRadius` uses it for greedy bundling, so a branch's whole
+ * unassigned pool clusters in roughly linear time rather than O(n²).
+ */
+
+type LatLng = { lat: number; lng: number }
+
+export type GeoGrid<T> = {
+  cellDeg: number
+  cells: Map<number, { item: T; index: number; lat: number; lng: number }[]>
+}
+
+const KM_PER_DEG_LAT = 111.32
+
+export function haversineKm(lat1: number, lon1: number, lat2: number, lon2: number): number {
+  const R = 6371
+  const dLat = ((lat2 - lat1) * Math.PI) / 180
+  const dLon = ((lon2 - lon1) * Math.PI) / 180
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos((lat1 * Math.PI) / 180) * Math.cos((lat2 * Math.PI) / 180) * Math.sin(dLon / 2) ** 2
+  return R * 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a))
+}
+
+// Cell indices stay well under 1e6 for any cell of 100 m or more
+const cellKey = (latCell: number, lngCell: number) => latCell * 1e6 + lngCell
+
+/** Bucket `items` by the point `pointOf` returns; items without one are left out. */
+export function buildGeoGrid<T>(items: T[], pointOf: (item: T) => LatLng | null, cellKm: number): GeoGrid<T> {
+  const cellDeg = Math.max(cellKm, 0.1) / KM_PER_DEG_LAT
+  const cells: GeoGrid<T>['cells'] = new Map()
+  items.forEach((item, index) => {
+    const p = pointOf(item)
+    if (!p || !Number.isFinite(p.lat) || !Number.isFinite(p.lng)) return
+    const key = cellKey(Math.floor(p.lat / cellDeg), Math.floor(p.lng / cellDeg))
+    const entry = { item, index, lat: p.lat, lng: p.lng }
+    const bucket = cells.get(key)
+    if (bucket) bucket.push(entry)
+    else cells.set(key, [entry])
+  })
+  return { cellDeg, cells }
+}
+
+function query<T>(
+  grid: GeoGrid<T>,
+  lat: number,
+  lng: number,
+  radiusKm: number,
+  accept: (item: T, index: number) => boolean
+): { item: T; index: number }[] {
+  const { cellDeg } = grid
+  const latSpan = Math.ceil(radiusKm / KM_PER_DEG_LAT / cellDeg)
+  // A degree of longitude shrinks with latitude; widen the column span to match
+  const cosLat = Math.max(Math.cos((lat * Math.PI) / 180), 0.01)
+  const lngSpan = Math.ceil(radiusKm / (KM_PER_DEG_LAT * cosLat) / cellDeg)
+  const latCell = Math.floor(lat / cellDeg)
+  const lngCell = Math.floor(lng / cellDeg)
+
+  const hits: { item: T; index: number }[] = []
+  for (let i = latCell - latSpan; i <= latCell + latSpan; i++) {
+    for (let j = lngCell - lngSpan; j <= lngCell + lngSpan; j++) {
+      const bucket = grid.cells.get(cellKey(i, j))
+      if (!bucket) continue
+      for (const entry of bucket) {
+        if (!accept(entry.item, entry.index)) continue
+        if (haversineKm(lat, lng, entry.lat, entry.lng) <= radiusKm) hits.push(entry)
+      }
+    }
+  }
+  return hits.sort((a, b) => a.index - b.index)
+}
+
+/**
+ * Items within `radiusKm` of the point, in their original order. `accept`
+ * runs before the distance check, so cheap exclusions skip the haversine.
+ */
+export function withinRadius<T>(
+  grid: GeoGrid<T>,
+  lat: number,
+  lng: number,
+  radiusKm: number,
+  accept: (item: T, index: number) => boolean = () => true
+): T[] {
+  return query(grid, lat, lng, radiusKm, accept).map(h => h.item)
+}
+
+/**
+ * Greedy clustering in input order: each item not yet clustered becomes a
+ * pivot and takes every other unclustered item within `radiusKm` of it.
+ * Items with no neighbour are not returned.
+ */
+export function clusterWithinRadius<T>(items: T[], pointOf: (item: T) => LatLng | null, radiusKm: number): { pivot: T; members: T[] }[] {
+  const grid = buildGeoGrid(items, pointOf, radiusKm)
+  const handled = new Uint8Array(items.length)
+  const clusters: { pivot: T; members: T[] }[] = []
+
+  items.forEach((pivot, pivotIndex) => {
+    if (handled[pivotIndex]) return
+    const p = pointOf(pivot)
+    if (!p) return
+    const hits = query(grid, p.lat, p.lng, radiusKm, (_, index) => index !== pivotIndex && !handled[index])
+    if (hits.length === 0) return
+
+    clusters.push({ pivot, members: hits.map(h => h.item) })
+    handled[pivotIndex] = 1
+    hits.forEach(h => { handled[h.index] = 1 })
+  })
+  return clusters
+}
@@ -1,5 +1,7 @@
 "use client"
 
+import type { CompressResponse } from "./image-compression.worker"
+
 /**
  * Compresses an image file using HTML5 Canvas.
  * @param file The original image file
@@ -73,3 +75,62 @@ export async function compressImage(
         img.src = url
     })
 }
+
+let worker: Worker | null = null
+let nextRequestId = 0
+const waiting = new Map<number, { resolve: (blob: Blob) => void; reject: (err: Error) => void }>()
+
+function compressionWorker(): Worker | null {
+    if (worker) return worker
+    if (typeof Worker === 'undefined' || typeof OffscreenCanvas === 'undefined' || typeof createImageBitmap === 'undefined') {
+        return null
+    }
+    try {
+        worker = new Worker(new URL('./image-compression.worker.ts', import.meta.url), { type: 'module' })
+    } catch {
+        return null
+    }
+    worker.onmessage = ({ data }: MessageEvent<CompressResponse>) => {
+        const pending = waiting.get(data.id)
+        if (!pending) return
+        waiting.delete(data.id)
+        if (data.blob) pending.resolve(data.blob)
+        else pending.reject(new Error(data.error || 'Compression failed'))
+    }
+    worker.onerror = () => {
+        // A worker that fails to load fails every request; drop it so the
+        // callers (and later ones) fall back to the main-thread canvas.
+        waiting.forEach(p => p.reject(new Error('Compression worker failed')))
+        waiting.clear()
+        worker?.terminate()
+        worker = null
+    }
+    return worker
+}
+
+/**
+ * Downsizes and re-encodes a photo in a Web Worker, as WebP where the browser
+ * can encode it and JPEG otherwise, so decoding a 4–8 MB camera photo never
+ * blocks the page. Falls back to `compressImage` on the main thread when
+ * OffscreenCanvas is unavailable or the worker fails.
+ */
+export async function compressImageOffThread(
+    file: File,
+    maxWidth: number = 1280,
+    maxHeight: number = 1280,
+    quality: number = 0.7
+): Promise<Blob> {
+    const target = compressionWorker()
+    if (target) {
+        try {
+            return await new Promise<Blob>((resolve, reject) => {
+                const id = nextRequestId++
+                waiting.set(id, { resolve, reject })
+                target.postMessage({ id, file, maxWidth, maxHeight, quality, type: 'image/webp' })
+            })
+        } catch (err) {
+            console.warn('[compressImageOffThread] falling back to main thread:', err)
+        }
+    }
+    return compressImage(file, maxWidth, maxHeight, quality)
+}
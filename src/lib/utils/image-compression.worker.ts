@@ -0,0 +1,44 @@
+/**
+ * Off-main-thread photo downsizing for compressImageOffThread.
+ *
+ * Decodes with createImageBitmap, scales into an OffscreenCanvas and encodes
+ * to the requested type. Browsers without that encoder (Safari has no WebP)
+ * hand back PNG, in which case the image is re-encoded as JPEG instead.
+ */
+
+export type CompressRequest = {
+    id: number
+    file: Blob
+    maxWidth: number
+    maxHeight: number
+    quality: number
+    type: string
+}
+
+export type CompressResponse = { id: number; blob?: Blob; error?: string }
+
+// The project compiles against the DOM lib; describe just the worker scope we use.
+const scope = self as unknown as {
+    onmessage: ((event: MessageEvent<CompressRequest>) => void) | null
+    postMessage(message: CompressResponse): void
+}
+
+scope.onmessage = async ({ data }) => {
+    try {
+        const bitmap = await createImageBitmap(data.file)
+        const scale = Math.min(1, data.maxWidth / bitmap.width, data.maxHeight / bitmap.height)
+        const canvas = new OffscreenCanvas(Math.round(bitmap.width * scale), Math.round(bitmap.height * scale))
+        const ctx = canvas.getContext('2d')
+        if (!ctx) throw new Error('Failed to get 2D context')
+        ctx.drawImage(bitmap, 0, 0, canvas.width, canvas.height)
+        bitmap.close()
+
+        let blob = await canvas.convertToBlob({ type: data.type, quality: data.quality })
+        if (blob.type !== data.type) {
+            blob = await canvas.convertToBlob({ type: 'image/jpeg', quality: data.quality })
+        }
+        scope.postMessage({ id: data.id, blob })
+    } catch (err) {
+        scope.postMessage({ id: data.id, error: err instanceof Error ? err.message : String(err) })
+    }
+}
@@ -0,0 +1,89 @@
+/**
+ * Chunking and resume bookkeeping for large Excel imports (ExcelImport).
+ *
+ * A sheet is sent in fixed-size chunks, one server action call each. After a
+ * chunk is acknowledged its index is stored in localStorage under the file's
+ * fingerprint, so an import interrupted by a closed tab or a dropped
+ * connection picks up at the next chunk when the same file is chosen again.
+ */
+
+export type ImportChunk = {
+  /** Stable id for the whole import; identical across resumes. */
+  importId: string
+  /** Index of the chunk's first row in the sheet. */
+  offset: number
+  index: number
+  total: number
+}
+
+export type ImportProgress = {
+  importId: string
+  /** First chunk not yet acknowledged by the server. */
+  nextChunk: number
+  totalChunks: number
+  chunkSize: number
+  rows: number
+  options: string
+}
+
+const STORAGE_PREFIX = 'tms:import:'
+
+/**
+ * Split `rows` into chunks of about `size` rows. When `canSplitBefore` is
+ * given a chunk only ends right before a row it accepts, so multi-row records
+ * (master-sheet grouping) never straddle two chunks.
+ */
+export function splitImportChunks<T>(
+  rows: T[],
+  size: number,
+  canSplitBefore?: (row: T) => boolean
+): { offset: number; rows: T[] }[] {
+  const chunks: { offset: number; rows: T[] }[] = []
+  let start = 0
+  while (start < rows.length) {
+    let end = Math.min(start + size, rows.length)
+    if (canSplitBefore) {
+      while (end < rows.length && !canSplitBefore(rows[end])) end++
+    }
+    chunks.push({ offset: start, rows: rows.slice(start, end) })
+    start = end
+  }
+  return chunks
+}
+
+export function importFingerprint(file: File): string {
+  return `${STORAGE_PREFIX}${file.name}:${file.size}:${file.lastModified}`
+}
+
+export function newImportId(): string {
+  return `${Date.now().toString(36)}${Math.random().toString(36).slice(2, 6)}`.toUpperCase()
+}
+
+export function loadImportProgress(key: string): ImportProgress | null {
+  try {
+    const raw = localStorage.getItem(key)
+    return raw ? (JSON.parse(raw) as ImportProgress) : null
+  } catch {
+    return null
+  }
+}
+
+export function saveImportProgress(key: string, progress: ImportProgress) {
+  try {
+    localStorage.setItem(key, JSON.stringify(progress))
+  } catch {
+    // Storage full or disabled: the import still runs, it just cannot resume.
+  }
+}
+
+export function clearImportProgress(key: string) {
+  try {
+    localStorage.removeItem(key)
+  } catch { /* ignore */ }
+}
+
+/** Resolves once the browser reports it is back online. */
+export function waitForOnline(): Promise<void> {
+  if (typeof navigator === 'undefined' || navigator.onLine) return Promise.resolve()
+  return new Promise(resolve => window.addEventListener('online', () => resolve(), { once: true }))
+}
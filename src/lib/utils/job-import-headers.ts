@@ -0,0 +1,161 @@
+/**
+ * Header resolution for Excel/CSV job imports (createBulkJobs).
+ *
+ * A sheet's columns are matched against the accepted Thai/English aliases once
+ * per upload instead of once per cell: `resolveHeaders` turns the header list
+ * into a plan (canonical field -> sheet keys, in alias priority order) and
+ * `readAliased` then reads each row through that plan with plain lookups.
+ * Plans are cached by header signature, so repeat uploads of the same template
+ * skip resolution entirely.
+ */
+
+/** Accepted headers per canonical field, highest priority first. */
+export const JOB_IMPORT_ALIASES: Record<string, readonly string[]> = {
+  Job_ID: ['Job_ID', 'id', 'รหัสงาน'],
+  Plan_Date: ['Plan_Date', 'date', 'วันที่แผน', 'วันที่'],
+  Delivery_Date: ['Delivery_Date', 'delivery_date', 'วันจัดส่ง', 'วันที่จัดส่ง', 'วันส่ง'],
+  Customer_ID: ['Customer_ID', 'cust_id', 'รหัสลูกค้า'],
+  Customer_Name: ['Customer_Name', 'customer', 'ลูกค้า', 'ชื่อลูกค้า'],
+  Route_Name: ['Route_Name', 'route', 'เส้นทาง'],
+  Driver_ID: ['Driver_ID', 'driver', 'รหัสคนขับ'],
+  Vehicle_Plate: ['Vehicle_Plate', 'plate', 'ทะเบียนรถ', 'ทะเบียน'],
+  Vehicle_Type: ['Vehicle_Type', 'vehicle_type', 'ประเภทรถ', 'ชนิดรถ'],
+  Weight_Kg: ['Weight_Kg', 'weight', 'น้ำหนัก', 'น้ำหนักสินค้า'],
+  Volume_Cbm: ['Volume_Cbm', 'volume', 'ปริมาตร', 'คิว'],
+  Price_Cust_Total: ['Price_Cust_Total', 'price', 'รายได้', 'ราคาขาย', 'ราคาลูกค้า'],
+  Cost_Driver_Total: ['Cost_Driver_Total', 'cost', 'ต้นทุน', 'ค่ารถ', 'จ่ายคนขับ', 'ค่าเที่ยว'],
+  Notes: ['Notes', 'remark', 'หมายเหตุ'],
+  Ref_No: ['Ref_No', 'so', 'do', 'เลขที่อ้างอิง'],
+  Branch_ID: ['Branch_ID', 'branch', 'สาขา'],
+  Job_Status: ['Job_Status', 'status', 'สถานะ'],
+
+  Origin_Location: ['Origin_Location', 'origin', 'ต้นทาง', 'รับที่'],
+  Dest_Location: ['Dest_Location', 'destination', 'ปลายทาง', 'ส่งที่'],
+  Est_Distance_KM: ['Est_Distance_KM', 'distance', 'km', 'ระยะทาง', 'กิโลเมตร'],
+  Pickup_Lat: ['pickup_lat', 'origin_lat', 'lat_start', 'ละติจูดต้นทาง', 'lat_ต้นทาง'],
+  Pickup_Lon: ['pickup_lon', 'origin_lon', 'lon_start', 'ลองติจูดต้นทาง', 'lon_ต้นทาง'],
+  Delivery_Lat: ['delivery_lat', 'dest_lat', 'lat_end', 'ละติจูดปลายทาง', 'lat_ปลายทาง'],
+  Delivery_Lon: ['delivery_lon', 'dest_lon', 'lon_end', 'ลองติจูดปลายทาง', 'lon_ปลายทาง'],
+  Show_Price_To_Driver: ['Show_Price_To_Driver', 'show_price', 'การแสดงรายได้'],
+  Round: ['Round', 'trip', 'รอบ', 'เที่ยว', 'รอบวิ่ง', 'ลำดับรอบ'],
+
+  // Container Fields
+  job_type: ['job_type', 'ประเภทงาน'],
+  chassis_plate: ['chassis_plate', 'ทะเบียนหาง', 'หางลาก'],
+  container_no: ['container_no', 'หมายเลขตู้', 'เลขตู้'],
+  seal_no: ['seal_no', 'หมายเลขซีล', 'เลขซีล'],
+  container_size: ['container_size', 'ขนาดตู้'],
+  shipping_line: ['shipping_line', 'สายเรือ'],
+  vessel_voyage: ['vessel_voyage', 'เรือ/เที่ยว'],
+  lfd_demurrage: ['lfd_demurrage', 'LFD Demurrage'],
+  lfd_detention: ['lfd_detention', 'LFD Detention'],
+  target_temperature: ['target_temperature', 'อุณหภูมิเป้าหมาย'],
+}
+
+export type HeaderPlan = {
+  /** Canonical field -> sheet keys to try, in alias priority order. */
+  fields: [field: string, keys: string[]][]
+  /** Numbered extra origin columns (ต้นทาง2, origin 3, ...) in drop order. */
+  extraOrigins: string[]
+  /** Numbered extra destination columns (ปลายทาง2, dest3, ...) in drop order. */
+  extraDestinations: string[]
+}
+
+const MAX_CACHED_PLANS = 64
+const planCache = new Map<string, HeaderPlan>()
+
+const normalizeHeader = (key: string) => key.toLowerCase().replace(/\s+/g, '_')
+
+const dropNumber = (key: string) => parseInt(key.match(/\d+/)?.[0] || '0')
+
+const numberedColumns = (keys: string[], prefixes: string[]) =>
+  keys.filter(k => {
+    const nk = k.toLowerCase().replace(/\s+/g, '')
+    return prefixes.some(p => nk.startsWith(p)) &&
+           /\d+/.test(nk) &&
+           !nk.includes('lat') && !nk.includes('lon')
+  }).sort((a, b) => dropNumber(a) - dropNumber(b))
+
+/**
+ * Every distinct key across `rows`, in first-seen (column) order.
+ * SheetJS omits empty cells, so a single row may not carry every header.
+ */
+export function collectHeaders(rows: object[]): string[] {
+  const seen = new Set<string>()
+  for (const row of rows) {
+    for (const key of Object.keys(row)) seen.add(key)
+  }
+  return Array.from(seen)
+}
+
+/** Resolve sheet headers to canonical fields; cached per header signature. */
+export function resolveHeaders(headers: string[]): HeaderPlan {
+  const signature = headers.join('\u0000')
+  const cached = planCache.get(signature)
+  if (cached) return cached
+
+  const byNormalized = new Map<string, string[]>()
+  for (const header of headers) {
+    const nk = normalizeHeader(header)
+    const keys = byNormalized.get(nk)
+    if (keys) keys.push(header)
+    else byNormalized.set(nk, [header])
+  }
+
+  const fields: HeaderPlan['fields'] = []
+  for (const [field, aliases] of Object.entries(JOB_IMPORT_ALIASES)) {
+    const keys = aliases.flatMap(alias => byNormalized.get(normalizeHeader(alias)) ?? [])
+    fields.push([field, Array.from(new Set(keys))])
+  }
+
+  const plan: HeaderPlan = {
+    fields,
+    extraOrigins: numberedColumns(headers, ['ต้นทาง', 'origin']),
+    extraDestinations: numberedColumns(headers, ['ปลายทาง', 'destination', 'dest']),
+  }
+
+  if (planCache.size >= MAX_CACHED_PLANS) {
+    planCache.delete(planCache.keys().next().value as string)
+  }
+  planCache.set(signature, plan)
+  return plan
+}
+
+const IDENTITY_FIELDS = ['Job_ID', 'Customer_ID', 'Customer_Name']
+
+/**
+ * Split rule for master-sheet grouping: the returned predicate is true when a
+ * row opens a job (it carries a job ID or customer); rows that don't are extra
+ * drops of the job above. Chunked imports only split before such rows. The
+ * header plan is resolved once for the whole sheet.
+ */
+export function importJobStarts(rows: object[]): (row: object) => boolean {
+  const identityKeys = resolveHeaders(collectHeaders(rows)).fields
+    .filter(([field]) => IDENTITY_FIELDS.includes(field))
+    .flatMap(([, keys]) => keys)
+  return row => {
+    const record = row as Record<string, unknown>
+    return identityKeys.some(k => record[k] !== undefined && record[k] !== null && String(record[k]).trim() !== '')
+  }
+}
+
+/**
+ * Canonical field values for one row: the first non-null value among the
+ * field's resolved keys, or undefined when the sheet has none.
+ */
+export function readAliased(row: object, plan: HeaderPlan): Record<string, unknown> {
+  const record = row as Record<string, unknown>
+  const normalized: Record<string, unknown> = {}
+  for (const [field, keys] of plan.fields) {
+    let value: unknown = undefined
+    for (const key of keys) {
+      const v = record[key]
+      if (v !== undefined && v !== null) {
+        value = v
+        break
+      }
+    }
+    normalized[field] = value
+  }
+  return normalized
+}
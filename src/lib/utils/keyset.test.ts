@@ -0,0 +1,218 @@
+import { describe, it, expect } from 'vitest'
+import { decodeCursor, encodeCursor, keysetPage, keysetPlan, type KeysetKey, type KeysetPlan } from './keyset'
+
+type Row = Record<string, string | number | null>
+
+// ── A tiny PostgREST stand-in: applies a plan's filters, or() and order to rows ──
+
+// Split on top-level commas, leaving commas inside (...) and "..." alone
+function splitList(input: string): string[] {
+  const parts: string[] = []
+  let depth = 0
+  let quoted = false
+  let current = ''
+  for (let i = 0; i < input.length; i++) {
+    const ch = input[i]
+    if (quoted && ch === '\\') {
+      current += ch + input[++i]
+      continue
+    }
+    if (ch === '"') quoted = !quoted
+    else if (!quoted && ch === '(') depth++
+    else if (!quoted && ch === ')') depth--
+    if (!quoted && depth === 0 && ch === ',') {
+      parts.push(current)
+      current = ''
+    } else {
+      current += ch
+    }
+  }
+  parts.push(current)
+  return parts
+}
+
+const unquote = (raw: string) => raw.startsWith('"') ? raw.slice(1, -1).replace(/\\(.)/g, '$1') : raw
+
+function compare(a: string | number, b: string): number {
+  if (typeof a === 'number') return a - Number(b)
+  return a < b ? -1 : a > b ? 1 : 0
+}
+
+function applyFilter(row: Row, column: string, operator: string, raw: string): boolean {
+  const value = row[column]
+  if (operator === 'is') return raw === 'null' ? value === null : false
+  if (operator === 'not.is') return raw === 'null' ? value !== null : false
+  if (value === null) return false // SQL comparisons with NULL are never true
+  const c = compare(value, unquote(raw))
+  return { gt: c > 0, gte: c >= 0, lt: c < 0, lte: c <= 0, eq: c === 0 }[operator] ?? false
+}
+
+function matches(row: Row, expr: string): boolean {
+  const group = expr.match(/^(and|or)\((.*)\)$/)
+  if (group) {
+    const terms = splitList(group[2])
+    return group[1] === 'and' ? terms.every(t => matches(row, t)) : terms.some(t => matches(row, t))
+  }
+  const [, column, operator, raw] = expr.match(/^([^.]+)\.(not\.is|is|gte|gt|lte|lt|eq)\.(.*)$/)!
+  return applyFilter(row, column, operator, raw)
+}
+
+function runPlan(rows: Row[], plan: KeysetPlan, limit: number): Row[] {
+  const filtered = rows.filter(row =>
+    plan.filters.every(f => applyFilter(row, f.column, f.operator, f.value)) &&
+    (plan.or === null || matches(row, `or(${plan.or})`))
+  )
+  return filtered.sort((a, b) => {
+    for (const { column, ascending } of plan.orders) {
+      const x = a[column]
+      const y = b[column]
+      if (x === y) continue
+      // Postgres defaults: NULLS LAST ascending, NULLS FIRST descending
+      if (x === null) return ascending ? 1 : -1
+      if (y === null) return ascending ? -1 : 1
+      const c = compare(x, String(y))
+      return ascending ? c : -c
+    }
+    return 0
+  }).slice(0, limit + 1)
+}
+
+function fetchPage(rows: Row[], keys: KeysetKey[], token: string | null, limit: number) {
+  const plan = keysetPlan(keys, decodeCursor(token, keys))
+  return keysetPage(keys, runPlan(rows, plan, limit), limit, plan)
+}
+
+// Every page forwards, then back again from the last page via prevCursor
+function walk(rows: Row[], keys: KeysetKey[], limit: number) {
+  const forward: Row[][] = []
+  let page = fetchPage(rows, keys, null, limit)
+  forward.push(page.rows)
+  while (page.nextCursor) {
+    page = fetchPage(rows, keys, page.nextCursor, limit)
+    if (page.rows.length) forward.push(page.rows)
+  }
+  const backward: Row[][] = [page.rows]
+  while (page.prevCursor) {
+    page = fetchPage(rows, keys, page.prevCursor, limit)
+    if (page.rows.length) backward.unshift(page.rows)
+  }
+  return { forward, backward }
+}
+
+const sortedIds = (rows: Row[], keys: KeysetKey[]) =>
+  runPlan(rows, keysetPlan(keys, null), rows.length).map(r => r.id)
+
+const ROWS: Row[] = [
+  { id: 'J01', date: '2026-10-01', price: 100 },
+  { id: 'J02', date: null, price: 250 },
+  { id: 'J03', date: '2026-10-03', price: null },
+  { id: 'J04', date: '2026-10-01', price: 100 },
+  { id: 'J05', date: null, price: null },
+  { id: 'J06', date: '2026-10-02', price: 75 },
+  { id: 'J07', date: '2026-10-03', price: 250 },
+  { id: 'J08', date: null, price: 100 },
+  { id: 'J09', date: '2026-10-02', price: null },
+  { id: 'J10', date: '2026-10-04', price: 75 },
+]
+
+describe('keysetPlan / keysetPage', () => {
+  const cases: [string, KeysetKey[]][] = [
+    ['nullable descending key', [{ column: 'date', ascending: false, nullable: true }, { column: 'id', ascending: true }]],
+    ['nullable ascending key', [{ column: 'date', ascending: true, nullable: true }, { column: 'id', ascending: false }]],
+    ['nullable numeric middle key', [
+      { column: 'price', ascending: true, nullable: true },
+      { column: 'date', ascending: false, nullable: true },
+      { column: 'id', ascending: true },
+    ]],
+    ['single non-null key', [{ column: 'id', ascending: false }]],
+  ]
+
+  for (const [name, keys] of cases) {
+    it(`pages through every row exactly once (${name})`, () => {
+      for (const limit of [1, 2, 3, 4]) {
+        const { forward } = walk(ROWS, keys, limit)
+        expect(forward.flat().map(r => r.id)).toEqual(sortedIds(ROWS, keys))
+      }
+    })
+
+    it(`prev pages return the same pages in reverse (${name})`, () => {
+      for (const limit of [2, 3]) {
+        const { forward, backward } = walk(ROWS, keys, limit)
+        expect(backward.flat().map(r => r.id)).toEqual(forward.flat().map(r => r.id))
+        expect(backward.map(p => p.map(r => r.id))).toEqual(forward.map(p => p.map(r => r.id)))
+      }
+    })
+  }
+
+  it('continues after a NULL boundary on an ascending nullable key', () => {
+    const keys: KeysetKey[] = [{ column: 'date', ascending: true, nullable: true }, { column: 'id', ascending: true }]
+    const plan = keysetPlan(keys, { values: [null, 'J02'], direction: 'next' })
+    expect(runPlan(ROWS, plan, 10).map(r => r.id)).toEqual(['J05', 'J08'])
+    expect(plan.filters).toEqual([])
+  })
+
+  it('moves past the NULL group on a descending nullable key', () => {
+    const keys: KeysetKey[] = [{ column: 'date', ascending: false, nullable: true }, { column: 'id', ascending: true }]
+    const plan = keysetPlan(keys, { values: [null, 'J08'], direction: 'next' })
+    expect(runPlan(ROWS, plan, 10).map(r => r.id)[0]).toBe('J10')
+    expect(runPlan(ROWS, plan, 10)).toHaveLength(7)
+  })
+
+  it('matches nothing after a trailing NULL on a single ascending nullable key', () => {
+    const keys: KeysetKey[] = [{ column: 'price', ascending: true, nullable: true }]
+    const plan = keysetPlan(keys, { values: [null], direction: 'next' })
+    expect(runPlan(ROWS, plan, 10)).toEqual([])
+  })
+
+  it('uses a plain filter for a single non-null key', () => {
+    const keys: KeysetKey[] = [{ column: 'id', ascending: true }]
+    const plan = keysetPlan(keys, { values: ['J04'], direction: 'next' })
+    expect(plan.or).toBeNull()
+    expect(plan.filters).toEqual([{ column: 'id', operator: 'gt', value: 'J04' }])
+
+    const prev = keysetPlan(keys, { values: ['J04'], direction: 'prev' })
+    expect(prev.orders).toEqual([{ column: 'id', ascending: false }])
+    expect(prev.filters).toEqual([{ column: 'id', operator: 'lt', value: 'J04' }])
+  })
+
+  it('quotes commas, quotes and parentheses inside or()', () => {
+    const rows: Row[] = [
+      { id: '1', name: 'Acme, Inc.' },
+      { id: '2', name: 'Acme, Inc.' },
+      { id: '3', name: 'Bo "Big" (Co)' },
+      { id: '4', name: 'Bo "Big" (Co)' },
+      { id: '5', name: 'C\\D' },
+      { id: '6', name: 'Zed' },
+    ]
+    const keys: KeysetKey[] = [{ column: 'name', ascending: true }, { column: 'id', ascending: true }]
+
+    const plan = keysetPlan(keys, { values: ['Bo "Big" (Co)', '3'], direction: 'next' })
+    expect(plan.or).toContain('"Bo \\"Big\\" (Co)"')
+    expect(runPlan(rows, plan, 10).map(r => r.id)).toEqual(['4', '5', '6'])
+
+    const { forward, backward } = walk(rows, keys, 1)
+    expect(forward.flat().map(r => r.id)).toEqual(['1', '2', '3', '4', '5', '6'])
+    expect(backward.flat().map(r => r.id)).toEqual(['1', '2', '3', '4', '5', '6'])
+  })
+})
+
+describe('decodeCursor', () => {
+  const keys: KeysetKey[] = [{ column: 'date', ascending: false, nullable: true }, { column: 'id', ascending: true }]
+
+  it('round-trips values and direction', () => {
+    const cursor = { values: [null, 'J,01 "x"'], direction: 'prev' as const }
+    expect(decodeCursor(encodeCursor(cursor), keys)).toEqual(cursor)
+  })
+
+  it('returns null for missing, malformed or foreign tokens', () => {
+    const b64 = (value: string) => Buffer.from(value).toString('base64url')
+    expect(decodeCursor(null, keys)).toBeNull()
+    expect(decodeCursor('', keys)).toBeNull()
+    expect(decodeCursor('not a token!', keys)).toBeNull()
+    expect(decodeCursor(b64('{"v":'), keys)).toBeNull()
+    expect(decodeCursor(b64('null'), keys)).toBeNull()
+    expect(decodeCursor(b64('{"v":"J01","d":"n"}'), keys)).toBeNull()
+    // minted for a list with a different number of sort keys
+    expect(decodeCursor(encodeCursor({ values: ['J01'], direction: 'next' }), keys)).toBeNull()
+  })
+})
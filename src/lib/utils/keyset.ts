@@ -0,0 +1,130 @@
+/**
+ * Keyset (cursor) pagination for PostgREST list queries.
+ *
+ * `.range(offset, ...)` makes Postgres walk and discard every row before the
+ * page, so deep pages get slower the further you go. A keyset page instead
+ * asks for rows *after* the last row already shown, on the list's own sort
+ * key, which an index on those columns answers in constant time.
+ *
+ * Cursors are opaque tokens (base64url JSON of the boundary row's key values
+ * plus a direction). `keysetPlan` turns one into order/filter clauses for the
+ * query; `keysetPage` trims the `limit + 1` rows fetched and mints the
+ * next/prev tokens.
+ */
+
+export type KeysetKey = {
+  column: string
+  ascending: boolean
+  /** Nullable columns sort with Postgres defaults (NULLS FIRST when descending). */
+  nullable?: boolean
+}
+
+type KeyValue = string | number | null
+
+export type KeysetCursor = {
+  values: KeyValue[]
+  direction: 'next' | 'prev'
+}
+
+export type KeysetPlan = {
+  /** Sort to apply, already reversed for 'prev' pages. */
+  orders: { column: string; ascending: boolean }[]
+  /** PostgREST `or` filter selecting rows past the cursor (multi-column keys). */
+  or: string | null
+  /** Plain `column.operator.value` filters (single-column keys, index bound). */
+  filters: { column: string; operator: string; value: string }[]
+  cursor: KeysetCursor | null
+}
+
+export function encodeCursor(cursor: KeysetCursor): string {
+  return Buffer.from(JSON.stringify({ v: cursor.values, d: cursor.direction === 'prev' ? 'p' : 'n' })).toString('base64url')
+}
+
+/** Null for a missing, malformed or foreign token (the caller falls back to page numbers). */
+export function decodeCursor(token: string | null | undefined, keys: KeysetKey[]): KeysetCursor | null {
+  if (!token) return null
+  try {
+    const raw = JSON.parse(Buffer.from(token, 'base64url').toString('utf8'))
+    if (!Array.isArray(raw?.v) || raw.v.length !== keys.length) return null
+    return { values: raw.v, direction: raw.d === 'p' ? 'prev' : 'next' }
+  } catch {
+    return null
+  }
+}
+
+// Double-quoted so commas, dots and parentheses in values survive the or() syntax
+const quote = (value: KeyValue) => `"${String(value).replace(/["\\]/g, '\\$&')}"`
+
+export function keysetPlan(keys: KeysetKey[], cursor: KeysetCursor | null): KeysetPlan {
+  const reverse = cursor?.direction === 'prev'
+  const orders = keys.map(k => ({ column: k.column, ascending: reverse ? !k.ascending : k.ascending }))
+  const plan: KeysetPlan = { orders, or: null, filters: [], cursor }
+  if (!cursor) return plan
+
+  // Rows strictly after the cursor in `orders`, one clause per key position:
+  // (k0 > v0) or (k0 = v0 and k1 > v1) or ...
+  const clauses: string[] = []
+  const ties: string[] = []
+  orders.forEach((order, i) => {
+    const { column, ascending } = order
+    const value = cursor.values[i]
+    const nullable = keys[i].nullable
+    let after: string | null
+    if (value === null) {
+      // NULLs sort last ascending and first descending
+      after = ascending ? null : `${column}.not.is.null`
+    } else {
+      after = `${column}.${ascending ? 'gt' : 'lt'}.${quote(value)}`
+      if (nullable && ascending) after = `or(${after},${column}.is.null)`
+    }
+    if (after) clauses.push(ties.length ? `and(${[...ties, after].join(',')})` : after)
+    ties.push(value === null ? `${column}.is.null` : `${column}.eq.${quote(value)}`)
+  })
+
+  const [first] = orders
+  const firstValue = cursor.values[0]
+  if (keys.length === 1 && !keys[0].nullable && firstValue !== null) {
+    plan.filters.push({ column: first.column, operator: first.ascending ? 'gt' : 'lt', value: String(firstValue) })
+    return plan
+  }
+
+  // Leading-column bound so the index scan starts at the cursor instead of
+  // filtering its way there
+  if (firstValue !== null && (!keys[0].nullable || !first.ascending)) {
+    plan.filters.push({ column: first.column, operator: first.ascending ? 'gte' : 'lte', value: String(firstValue) })
+  }
+  // Nothing sorts after a trailing NULL on an ascending key: match no rows
+  plan.or = clauses.length ? clauses.join(',') : `and(${first.column}.is.null,${first.column}.not.is.null)`
+  return plan
+}
+
+/**
+ * Trim rows fetched with `limit + 1` to the page and mint its tokens.
+ * `hasPrevious` covers page-number entry points (page > 1 without a cursor).
+ */
+export function keysetPage<T extends object>(
+  keys: KeysetKey[],
+  rows: T[],
+  limit: number,
+  plan: KeysetPlan,
+  hasPrevious = false
+): { rows: T[]; nextCursor: string | null; prevCursor: string | null } {
+  const more = rows.length > limit
+  const page = rows.slice(0, limit)
+  const reverse = plan.cursor?.direction === 'prev'
+  if (reverse) page.reverse()
+
+  const tokenFor = (row: T | undefined, direction: KeysetCursor['direction']) => {
+    if (!row) return null
+    const record = row as Record<string, unknown>
+    return encodeCursor({ values: keys.map(k => (record[k.column] ?? null) as KeyValue), direction })
+  }
+
+  const hasNext = reverse ? page.length > 0 : more
+  const hasPrev = reverse ? more : (!!plan.cursor || hasPrevious)
+  return {
+    rows: page,
+    nextCursor: hasNext ? tokenFor(page[page.length - 1], 'next') : null,
+    prevCursor: hasPrev ? tokenFor(page[0], 'prev') : null,
+  }
+}
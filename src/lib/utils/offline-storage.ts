@@ -1,8 +1,9 @@
 "use client"
 
 import { submitJobPOD, submitJobPickup } from "@/lib/actions/pod-actions"
-import { updateJobStatus, getJobDetails } from "@/app/mobile/jobs/actions"
+import { replayOfflineUpdates } from "@/app/mobile/jobs/actions"
 import { notifyTrackingStateChanged } from "@/lib/tracking-state"
+import { mapWithConcurrency } from "@/lib/utils/concurrency"
 
 export interface OfflineJob {
     id: string
@@ -19,8 +20,12 @@ const STORE_NAME = 'offline_jobs'
 const DB_VERSION = 1
 const MAX_RETRIES = 5
 
+// One connection for the life of the page; reopened if the browser closes it
+let dbPromise: Promise<IDBDatabase> | null = null
+
 function openDB(): Promise<IDBDatabase> {
-    return new Promise((resolve, reject) => {
+    if (dbPromise) return dbPromise
+    dbPromise = new Promise<IDBDatabase>((resolve, reject) => {
         if (typeof indexedDB === 'undefined') {
             reject(new Error('IndexedDB not supported'))
             return
@@ -32,9 +37,16 @@ function openDB(): Promise<IDBDatabase> {
                 db.createObjectStore(STORE_NAME, { keyPath: 'id' })
             }
         }
-        request.onsuccess = () => resolve(request.result)
+        request.onsuccess = () => {
+            const db = request.result
+            db.onclose = () => { dbPromise = null }
+            db.onversionchange = () => { db.close(); dbPromise = null }
+            resolve(db)
+        }
         request.onerror = () => reject(request.error)
     })
+    dbPromise.catch(() => { dbPromise = null })
+    return dbPromise
 }
 
 const notifyQueueChange = () => {
@@ -143,112 +155,224 @@ export const removeOfflineJob = async (id: string) => {
     }
 }
 
-export const syncOfflineJobs = async () => {
-    if (typeof window === 'undefined' || !navigator.onLine) return
-    
-    // Replay in the order the driver performed them — important for stacked
-    // status transitions on the same job (e.g. Accepted before Arrived Pickup).
-    const jobs = (await getOfflineJobs()).sort((a, b) => a.timestamp - b.timestamp)
-    if (jobs.length === 0) return
+/**
+ * Apply a sync round's queue changes in a single readwrite transaction, so
+ * the store never shows a half-applied round and listeners hear one change.
+ */
+const commitQueueChanges = async (removeIds: Iterable<string>, updates: Iterable<OfflineJob>) => {
+    const removals = [...removeIds]
+    const puts = [...updates]
+    if (removals.length === 0 && puts.length === 0) return
+    try {
+        const db = await openDB()
+        const tx = db.transaction(STORE_NAME, 'readwrite')
+        const store = tx.objectStore(STORE_NAME)
+        removals.forEach(id => store.delete(id))
+        puts.forEach(job => store.put(job))
+        await new Promise<void>((resolve, reject) => {
+            tx.oncomplete = () => resolve()
+            tx.onerror = () => reject(tx.error)
+            tx.onabort = () => reject(tx.error)
+        })
+        notifyQueueChange()
+    } catch (err) {
+        console.error('Failed to commit offline queue changes', err)
+    }
+}
+
+const PROOF_UPLOAD_CONCURRENCY = 3
 
+const failed = (job: OfflineJob, message: string): OfflineJob => ({
+    ...job,
+    retryCount: (job.retryCount || 0) + 1,
+    lastError: message
+})
+
+/**
+ * Drop queue entries that replaying would only repeat: a second copy of the
+ * same pending status for a job, and all but the newest POD / pickup proof
+ * for a job (the driver re-submitted; only the last one is what they meant).
+ */
+function dedupeQueue(jobs: OfflineJob[]): { keep: OfflineJob[]; drop: string[] } {
+    const seenStatus = new Set<string>()
+    const newestProof = new Map<string, OfflineJob>()
     for (const job of jobs) {
-        // The proof may already be on the server — e.g. the driver re-submitted
-        // from the job page after this entry got stuck, or an earlier retry
-        // succeeded but we lost the response. Drop the redundant entry so it
-        // stops lingering as a "pending" zombie that flickers on every sync.
-        // Runs before the retry-cap check so retry-exhausted items clear too.
-        if (job.type === 'POD' || job.type === 'PICKUP') {
-            try {
-                const current = await getJobDetails(job.jobId)
-                const podDone = !!(current?.Photo_Proof_Url || current?.Signature_Url)
-                const pickupDone = !!(current?.Pickup_Photo_Url || current?.Pickup_Signature_Url)
-                if ((job.type === 'POD' && podDone) || (job.type === 'PICKUP' && pickupDone)) {
-                    await removeOfflineJob(job.id)
-                    continue
-                }
-            } catch {
-                // Lookup failed (offline/transient) — fall through to normal replay.
-            }
+        if (job.type !== 'STATUS') newestProof.set(`${job.jobId}|${job.type}`, job)
+    }
+    const keep: OfflineJob[] = []
+    const drop: string[] = []
+    for (const job of jobs) {
+        if (job.type === 'STATUS') {
+            const key = `${job.jobId}|${String(job.data?.status)}`
+            if (seenStatus.has(key)) { drop.push(job.id); continue }
+            seenStatus.add(key)
+        } else if (newestProof.get(`${job.jobId}|${job.type}`) !== job) {
+            drop.push(job.id)
+            continue
         }
+        keep.push(job)
+    }
+    return { keep, drop }
+}
+
+function proofFormData(job: OfflineJob): FormData {
+    const formData = new FormData()
+    Object.entries(job.data).forEach(([key, value]) => {
+        if (key === 'photos' && Array.isArray(value)) {
+            value.forEach((b64: string, i: number) => {
+                const blob = b64ToBlob(b64)
+                formData.append(`photo_${i}`, blob, `offline_photo_${i}.jpg`)
+            })
+            formData.append('photo_count', value.length.toString())
+        } else if (key === 'signature' && typeof value === 'string') {
+            formData.append('signature', b64ToBlob(value), 'signature.png')
+        } else if (key === 'pod_report' && typeof value === 'string') {
+            formData.append('pod_report', b64ToBlob(value), 'report.jpg')
+        } else if (key === 'floor_climb_report' && typeof value === 'string') {
+            formData.append('floor_climb_report', b64ToBlob(value), `Floor_Climb_Report_${job.jobId}.jpg`)
+        } else if (key === 'pickup_report' && typeof value === 'string') {
+            formData.append('pickup_report', b64ToBlob(value), 'report.jpg')
+        } else if (value !== null && value !== undefined) {
+            formData.append(key, String(value))
+        }
+    })
+    return formData
+}
+
+/**
+ * Replay the offline queue.
+ *
+ * Entries are grouped per job and kept in the order the driver performed
+ * them (Accepted before Arrived Pickup, the pickup proof before a later
+ * status). Each round sends every job's leading run of status transitions in
+ * one batched server call, then uploads the proofs now at the head of their
+ * job's queue in parallel, a few at a time. A failure holds back the rest of
+ * that job until the next sync; other jobs carry on. Each round's removals
+ * and retry bumps are written in one IndexedDB transaction.
+ */
+export const syncOfflineJobs = async () => {
+    if (typeof window === 'undefined' || !navigator.onLine) return
+
+    const queued = (await getOfflineJobs()).sort((a, b) => a.timestamp - b.timestamp)
+    if (queued.length === 0) return
 
+    const { keep, drop } = dedupeQueue(queued)
+    const removals = new Set<string>(drop)
+    const updates = new Map<string, OfflineJob>()
+
+    const pending = new Map<string, OfflineJob[]>()
+    for (const job of keep) {
         if ((job.retryCount || 0) >= MAX_RETRIES) {
             // Status waypoints are low-stakes — give up cleanly so the queue
-            // doesn't stay stuck forever. Proof (POD/PICKUP) is kept for review.
-            if (job.type === 'STATUS') await removeOfflineJob(job.id)
+            // doesn't stay stuck forever. Proof (POD/PICKUP) is kept for
+            // review, and no longer holds back the job's later entries.
+            if (job.type === 'STATUS') removals.add(job.id)
             continue
         }
+        const list = pending.get(job.jobId)
+        if (list) list.push(job)
+        else pending.set(job.jobId, [job])
+    }
 
-        // Simple status transition (เริ่มงาน / ถึงจุดรับ / ถึงจุดส่ง)
-        if (job.type === 'STATUS') {
+    // The proof may already be on the server — e.g. the driver re-submitted
+    // from the job page after this entry got stuck, or an earlier retry
+    // succeeded but we lost the response. Covers retry-exhausted entries too
+    // so they stop lingering as "pending" zombies.
+    const proofJobIds = [...new Set(keep.filter(j => j.type !== 'STATUS').map(j => j.jobId))]
+    let trackingChanged = false
+    let firstRound = true
+
+    while (pending.size > 0) {
+        const statuses: { id: string; jobId: string; status: string; driverId?: string }[] = []
+        for (const [jobId, list] of pending) {
+            for (const job of list) {
+                if (job.type !== 'STATUS') break
+                statuses.push({
+                    id: job.id,
+                    jobId,
+                    status: String(job.data.status),
+                    driverId: job.data.driverId ? String(job.data.driverId) : undefined
+                })
+            }
+        }
+
+        if (statuses.length > 0 || (firstRound && proofJobIds.length > 0)) {
             try {
-                const result = await updateJobStatus(
-                    job.jobId,
-                    String(job.data.status),
-                    job.data.driverId ? String(job.data.driverId) : undefined
-                )
-                if (result.success) {
-                    await removeOfflineJob(job.id)
-                    notifyTrackingStateChanged()
-                } else {
-                    await updateOfflineJob({
-                        ...job,
-                        retryCount: (job.retryCount || 0) + 1,
-                        lastError: result.message || 'Server rejected transition'
-                    })
+                const { results, proofs } = await replayOfflineUpdates(statuses, firstRound ? proofJobIds : [])
+                if (firstRound) {
+                    for (const job of keep) {
+                        const done = proofs[job.jobId]
+                        if (!done || job.type === 'STATUS') continue
+                        if ((job.type === 'POD' && done.pod) || (job.type === 'PICKUP' && done.pickup)) {
+                            removals.add(job.id)
+                            const list = pending.get(job.jobId)
+                            if (list) pending.set(job.jobId, list.filter(j => j.id !== job.id))
+                        }
+                    }
+                }
+                const outcome = new Map(results.map(r => [r.id, r]))
+                for (const [jobId, list] of pending) {
+                    let next = 0
+                    let rejected = false
+                    for (; next < list.length; next++) {
+                        const result = outcome.get(list[next].id)
+                        if (!result) break
+                        if (!result.success) {
+                            updates.set(list[next].id, failed(list[next], result.message || 'Server rejected transition'))
+                            rejected = true
+                            break
+                        }
+                        removals.add(list[next].id)
+                        trackingChanged = true
+                    }
+                    if (rejected) pending.delete(jobId)
+                    else pending.set(jobId, list.slice(next))
                 }
             } catch (error) {
-                await updateOfflineJob({
-                    ...job,
-                    retryCount: (job.retryCount || 0) + 1,
-                    lastError: error instanceof Error ? error.message : 'Unknown exception'
-                })
+                // Whole batch failed (offline/transient) — count it against
+                // every status we tried and leave the proofs for next time.
+                const message = error instanceof Error ? error.message : 'Unknown exception'
+                const tried = new Set(statuses.map(s => s.id))
+                keep.filter(job => tried.has(job.id)).forEach(job => updates.set(job.id, failed(job, message)))
+                break
             }
-            continue
         }
+        firstRound = false
 
-        try {
-            const formData = new FormData()
-            Object.entries(job.data).forEach(([key, value]) => {
-                if (key === 'photos' && Array.isArray(value)) {
-                    value.forEach((b64: string, i: number) => {
-                        const blob = b64ToBlob(b64)
-                        formData.append(`photo_${i}`, blob, `offline_photo_${i}.jpg`)
-                    })
-                    formData.append('photo_count', value.length.toString())
-                } else if (key === 'signature' && typeof value === 'string') {
-                    formData.append('signature', b64ToBlob(value), 'signature.png')
-                } else if (key === 'pod_report' && typeof value === 'string') {
-                    formData.append('pod_report', b64ToBlob(value), 'report.jpg')
-                } else if (key === 'floor_climb_report' && typeof value === 'string') {
-                    formData.append('floor_climb_report', b64ToBlob(value), `Floor_Climb_Report_${job.jobId}.jpg`)
-                } else if (key === 'pickup_report' && typeof value === 'string') {
-                    formData.append('pickup_report', b64ToBlob(value), 'report.jpg')
-                } else if (value !== null && value !== undefined) {
-                    formData.append(key, String(value))
-                }
-            })
+        for (const [jobId, list] of pending) {
+            if (list.length === 0) pending.delete(jobId)
+        }
+        const heads = [...pending.values()].map(list => list[0]).filter(job => job.type !== 'STATUS')
+        // Nothing to upload: the queue is drained, or what is left is
+        // waiting on the next sync.
+        if (heads.length === 0) break
 
-            const result = job.type === 'PICKUP' 
-                ? await submitJobPickup(job.jobId, formData)
-                : await submitJobPOD(job.jobId, formData)
-
-            if (result.success) {
-                await removeOfflineJob(job.id)
-            } else {
-                await updateOfflineJob({
-                    ...job,
-                    retryCount: (job.retryCount || 0) + 1,
-                    lastError: typeof result.error === 'string' ? result.error : 'Server error'
-                })
+        await mapWithConcurrency(heads, PROOF_UPLOAD_CONCURRENCY, async (job) => {
+            try {
+                const formData = proofFormData(job)
+                const result = job.type === 'PICKUP'
+                    ? await submitJobPickup(job.jobId, formData)
+                    : await submitJobPOD(job.jobId, formData)
+                if (result.success) {
+                    removals.add(job.id)
+                    pending.set(job.jobId, pending.get(job.jobId)!.slice(1))
+                } else {
+                    updates.set(job.id, failed(job, typeof result.error === 'string' ? result.error : 'Server error'))
+                    pending.delete(job.jobId)
+                }
+            } catch (error) {
+                updates.set(job.id, failed(job, error instanceof Error ? error.message : 'Unknown exception'))
+                pending.delete(job.jobId)
             }
-        } catch (error) {
-            await updateOfflineJob({
-                ...job,
-                retryCount: (job.retryCount || 0) + 1,
-                lastError: error instanceof Error ? error.message : 'Unknown exception'
-            })
-        }
+        })
+
+        await commitQueueChanges(removals, updates.values())
+        removals.clear()
+        updates.clear()
     }
+
+    await commitQueueChanges(removals, updates.values())
+    if (trackingChanged) notifyTrackingStateChanged()
 }
 
 export function blobToB64(blob: Blob): Promise<string> {
@@ -279,3 +403,12 @@ function b64ToBlob(b64Data: string, contentType = 'image/jpeg') {
     
     return new Blob(byteArrays, { type: contentType })
 }
+
+/**
+ * Drop the service worker's cached driver pages (see next.config.ts) so the
+ * next driver on this phone never sees the previous one's jobs offline.
+ */
+export const clearDriverPageCache = async () => {
+    if (typeof window === 'undefined' || !('caches' in window)) return
+    await Promise.all(['driver-pages', 'driver-rsc'].map(name => caches.delete(name).catch(() => false)))
+}
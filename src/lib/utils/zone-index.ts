@@ -0,0 +1,127 @@
+import { isPointInPolygon } from '@/lib/utils'
+
+/**
+ * Spatial index for danger-zone checks on GPS points.
+ *
+ * Each zone's bounding box is bucketed into a fixed lat/lng grid once, when
+ * the index is built. A lookup reads the one cell the point falls in, drops
+ * candidates whose box doesn't contain the point and only then runs the exact
+ * polygon test, so the cost per point no longer grows with the number of zones.
+ *
+ * Indexes are cached per branch (`getCachedZoneIndex`); zone edits call
+ * `invalidateZoneIndexes` so the next check rebuilds from the table.
+ */
+
+type LatLng = [number, number]
+
+export type IndexedZone<Z> = {
+  zone: Z
+  polygon: LatLng[]
+  minLat: number
+  maxLat: number
+  minLng: number
+  maxLng: number
+}
+
+export type ZoneIndex<Z> = {
+  cells: Map<string, IndexedZone<Z>[]>
+  /** Zones too large to bucket; checked by bounding box on every lookup. */
+  wide: IndexedZone<Z>[]
+  size: number
+}
+
+// ~5.5 km cells: a typical zone (a depot, a district) touches a handful
+const CELL_DEG = 0.05
+// Zones spanning more cells than this go to the `wide` list instead
+const MAX_CELLS_PER_ZONE = 1024
+
+const cellOf = (value: number) => Math.floor(value / CELL_DEG)
+
+export function buildZoneIndex<Z>(zones: Z[], polygonOf: (zone: Z) => LatLng[]): ZoneIndex<Z> {
+  const index: ZoneIndex<Z> = { cells: new Map(), wide: [], size: 0 }
+  for (const zone of zones) {
+    const polygon = polygonOf(zone)
+    if (!polygon || polygon.length < 3) continue
+    const entry: IndexedZone<Z> = {
+      zone,
+      polygon,
+      minLat: Math.min(...polygon.map(p => p[0])),
+      maxLat: Math.max(...polygon.map(p => p[0])),
+      minLng: Math.min(...polygon.map(p => p[1])),
+      maxLng: Math.max(...polygon.map(p => p[1])),
+    }
+    index.size++
+
+    const [lat0, lat1, lng0, lng1] = [cellOf(entry.minLat), cellOf(entry.maxLat), cellOf(entry.minLng), cellOf(entry.maxLng)]
+    if ((lat1 - lat0 + 1) * (lng1 - lng0 + 1) > MAX_CELLS_PER_ZONE) {
+      index.wide.push(entry)
+      continue
+    }
+    for (let i = lat0; i <= lat1; i++) {
+      for (let j = lng0; j <= lng1; j++) {
+        const key = `${i}:${j}`
+        const bucket = index.cells.get(key)
+        if (bucket) bucket.push(entry)
+        else index.cells.set(key, [entry])
+      }
+    }
+  }
+  return index
+}
+
+/** Zones whose polygon contains the point. */
+export function zonesAt<Z>(index: ZoneIndex<Z>, lat: number, lng: number): Z[] {
+  const hits: Z[] = []
+  const test = (entry: IndexedZone<Z>) => {
+    if (lat < entry.minLat || lat > entry.maxLat || lng < entry.minLng || lng > entry.maxLng) return
+    if (isPointInPolygon([lat, lng], entry.polygon)) hits.push(entry.zone)
+  }
+  index.cells.get(`${cellOf(lat)}:${cellOf(lng)}`)?.forEach(test)
+  index.wide.forEach(test)
+  return hits
+}
+
+// ── Per-branch cache ─────────────────────────────────────────────
+
+// Also bounds how stale another server instance can be after an edit
+const ZONE_INDEX_TTL = 300000 // 5 minutes cache
+const indexCache = new Map<string, { index: ZoneIndex<unknown>; timestamp: number }>()
+
+export function getCachedZoneIndex<Z>(branchId: string): ZoneIndex<Z> | null {
+  const cached = indexCache.get(branchId)
+  if (!cached || Date.now() - cached.timestamp >= ZONE_INDEX_TTL) return null
+  return cached.index as ZoneIndex<Z>
+}
+
+export function setCachedZoneIndex<Z>(branchId: string, index: ZoneIndex<Z>) {
+  indexCache.set(branchId, { index: index as ZoneIndex<unknown>, timestamp: Date.now() })
+}
+
+/** Drop every cached index; a zone edit can affect its branch and 'All'. */
+export function invalidateZoneIndexes() {
+  indexCache.clear()
+}
+
+// ── Alert debounce ───────────────────────────────────────────────
+
+// A driver inside a zone pings every few seconds; alert on entry, then stay
+// quiet until they have been out of the zone for this long
+const ALERT_DEBOUNCE_MS = 15 * 60 * 1000
+const lastInside = new Map<string, number>()
+
+/**
+ * Record that `driverId` is inside `zoneId` now; true when this counts as a
+ * new entry that should be alerted.
+ */
+export function shouldAlertZoneEntry(driverId: string, zoneId: string, now = Date.now()): boolean {
+  const key = `${driverId}\u0000${zoneId}`
+  const previous = lastInside.get(key)
+  lastInside.set(key, now)
+
+  if (lastInside.size > 10000) {
+    for (const [k, seen] of lastInside) {
+      if (now - seen >= ALERT_DEBOUNCE_MS) lastInside.delete(k)
+    }
+  }
+  return previous === undefined || now - previous >= ALERT_DEBOUNCE_MS
+}
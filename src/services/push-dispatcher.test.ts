@@ -0,0 +1,122 @@
+import { describe, it, expect, vi } from 'vitest'
+import { dispatchPush, isDeadSubscription, type PushSendResult, type PushTarget, type PushTransport } from './push-dispatcher'
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Local stand-in for the FCM and Web Push services: answers after `latencyMs`,
+// reports unknown tokens / endpoints the way the real services do, and
+// records request sizes and the peak number of requests in flight.
+function mockPushService({ latencyMs = 5, gone = new Set<string>(), broken = new Set<string>() } = {}) {
+  const stats = { multicastSizes: [] as number[], webRequests: 0, inFlight: 0, peakWebInFlight: 0 }
+  const answer = (endpoint: string, kind: 'fcm' | 'web'): PushSendResult => {
+    if (gone.has(endpoint)) {
+      return kind === 'fcm'
+        ? { success: false, code: 'messaging/registration-token-not-registered' }
+        : { success: false, statusCode: endpoint.includes('404') ? 404 : 410 }
+    }
+    if (broken.has(endpoint)) return { success: false, statusCode: 500, code: 'messaging/internal-error' }
+    return { success: true }
+  }
+  const transport: PushTransport = {
+    async sendFcmMulticast(tokens) {
+      stats.multicastSizes.push(tokens.length)
+      await sleep(latencyMs)
+      return tokens.map(t => answer(t, 'fcm'))
+    },
+    async sendWebPush(target) {
+      stats.webRequests++
+      stats.inFlight++
+      stats.peakWebInFlight = Math.max(stats.peakWebInFlight, stats.inFlight)
+      await sleep(latencyMs)
+      stats.inFlight--
+      return answer(target.endpoint, 'web')
+    },
+  }
+  return { transport, stats }
+}
+
+const fcmTargets = (n: number, prefix = 'token'): PushTarget[] =>
+  Array.from({ length: n }, (_, i) => ({ kind: 'fcm', endpoint: `${prefix}-${i}` }))
+
+const webTargets = (n: number, prefix = 'https://push.example/sub'): PushTarget[] =>
+  Array.from({ length: n }, (_, i) => ({ kind: 'web', endpoint: `${prefix}-${i}`, p256dh: 'p', auth: 'a' }))
+
+describe('dispatchPush', () => {
+  it('groups FCM tokens into multicast batches of at most 500', async () => {
+    const { transport, stats } = mockPushService()
+    const report = await dispatchPush(fcmTargets(1200), transport)
+
+    expect(stats.multicastSizes.sort((a, b) => b - a)).toEqual([500, 500, 200])
+    expect(report.sent).toBe(1200)
+    expect(report.batches.filter(b => b.kind === 'fcm').map(b => b.size)).toEqual([500, 500, 200])
+  })
+
+  it('keeps web push requests within the concurrency bound', async () => {
+    const { transport, stats } = mockPushService({ latencyMs: 2 })
+    const report = await dispatchPush(webTargets(250), transport, { webConcurrency: 8, webBatchSize: 100 })
+
+    expect(stats.webRequests).toBe(250)
+    expect(stats.peakWebInFlight).toBe(8)
+    expect(report.batches.map(b => b.size)).toEqual([100, 100, 50])
+    expect(report.sent).toBe(250)
+  })
+
+  it('prunes 404/410 and unregistered tokens, but not other failures', async () => {
+    const gone = new Set(['token-1', 'token-7', 'https://push.example/sub-404', 'https://push.example/sub-3'])
+    const broken = new Set(['token-2', 'https://push.example/sub-5'])
+    const { transport } = mockPushService({ gone, broken })
+    const prune = vi.fn().mockResolvedValue(undefined)
+
+    const targets = [
+      ...fcmTargets(10),
+      ...webTargets(6),
+      { kind: 'web', endpoint: 'https://push.example/sub-404', p256dh: 'p', auth: 'a' } as PushTarget,
+    ]
+    const report = await dispatchPush(targets, transport, { prune })
+
+    expect(prune).toHaveBeenCalledTimes(1)
+    expect([...prune.mock.calls[0][0]].sort()).toEqual([...gone].sort())
+    expect(report.dead.sort()).toEqual([...gone].sort())
+    expect(report.failed).toBe(gone.size + broken.size)
+    expect(report.sent).toBe(targets.length - gone.size - broken.size)
+  })
+
+  it('fails only the batch whose FCM request throws', async () => {
+    const { transport } = mockPushService()
+    const sendFcmMulticast = transport.sendFcmMulticast
+    let calls = 0
+    transport.sendFcmMulticast = async tokens => {
+      if (++calls === 1) throw new Error('socket hang up')
+      return sendFcmMulticast(tokens)
+    }
+    const prune = vi.fn()
+
+    const report = await dispatchPush(fcmTargets(600), transport, { fcmConcurrency: 1, prune })
+
+    expect(report.batches.map(b => [b.size, b.sent])).toEqual([[500, 0], [100, 100]])
+    expect(report.failed).toBe(500)
+    expect(prune).not.toHaveBeenCalled()
+  })
+
+  it('reports per-batch latency and sends a duplicated endpoint once', async () => {
+    const { transport, stats } = mockPushService({ latencyMs: 20 })
+    const targets = [...fcmTargets(3), ...fcmTargets(3), ...webTargets(2)]
+    const report = await dispatchPush(targets, transport)
+
+    expect(stats.multicastSizes).toEqual([3])
+    expect(stats.webRequests).toBe(2)
+    expect(report.sent).toBe(5)
+    for (const batch of report.batches) expect(batch.ms).toBeGreaterThanOrEqual(15)
+  })
+})
+
+describe('isDeadSubscription', () => {
+  it('treats only gone subscriptions as dead', () => {
+    expect(isDeadSubscription({ success: false, statusCode: 410 })).toBe(true)
+    expect(isDeadSubscription({ success: false, statusCode: 404 })).toBe(true)
+    expect(isDeadSubscription({ success: false, code: 'messaging/registration-token-not-registered' })).toBe(true)
+    expect(isDeadSubscription({ success: false, statusCode: 429 })).toBe(false)
+    expect(isDeadSubscription({ success: false, code: 'messaging/invalid-argument' })).toBe(false)
+    expect(isDeadSubscription({ success: true, statusCode: 410 })).toBe(false)
+  })
+})
@@ -0,0 +1,179 @@
+/**
+ * Push Dispatcher — TMS 2026
+ * Fans one notification out to many Push_Subscriptions rows without bursting
+ * thousands of HTTPS calls from a single serverless invocation.
+ *
+ * FCM tokens go out in multicast batches (one FCM request per up to 500
+ * tokens); Web Push subscriptions are sent in batches with a bounded number
+ * in flight. Subscriptions the push service reports as gone (FCM
+ * "not registered", Web Push 404/410) come back in `dead` and are handed to
+ * `prune`, so callers drop them without a per-row delete. Every batch reports
+ * its size, outcome and latency.
+ *
+ * Transports are injected, so the dispatcher has no Firebase / web-push
+ * dependency of its own and can be exercised against a mock push service.
+ */
+
+import { mapWithConcurrency } from '@/lib/utils/concurrency'
+
+export type PushTarget =
+  | { kind: 'fcm'; endpoint: string }
+  | { kind: 'web'; endpoint: string; p256dh: string; auth: string }
+
+/** Outcome of one delivery attempt. */
+export type PushSendResult = {
+  success: boolean
+  /** HTTP status from a Web Push service. */
+  statusCode?: number
+  /** Firebase error code, e.g. 'messaging/registration-token-not-registered'. */
+  code?: string
+  error?: string
+}
+
+export type PushTransport = {
+  /** Send to up to `fcmBatchSize` tokens; one result per token, in order. */
+  sendFcmMulticast(tokens: string[]): Promise<PushSendResult[]>
+  sendWebPush(target: Extract<PushTarget, { kind: 'web' }>): Promise<PushSendResult>
+}
+
+export type PushDispatchOptions = {
+  /** FCM multicast limit is 500 tokens per request. */
+  fcmBatchSize?: number
+  /** FCM batches in flight at once. */
+  fcmConcurrency?: number
+  /** Web Push subscriptions per reported batch. */
+  webBatchSize?: number
+  /** Web Push requests in flight at once. */
+  webConcurrency?: number
+  /** Called once with every dead endpoint; failures are logged, not thrown. */
+  prune?: (endpoints: string[]) => Promise<void>
+}
+
+export type PushBatchReport = {
+  kind: 'fcm' | 'web'
+  size: number
+  sent: number
+  failed: number
+  dead: number
+  ms: number
+}
+
+export type PushDispatchReport = {
+  sent: number
+  failed: number
+  /** Endpoints the push service no longer knows; pruned when `prune` is set. */
+  dead: string[]
+  batches: PushBatchReport[]
+  elapsedMs: number
+}
+
+const DEAD_FCM_CODES = new Set([
+  'messaging/registration-token-not-registered',
+  'messaging/invalid-registration-token',
+])
+
+export function isDeadSubscription(result: PushSendResult): boolean {
+  if (result.success) return false
+  if (result.statusCode === 404 || result.statusCode === 410) return true
+  return !!result.code && DEAD_FCM_CODES.has(result.code)
+}
+
+function chunk<T>(items: T[], size: number): T[][] {
+  const out: T[][] = []
+  for (let i = 0; i < items.length; i += size) out.push(items.slice(i, i + size))
+  return out
+}
+
+/**
+ * Deliver to every target. Never throws for a failed delivery: a transport
+ * error fails just the batch (FCM) or subscription (Web Push) it belongs to.
+ */
+export async function dispatchPush(
+  targets: PushTarget[],
+  transport: PushTransport,
+  options: PushDispatchOptions = {}
+): Promise<PushDispatchReport> {
+  const {
+    fcmBatchSize = 500,
+    fcmConcurrency = 2,
+    webBatchSize = 100,
+    webConcurrency = 20,
+    prune,
+  } = options
+  const started = performance.now()
+
+  // The same endpoint can be stored twice (re-subscribe races); send once.
+  const unique = [...new Map(targets.map(t => [t.endpoint, t])).values()]
+  const fcm = unique.filter((t): t is Extract<PushTarget, { kind: 'fcm' }> => t.kind === 'fcm')
+  const web = unique.filter((t): t is Extract<PushTarget, { kind: 'web' }> => t.kind === 'web')
+
+  const dead: string[] = []
+  const report = (kind: 'fcm' | 'web', endpoints: string[], results: PushSendResult[], batchStarted: number): PushBatchReport => {
+    let sent = 0
+    let deadCount = 0
+    results.forEach((result, i) => {
+      if (result.success) sent++
+      else if (isDeadSubscription(result)) {
+        dead.push(endpoints[i])
+        deadCount++
+      }
+    })
+    return {
+      kind,
+      size: endpoints.length,
+      sent,
+      failed: endpoints.length - sent,
+      dead: deadCount,
+      ms: Math.round(performance.now() - batchStarted),
+    }
+  }
+
+  const fcmBatches = mapWithConcurrency(chunk(fcm, fcmBatchSize), fcmConcurrency, async batch => {
+    const batchStarted = performance.now()
+    const tokens = batch.map(t => t.endpoint)
+    let results: PushSendResult[]
+    try {
+      results = await transport.sendFcmMulticast(tokens)
+    } catch (err) {
+      const error = err instanceof Error ? err.message : String(err)
+      results = tokens.map(() => ({ success: false, error }))
+    }
+    return report('fcm', tokens, results, batchStarted)
+  })
+
+  // Batches run one after another; the concurrency bound applies within each.
+  const webBatches = (async () => {
+    const out: PushBatchReport[] = []
+    for (const batch of chunk(web, webBatchSize)) {
+      const batchStarted = performance.now()
+      const results = await mapWithConcurrency(batch, webConcurrency, async target => {
+        try {
+          return await transport.sendWebPush(target)
+        } catch (err) {
+          return { success: false, error: err instanceof Error ? err.message : String(err) }
+        }
+      })
+      out.push(report('web', batch.map(t => t.endpoint), results, batchStarted))
+    }
+    return out
+  })()
+
+  const batches = [...(await fcmBatches), ...(await webBatches)]
+
+  if (prune && dead.length > 0) {
+    try {
+      await prune(dead)
+    } catch (err) {
+      console.error('[PUSH] Pruning dead subscriptions failed:', err)
+    }
+  }
+
+  const sent = batches.reduce((s, b) => s + b.sent, 0)
+  return {
+    sent,
+    failed: unique.length - sent,
+    dead,
+    batches,
+    elapsedMs: Math.round(performance.now() - started),
+  }
+}
@@ -0,0 +1,105 @@
+import { describe, it, expect } from 'vitest'
+import { solveVrp, toFlatMatrix, type VrpProblem, type VrpStop, type VrpVehicle } from './vrp-solver'
+
+// Depot at node 0, stops on a line: travel time = distance
+function lineProblem(xs: number[], stops: Omit<VrpStop, 'node'>[], vehicles: VrpVehicle[]): VrpProblem {
+  const points = [0, ...xs]
+  const matrix = toFlatMatrix(points.map(a => points.map(b => Math.abs(a - b))))
+  return {
+    size: points.length,
+    time: matrix,
+    distance: matrix,
+    stops: stops.map((s, i) => ({ ...s, node: i + 1 })),
+    vehicles,
+  }
+}
+
+describe('solveVrp', () => {
+  it('visits every stop once in the shortest order for a single vehicle', () => {
+    const problem = lineProblem(
+      [30, 10, 20, 40],
+      [{ id: 'A' }, { id: 'B' }, { id: 'C' }, { id: 'D' }],
+      [{ id: 'T1', start: 0, end: null }]
+    )
+    const result = solveVrp(problem, { timeLimitMs: 500 })
+
+    expect(result.unassigned).toEqual([])
+    expect(result.routes).toHaveLength(1)
+    expect(result.routes[0].stopIds).toEqual(['B', 'C', 'A', 'D'])
+    expect(result.totalDistance).toBe(40)
+  })
+
+  it('splits stops across trucks when capacity runs out', () => {
+    const problem = lineProblem(
+      [10, 11, 12, 13],
+      [{ id: 'A', weightKg: 600 }, { id: 'B', weightKg: 600 }, { id: 'C', weightKg: 600 }, { id: 'D', weightKg: 600 }],
+      [
+        { id: 'T1', start: 0, maxWeightKg: 1500 },
+        { id: 'T2', start: 0, maxWeightKg: 1500 },
+      ]
+    )
+    const result = solveVrp(problem, { timeLimitMs: 500 })
+
+    expect(result.unassigned).toEqual([])
+    expect(result.vehiclesUsed).toBe(2)
+    result.routes.forEach(route => expect(route.weightKg).toBeLessThanOrEqual(1500))
+  })
+
+  it('only gives a stop to a vehicle of the requested type', () => {
+    const problem = lineProblem(
+      [10, 20],
+      [{ id: 'frozen', vehicleType: '6-Wheel Cold' }, { id: 'dry' }],
+      [
+        { id: 'VAN', start: 0, vehicleType: '4-Wheel' },
+        { id: 'COLD', start: 0, vehicleType: '6-wheel cold' },
+      ]
+    )
+    const result = solveVrp(problem, { timeLimitMs: 500 })
+    const frozenRoute = result.routes.find(r => r.stopIds.includes('frozen'))
+
+    expect(frozenRoute?.vehicleId).toBe('COLD')
+  })
+
+  it('respects time windows even when that means a longer route', () => {
+    // Nearest-first would reach B (x=10) at 10, but B only opens at 50;
+    // A (x=20) closes at 25, so A must come first.
+    const problem = lineProblem(
+      [20, 10],
+      [{ id: 'A', windowEnd: 25 }, { id: 'B', windowStart: 50 }],
+      [{ id: 'T1', start: 0, end: null }]
+    )
+    const result = solveVrp(problem, { timeLimitMs: 500 })
+
+    expect(result.routes[0].stopIds).toEqual(['A', 'B'])
+  })
+
+  it('reports stops that no vehicle can take', () => {
+    const problem = lineProblem(
+      [10, 20],
+      [{ id: 'A', weightKg: 100 }, { id: 'heavy', weightKg: 5000 }],
+      [{ id: 'T1', start: 0, maxWeightKg: 1000 }]
+    )
+    const result = solveVrp(problem, { timeLimitMs: 500 })
+
+    expect(result.unassigned).toEqual(['heavy'])
+    expect(result.routes[0].stopIds).toEqual(['A'])
+  })
+
+  it('plans 300 drops across 40 trucks within its time budget', () => {
+    let seed = 19
+    const rand = () => (seed = (seed * 1103515245 + 12345) % 2147483648) / 2147483648
+    const points: [number, number][] = [[50, 50], ...Array.from({ length: 300 }, () => [rand() * 100, rand() * 100] as [number, number])]
+    const matrix = toFlatMatrix(points.map(a => points.map(b => Math.hypot(a[0] - b[0], a[1] - b[1]))))
+    const problem: VrpProblem = {
+      size: points.length,
+      time: matrix,
+      stops: points.slice(1).map((_, i) => ({ id: `S${i}`, node: i + 1, weightKg: 5 + (i % 20), serviceTime: 5 })),
+      vehicles: Array.from({ length: 40 }, (_, i) => ({ id: `T${i}`, start: 0, maxWeightKg: 200, shiftEnd: 600 })),
+    }
+    const result = solveVrp(problem, { timeLimitMs: 3000 })
+
+    expect(result.unassigned).toEqual([])
+    expect(result.elapsedMs).toBeLessThan(5000)
+    expect(result.routes.flatMap(r => r.stopIds).sort()).toEqual(problem.stops.map(s => s.id).sort())
+  })
+})
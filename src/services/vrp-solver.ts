@@ -0,0 +1,472 @@
+/**
+ * VRP Solver — TMS 2026
+ * Multi-vehicle routing with capacity (kg and cbm), vehicle-type and
+ * time-window constraints, solved in-process with no network calls.
+ *
+ * Travel times come in as one flat row-major matrix (`time[from * size + to]`)
+ * so the inner loops read typed arrays instead of nested JS arrays. A regret-2
+ * cheapest-insertion pass builds the routes; local search (relocate, or-opt
+ * segment moves, intra-route 2-opt and inter-route 2-opt*) then improves them
+ * until nothing improves or `timeLimitMs` runs out. Stops no vehicle can take
+ * come back in `unassigned`.
+ *
+ * Units are whatever the matrix uses: time windows, service times and shift
+ * bounds must be in the same unit (the planning action uses minutes).
+ */
+
+export type VrpStop = {
+  id: string
+  /** Row/column of this stop in the matrix. */
+  node: number
+  weightKg?: number | null
+  volumeCbm?: number | null
+  /** Time spent at the stop. */
+  serviceTime?: number | null
+  /** Earliest / latest arrival, from the start of the plan. */
+  windowStart?: number | null
+  windowEnd?: number | null
+  /** Only vehicles of this type may serve the stop. */
+  vehicleType?: string | null
+}
+
+export type VrpVehicle = {
+  id: string
+  /** Node the vehicle starts from. */
+  start: number
+  /** Node it must finish at; null for an open route. Defaults to `start`. */
+  end?: number | null
+  /** Null or 0 = no limit. */
+  maxWeightKg?: number | null
+  maxVolumeCbm?: number | null
+  vehicleType?: string | null
+  shiftStart?: number | null
+  shiftEnd?: number | null
+}
+
+export type VrpProblem = {
+  size: number
+  /** size × size travel times, row-major. */
+  time: Float64Array
+  /** Optional size × size distances, only reported per route. */
+  distance?: Float64Array
+  stops: VrpStop[]
+  vehicles: VrpVehicle[]
+}
+
+export type VrpOptions = {
+  /** Wall-clock budget for the whole solve (default 2000 ms). */
+  timeLimitMs?: number
+  /** Added once per vehicle used, to prefer fewer trucks (default 0). */
+  vehicleCost?: number
+}
+
+export type VrpRoute = {
+  vehicleId: string
+  stopIds: string[]
+  time: number
+  distance: number
+  weightKg: number
+  volumeCbm: number
+}
+
+export type VrpSolution = {
+  routes: VrpRoute[]
+  unassigned: string[]
+  totalTime: number
+  totalDistance: number
+  vehiclesUsed: number
+  elapsedMs: number
+  /** Improving local-search moves applied. */
+  moves: number
+}
+
+const EPS = 1e-7
+
+export function toFlatMatrix(rows: number[][]): Float64Array {
+  const n = rows.length
+  const flat = new Float64Array(n * n)
+  for (let i = 0; i < n; i++) flat.set(rows[i], i * n)
+  return flat
+}
+
+const normType = (t?: string | null) => (t || '').trim().toLowerCase()
+
+export function solveVrp(problem: VrpProblem, options: VrpOptions = {}): VrpSolution {
+  const started = performance.now()
+  const deadline = started + (options.timeLimitMs ?? 2000)
+  const outOfTime = () => performance.now() > deadline
+  const fixedCost = options.vehicleCost ?? 0
+
+  const { size: n, time, stops, vehicles } = problem
+  const S = stops.length
+  const R = vehicles.length
+
+  const node = Int32Array.from(stops, s => s.node)
+  const kg = Float64Array.from(stops, s => Number(s.weightKg) || 0)
+  const cbm = Float64Array.from(stops, s => Number(s.volumeCbm) || 0)
+  const svc = Float64Array.from(stops, s => Number(s.serviceTime) || 0)
+  const ws = Float64Array.from(stops, s => s.windowStart ?? -Infinity)
+  const we = Float64Array.from(stops, s => s.windowEnd ?? Infinity)
+
+  const vStart = Int32Array.from(vehicles, v => v.start)
+  const vEnd = Int32Array.from(vehicles, v => (v.end === undefined ? v.start : v.end ?? -1))
+  const capKg = Float64Array.from(vehicles, v => v.maxWeightKg || Infinity)
+  const capCbm = Float64Array.from(vehicles, v => v.maxVolumeCbm || Infinity)
+  const shiftStart = Float64Array.from(vehicles, v => v.shiftStart ?? 0)
+  const shiftEnd = Float64Array.from(vehicles, v => v.shiftEnd ?? Infinity)
+
+  const compat = new Uint8Array(S * R)
+  for (let s = 0; s < S; s++) {
+    const need = normType(stops[s].vehicleType)
+    for (let r = 0; r < R; r++) {
+      const has = normType(vehicles[r].vehicleType)
+      compat[s * R + r] = !need || !has || need === has ? 1 : 0
+    }
+  }
+
+  const routes: number[][] = Array.from({ length: R }, () => [])
+  const cost = new Float64Array(R)
+  const loadKg = new Float64Array(R)
+  const loadCbm = new Float64Array(R)
+
+  // Candidate sequences are assembled here, so evaluating a move allocates nothing
+  const scratch = new Int32Array(S + 4)
+
+  /** Cost of route r over scratch[0..m); Infinity if any constraint fails. */
+  const evalScratch = (r: number, m: number): number => {
+    if (m === 0) return 0
+    let t = shiftStart[r]
+    let travel = 0
+    let prev = vStart[r]
+    let w = 0
+    let vol = 0
+    for (let i = 0; i < m; i++) {
+      const s = scratch[i]
+      if (!compat[s * R + r]) return Infinity
+      w += kg[s]
+      vol += cbm[s]
+      if (w > capKg[r] + EPS || vol > capCbm[r] + EPS) return Infinity
+      const leg = time[prev * n + node[s]]
+      travel += leg
+      t += leg
+      if (t < ws[s]) t = ws[s]
+      if (t > we[s] + EPS) return Infinity
+      t += svc[s]
+      prev = node[s]
+    }
+    if (vEnd[r] >= 0) {
+      const leg = time[prev * n + vEnd[r]]
+      travel += leg
+      t += leg
+    }
+    if (t > shiftEnd[r] + EPS) return Infinity
+    return travel + fixedCost
+  }
+
+  /**
+   * Cost of `seq` on route r with seq[cutFrom..cutTo) removed and `ins`
+   * (reversed if asked) placed before original index `at`.
+   */
+  const evalEdit = (r: number, seq: number[], cutFrom: number, cutTo: number, at: number, ins: number[] | null, reversed = false) => {
+    let m = 0
+    const len = seq.length
+    for (let k = 0; k <= len; k++) {
+      if (k === at && ins) {
+        if (reversed) for (let q = ins.length - 1; q >= 0; q--) scratch[m++] = ins[q]
+        else for (let q = 0; q < ins.length; q++) scratch[m++] = ins[q]
+      }
+      if (k < len && (k < cutFrom || k >= cutTo)) scratch[m++] = seq[k]
+    }
+    return evalScratch(r, m)
+  }
+
+  const refresh = (r: number) => {
+    const seq = routes[r]
+    let w = 0
+    let vol = 0
+    for (let i = 0; i < seq.length; i++) {
+      scratch[i] = seq[i]
+      w += kg[seq[i]]
+      vol += cbm[seq[i]]
+    }
+    cost[r] = evalScratch(r, seq.length)
+    loadKg[r] = w
+    loadCbm[r] = vol
+  }
+
+  const single = [0]
+  /** Cheapest feasible insertion of stop s into route r: [delta, position]. */
+  const bestInsertion = (s: number, r: number): [number, number] => {
+    if (!compat[s * R + r]) return [Infinity, -1]
+    if (loadKg[r] + kg[s] > capKg[r] + EPS || loadCbm[r] + cbm[s] > capCbm[r] + EPS) return [Infinity, -1]
+    single[0] = s
+    const seq = routes[r]
+    let best = Infinity
+    let pos = -1
+    for (let at = 0; at <= seq.length; at++) {
+      const delta = evalEdit(r, seq, 0, 0, at, single) - cost[r]
+      if (delta < best) {
+        best = delta
+        pos = at
+      }
+    }
+    return [best, pos]
+  }
+
+  // ── Construction: regret-2 insertion ─────────────────────────────
+  const insCost = new Float64Array(S * R)
+  const insPos = new Int32Array(S * R)
+  let pending: number[] = Array.from({ length: S }, (_, s) => s)
+  for (const s of pending) {
+    for (let r = 0; r < R; r++) {
+      const [delta, pos] = bestInsertion(s, r)
+      insCost[s * R + r] = delta
+      insPos[s * R + r] = pos
+    }
+  }
+
+  while (pending.length > 0) {
+    let pick = -1
+    let pickRoute = -1
+    let pickRegret = -Infinity
+    let pickCost = Infinity
+    for (const s of pending) {
+      let b1 = Infinity
+      let b2 = Infinity
+      let b1r = -1
+      for (let r = 0; r < R; r++) {
+        const c = insCost[s * R + r]
+        if (c < b1) {
+          b2 = b1
+          b1 = c
+          b1r = r
+        } else if (c < b2) {
+          b2 = c
+        }
+      }
+      if (b1r < 0) continue
+      // A stop with a single option goes first, before it loses that option too
+      const regret = b2 === Infinity ? Number.MAX_VALUE : b2 - b1
+      if (regret > pickRegret + EPS || (Math.abs(regret - pickRegret) <= EPS && b1 < pickCost)) {
+        pick = s
+        pickRoute = b1r
+        pickRegret = regret
+        pickCost = b1
+      }
+    }
+    if (pick < 0) break
+
+    routes[pickRoute].splice(insPos[pick * R + pickRoute], 0, pick)
+    refresh(pickRoute)
+    pending = pending.filter(s => s !== pick)
+    for (const s of pending) {
+      const [delta, pos] = bestInsertion(s, pickRoute)
+      insCost[s * R + pickRoute] = delta
+      insPos[s * R + pickRoute] = pos
+    }
+  }
+
+  // ── Local search ─────────────────────────────────────────────────
+  let moves = 0
+
+  /** Move segments of `length` stops (reversed too, for length > 1) to their best place. */
+  const segmentMoves = (length: number): boolean => {
+    let improved = false
+    for (let a = 0; a < R && !outOfTime(); a++) {
+      for (let i = 0; i + length <= routes[a].length; i++) {
+        const seqA = routes[a]
+        const seg = seqA.slice(i, i + length)
+        const without = evalEdit(a, seqA, i, i + length, -1, null)
+        const gain = cost[a] - without
+        if (!(gain > EPS)) continue
+
+        let segKg = 0
+        let segCbm = 0
+        for (const s of seg) {
+          segKg += kg[s]
+          segCbm += cbm[s]
+        }
+
+        let bestDelta = -EPS
+        let bestRoute = -1
+        let bestAt = -1
+        let bestRev = false
+        for (let b = 0; b < R; b++) {
+          if (b !== a && (loadKg[b] + segKg > capKg[b] + EPS || loadCbm[b] + segCbm > capCbm[b] + EPS)) continue
+          const seqB = routes[b]
+          for (let at = 0; at <= seqB.length; at++) {
+            if (b === a && at >= i && at <= i + length) continue
+            for (const rev of length > 1 ? [false, true] : [false]) {
+              const delta = b === a
+                ? evalEdit(a, seqA, i, i + length, at, seg, rev) - cost[a]
+                : evalEdit(b, seqB, 0, 0, at, seg, rev) - cost[b] - gain
+              if (delta < bestDelta) {
+                bestDelta = delta
+                bestRoute = b
+                bestAt = at
+                bestRev = rev
+              }
+            }
+          }
+        }
+        if (bestRoute < 0) continue
+
+        const placed = bestRev ? [...seg].reverse() : seg
+        if (bestRoute === a) {
+          const next: number[] = []
+          for (let k = 0; k <= seqA.length; k++) {
+            if (k === bestAt) next.push(...placed)
+            if (k < seqA.length && (k < i || k >= i + length)) next.push(seqA[k])
+          }
+          routes[a] = next
+        } else {
+          routes[a] = seqA.filter((_, k) => k < i || k >= i + length)
+          routes[bestRoute].splice(bestAt, 0, ...placed)
+          refresh(bestRoute)
+        }
+        refresh(a)
+        moves++
+        improved = true
+      }
+    }
+    return improved
+  }
+
+  /** Reverse a stretch of one route. */
+  const twoOpt = (): boolean => {
+    let improved = false
+    for (let r = 0; r < R && !outOfTime(); r++) {
+      const seq = routes[r]
+      for (let i = 0; i < seq.length - 1; i++) {
+        for (let j = i + 1; j < seq.length; j++) {
+          let m = 0
+          for (let k = 0; k < i; k++) scratch[m++] = seq[k]
+          for (let k = j; k >= i; k--) scratch[m++] = seq[k]
+          for (let k = j + 1; k < seq.length; k++) scratch[m++] = seq[k]
+          if (evalScratch(r, m) < cost[r] - EPS) {
+            const middle = seq.slice(i, j + 1).reverse()
+            seq.splice(i, middle.length, ...middle)
+            refresh(r)
+            moves++
+            improved = true
+          }
+        }
+      }
+    }
+    return improved
+  }
+
+  /** Swap the tails of two routes (2-opt*). */
+  const twoOptStar = (): boolean => {
+    let improved = false
+    for (let a = 0; a < R && !outOfTime(); a++) {
+      for (let b = a + 1; b < R; b++) {
+        const seqA = routes[a]
+        const seqB = routes[b]
+        if (seqA.length === 0 && seqB.length === 0) continue
+        let best = -EPS
+        let bi = -1
+        let bj = -1
+        for (let i = 0; i <= seqA.length; i++) {
+          for (let j = 0; j <= seqB.length; j++) {
+            if ((i === seqA.length && j === seqB.length) || (i === 0 && j === 0)) continue
+            let m = 0
+            for (let k = 0; k < i; k++) scratch[m++] = seqA[k]
+            for (let k = j; k < seqB.length; k++) scratch[m++] = seqB[k]
+            const newA = evalScratch(a, m)
+            if (newA === Infinity) continue
+            m = 0
+            for (let k = 0; k < j; k++) scratch[m++] = seqB[k]
+            for (let k = i; k < seqA.length; k++) scratch[m++] = seqA[k]
+            const delta = newA + evalScratch(b, m) - cost[a] - cost[b]
+            if (delta < best) {
+              best = delta
+              bi = i
+              bj = j
+            }
+          }
+        }
+        if (bi < 0) continue
+        routes[a] = [...seqA.slice(0, bi), ...seqB.slice(bj)]
+        routes[b] = [...seqB.slice(0, bj), ...seqA.slice(bi)]
+        refresh(a)
+        refresh(b)
+        moves++
+        improved = true
+      }
+    }
+    return improved
+  }
+
+  /** Stops left over from construction may fit once routes have tightened. */
+  const insertPending = (): boolean => {
+    let improved = false
+    pending = pending.filter(s => {
+      let best = Infinity
+      let route = -1
+      let at = -1
+      for (let r = 0; r < R; r++) {
+        const [delta, pos] = bestInsertion(s, r)
+        if (delta < best) {
+          best = delta
+          route = r
+          at = pos
+        }
+      }
+      if (route < 0) return true
+      routes[route].splice(at, 0, s)
+      refresh(route)
+      improved = true
+      return false
+    })
+    return improved
+  }
+
+  for (let improved = true; improved && !outOfTime();) {
+    improved = false
+    for (const step of [() => segmentMoves(1), twoOpt, () => segmentMoves(2), () => segmentMoves(3), twoOptStar]) {
+      if (outOfTime()) break
+      if (step()) improved = true
+    }
+    if (pending.length > 0 && insertPending()) improved = true
+  }
+
+  // ── Result ───────────────────────────────────────────────────────
+  const result: VrpRoute[] = []
+  let totalTime = 0
+  let totalDistance = 0
+  for (let r = 0; r < R; r++) {
+    const seq = routes[r]
+    if (seq.length === 0) continue
+    let distance = 0
+    if (problem.distance) {
+      let prev = vStart[r]
+      for (const s of seq) {
+        distance += problem.distance[prev * n + node[s]]
+        prev = node[s]
+      }
+      if (vEnd[r] >= 0) distance += problem.distance[prev * n + vEnd[r]]
+    }
+    const routeTime = cost[r] - fixedCost
+    totalTime += routeTime
+    totalDistance += distance
+    result.push({
+      vehicleId: vehicles[r].id,
+      stopIds: seq.map(s => stops[s].id),
+      time: routeTime,
+      distance,
+      weightKg: loadKg[r],
+      volumeCbm: loadCbm[r],
+    })
+  }
+
+  return {
+    routes: result,
+    unassigned: pending.map(s => stops[s].id),
+    totalTime,
+    totalDistance,
+    vehiclesUsed: result.length,
+    elapsedMs: Math.round(performance.now() - started),
+    moves,
+  }
+}
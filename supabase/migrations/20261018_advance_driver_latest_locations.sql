@@ -0,0 +1,37 @@
+-- ─────────────────────────────────────────────────────────────────
+-- advance_driver_latest_locations — อัปเดตตำแหน่งล่าสุดของคนขับเฉพาะเมื่อใหม่กว่า
+--
+--   ใช้โดย ingestGPSBatch (src/lib/gps-ingest.ts): ส่งจุดล่าสุดของแต่ละคนขับใน
+--   batch มาเป็น jsonb แล้ว upsert ลง driver_latest_locations โดยเขียนทับเฉพาะแถวที่
+--   "timestamp" ใหม่กว่าของเดิม — batch ย้อนหลัง/ค้างส่ง (offline backlog) จึงไม่ทำให้
+--   ตำแหน่งบนแผนที่ถอยกลับ คืน driver_id ที่ถูกอัปเดตจริง เพื่อให้ส่งขึ้นแผนที่สด
+--   และตรวจ danger zone เฉพาะคนขับกลุ่มนั้น
+--
+--   security definer → เรียกได้เฉพาะ service role (ปิดสิทธิ์ anon/authenticated)
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create or replace function advance_driver_latest_locations(positions jsonb)
+returns setof text
+language sql volatile security definer
+set search_path = public
+as $$
+    insert into driver_latest_locations as cur
+        (driver_id, vehicle_plate, latitude, longitude, job_id, speed, "timestamp", updated_at)
+    select p.driver_id, p.vehicle_plate, p.latitude, p.longitude, p.job_id, p.speed, p."timestamp", now()
+    from jsonb_populate_recordset(null::driver_latest_locations, positions) p
+    on conflict (driver_id) do update set
+        vehicle_plate = excluded.vehicle_plate,
+        latitude      = excluded.latitude,
+        longitude     = excluded.longitude,
+        job_id        = excluded.job_id,
+        speed         = excluded.speed,
+        "timestamp"   = excluded."timestamp",
+        updated_at    = excluded.updated_at
+    where cur."timestamp" is null or excluded."timestamp" > cur."timestamp"
+    returning cur.driver_id::text;
+$$;
+
+revoke execute on function advance_driver_latest_locations(jsonb) from public, anon, authenticated;
+grant execute on function advance_driver_latest_locations(jsonb) to service_role;
@@ -0,0 +1,26 @@
+-- ─────────────────────────────────────────────────────────────────
+-- Cache ระยะทาง/เวลาขับรถระหว่างจุด (distance matrix) จาก OSRM
+--
+--   ใช้โดย src/lib/ai/distance-matrix.ts: optimizeRoute, optimizeRouteSequence
+--   และ getDrivingDistance อ่าน matrix จาก cache ในหน่วยความจำ → ตารางนี้ →
+--   เรียก OSRM table service เฉพาะคู่ที่ยังไม่มี (ครั้งเดียวทั้งชุด)
+--
+--   key = พิกัดปัด 4 ตำแหน่ง "lat,lng" (~11 ม.) — จุดส่งของเดิมทุกวันจึงได้ key เดิม
+--   เป็นระยะทางแบบมีทิศทาง (from → to) เพราะถนนทางเดียว/กลับรถทำให้ไม่สมมาตร
+--   เติมล่วงหน้าจาก Master_Routes / Master_Locations ผ่าน /api/cron/distance-matrix
+--
+--   ไม่มี policy: อ่าน/เขียนผ่าน service role เท่านั้น
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create table if not exists distance_matrix_cache (
+    from_key   text not null,
+    to_key     text not null,
+    distance_m integer not null,
+    duration_s integer not null,
+    updated_at timestamptz not null default now(),
+    primary key (from_key, to_key)
+);
+
+alter table distance_matrix_cache enable row level security;
@@ -0,0 +1,44 @@
+-- ─────────────────────────────────────────────────────────────────
+-- fleet location sync — ข้อมูลที่ location store (src/lib/location-store.ts) ใช้
+-- ซิงก์ตำแหน่งคนขับระหว่าง server instance
+--
+--   driver_location_logouts: คนขับที่ออกจากระบบ 1 แถวต่อคน (upsert ตอน logout ใน
+--   auth-actions.ts) ทุก instance อ่านตาราง logged_out_at ใหม่ ๆ แล้วลบหมุดบนแผนที่
+--   ไม่ใช่แค่ instance ที่รับคำขอ logout
+--
+--   gps_latest_since(since): จุดล่าสุดของแต่ละคนขับใน gps_logs ตั้งแต่ since
+--   (1 แถวต่อคนขับ) ให้ฝั่ง server แบ่งหน้าแบบ keyset ตาม driver_id ได้ แทนการอ่าน
+--   ทุกแถวแบบ limit ที่ตัดคนขับทิ้งเงียบ ๆ เมื่อรถเยอะ
+--
+--   security definer → เรียกได้เฉพาะ service role (ปิดสิทธิ์ anon/authenticated)
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create table if not exists driver_location_logouts (
+    driver_id     text primary key,
+    logged_out_at timestamptz not null default now()
+);
+
+create index if not exists idx_driver_location_logouts_at
+    on driver_location_logouts (logged_out_at, driver_id);
+
+alter table driver_location_logouts enable row level security;
+
+create or replace function gps_latest_since(since timestamptz)
+returns setof gps_logs
+language sql stable security definer
+set search_path = public
+as $$
+    select distinct on (g.driver_id) g.*
+    from gps_logs g
+    where g."timestamp" >= since
+    order by g.driver_id, g."timestamp" desc;
+$$;
+
+revoke execute on function gps_latest_since(timestamptz) from public, anon, authenticated;
+grant execute on function gps_latest_since(timestamptz) to service_role;
+
+-- Range scan for gps_latest_since and the keyset fallback (timestamp, log_id)
+create index if not exists idx_gps_logs_timestamp_log_id
+    on gps_logs ("timestamp", log_id);
@@ -0,0 +1,63 @@
+-- ─────────────────────────────────────────────────────────────────
+-- job_status_counts — นับงานตามสถานะในฐานข้อมูล (แทนการดึงทุกแถวมานับใน Node)
+--
+--   ใช้โดย getTodayJobStats / getJobStatsSummary / getJobStatusDistribution
+--   (src/lib/supabase/jobs.ts) คืน 1 แถวต่อ Job_Status พร้อมยอด Loaded_Qty และ
+--   จำนวนงานที่มีรูป/ลายเซ็น POD. ไม่ติด row cap ของ PostgREST (default 1000)
+--   ที่เคยทำให้ตัวเลขบนแดชบอร์ดถูกตัดเงียบ ๆ เมื่อเลือกช่วงวันที่ยาว
+--
+--   ตัวกรองทุกตัวเป็น optional (NULL = ไม่กรอง); การจำกัดสิทธิ์สาขา/ลูกค้า
+--   ทำฝั่ง server ก่อนเรียก (เหมือน get_dashboard_metrics)
+--
+--   security invoker → รันด้วยสิทธิ์ของผู้เรียก: RLS ของ Jobs_Main ยังมีผล
+--   (client ที่ใช้ RLS เห็นเฉพาะแถวที่ตัวเองเห็นได้; service role เท่านั้นที่เห็นทุกแถว)
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create or replace function job_status_counts(
+    start_date              text    default null,
+    end_date                text    default null,
+    filter_branch_id        text    default null,
+    include_shared_branches boolean default false,   -- + Branch_ID 'All' / NULL
+    filter_customer_ids     text[]  default null,
+    filter_customer_names   text[]  default null,
+    search                  text    default null     -- ilike Job_ID / Customer_Name / Route_Name
+)
+returns table (
+    job_status     text,
+    jobs           bigint,
+    loaded_qty     numeric,
+    with_photo     bigint,
+    with_signature bigint
+)
+language sql stable security invoker
+set search_path = public
+as $$
+    select
+        j."Job_Status"::text,
+        count(*),
+        coalesce(sum(case when j."Loaded_Qty"::text ~ '^-?[0-9]+(\.[0-9]+)?$'
+                          then j."Loaded_Qty"::text::numeric end), 0),
+        count(*) filter (where nullif(j."Photo_Proof_Url", '') is not null
+                            or nullif(j."Pickup_Photo_Url", '') is not null),
+        count(*) filter (where nullif(j."Signature_Url", '') is not null
+                            or nullif(j."Pickup_Signature_Url", '') is not null)
+    from "Jobs_Main" j
+    where (start_date is null or j."Plan_Date" >= start_date)
+      and (end_date   is null or j."Plan_Date" <= end_date)
+      and (filter_branch_id is null
+           or j."Branch_ID" = filter_branch_id
+           or (include_shared_branches and (j."Branch_ID" = 'All' or j."Branch_ID" is null)))
+      and (filter_customer_ids   is null or j."Customer_ID"   = any (filter_customer_ids))
+      and (filter_customer_names is null or j."Customer_Name" = any (filter_customer_names))
+      and (search is null
+           or j."Job_ID"        ilike '%' || search || '%'
+           or j."Customer_Name" ilike '%' || search || '%'
+           or j."Route_Name"    ilike '%' || search || '%')
+    group by j."Job_Status";
+$$;
+
+-- Covering index for the common "date range + branch" dashboard filter
+create index if not exists idx_jobs_main_plan_date_branch_status
+    on "Jobs_Main" ("Plan_Date", "Branch_ID", "Job_Status");
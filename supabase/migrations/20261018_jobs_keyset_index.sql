@@ -0,0 +1,20 @@
+-- ─────────────────────────────────────────────────────────────────
+-- Index สำหรับแบ่งหน้าแบบ keyset (cursor) ของรายการงาน (getAllJobs)
+--
+--   ลำดับรายการ: Plan_Date desc, Created_At desc, Job_ID desc (NULLS FIRST
+--   ตามค่า default ของ desc). หน้าถัดไปขอ "แถวหลัง cursor" แทน offset
+--   index ที่เรียงตรงกันจึงเริ่มอ่านที่ตำแหน่ง cursor ได้เลย — หน้า 500 ใช้เวลา
+--   เท่ากับหน้า 1
+--
+--   ตัวที่สองขึ้นต้นด้วย Branch_ID สำหรับแอดมินสาขาที่ถูกกรองสาขาเสมอ
+--
+--   CREATE INDEX CONCURRENTLY รันใน transaction ไม่ได้ — ให้รันทีละคำสั่ง
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create index concurrently if not exists idx_jobs_main_list_keyset
+    on "Jobs_Main" ("Plan_Date" desc, "Created_At" desc, "Job_ID" desc);
+
+create index concurrently if not exists idx_jobs_main_branch_list_keyset
+    on "Jobs_Main" ("Branch_ID", "Plan_Date" desc, "Created_At" desc, "Job_ID" desc);
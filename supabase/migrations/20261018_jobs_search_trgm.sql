@@ -0,0 +1,75 @@
+-- ─────────────────────────────────────────────────────────────────
+-- ค้นหางาน (Jobs_Main) ด้วย trigram index + ผลลัพธ์เรียงตามความใกล้เคียง
+--
+--   getAllJobs (หน้า /jobs/history) ค้นด้วย ilike '%q%' บน Job_ID /
+--   Customer_Name / Route_Name / Notes ซึ่งเดิมต้อง seq scan ทั้งตารางทุกครั้ง
+--   ที่พิมพ์. GIN index แบบ gin_trgm_ops รองรับ ilike '%q%' ได้ตรง ๆ
+--   (ทั้ง job_status_counts และ globalSearch ที่ใช้เงื่อนไขเดียวกันก็ได้ประโยชน์ด้วย)
+--
+--   ภาษาไทยไม่มีช่องว่างระหว่างคำ tsvector แบบแยกคำตาม dictionary จึงตัดคำไทย
+--   ไม่ได้ถ้าไม่มี extension ตัดคำเพิ่ม; trigram เป็นการตัดทีละ 3 ตัวอักษร
+--   จึงจับ substring ได้ทุกภาษา (ไทย/อังกฤษ/รหัสงาน) โดยไม่ต้องตัดคำ
+--
+--   search_jobs: คืนแถว Jobs_Main ที่ตรงกับคำค้น เรียงตาม
+--     Job_ID ตรงตัว > Job_ID ขึ้นต้นด้วยคำค้น > word_similarity สูงสุด > Plan_Date ล่าสุด
+--   ตัวกรองเหมือน getAllJobs (NULL = ไม่กรอง); สิทธิ์สาขา/ลูกค้าคำนวณฝั่ง server
+--   ก่อนเรียก. เป็น SECURITY INVOKER เพื่อให้ RLS ของผู้เรียกยังมีผล
+--
+--   CREATE INDEX CONCURRENTLY รันใน transaction ไม่ได้ — ให้รันทีละคำสั่ง
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create extension if not exists pg_trgm;
+
+create index concurrently if not exists idx_jobs_main_job_id_trgm
+    on "Jobs_Main" using gin ("Job_ID" gin_trgm_ops);
+create index concurrently if not exists idx_jobs_main_customer_name_trgm
+    on "Jobs_Main" using gin ("Customer_Name" gin_trgm_ops);
+create index concurrently if not exists idx_jobs_main_route_name_trgm
+    on "Jobs_Main" using gin ("Route_Name" gin_trgm_ops);
+create index concurrently if not exists idx_jobs_main_notes_trgm
+    on "Jobs_Main" using gin ("Notes" gin_trgm_ops);
+
+create or replace function search_jobs(
+    q                   text,
+    start_date          text    default null,
+    end_date            text    default null,
+    filter_branch_id    text    default null,
+    filter_customer_ids text[]  default null,
+    statuses            text[]  default null,   -- Job_Status in (...)
+    exclude_statuses    text[]  default null,   -- Job_Status not in (...)
+    delivery_before     text    default null,   -- Delivery_Date < (งานเลยกำหนด)
+    page_limit          int     default 50,
+    page_offset         int     default 0
+)
+returns setof "Jobs_Main"
+language sql stable
+as $$
+    select j.*
+    from "Jobs_Main" j
+    where (j."Job_ID"           ilike '%' || q || '%'
+           or j."Customer_Name" ilike '%' || q || '%'
+           or j."Route_Name"    ilike '%' || q || '%'
+           or j."Notes"         ilike '%' || q || '%')
+      and (start_date is null or j."Plan_Date" >= start_date)
+      and (end_date   is null or j."Plan_Date" <= end_date)
+      and (filter_branch_id    is null or j."Branch_ID"   = filter_branch_id)
+      and (filter_customer_ids is null or j."Customer_ID" = any (filter_customer_ids))
+      and (statuses            is null or j."Job_Status"  = any (statuses))
+      and (exclude_statuses    is null or j."Job_Status" <> all (exclude_statuses))
+      and (delivery_before     is null or j."Delivery_Date" < delivery_before)
+    order by
+        lower(j."Job_ID") = lower(q) desc,
+        j."Job_ID" ilike q || '%' desc,
+        greatest(
+            word_similarity(q, coalesce(j."Job_ID", '')),
+            word_similarity(q, coalesce(j."Customer_Name", '')),
+            word_similarity(q, coalesce(j."Route_Name", '')),
+            word_similarity(q, coalesce(j."Notes", ''))
+        ) desc,
+        j."Plan_Date" desc nulls last,
+        j."Created_At" desc nulls last
+    limit page_limit
+    offset page_offset;
+$$;
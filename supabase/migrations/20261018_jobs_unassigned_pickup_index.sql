@@ -0,0 +1,17 @@
+-- ─────────────────────────────────────────────────────────────────
+-- Index สำหรับค้นหางานที่ยังไม่มอบหมายใกล้จุดรับสินค้า (getNearbyUnassignedJobs)
+--
+--   query กรองด้วยกรอบพิกัด (bounding box) ของรัศมีค้นหา:
+--     Job_Status = 'New' and Driver_ID is null
+--     and Pickup_Lat between ... and Pickup_Lon between ...
+--   partial index เก็บเฉพาะงานที่ยังไม่มอบหมาย จึงเล็กและอัปเดตน้อย
+--   ขึ้นต้นด้วย Branch_ID เพราะ query กรองสาขาของผู้ใช้เสมอ (ยกเว้น super admin 'All')
+--
+--   CREATE INDEX CONCURRENTLY รันใน transaction ไม่ได้ — ให้รันทีละคำสั่ง
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create index concurrently if not exists idx_jobs_main_unassigned_pickup
+    on "Jobs_Main" ("Branch_ID", "Pickup_Lat", "Pickup_Lon")
+    where "Job_Status" = 'New' and "Driver_ID" is null;
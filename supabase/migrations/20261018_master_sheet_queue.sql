@@ -0,0 +1,44 @@
+-- ─────────────────────────────────────────────────────────────────
+-- คิวเขียนงานลง MASTER Google Sheet + ดัชนี Job_ID ต่อแท็บ
+--
+--   ใช้โดย src/lib/actions/master-sheet-sync.ts:
+--   - ตอนตรวจงาน (Verified) แค่ queueJobForMaster → แถวใน master_sheet_queue
+--   - flushMasterSheetQueue รันทันทีหลังตรวจงาน (after()) และ /api/cron/master-sheet-sync
+--     วันละครั้งเก็บตกที่ค้าง; ปุ่มในหน้า /admin/health สั่งเขียนเองได้:
+--     อ่าน metadata 1 ครั้ง, batchGet 1 ครั้ง, append 1 ครั้งต่อแท็บ และ
+--     sort ทุกแท็บใน batchUpdate เดียว (แทนการอ่านทั้งแท็บ + sort ต่องาน)
+--   - master_sheet_index เก็บ Job_ID ที่อยู่ในแต่ละแท็บแล้ว ใช้กันเขียนซ้ำ
+--     โดยไม่ต้องอ่านทั้งแท็บ; อ่านแท็บใหม่เมื่อ indexed_at เก่ากว่า 6 ชม.
+--     (แถวที่แก้/ลบด้วยมือในชีตจะถูกเก็บเข้าดัชนีรอบถัดไป)
+--
+--   claimed_at: flush ที่กำลังทำงานจองแถวไว้; ค้างเกิน 10 นาทีถือว่าหลุด
+--   attempts: จำนวนครั้งที่เขียนไม่สำเร็จ; ครบ 5 ครั้งจะค้างไว้พร้อม last_error
+--   ไม่ลองซ้ำอีก จนกว่าจะตรวจงานใหม่ (queueJobForMaster รีเซ็ตเป็น 0)
+--   ไม่มี policy: อ่าน/เขียนผ่าน service role เท่านั้น
+--
+-- รันเองใน Supabase SQL editor (project: uotofvfmlimkdmkcfsbr).
+-- ─────────────────────────────────────────────────────────────────
+
+create table if not exists master_sheet_queue (
+    job_id     text primary key,
+    queued_at  timestamptz not null default now(),
+    claimed_at timestamptz,
+    last_error text,
+    attempts   integer not null default 0
+);
+
+alter table master_sheet_queue add column if not exists attempts integer not null default 0;
+
+create index if not exists master_sheet_queue_queued_at_idx
+    on master_sheet_queue (queued_at);
+
+alter table master_sheet_queue enable row level security;
+
+create table if not exists master_sheet_index (
+    tab        text primary key,
+    job_ids    text[] not null default '{}',
+    indexed_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+
+alter table master_sheet_index enable row level security;
@@ -1,5 +1,8 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
 
 async def run_test():
     pw = None
@@ -28,66 +31,51 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Attempt to reload the current page using the visible 'Reload' button to recover from ERR_EMPTY_RESPONSE. If reload succeeds, continue by locating the login form or session indicators; if it still fails, report the issue.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Wait briefly for the SPA to load, then navigate directly to the login page at /login to attempt to load the login form (use direct navigation only because the current page has no interactive elements).
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/login")
         
         # -> Fill phone and password fields on the login form and submit the form to attempt authentication and trigger a redirect to the dashboard.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/div/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('0812345678')
+        await act.fill(elem, '0812345678')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await act.fill(elem, 'password123')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the login submit button to attempt authentication and then (after navigation) extract page content to search for session tokens (access_token, refresh_token, jwt, Authorization, Bearer, token, localStorage, session, user_id, userId, email).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
-        ```
         try:
             await expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: The test attempted to verify that a user logging in with valid credentials is redirected to the dashboard and a session is established (session tokens available). The page did not display 'Dashboard', so the login, redirect, or session creation likely failed.")
-        ```
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
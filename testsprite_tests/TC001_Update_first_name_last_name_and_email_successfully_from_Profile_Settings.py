@@ -1,5 +1,10 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
 
 async def run_test():
     pw = None
@@ -21,92 +26,35 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open Settings from the sidebar, then 'แก้ไขโปรไฟล์' (Edit Profile) to reach /settings/profile.
+        profile = await ProfilePage(page, act).open_from_settings()
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> Fill First Name, Last Name and Email with test values and click 'บันทึกการเปลี่ยนแปลง' (Save Changes).
+        await profile.fill(
+            first_name='TestFirst',
+            last_name='TestLast',
+            email='test.user.updated@example.com',
+        )
+        await profile.save()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Open the login page (navigate to /login) by clicking a navigation/button element on the current page (avoid direct URL navigation).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user menu to find navigation to Settings/Profile by clicking the user/menu button (index=1926).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'ตั้งค่า' (Settings) navigation link to open settings (use element index 2502).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button to open the profile editing page (/settings/profile).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the profile edit form (reveal First Name, Last Name, Email input fields and the Save Changes button) so fields can be updated and saved.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill First Name, Last Name, Email with test values and click 'บันทึกการเปลี่ยนแปลง' (Save Changes). Then verify success message and that updated values persist on the profile page.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestFirst')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestLast')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test.user.updated@example.com')
-        
-        # -> Click the 'บันทึกการเปลี่ยนแปลง' (Save Changes) button to submit the profile update and then verify the success confirmation and that the updated values persist on the profile page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
         # --> Assertions to verify final state
-        frame = context.pages[-1]
+        frame = page
         try:
             await expect(frame.locator('text=สำเร็จ').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Expected profile update success confirmation ('สำเร็จ') after saving changes; the test was verifying that an authenticated user could save First Name, Last Name, and Email and see the success message and updated values persist on the profile page, but the confirmation did not appear")
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
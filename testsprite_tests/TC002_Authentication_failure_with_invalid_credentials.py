@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+
 async def run_test():
     pw = None
     browser = None
@@ -28,27 +30,14 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,5 +1,10 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
 
 async def run_test():
     pw = None
@@ -21,111 +26,35 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open Settings from the sidebar, then 'แก้ไขโปรไฟล์' (Edit Profile) to reach /settings/profile.
+        profile = await ProfilePage(page, act).open_from_settings()
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> Fill First Name and Last Name with valid values and Email with an invalid one, then click Save.
+        await profile.fill(
+            first_name='BadEmailFirst',
+            last_name='BadEmailLast',
+            email='not-an-email',
+        )
+        await profile.save()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the /login page to start the login step.
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
-        
-        # -> Fill the username and password fields with provided credentials and click the login button to sign in (use indices 402, 403, then click 405).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'เข้าสู่ระบบ' (Login) button again to attempt to sign in and navigate to the dashboard.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'ตั้งค่า' (Settings) link in the left navigation to open the Settings section (use element index 821).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user menu to access the Profile option (click the user button) and then select Profile to reach /settings/profile.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button to open the profile edit form (navigate to /settings/profile).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button to open the profile edit form and navigate to /settings/profile so the profile inputs become available.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Type 'BadEmailFirst' into First Name (index 17045) then fill Last Name and Email with invalid value and click Save to validate error handling.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('BadEmailFirst')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('BadEmailLast')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-an-email')
-        
-        # -> Click the 'บันทึกการเปลี่ยนแปลง' (Save Changes) button (index 17066), then extract page content to verify the presence of the text 'Email' and the validation message 'invalid', and confirm the URL still contains '/settings/profile'.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
         # --> Assertions to verify final state
-        frame = context.pages[-1]
+        frame = page
         try:
             await expect(frame.locator('text=invalid').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: expected to see an email validation error ('invalid') on the profile page and remain on /settings/profile, but the validation message did not appear — the invalid email may have been accepted or the error message is missing.")
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
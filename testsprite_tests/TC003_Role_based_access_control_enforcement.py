@@ -1,6 +1,9 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+
 async def run_test():
     pw = None
     browser = None
@@ -21,55 +24,42 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Open the user/profile menu (to find logout or switch-account options) so the session can be changed to a limited-permission user.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the logout button in the sidebar (index 275) to sign out so a limited-permission user can be logged in.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Reload button (index 74) to recover the application and get a fresh page state so login can be attempted.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Recover the application by reloading/navigating to the app URL to get a fresh page load so login can be attempted.
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
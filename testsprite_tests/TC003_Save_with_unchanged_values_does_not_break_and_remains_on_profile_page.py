@@ -1,6 +1,10 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
+
 async def run_test():
     pw = None
     browser = None
@@ -21,89 +25,23 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the login page (/login) to begin the login flow.
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
-        
-        # -> Fill the email and password fields with admin / 123456 and click the 'เข้าสู่ระบบ' (Login) button.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the login ('เข้าสู่ระบบ') button again and wait for navigation to /dashboard; if redirected, locate and click Settings to open Profile settings.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click 'ตั้งค่า' (Settings) in the left navigation to open the settings page (use element index 773).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user menu to locate and open Profile/Profile Settings. Immediate action: click the user menu button (index 803).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button to open the profile settings page (expect URL to become /settings/profile).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button (index 2042) to open the profile settings (/settings/profile) and wait for the page to load; then proceed to click 'บันทึกการเปลี่ยนแปลง' without changing fields.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'บันทึกการเปลี่ยนแปลง' (Save Changes) button (index 8864) to save without making changes and observe whether the page navigates away or remains on /settings/profile.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+        # -> Open Settings from the sidebar, then 'แก้ไขโปรไฟล์' (Edit Profile) to reach /settings/profile.
+        profile = await ProfilePage(page, act).open_from_settings()
+
+        # -> Click 'บันทึกการเปลี่ยนแปลง' (Save Changes) without changing any field.
+        await profile.save()
+        await act.settle()
 
     finally:
         if context:
@@ -1,10 +1,57 @@
 import asyncio
+import time
 from playwright import async_api
+from playwright.async_api import expect
+
+from perf.dashboard_timing import NAVIGATION_JS
+from perf.supabase import SupabaseRest
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.selectors import SelectorIndex
+
+# Well past the 1000-row PostgREST cap the status counters used to hit.
+SEED_JOBS = 5000
+SEED_BATCH = 1000
+SEED_DATES = ("2099-01-01", "2099-01-02", "2099-01-03")
+# Status mix cycled over the seeded jobs: (Job_Status, Loaded_Qty)
+SEED_STATUSES = [
+    ("Delivered", 10), ("Completed", 5), ("In Transit", 3), ("Arrived Dropoff", 2),
+    ("Assigned", 1), ("New", 1), ("Failed", 0), ("Cancelled", 0),
+]
+# Server render budget for /dashboard over the seeded range (navigation timing)
+MAX_SERVER_MS = 5000
+
+def seed_rows(marker):
+    rows = []
+    for i in range(SEED_JOBS):
+        status, qty = SEED_STATUSES[i % len(SEED_STATUSES)]
+        rows.append({
+            "Job_ID": f"{marker}-{i + 1:05d}",
+            "Plan_Date": SEED_DATES[i % len(SEED_DATES)],
+            "Customer_Name": marker,
+            "Job_Status": status,
+            "Loaded_Qty": qty,
+            "Branch_ID": None,
+            "Notes": marker,
+        })
+    return rows
+
+def expected_stats(rows):
+    def count(*statuses):
+        return sum(1 for r in rows if r["Job_Status"] in statuses)
+    return {
+        "total": len(rows),
+        "delivered": count("Delivered", "Completed", "Verified"),
+        "in_progress": count("In Transit", "In Progress", "Arrived Pickup", "Arrived Dropoff"),
+        "qty": sum(r["Loaded_Qty"] for r in rows),
+    }
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    rest = None
+    marker = f"tc004-{time.strftime('%m%d%H%M%S')}"
 
     try:
         # Start a Playwright session in asynchronous mode
@@ -21,53 +68,40 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the Reload button to attempt to recover the dashboard page (use interactive element index 74).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Reload the dashboard page to recover it so metrics can be re-extracted (navigate to http://localhost:3000/dashboard).
-        await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/dashboard")
         
         # -> Open the login page / perform login as an authorized user so dashboard data can be re-verified against backend data.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Dashboard page by clicking the 'Dashboard' navigation link (element index 2093) so current visible dashboard labels/metrics can be extracted for verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[1]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -75,9 +109,41 @@ async def run_test():
             await expect(frame.locator('text=Daily Tasks').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Expected the dashboard to display 'Daily Tasks' confirming daily tasks, vehicle statuses, and job statistics reflect backend data, but the expected header or metrics did not appear or were not visible")
-        await asyncio.sleep(5)
+        await act.settle()
+
+        # -> Seed a large dataset in an otherwise empty date range and check the
+        # summary cards against it, plus how long the server takes to render.
+        rest = await SupabaseRest.connect(pw, service=True)
+        rows = seed_rows(marker)
+        for start in range(0, len(rows), SEED_BATCH):
+            result = await rest.insert("Jobs_Main", rows[start:start + SEED_BATCH])
+            assert result.ok, f"Seeding Jobs_Main failed: {result.status} {result.body}"
+        expected = expected_stats(rows)
+
+        # customer=All keeps a saved header customer filter from narrowing the view
+        await act.goto(
+            f"http://localhost:3000/dashboard?start={SEED_DATES[0]}&end={SEED_DATES[-1]}"
+            f"&customers={marker}&customer=All"
+        )
+        await act.settle()
+        timing = await page.evaluate(NAVIGATION_JS)
+
+        summary = SelectorIndex(page)
+        await expect(summary["daily_summary.total"]).to_have_text(str(expected["total"]), timeout=15000)
+        await expect(summary["daily_summary.delivered"]).to_have_text(str(expected["delivered"]))
+        await expect(summary["daily_summary.in_progress"]).to_have_text(str(expected["in_progress"]))
+        qty = (await summary["daily_summary.qty"].inner_text()).replace(",", "")
+        assert qty == str(expected["qty"]), f"Dashboard total quantity shows {qty}, expected {expected['qty']}"
+
+        assert timing, "Navigation timing for /dashboard is not available"
+        assert timing["server"] <= MAX_SERVER_MS, (
+            f"Dashboard took {timing['server']:.0f} ms to render {SEED_JOBS} jobs, over the {MAX_SERVER_MS} ms budget"
+        )
 
     finally:
+        if rest:
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+            await rest.close()
         if context:
             await context.close()
         if browser:
@@ -1,5 +1,10 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
 
 async def run_test():
     pw = None
@@ -21,94 +26,31 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open the Profile settings page (/settings/profile) directly with the cached admin session.
+        profile = await ProfilePage(page, act).open()
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> Clear the Email field and click 'บันทึกการเปลี่ยนแปลง' (Save Changes).
+        await profile.fill(email='')
+        await profile.save()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the login page (/login) so the login form can be used.
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
-        
-        # -> Fill the email field with 'admin', fill the password with '123456', and click the login button to submit.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'เข้าสู่ระบบ' (login) button to submit credentials and trigger navigation to the dashboard.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Attempt to reach the dashboard page by navigating directly to /dashboard (fallback since login did not succeed)
-        await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Open the user menu / navigation to access Settings/Profile by clicking the appropriate top-right menu button.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Settings page by clicking the 'ตั้งค่า' (Settings) link in the left sidebar so the Profile/Settings options become available.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Navigate to the Profile settings page (expected URL: /settings/profile) so the Email field can be cleared and Save attempted.
-        await page.goto("http://localhost:3000/settings/profile", wait_until="commit", timeout=10000)
-        
-        # -> Clear the Email field, click 'บันทึกการเปลี่ยนแปลง' (Save Changes), then check the page for visible text 'Email' and 'required' to confirm validation and ensure URL remains '/settings/profile'.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
         # --> Assertions to verify final state
-        frame = context.pages[-1]
+        frame = page
         try:
             await expect(frame.locator('text=required').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Expected a visible 'required' validation message after clearing the Email field and clicking 'บันทึกการเปลี่ยนแปลง' (Save Changes) on the Profile settings page to prevent saving, but the 'required' message was not displayed.")
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,5 +1,9 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
 
 async def run_test():
     pw = None
@@ -21,104 +25,91 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Open the Drivers management page from the dashboard navigation (click the Drivers link in the sidebar).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[7]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Attempt to recover the dashboard by clicking the Reload button on the browser error page. If reload fails, look for alternative navigation or report site unavailable.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Reload the dashboard by navigating to http://localhost:3000/dashboard to attempt to recover the app and restore interactive elements.
-        await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/dashboard")
         
         # -> Open the Drivers management page by clicking the Drivers link in the dashboard sidebar.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to the Drivers management page (open /drivers). If that loads, locate the Create button to begin CRUD flow.
-        await page.goto("http://localhost:3000/drivers", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/drivers")
         
         # -> Open the Create (เพิ่มคนขับ) driver form by clicking the 'เพิ่มคนขับ' (Add driver) button on the Drivers page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Create Driver form by clicking the 'เพิ่มคนขับ' (Add Driver) button so the new driver can be entered.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Fill the Create Driver form with valid test data and submit the form (click the 'เพิ่มคนขับ' submit button) to create the new driver.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('E2E-DRV-001')
+        await act.fill(elem, 'E2E-DRV-001')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('E2E Test Driver')
+        await act.fill(elem, 'E2E Test Driver')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('0999999001')
+        await act.fill(elem, '0999999001')
         
         # -> Fill the Password field in the Add Driver form and submit the form to create the new driver (then verify the driver appears in the list).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await act.fill(elem, 'password123')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[4]/form/div[6]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Reload /drivers and verify that the new driver (Driver_ID = 'E2E-DRV-001', Driver_Name = 'E2E Test Driver', Mobile_No = '0999999001') appears in the drivers list with correct information.
-        await page.goto("http://localhost:3000/drivers?page=1", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/drivers?page=1")
         
         # -> Search the drivers list for 'E2E-DRV-001' using the page search input and submit the search to locate the created driver.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('E2E-DRV-001')
+        await act.fill(elem, 'E2E-DRV-001')
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -126,7 +117,7 @@ async def run_test():
             await expect(frame.locator('text=E2E-DRV-001').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: the test attempted to verify that the newly created driver with ID 'E2E-DRV-001' appears in the drivers list after creation, but the expected entry was not found — driver creation or list refresh likely failed.")
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,6 +1,10 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
+
 async def run_test():
     pw = None
     browser = None
@@ -21,111 +25,28 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the login page (/login) so the test can proceed with entering credentials.
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
-        
-        # -> Type username 'admin' into the Username/Email field, type password '123456' into the Password field, then click the 'เข้าสู่ระบบ' (Login) button.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Attempt login again by clicking the 'เข้าสู่ระบบ' button to trigger navigation to /dashboard.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user/profile menu so the Profile option can be selected (click the header user button).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click 'ตั้งค่า' (Settings) in the left navigation to open the settings area so the Profile option can be selected.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user menu (if closed) to reveal the 'Profile' option, then click 'Profile' to open the profile settings page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the profile edit page by clicking the 'แก้ไขโปรไฟล์' (Edit Profile) button.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the profile edit page (account profile) so input fields for First name, Last name, and Email become available.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div[1]/div/div[2]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill First name with 'ทดสอบชื่อ', Last name with 'ทดสอบนามสกุล', Email with 'thai.name@example.com', then click 'บันทึกการเปลี่ยนแปลง' (Save). After saving, verify success message and the saved Thai values are visible.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ทดสอบชื่อ')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ทดสอบนามสกุล')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('thai.name@example.com')
-        
-        # -> Click the 'บันทึกการเปลี่ยนแปลง' (Save) button (index 21439) to persist the changes, then verify the success message and that the saved Thai values are visible.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+        # -> Open Settings from the sidebar, then 'แก้ไขโปรไฟล์' (Edit Profile) to reach /settings/profile.
+        profile = await ProfilePage(page, act).open_from_settings()
+
+        # -> Fill First name and Last name with Thai text, Email with a valid address, then Save.
+        await profile.fill(
+            first_name='ทดสอบชื่อ',
+            last_name='ทดสอบนามสกุล',
+            email='thai.name@example.com',
+        )
+        await profile.save()
+        await act.settle()
 
     finally:
         if context:
@@ -1,6 +1,9 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+
 async def run_test():
     pw = None
     browser = None
@@ -21,70 +24,57 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Retry loading the dashboard by clicking the Reload button on the error page to recover the site before continuing to the Drivers page and the import flow.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Drivers management page by using the dashboard search input (enter 'คนขับ' — Thai for 'drivers') and submit the search to reveal the Drivers page link.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('คนขับ')
+        await act.fill(elem, 'คนขับ')
         
         # -> Click the 'คนขับ' (Drivers) link in the sidebar to open the Drivers management page (element index 138).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Drivers management page and wait for the page to load so the bulk import controls are visible. Then proceed to initiate the bulk import.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Import Excel dialog by clicking the 'นำเข้า Excel' (Import Excel) button (element index 1892) to begin the bulk import flow.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Upload a well-formed Excel file using the file input (index 2219) then click the Import button (index 2232) to start the bulk import.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,6 +1,10 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import ProfilePage
+
 async def run_test():
     pw = None
     browser = None
@@ -21,61 +25,23 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the 'ตั้งค่า' (Settings) link in the left navigation (element index 985) to open the Settings page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user/admin menu to find a Profile or Settings link (click element index 1014).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button to open the profile settings page and then verify profile fields.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'แก้ไขโปรไฟล์' (Edit Profile) button again to open the profile settings page, then verify URL contains '/settings/profile' and the presence of 'First Name', 'Last Name', 'Email', and the 'บันทึกการเปลี่ยนแปลง' button.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        # -> Open Settings from the sidebar, then 'แก้ไขโปรไฟล์' (Edit Profile) to reach /settings/profile.
+        profile = await ProfilePage(page, act).open_from_settings()
+
         # --> Assertions to verify final state
-        frame = context.pages[-1]
-        frame = context.pages[-1]
-        await page.wait_for_timeout(1000)
+        frame = page
+        await act.settle()
         
         # Verify URL fragments from the test plan
         assert "/dashboard" in page.url, f"Expected '/dashboard' in URL, got: {page.url}"
@@ -92,7 +58,7 @@ async def run_test():
         assert await frame.locator("text=นามสกุล").is_visible(), "นามสกุล (Last Name) not visible"
         assert await frame.locator("text=อีเมล").is_visible(), "อีเมล (Email) not visible"
         assert await frame.locator("text=บันทึกการเปลี่ยนแปลง").is_visible(), "'บันทึกการเปลี่ยนแปลง' (Save Changes) button not visible"
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,6 +1,9 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+
 async def run_test():
     pw = None
     browser = None
@@ -21,82 +24,69 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the 'Drivers' (Drivers management) navigation link on the dashboard to open the Drivers page so the bulk import UI can be accessed.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'Reload' button (index 74) to attempt to restore the dashboard so the Drivers link can be accessed.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'Drivers' (คนขับ) navigation link to open the Drivers management page and access the bulk import UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'Drivers' (คนขับ) navigation link to open the Drivers management page and access the bulk import UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'Drivers' navigation element (use element index 1218) to open the Drivers management page and access the bulk import UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the bulk import dialog by clicking the 'นำเข้า Excel' (Import Excel) button so the file upload input appears (element index 3289).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Upload a corrupted/invalid Excel file using the file input (index 3544), then click the import/submit button to trigger validation and observe any error messages (click index 3557).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Create an invalid/corrupted Excel file, upload it using the file input (index 3544), click the import button (index 3557), wait for processing, and extract any visible error/validation messages shown by the UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
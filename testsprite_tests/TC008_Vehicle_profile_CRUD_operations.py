@@ -1,6 +1,9 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+
 async def run_test():
     pw = None
     browser = None
@@ -21,174 +24,161 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the navigation element that leads to the Vehicles (vehicle management) page from the dashboard.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Reload button (index 74) to attempt reloading the dashboard so navigation links (Vehicles) become available.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the navigation element that leads to the Vehicles (vehicle management) page from the dashboard.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div[4]/div/div[3]/div[1]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Reload the application by navigating to the root URL (http://localhost:3000) to restore the SPA DOM; then re-check for the Vehicles navigation link.
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the navigation element that leads to the Vehicles (vehicle management) page from the dashboard.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Vehicles management page by clicking the 'รถ' (Vehicles) navigation link and verify the Vehicles list loads.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'รถ' (Vehicles) navigation link (index 2232) to open the Vehicles management page and verify the Vehicles list loads.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the 'เพิ่มรถใหม่' (Add New Vehicle) form by clicking the Add New Vehicle button (index 3906) so the vehicle creation form can be filled.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the 'เพิ่มรถใหม่' (Add New Vehicle) form by clicking the Add New Vehicle button (index 3906) and wait for the form to appear so form inputs can be filled.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Fill the Add New Vehicle form with test data (registration 'TEST-1234', brand 'Toyota', model 'Hilux Revo', current mileage 200000, next service mileage 210000, vehicle type '4 ล้อ (4-Wheel)') and submit. Then verify the new vehicle appears in the vehicles list.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TEST-1234')
+        await act.fill(elem, 'TEST-1234')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Toyota')
+        await act.fill(elem, 'Toyota')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Hilux Revo')
+        await act.fill(elem, 'Hilux Revo')
         
         # -> Fill current mileage with 200000 and next service mileage with 210000, then submit the Add New Vehicle form (click submit).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[3]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('200000')
+        await act.fill(elem, '200000')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[4]/form/div[3]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('210000')
+        await act.fill(elem, '210000')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[4]/form/div[5]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Reload the application by navigating to http://localhost:3000 to restore the SPA DOM, wait for the page to load, then re-open Vehicles and verify the vehicle 'TEST-1234' appears.
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Open the Vehicles management page by clicking the 'รถ' (Vehicles) navigation link and then verify whether the vehicle with plate 'TEST-1234' appears in the list.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Vehicles management page by clicking the 'รถ' (Vehicles) navigation link (index 5098), then locate/search for registration 'TEST-1234' to verify whether the vehicle exists.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Enter 'TEST-1234' into the Vehicles search input and click the search button to locate the vehicle in the list and verify whether it exists.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TEST-1234')
+        await act.fill(elem, 'TEST-1234')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Add New Vehicle form (modal) so the vehicle can be created again (or confirm form fields before submitting). Click the 'เพิ่มรถใหม่' (Add New Vehicle) button.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Fill the Add New Vehicle form with registration 'TEST-1234', brand 'Toyota', model 'Hilux Revo', current mileage '200000', next service mileage '210000' and then submit the form to create the vehicle (this is the second creation attempt).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TEST-1234')
+        await act.fill(elem, 'TEST-1234')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Toyota')
+        await act.fill(elem, 'Toyota')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[5]/form/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Hilux Revo')
+        await act.fill(elem, 'Hilux Revo')
         
         # -> Navigate to http://localhost:3000 to reload the SPA DOM so the Vehicles page and interactive elements can be restored for continuing verification (then re-open Vehicles and proceed to submit/verify the vehicle).
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the 'รถ' (Vehicles) navigation link to open the Vehicles management page so the CRUD verification can continue (then search for plate 'TEST-1234').
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
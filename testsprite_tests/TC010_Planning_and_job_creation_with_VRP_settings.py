@@ -1,5 +1,10 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import PlanningPage, Sidebar
 
 async def run_test():
     pw = None
@@ -21,154 +26,39 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open the 'วางแผนงาน' (Planning) page from the sidebar.
+        await act.goto("http://localhost:3000/dashboard")
+        await Sidebar(page, act).navigate("/planning")
+        planning = PlanningPage(page, act)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> Open 'สร้างงานใหม่' (Create new job) and fill customer and product type on the 'ข้อมูลงาน' tab.
+        dialog = await planning.new_job()
+        job_id = await dialog.job_id()
+        await dialog.fill_customer('Test Customer')
+        await dialog.fill_cargo_type('Test Product')
+        await dialog.next()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the Reload button (element index 74) to attempt to recover the dashboard, then re-locate and open the Planning page.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'วางแผนงาน' (Planning) navigation link to open the Planning page (use element index 1113).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'วางแผนงาน' (Planning) navigation link (index 1113) to open the Planning page, then wait 2 seconds for the page to load and verify Planning-specific UI elements.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the job creation form by clicking the 'สร้างงานใหม่' (Create new job) button so new job entries can be added.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill required job details (customer name and product type) in the 'ข้อมูลงาน' tab and click 'ถัดไป →' to proceed to the location step.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[5]/form/div[1]/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Customer')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[5]/form/div[1]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Product')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[5]/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Fill origin and destination location fields (name, latitude, longitude) in the Create Job modal and click 'ถัดไป →' to go to the 'มอบหมาย' (Assign/VRP) tab.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[1]/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Factory A')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[1]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('13.756300')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[1]/div[2]/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('100.501800')
-        
-        # -> Fill destination location fields (name, latitude, longitude) in the Create Job modal and click 'ถัดไป →' to proceed to the Assign (มอบหมาย) tab.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[2]/div[2]/div[1]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Customer Location')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[2]/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('13.745000')
-        
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[4]/form/div[1]/div[2]/div[2]/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('100.523000')
-        
-        # -> Click the 'ถัดไป →' (Next) button in the Create Job modal to go to the 'มอบหมาย' (Assign/VRP) tab, then configure VRP settings (vehicle types, job types, time windows).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[4]/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Configure VRP assignment: choose vehicle registration and driver, then proceed by clicking 'ถัดไป →' to reach the Price tab.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[4]/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'สร้างงาน' (Create job) button in the Create Job modal to submit the job.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Create Job modal again by clicking 'สร้างงานใหม่' so the job can be submitted (then proceed to submit and run optimization). Immediate action: click element index 2841 ('สร้างงานใหม่').
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'สร้างงาน' (Create job) submit button in the Create Job modal to create the job (element index 3742).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[5]/form/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the job detail for JOB-20260212-4555 to locate VRP/assignment/optimization controls (open job details to configure VRP and run optimization).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div[1]/div/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open JOB-20260212-4555 detail (if not already open), locate VRP/assignment/optimization controls (vehicle type selectors, time windows, assign/optimize buttons), and extract their visible labels/text for verification.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div[1]/div/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the JOB-20260212-4555 detail pane and extract all visible VRP / assignment / optimization controls and their labels/text so VRP configuration UI can be verified.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div[1]/div/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+        # -> Fill origin and destination (name, latitude, longitude) on the locations tab.
+        await dialog.fill_origin('Factory A', '13.756300', '100.501800')
+        await dialog.fill_destination('Customer Location', '13.745000', '100.523000')
+
+        # -> Click 'สร้างงาน' (Create job) to submit.
+        await dialog.submit()
+
+        # --> Assertions to verify final state
+        await expect(planning.job(job_id)).to_be_visible(timeout=10000)
+        await act.settle()
 
     finally:
         if context:
@@ -1,6 +1,16 @@
 import asyncio
+import time
 from playwright import async_api
 
+from perf.supabase import RESULTS_DIR, SupabaseRest
+from perf.xlsx import write_xlsx
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import PlanningPage, Sidebar
+
+# Large enough for several createBulkJobs chunks (500 rows each).
+RESUME_ROWS = 2000
+
 async def run_test():
     pw = None
     browser = None
@@ -21,73 +31,65 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open the 'วางแผนงาน' (Planning) page from the sidebar.
+        await act.goto("http://localhost:3000/dashboard")
+        await Sidebar(page, act).navigate("/planning")
+        planning = PlanningPage(page, act)
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> Open the 'นำเข้า Excel' (Import Excel) dialog and close it again.
+        excel = await planning.open_import()
+        await excel.cancel()
+
+        # -> Import a large sheet in chunks and drop the network mid-import.
+        # Rows carry no Job_ID, so the server derives IDs from sheet position;
+        # a chunk re-sent after the drop must not insert its rows twice.
+        marker = f"resume-{time.strftime('%m%d%H%M%S')}"
+        sheet = RESULTS_DIR / f"{marker}.xlsx"
+        write_xlsx(
+            sheet,
+            ["ชื่อลูกค้า", "ต้นทาง", "ปลายทาง", "หมายเหตุ"],
+            ([f"Resume Customer {n % 50}", "คลังสินค้าบางนา", "แหลมฉบัง", marker] for n in range(RESUME_ROWS)),
+        )
+        excel = await planning.open_import()
+        await excel.set_grouping(False)
+        await excel.set_draft(True)
+        await excel.upload(sheet)
+        await excel.wait_parsed(timeout_ms=60000)
+        await act.click(excel.sel["excel_import.submit"])
+        await excel.wait_progress(1, timeout_ms=120000)
+        _, total_chunks = await excel.progress()
+        assert total_chunks > 1, f"expected a chunked import, got {total_chunks} chunk(s)"
+
+        await context.set_offline(True)
+        # Give the in-flight chunk time to fail while offline.
+        await page.wait_for_timeout(3000)
+        await context.set_offline(False)
+
+        # The dialog retries once back online and closes when every chunk landed.
+        await excel.root.wait_for(state="hidden", timeout=300000)
+        rest = await SupabaseRest.connect(pw, service=True)
+        try:
+            imported = await rest.count("Jobs_Main", {"Notes": f"eq.{marker}"})
+            assert imported == RESUME_ROWS, f"expected {RESUME_ROWS} jobs after resume, found {imported}"
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+        finally:
+            await rest.close()
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Click the likely navigation/menu button (index 252) to expand/reveal the Planning or Drivers link so it can be clicked.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the Planning navigation link to open the Planning/Drivers page (click element index 57).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the Planning link again (index 57) to open the Planning/Drivers page and reveal the bulk import (Excel upload) controls.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'นำเข้า Excel' (Import Excel) button to open the Excel upload dialog (element index 1889).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'นำเข้า Excel' (Import Excel) button again (index 1889) to open the Excel upload dialog and reveal the file input for uploading an Excel file.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/main/div/div[1]/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Create a test Excel file, upload it via the file input (index 2122), click the import/confirm button (index 2135), wait for processing, then extract page content to verify that the job(s) from the file (e.g., 'Bulk Test Customer') appear in the job list.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
         # --> Assertions to verify final state
-        frame = context.pages[-1]
+        frame = page
         # Wait a short while for the import processing and job list to update
-        await page.wait_for_timeout(3000)
+        await act.settle()
         
         # Read visible page text and assert imported job details are present
         body_text = await page.locator('body').inner_text()
@@ -98,7 +100,7 @@ async def run_test():
         # Optional: verify the dashboard summary reflects the new job
         assert '1 งานวันนี้' in body_text or '1 งานวันนี้' in body_text.replace('\n',' '), "Dashboard summary for today's jobs does not show the expected count '1 งานวันนี้'"
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,5 +1,17 @@
 import asyncio
+import time
 from playwright import async_api
+from playwright.async_api import expect
+
+from perf.supabase import RESULTS_DIR, SupabaseRest
+from perf.xlsx import write_xlsx
+from runner.actions import Actions
+from runner.auth import BASE_URL, new_context
+from runner.pages import PlanningPage
+
+# Four 500-row chunks; the second has no customer names, so it is all invalid.
+SHEET_ROWS = 2000
+INVALID = range(500, 1000)
 
 async def run_test():
     pw = None
@@ -21,52 +33,81 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Open the navigation/menu item that leads to the Planning or Drivers page (click a sidebar/nav button).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the sidebar/navigation element that should open the Planning or Drivers page (attempt navigation to Planning/Drivers).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the page Reload button (index 74) to try to recover the dashboard and proceed with navigation to the Planning/Drivers page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[1]/div[1]/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
+
+        # -> Chunked import with an invalid chunk, interrupted by a page reload.
+        # The invalid chunk is skipped, not fatal; after the reload, choosing
+        # the same file resumes from the last acknowledged chunk.
+        marker = f"invalid-{time.strftime('%m%d%H%M%S')}"
+        sheet = RESULTS_DIR / f"{marker}.xlsx"
+        write_xlsx(
+            sheet,
+            ["customer", "origin", "destination", "remark"],
+            (
+                ["" if n in INVALID else f"Chunk Customer {n % 50}", "นวนคร", "ลาดกระบัง", marker]
+                for n in range(SHEET_ROWS)
+            ),
+        )
+        planning = PlanningPage(page, act)
+        await act.goto(BASE_URL + planning.path)
+        excel = await planning.open_import()
+        await excel.set_grouping(False)
+        await excel.set_draft(True)
+        await excel.upload(sheet)
+        await excel.wait_parsed(timeout_ms=60000)
+        await act.click(excel.sel["excel_import.submit"])
+        await excel.wait_progress(2, timeout_ms=120000)
+
+        await page.reload()
+        await act.wait_hydrated()
+        excel = await planning.open_import()
+        await excel.set_grouping(False)
+        await excel.set_draft(True)
+        await excel.upload(sheet)
+        await excel.wait_parsed(timeout_ms=60000)
+        await expect(excel.sel["excel_import.resume"]).to_be_visible()
+        await excel.submit(timeout_ms=300000)
+
+        rest = await SupabaseRest.connect(pw, service=True)
+        try:
+            imported = await rest.count("Jobs_Main", {"Notes": f"eq.{marker}"})
+            expected = SHEET_ROWS - len(INVALID)
+            assert imported == expected, f"expected {expected} valid jobs after resume, found {imported}"
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+        finally:
+            await rest.close()
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -1,10 +1,67 @@
 import asyncio
+import time
 from playwright import async_api
+from playwright.async_api import expect
+
+from perf.supabase import SupabaseRest
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.selectors import SelectorIndex
+from runner.trace import record_metric
+
+# Jobs updated while offline; each gets two ordered transitions queued
+QUEUED_JOBS = 25
+QUEUED_STATUSES = ("Accepted", "Arrived Pickup")
+# Time from reconnecting to the queue being empty
+MAX_SYNC_MS = 15000
+
+# Writes entries in the shape saveJobOffline stores (src/lib/utils/offline-storage.ts)
+QUEUE_JS = """(entries) => new Promise((resolve, reject) => {
+    const request = indexedDB.open('tms_offline_db', 1)
+    request.onupgradeneeded = () => {
+        if (!request.result.objectStoreNames.contains('offline_jobs')) {
+            request.result.createObjectStore('offline_jobs', { keyPath: 'id' })
+        }
+    }
+    request.onerror = () => reject(request.error)
+    request.onsuccess = () => {
+        const db = request.result
+        const tx = db.transaction('offline_jobs', 'readwrite')
+        const store = tx.objectStore('offline_jobs')
+        const now = Date.now()
+        entries.forEach((e, i) => store.add({
+            id: crypto.randomUUID(),
+            jobId: e.jobId,
+            data: { status: e.status, actualCompletionTime: new Date(now + i).toISOString() },
+            timestamp: now + i,
+            type: 'STATUS',
+            retryCount: 0
+        }))
+        tx.oncomplete = () => {
+            db.close()
+            window.dispatchEvent(new CustomEvent('tms_offline_queue_change'))
+            resolve(entries.length)
+        }
+        tx.onerror = () => reject(tx.error)
+    }
+})"""
+
+def seed_rows(marker):
+    return [{
+        "Job_ID": f"{marker}-{i + 1:03d}",
+        "Plan_Date": time.strftime("%Y-%m-%d"),
+        "Customer_Name": marker,
+        "Job_Status": "Assigned",
+        "Branch_ID": None,
+        "Notes": marker,
+    } for i in range(QUEUED_JOBS)]
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    rest = None
+    marker = f"tc015-{time.strftime('%m%d%H%M%S')}"
 
     try:
         # Start a Playwright session in asynchronous mode
@@ -21,71 +78,60 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as a driver, on a phone-sized screen
+        context = await new_context(browser, "driver", viewport={"width": 390, "height": 844})
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the Assigned Jobs / Tracking page by clicking the left-nav 'ติดตาม' link so the assigned jobs list can be accessed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'ติดตาม' (Assigned/Tracking) link in the left navigation to open the Assigned Jobs page so offline checks can begin.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Click the 'ติดตาม' (Assigned/Tracking) left-nav link (index 84) to open the Assigned Jobs page so offline checks can begin.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Allow the SPA time to load, then navigate to the dashboard URL (http://localhost:3000/dashboard) to restore a loaded app view and continue with offline workflow checks.
-        await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
-        
-        # -> Navigate to the Assigned Jobs (Monitoring) page and extract the assigned jobs list so offline checks can start (then simulate going offline).
-        await page.goto("http://localhost:3000/monitoring", wait_until="commit", timeout=10000)
-        
-        # -> Reload the SPA by navigating to Dashboard then back to Monitoring to attempt to force the assigned-jobs list to render, then extract visible assigned jobs. If jobs appear, proceed with offline simulation; otherwise report inability to locate per-job DOM nodes and request backend/API access or test data to continue.
-        await page.goto("http://localhost:3000/dashboard", wait_until="commit", timeout=10000)
-        
-        await page.goto("http://localhost:3000/monitoring", wait_until="commit", timeout=10000)
-        
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
+
+        # -> Seed assigned jobs to update from the driver app
+        rest = await SupabaseRest.connect(pw, service=True)
+        rows = seed_rows(marker)
+        result = await rest.insert("Jobs_Main", rows)
+        assert result.ok, f"Seeding Jobs_Main failed: {result.status} {result.body}"
+
+        # -> Open the driver job list so the sync manager is mounted
+        await act.goto("http://localhost:3000/mobile/jobs")
+        await act.settle()
+
+        # -> Lose the network and queue the status updates the way the job buttons do offline
+        await context.set_offline(True)
+        assert not await page.evaluate("navigator.onLine"), "Page still reports online after set_offline(True)"
+        entries = [{"jobId": r["Job_ID"], "status": s} for r in rows for s in QUEUED_STATUSES]
+        queued = await page.evaluate(QUEUE_JS, entries)
+
+        banner = SelectorIndex(page)["offline_sync"]
+        await expect(banner).to_have_attribute("data-state", "pending")
+        await expect(banner).to_contain_text(str(queued))
+
+        # -> Restore the network and time the replay until the banner reports synced
+        started = time.perf_counter()
+        await context.set_offline(False)
+        await expect(banner).to_have_attribute("data-state", "synced", timeout=MAX_SYNC_MS * 4)
+        sync_ms = (time.perf_counter() - started) * 1000
+        record_metric("offline_queue_items", queued)
+        record_metric("offline_sync_ms", round(sync_ms))
+
         # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Offline job updates synced').first).to_be_visible(timeout=3000)
-        except AssertionError:
-            raise AssertionError("Test case failed: Expected offline job updates to sync after network restoration. The test updated a job while offline, restored connectivity, and was expecting a visible 'Offline job updates synced' confirmation or the updated job status to appear, but no sync confirmation or updated status was found in the UI")
-        await asyncio.sleep(5)
+        synced = await rest.select("Jobs_Main", {"select": "Job_ID,Job_Status", "Notes": f"eq.{marker}"})
+        stale = [r["Job_ID"] for r in synced if r["Job_Status"] != QUEUED_STATUSES[-1]]
+        assert len(synced) == QUEUED_JOBS and not stale, (
+            f"Test case failed: expected all {QUEUED_JOBS} jobs to reach '{QUEUED_STATUSES[-1]}' after reconnecting, "
+            f"but {len(stale)} did not: {stale[:5]}"
+        )
+        assert sync_ms <= MAX_SYNC_MS, (
+            f"Offline queue of {queued} updates took {sync_ms:.0f} ms to sync, over the {MAX_SYNC_MS} ms budget"
+        )
+        await act.settle()
 
     finally:
+        if rest:
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+            await rest.close()
         if context:
             await context.close()
         if browser:
@@ -94,4 +140,3 @@ async def run_test():
             await pw.stop()
 
 asyncio.run(run_test())
-    
\ No newline at end of file
@@ -1,10 +1,28 @@
 import asyncio
+import time
 from playwright import async_api
+from playwright.async_api import expect
+
+from perf.dashboard_timing import NAVIGATION_JS
+from perf.job_search import ensure_seeded, time_query
+from perf.supabase import SupabaseRest
+from runner.actions import Actions
+from runner.auth import new_context
+
+# Persistent search fixture (perf.job_search); the first run seeds it, so run
+# `python -m perf.job_search --rows 500000 --repeat 1` beforehand or give this
+# case a longer --timeout.
+SEARCH_ROWS = 500_000
+# search_jobs RPC round trip and /jobs/history server render with a query
+MAX_SEARCH_MS = 300
+MAX_PAGE_MS = 3000
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    rest = None
+    marker = f"tc016-{time.strftime('%m%d%H%M%S')}"
 
     try:
         # Start a Playwright session in asynchronous mode
@@ -21,78 +39,100 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Navigate to the job/planning page by clicking the 'วางแผนงาน' (Planning) navigation link (index 61) to start applying filters and searches.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Enter a job identifier into the search box (index 1329), submit the search, and extract the visible job list items to verify the results update according to the search/filter.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('JOB-20260212-6643')
+        await act.fill(elem, 'JOB-20260212-6643')
         
         # -> Open the full job list (click 'ดูทั้งหมด') to reveal the full filtering UI so status, date range, vehicle, driver filters can be applied and verified.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Apply a date range filter (set start and end date to 2026-02-12), trigger the filter/search, then extract visible job list entries to verify the list updates correctly for the date range.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2026-02-12')
+        await act.fill(elem, '2026-02-12')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('2026-02-12')
+        await act.fill(elem, '2026-02-12')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[2]/div/div/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
-        ```
         try:
             await expect(frame.locator('text=JOB-20260212-6643').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Expected job 'JOB-20260212-6643' to appear in the filtered job/shipment list after applying the search and date range filters (and other criteria); the list did not update to show the expected result.")
-        ```
-        await asyncio.sleep(5)
+        await act.settle()
+
+        # -> Search a large Jobs_Main: a needle job among SEARCH_ROWS seeded jobs
+        # must rank first for its ID and be found by a Thai customer substring,
+        # within the latency budget.
+        rest = await SupabaseRest.connect(pw, service=True)
+        await ensure_seeded(rest, SEARCH_ROWS)
+        needle_id = f"{marker.upper()}-NEEDLE"
+        needle_customer = f"ห้างหุ้นส่วนจำกัด ทดสอบค้นหา {marker}"
+        result = await rest.insert("Jobs_Main", [{
+            "Job_ID": needle_id,
+            "Plan_Date": "2001-06-15",
+            "Customer_Name": needle_customer,
+            "Route_Name": "ลาดกระบัง - แหลมฉบัง",
+            "Job_Status": "Completed",
+            "Notes": marker,
+        }])
+        assert result.ok, f"Inserting the search needle failed: {result.status} {result.body}"
+
+        await time_query(rest, needle_id)  # warm the plan cache
+        elapsed, found = await time_query(rest, needle_id)
+        assert found and found[0]["Job_ID"] == needle_id, f"search_jobs did not rank {needle_id} first"
+        assert elapsed <= MAX_SEARCH_MS, f"Job ID search took {elapsed:.0f} ms over {SEARCH_ROWS} jobs (budget {MAX_SEARCH_MS} ms)"
+
+        elapsed, found = await time_query(rest, f"ทดสอบค้นหา {marker}")
+        assert any(job["Job_ID"] == needle_id for job in found), "Thai customer substring search did not find the needle job"
+        assert elapsed <= MAX_SEARCH_MS, f"Thai substring search took {elapsed:.0f} ms over {SEARCH_ROWS} jobs (budget {MAX_SEARCH_MS} ms)"
+
+        await act.goto(f"http://localhost:3000/jobs/history?q={needle_id}&customer=All")
+        await act.settle()
+        timing = await page.evaluate(NAVIGATION_JS)
+        await expect(page.locator(f"text={needle_id}").first).to_be_visible(timeout=10000)
+        assert timing and timing["server"] <= MAX_PAGE_MS, (
+            f"Job history search rendered in {timing and round(timing['server'])} ms (budget {MAX_PAGE_MS} ms)"
+        )
 
     finally:
+        if rest:
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+            await rest.close()
         if context:
             await context.close()
         if browser:
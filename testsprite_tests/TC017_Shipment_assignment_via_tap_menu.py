@@ -1,5 +1,9 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
 
 async def run_test():
     pw = None
@@ -21,119 +25,106 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Click the 'วางแผนงาน' (Plan jobs) link to open the shipment/job assignment interface and load the assignment UI.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the 'วางแผนงาน' (Plan jobs) link (index 61) to open the shipment/job assignment interface and load the assignment UI (then inspect for job list and tap/assign controls).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Allow the SPA time to load; if DOM remains empty, reload the planning page to recover the app and then locate the assignment UI (job list and tap/assign controls).
-        await page.goto("http://localhost:3000/planning", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000/planning")
         
         # -> Open the job detail for JOB-20260212-6643 by clicking its job entry (element index 2469) to locate the tap menu and assignment controls.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div/div/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the job entry (index 2469) to open its detail panel and reveal the tap menu / assignment controls.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div/div/div[1]/div[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open full job list by clicking 'ดูทั้งหมด' (View all) button (index 2460) to access the job detail without repeating the previous failing click.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[1]/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the svg element inside the job row (index 2470) to open the tap menu or job detail and reveal assignment controls.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[3]/div/div[2]/div/div/div[1]/div[1]/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job detail for JOB-20260212-6643 from the Jobs History page to reveal the tap menu / assignment controls (click the job row/svg that opens the detail).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr/td[2]/div/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job detail / tap-menu for JOB-20260212-6643 by clicking the job-row SVG control (index 3035) to reveal assignment controls.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr/td[2]/div/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job detail/tap-menu for JOB-20260212-6643 by clicking the alternative svg control at index 3040 to reveal assignment controls.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr/td[4]/div/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job's tap menu / detail for JOB-20260212-6643 by clicking the SVG control at index 3046 to reveal assignment controls (vehicle assignment).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr/td[7]/span/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job's tap menu / detail for JOB-20260212-6643 to reveal assignment controls by clicking the job-row SVG control (index 3035). If the tap menu opens, locate and use the 'Assign to vehicle' option.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr/td[2]/div/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the job-row SVG control (index 3046) to attempt to open the tap menu / job detail and reveal the 'Assign to vehicle' option.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr[2]/td[7]/span/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the job-row SVG control at index 3040 to attempt to open the tap menu / job detail and reveal the 'Assign to vehicle' option.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr[2]/td[4]/div/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the job's tap-menu for JOB-20260212-6643 by clicking the job-row SVG control (index 3046) to reveal the 'Assign to vehicle' option and then inspect the DOM for the assignment control/menu.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/main/div/div[4]/div[2]/div[1]/table/tbody/tr[2]/td[7]/span/svg').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -141,7 +132,7 @@ async def run_test():
             await expect(frame.locator('text=Assigned to vehicle').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: attempted to assign selected job(s) to a vehicle via the tap menu and verify the assignment appeared in the UI; expected 'Assigned to vehicle' confirmation but it did not appear — the assignment may not have been saved or the UI did not update")
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
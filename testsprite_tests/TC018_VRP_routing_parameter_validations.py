@@ -1,5 +1,10 @@
 import asyncio
 from playwright import async_api
+from playwright.async_api import expect
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import PlanningPage, Sidebar
 
 async def run_test():
     pw = None
@@ -21,172 +26,31 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
+        # Interact with the page elements to simulate user flow
+        # -> Open the 'วางแผนงาน' (Planning) page from the sidebar and start a new job.
+        await act.goto("http://localhost:3000/dashboard")
+        await Sidebar(page, act).navigate("/planning")
+        dialog = await PlanningPage(page, act).new_job()
 
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # -> On the locations tab, route optimisation must stay disabled with a single destination.
+        await dialog.show_tab('location')
+        await dialog.fill_origin('Factory A', '13.756300', '100.501800')
+        await dialog.fill_destination('Customer Location', '13.745000', '100.523000')
 
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # -> Use the dashboard search input to find 'VRP' and open the Vehicle Routing Problem configuration/settings page (search input index 254, search button index 256). Then proceed to input invalid/conflicting parameters and verify validations.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the system Settings page to locate Vehicle Routing Problem (VRP) configuration. Click the 'ตั้งค่า' (Settings) link (index 236) and then locate VRP configuration within settings.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Planning/VRP area by clicking the 'วางแผนงาน' (Planning) link (index 61) so the VRP configuration/settings can be located.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the planning page search, search for 'VRP' using the search input on this page and click the search button to try to open the VRP configuration/settings page (use input index 1838 then click button index 1840).
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the system Settings page to locate VRP configuration by clicking the 'ตั้งค่า' (Settings) link (index 1818) to navigate into settings.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the system Settings page to locate Vehicle Routing Problem (VRP) configuration by clicking the 'ตั้งค่า' (Settings) link (index 1818), then locate the VRP configuration section.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Search for 'VRP' in the Settings page using the search input (index 2895) and click the adjacent search button (index 2897) to open the VRP configuration section.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Trigger the Settings search (click button index 2897) to open the VRP configuration section so validation checks can be performed.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Planning area from the Settings left navigation to try locating the VRP configuration there. If Planning loads, search within Planning for VRP and open its configuration page to begin validation checks (access settings, input invalid params, verify validation).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Planning area from the left navigation to try to locate the VRP configuration entry there (click the 'วางแผนงาน' nav link).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Search for 'VRP' on the Planning page using the search input (index 3990) and click the adjacent search button (index 3992) to attempt to open the VRP configuration interface.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Settings page from the left navigation to locate the VRP configuration entry (click anchor index 3970).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the user/admin menu to find an alternative path to system settings or VRP configuration (click the Admin button/profile menu) and then look for VRP or System/Settings link.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open the Planning area to search for and access the Vehicle Routing Problem (VRP) configuration (click 'วางแผนงาน' nav link).
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Use the header search input to search for 'VRP' (new search widget index 4544) and trigger the search (click button index 4567) to try to open the VRP configuration page.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open System Settings from the left nav to attempt to find VRP configuration entry (click Settings link). After Settings opens, locate the VRP settings entry and click to open the VRP configuration screen.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Open System Settings from the left nav (click element index 4997) to attempt to locate the VRP configuration entry, then wait for the page to load.
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/aside/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        # -> Use the Settings search input (index 5991) to search for 'VRP' and trigger the search (button index 5993) to reveal the VRP configuration entry so it can be opened.
-        frame = context.pages[-1]
-        # Input text
-        elem = frame.locator('xpath=html/body/div[2]/header/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('VRP')
-        
-        frame = context.pages[-1]
-        # Click element
-        elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-        await asyncio.sleep(5)
+        # --> Assertions to verify final state
+        await expect(dialog.sel["job_dialog.optimize_route"]).to_be_disabled()
+        await dialog.cancel()
+        await act.settle()
 
     finally:
         if context:
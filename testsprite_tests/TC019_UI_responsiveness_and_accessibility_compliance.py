@@ -1,6 +1,9 @@
 import asyncio
 from playwright import async_api
 
+from runner.actions import Actions
+from runner.auth import new_context
+
 async def run_test():
     pw = None
     browser = None
@@ -21,148 +24,135 @@ async def run_test():
             ],
         )
 
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context already signed in as staff admin
+        context = await new_context(browser, "admin")
         context.set_default_timeout(5000)
 
         # Open a new page in the browser context
         page = await context.new_page()
 
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
+        # Waits on actionability, hydration and in-flight requests instead of fixed sleeps
+        act = Actions(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await act.goto("http://localhost:3000")
         
         # -> Open the navigation/menu to reveal links to other main pages so the tests can navigate to Drivers, Vehicles, Planning, and Maps (click nav/menu control).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/header/div[2]/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Drivers page (desktop viewport) by clicking the 'คนขับ' / Drivers link in the left navigation.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Try to navigate to the Drivers page by clicking the 'คนขับ' link in the left navigation again (element index 142).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Attempt navigation to the Drivers page again by clicking the 'คนขับ' / Drivers link (element index 142).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to Dashboard (desktop) by clicking the dashboard/home link (anchor index 1626) to load the Dashboard page on the current tab.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[1]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to Dashboard (desktop) by clicking the Dashboard link in the left navigation to load the Dashboard page on the current tab so layout and accessibility checks can begin on desktop.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[1]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to the Drivers page on the current tab (desktop viewport) and then run keyboard navigation + extract page headings and interactive elements for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Drivers ('คนขับ') link in the left navigation to load the Drivers page on the current tab (desktop viewport). After it loads, run keyboard navigation and extract headings + interactive elements for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to Vehicles page (desktop viewport) by clicking the 'รถ' / Vehicles link in the left navigation and then perform keyboard navigation and extract main headings and interactive elements for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Vehicles ('รถ') link (index 4847) to load the Vehicles page on the current tab (desktop), wait for the page to load, run keyboard navigation (Tab x10), then extract main headings and all interactive elements (with ARIA/title/placeholder) and note any missing accessible labels or focus issues.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Vehicles link (index 4847) to load the Vehicles page on the current tab (desktop), then run keyboard navigation (Tab x10) and extract main headings and all interactive elements (buttons, links, inputs) including visible text and ARIA/title/placeholder attributes; note missing accessible labels or focus-state issues.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[3]/div/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Open the Planning page (วางแผนงาน) using the left navigation link and load the Planning page on the current tab (desktop) so keyboard navigation and screen-reader extraction can be performed.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Planning link in the left navigation (index 6845) to load the Planning page on the current tab (desktop), wait for load, run keyboard navigation (Tab x10), then extract main headings (h1/h2/h3) and enumerate all interactive elements with visible text and ARIA/title/placeholder attributes and note missing labels or focus issues.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Planning link in the left navigation (index 6845) to load the Planning page on the current tab (desktop). After the page loads, run keyboard navigation (Tab x10) and extract main headings and interactive elements for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Load the Planning page (วางแผนงาน) on the current tab (desktop), run keyboard navigation (Tab x10), then extract the main headings (h1/h2/h3) and list all interactive elements (buttons, links, inputs) with visible text and any ARIA/title/placeholder attributes for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Planning link in the left navigation (index 6845) to load the Planning page on the current tab (desktop). After the page loads, run keyboard navigation (Tab x10) and extract main headings (h1/h2/h3) and enumerate interactive elements with visible text and ARIA/title/placeholder attributes for screen-reader verification.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Click the Planning link in the left navigation (index 6845) to load the Planning page on the current tab (desktop). After page loads, run keyboard navigation (Tab x10) and extract main headings and interactive elements for screen-reader verification (this extraction will be scheduled once page load is confirmed).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> Navigate to the Maps (ติดตาม) page on the current tab (desktop) by clicking the Maps link (index 6847). After it loads, perform keyboard navigation and extract headings + interactive elements for screen-reader verification (scheduled after load confirmation).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
         # -> On the current tab: (1) load Maps page (click index 6847), perform keyboard navigation (Tab x10) and extract headings + interactive elements for screen-reader verification; (2) navigate to Planning using the search input (index 6986) to avoid repeated clicks on the Planning nav item, then perform keyboard navigation (Tab x10) and extract headings + interactive elements.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=html/body/div[2]/aside/nav/div[2]/div/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await act.click(elem)
         
-        await asyncio.sleep(5)
+        await act.settle()
 
     finally:
         if context:
@@ -0,0 +1,8 @@
+"""Load generators and benchmarks that reuse the E2E runner's plumbing.
+
+Run from ``testsprite_tests/`` like the runner itself::
+
+    python -m perf.gps_load --drivers 100,250,500
+
+Results land in ``tmp/perf/``.
+"""
@@ -0,0 +1,373 @@
+"""Bulk job import benchmark: large Excel files through the planning import.
+
+Builds on TC011: signs in as admin, opens ``/planning`` and drives
+``excel-import.tsx`` through :class:`~runner.pages.PlanningPage`, but uploads
+generated sheets of 1k / 10k / 50k rows instead of a single job.
+
+Headers are the aliases ``normalizeData`` in ``src/app/planning/actions.ts``
+accepts. ``--headers mixed`` (default) alternates Thai and English aliases
+column by column, so the alias lookup is exercised both ways.
+
+For each size it records:
+
+* ``parse_s`` - file chosen until the preview is ready (FileReader + SheetJS
+  + React render), i.e. until the import button enables,
+* ``server_action_s`` - first to last ``createBulkJobs`` server action
+  request (one per chunk for large sheets), plus total request body size,
+* ``submit_s`` - import click until the dialog closes (action + refresh),
+* ``peak_heap_mb`` - highest ``JSHeapUsedSize`` seen over CDP while parsing
+  and importing,
+* ``rows_per_s`` - rows / (parse + server action).
+
+``--extra-columns N`` pads each sheet with unrelated columns (real exports
+carry plenty), which is what made per-cell alias scanning in ``normalizeData``
+expensive. ``--baseline`` compares against an earlier result file, e.g. one
+taken before the header-resolution change, and prints the throughput gain
+per size:
+
+    python -m perf.bulk_import --rows 20000 --extra-columns 20 --baseline tmp/perf/bulk_import-<before>.json
+
+Rows are imported as drafts without drivers, so no driver notifications go
+out. Job IDs are ``BENCH-<run>-<n>``; ``--cleanup`` deletes them afterwards
+with the service role key.
+
+    python -m perf.bulk_import --rows 1000,10000,50000 --cleanup
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+
+from playwright.async_api import Error, Page, Request, async_playwright
+
+from runner.actions import Actions
+from runner.auth import new_context
+from runner.pages import PlanningPage
+from runner.pool import DEFAULT_LAUNCH_ARGS
+
+from .report import write_result
+from .supabase import RESULTS_DIR, SupabaseRest
+from .xlsx import write_xlsx
+
+# (canonical column, Thai alias, English alias) as accepted by normalizeData.
+COLUMNS = [
+    ("Job_ID", "รหัสงาน", "id"),
+    ("Plan_Date", "วันที่แผน", "date"),
+    ("Delivery_Date", "วันจัดส่ง", "delivery_date"),
+    ("Customer_Name", "ชื่อลูกค้า", "customer"),
+    ("Origin_Location", "ต้นทาง", "origin"),
+    ("Dest_Location", "ปลายทาง", "destination"),
+    ("Pickup_Lat", "ละติจูดต้นทาง", "pickup_lat"),
+    ("Pickup_Lon", "ลองติจูดต้นทาง", "pickup_lon"),
+    ("Delivery_Lat", "ละติจูดปลายทาง", "delivery_lat"),
+    ("Delivery_Lon", "ลองติจูดปลายทาง", "delivery_lon"),
+    ("Vehicle_Type", "ประเภทรถ", "vehicle_type"),
+    ("Weight_Kg", "น้ำหนัก", "weight"),
+    ("Volume_Cbm", "ปริมาตร", "volume"),
+    ("Price_Cust_Total", "ราคาขาย", "price"),
+    ("Cost_Driver_Total", "ค่าเที่ยว", "cost"),
+    ("Est_Distance_KM", "ระยะทาง", "km"),
+    ("Ref_No", "เลขที่อ้างอิง", "so"),
+    ("Notes", "หมายเหตุ", "remark"),
+]
+
+PLACES = [
+    ("คลังสินค้าบางนา", 13.6686, 100.6050),
+    ("นิคมอมตะนคร", 13.4300, 101.0000),
+    ("แหลมฉบัง", 13.0827, 100.8830),
+    ("นวนคร", 14.1067, 100.6170),
+    ("ลาดกระบัง", 13.7220, 100.7480),
+    ("โคราช", 14.9799, 102.0978),
+    ("Pakchong DC", 14.7080, 101.4150),
+    ("Rayong Plant", 12.6814, 101.2816),
+]
+VEHICLE_TYPES = ["4-Wheel", "6-Wheel", "10-Wheel", "Trailer"]
+
+
+def headers(style: str, extra: int = 0) -> list[str]:
+    if style == "thai":
+        names = [thai for _, thai, _ in COLUMNS]
+    elif style == "english":
+        names = [english for _, _, english in COLUMNS]
+    else:
+        names = [thai if i % 2 else english for i, (_, thai, english) in enumerate(COLUMNS)]
+    return names + [f"ข้อมูลเพิ่มเติม {n}" for n in range(1, extra + 1)]
+
+
+def generate_rows(run_id: str, count: int, seed: int, extra: int = 0) -> Iterator[list[object]]:
+    rng = random.Random(seed)
+    start = date.today()
+    for n in range(1, count + 1):
+        (o_name, o_lat, o_lng), (d_name, d_lat, d_lng) = rng.sample(PLACES, 2)
+        plan = start + timedelta(days=rng.randint(0, 27))
+        price = rng.randint(15, 120) * 100
+        yield [
+            f"BENCH-{run_id}-{n:05d}",
+            plan.isoformat(),
+            (plan + timedelta(days=rng.randint(0, 2))).isoformat(),
+            f"BENCH Customer {rng.randint(1, 200):03d}",
+            o_name,
+            d_name,
+            o_lat,
+            o_lng,
+            d_lat,
+            d_lng,
+            rng.choice(VEHICLE_TYPES),
+            rng.randint(200, 12000),
+            round(rng.uniform(1, 40), 1),
+            price,
+            int(price * rng.uniform(0.6, 0.85)),
+            rng.randint(10, 400),
+            f"SO{rng.randint(100000, 999999)}",
+            "benchmark import",
+            *(f"x{n}" for n in range(extra)),
+        ]
+
+
+@dataclass
+class ImportResult:
+    rows: int
+    file_mb: float
+    ok: bool
+    parse_s: float | None = None
+    server_action_s: float | None = None
+    server_action_status: int | None = None
+    server_action_calls: int | None = None
+    request_mb: float | None = None
+    submit_s: float | None = None
+    peak_heap_mb: float | None = None
+    rows_per_s: float | None = None
+    error: str | None = None
+
+
+class HeapSampler:
+    """Polls ``JSHeapUsedSize`` over CDP and keeps the maximum."""
+
+    def __init__(self, page: Page, interval_s: float = 0.25) -> None:
+        self.page = page
+        self.interval_s = interval_s
+        self.peak = 0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        cdp = await self.page.context.new_cdp_session(self.page)
+        await cdp.send("Performance.enable")
+        try:
+            while True:
+                metrics = await cdp.send("Performance.getMetrics")
+                for m in metrics["metrics"]:
+                    if m["name"] == "JSHeapUsedSize":
+                        self.peak = max(self.peak, int(m["value"]))
+                await asyncio.sleep(self.interval_s)
+        except Error:
+            pass
+
+    async def __aenter__(self) -> "HeapSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class ServerActionTimer:
+    """Times the server action requests issued after ``arm()``.
+
+    Large sheets go out as several chunked ``createBulkJobs`` calls; the
+    timer spans the first request's start to the last one's end and sums
+    their bodies. ``status`` is the worst (highest) status seen.
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.status: int | None = None
+        self.body_bytes: int | None = None
+        self.calls = 0
+        self._requests: set[Request] = set()
+        self._armed = False
+        self._page = page
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_done)
+        page.on("requestfailed", self._on_done)
+
+    def close(self) -> None:
+        self._armed = False
+        self._page.remove_listener("request", self._on_request)
+        self._page.remove_listener("requestfinished", self._on_done)
+        self._page.remove_listener("requestfailed", self._on_done)
+
+    def arm(self) -> None:
+        self._armed = True
+        self._requests.clear()
+        self.started = self.finished = self.status = self.body_bytes = None
+        self.calls = 0
+
+    def _on_request(self, request: Request) -> None:
+        if not (self._armed and "next-action" in request.headers):
+            return
+        self._requests.add(request)
+        self.calls += 1
+        if self.started is None:
+            self.started = time.perf_counter()
+        body = request.post_data_buffer
+        self.body_bytes = (self.body_bytes or 0) + (len(body) if body else 0)
+
+    async def _on_done(self, request: Request) -> None:
+        if request not in self._requests:
+            return
+        self.finished = time.perf_counter()
+        try:
+            response = await request.response()
+            status = response.status if response else 0
+        except Error:
+            status = 0
+        self.status = max(self.status or 0, status)
+
+    @property
+    def elapsed_s(self) -> float | None:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+async def import_file(page: Page, act: Actions, path: Path, rows: int, timeout_s: float) -> ImportResult:
+    result = ImportResult(rows, round(path.stat().st_size / 2**20, 2), ok=False)
+    timer = ServerActionTimer(page)
+    planning = await PlanningPage(page, act).open()
+    dialog = await planning.open_import()
+    await dialog.set_grouping(False)
+    await dialog.set_draft(True)
+
+    async with HeapSampler(page) as heap:
+        try:
+            started = time.perf_counter()
+            await dialog.upload(path)
+            await dialog.wait_parsed(timeout_ms=int(timeout_s * 1000))
+            result.parse_s = round(time.perf_counter() - started, 2)
+
+            timer.arm()
+            started = time.perf_counter()
+            await dialog.submit(timeout_ms=int(timeout_s * 1000))
+            result.submit_s = round(time.perf_counter() - started, 2)
+            result.ok = True
+        except Error as exc:
+            result.error = str(exc).splitlines()[0][:300]
+        finally:
+            result.peak_heap_mb = round(heap.peak / 2**20, 1)
+            timer.close()
+
+    if timer.elapsed_s is not None:
+        result.server_action_s = round(timer.elapsed_s, 2)
+        result.server_action_status = timer.status
+        result.server_action_calls = timer.calls
+    if timer.body_bytes is not None:
+        result.request_mb = round(timer.body_bytes / 2**20, 2)
+    if result.ok and result.parse_s and result.server_action_s:
+        result.rows_per_s = round(rows / (result.parse_s + result.server_action_s), 1)
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    run_id = time.strftime("%m%d%H%M")
+    workdir = RESULTS_DIR / "bulk_import"
+    results: list[ImportResult] = []
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=not args.headed, args=DEFAULT_LAUNCH_ARGS)
+        try:
+            context = await new_context(browser, "admin")
+            page = await context.new_page()
+            act = Actions(page, navigation_timeout_ms=60000)
+            for i, rows in enumerate(args.rows):
+                path = workdir / f"bench-{rows}-{args.headers}-{args.extra_columns}.xlsx"
+                write_xlsx(
+                    path,
+                    headers(args.headers, args.extra_columns),
+                    generate_rows(f"{run_id}{i}", rows, args.seed, args.extra_columns),
+                )
+                result = await import_file(page, act, path, rows, args.timeout)
+                results.append(result)
+                print(
+                    f"{rows:>7} rows  {result.file_mb:>6}MB  parse {result.parse_s}s  "
+                    f"action {result.server_action_s}s ({result.request_mb}MB, "
+                    f"{result.server_action_status})  heap {result.peak_heap_mb}MB  "
+                    f"{result.rows_per_s} rows/s" + (f"  ERROR {result.error}" if result.error else "")
+                )
+                # Reload so one size's heap does not carry into the next.
+                await act.goto(page.url)
+        finally:
+            await browser.close()
+
+        if args.cleanup:
+            rest = await SupabaseRest.connect(pw, service=True)
+            try:
+                deleted = await rest.delete("Jobs_Main", {"Job_ID": f"like.BENCH-{run_id}*"})
+                print(f"cleanup: {deleted.status} in {deleted.elapsed_ms:.0f}ms")
+            finally:
+                await rest.close()
+
+    return {
+        "run": run_id,
+        "headers": args.headers,
+        "extra_columns": args.extra_columns,
+        "results": [asdict(r) for r in results],
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """One line per row count present in both runs: server action and rows/s gain."""
+    before = {r["rows"]: r for r in baseline["results"] if r["ok"]}
+    lines = []
+    for r in current["results"]:
+        b = before.get(r["rows"])
+        if not (b and r["ok"] and b["server_action_s"] and r["server_action_s"]):
+            continue
+        lines.append(
+            f"{r['rows']:>7} rows  action {b['server_action_s']}s -> {r['server_action_s']}s "
+            f"(x{b['server_action_s'] / r['server_action_s']:.2f})  "
+            f"rows/s {b['rows_per_s']} -> {r['rows_per_s']}"
+        )
+    return lines
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.bulk_import", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=lambda s: [int(x) for x in s.split(",")], default=[1000, 10000, 50000],
+        help="comma-separated row counts (default: 1000,10000,50000)",
+    )
+    parser.add_argument("--headers", choices=("mixed", "thai", "english"), default="mixed")
+    parser.add_argument("--extra-columns", type=int, default=0, help="unrelated columns per row")
+    parser.add_argument("--baseline", type=Path, help="earlier bulk_import result to compare against")
+    parser.add_argument("--timeout", type=float, default=900.0, help="seconds per phase per file")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true", help="delete the BENCH-* jobs afterwards")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("bulk_import", result)
+    print(f"results: {path}")
+    if args.baseline:
+        lines = compare(json.loads(args.baseline.read_text(encoding="utf-8")), result)
+        print("\n".join(lines) or "no comparable sizes in baseline")
+    return 0 if all(r["ok"] for r in result["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Server time of ``/dashboard`` as seen from the browser (TC004's page).
+
+The dashboard is a server component that calls a dozen data helpers in one
+render; each used to resolve the session, role, branch and customer on its
+own. Those lookups happen server-side, so the browser cannot count them
+directly; what it can measure is their cost:
+
+* ``server_ms`` - navigation ``requestStart`` -> ``responseStart`` of the
+  document (render time on the server, including every auth lookup),
+* ``document_ms`` - ``requestStart`` -> ``responseEnd`` (streamed Suspense
+  boundaries included),
+* ``actions`` / ``action_ms`` - server action calls issued while the page
+  settles (each one resolves identity again on its own request).
+
+Run it before and after a change and compare with ``--baseline``; add
+``--max-server-ms`` to use it as a pass/fail check:
+
+    python -m perf.dashboard_timing --loads 15 --baseline tmp/perf/dashboard_timing-<before>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import Page, Request, async_playwright
+
+from runner.actions import Actions
+from runner.auth import BASE_URL, new_context
+from runner.pool import DEFAULT_LAUNCH_ARGS
+
+from .report import summarize, write_result
+
+NAVIGATION_JS = """() => {
+  const n = performance.getEntriesByType('navigation')[0]
+  return n ? { server: n.responseStart - n.requestStart, document: n.responseEnd - n.requestStart } : null
+}"""
+
+
+async def load_once(page: Page, act: Actions) -> dict[str, Any]:
+    started: dict[Request, float] = {}
+    durations: list[float] = []
+
+    def on_request(request: Request) -> None:
+        if "next-action" in request.headers:
+            started[request] = time.perf_counter()
+
+    def on_done(request: Request) -> None:
+        if request in started:
+            durations.append((time.perf_counter() - started.pop(request)) * 1000)
+
+    page.on("request", on_request)
+    page.on("requestfinished", on_done)
+    try:
+        await act.goto(f"{BASE_URL}/dashboard")
+        await act.settle()
+        timing = await page.evaluate(NAVIGATION_JS)
+    finally:
+        page.remove_listener("request", on_request)
+        page.remove_listener("requestfinished", on_done)
+    return {
+        "server_ms": round(timing["server"], 1) if timing else None,
+        "document_ms": round(timing["document"], 1) if timing else None,
+        "actions": len(durations),
+        "action_ms": round(sum(durations), 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True, args=DEFAULT_LAUNCH_ARGS)
+        try:
+            context = await new_context(browser, args.role)
+            page = await context.new_page()
+            act = Actions(page, navigation_timeout_ms=60000, settle_timeout_ms=30000)
+            # First load compiles the route in dev and warms connections.
+            await load_once(page, act)
+            loads = [await load_once(page, act) for _ in range(args.loads)]
+        finally:
+            await browser.close()
+
+    def column(key: str) -> list[float]:
+        return [load[key] for load in loads if load[key] is not None]
+
+    return {
+        "role": args.role,
+        "loads": loads,
+        "server_ms": summarize(column("server_ms")),
+        "document_ms": summarize(column("document_ms")),
+        "actions": summarize(column("actions"), digits=0),
+        "action_ms": summarize(column("action_ms")),
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    lines = []
+    for key in ("server_ms", "document_ms", "action_ms"):
+        before, after = baseline[key]["p50"], current[key]["p50"]
+        if before and after:
+            lines.append(f"{key:<12} p50 {before} -> {after}  (x{before / after:.2f})")
+    return lines
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.dashboard_timing", description=__doc__.splitlines()[0])
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--role", default="admin", choices=("admin", "customer"))
+    parser.add_argument("--baseline", type=Path, help="earlier dashboard_timing result to compare against")
+    parser.add_argument("--max-server-ms", type=float, help="fail when server_ms p50 exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("dashboard_timing", result)
+    for key in ("server_ms", "document_ms", "actions", "action_ms"):
+        print(f"{key:<12} {result[key]}")
+    print(f"results: {path}")
+    if args.baseline:
+        lines = compare(json.loads(args.baseline.read_text(encoding="utf-8")), result)
+        print("\n".join(lines) or "baseline has no comparable samples")
+    p50 = result["server_ms"]["p50"]
+    if args.max_server_ms is not None and (p50 is None or p50 > args.max_server_ms):
+        print(f"FAIL server_ms p50 {p50} > {args.max_server_ms}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Sustained throughput of the batched GPS ingest endpoint.
+
+``POST /api/external/v1/gps`` (``ingestGPSBatch`` in ``src/lib/gps-ingest.ts``)
+stores a whole batch with one driver lookup, one ``gps_logs`` insert, one
+``driver_latest_locations`` upsert of each driver's newest point and one
+danger-zone pass. This tool keeps ``--concurrency`` requests in flight for
+``--seconds`` per stage and reports accepted points per second and request
+latency. Each stage uses a different ``--batch-points`` size; a batch of 1 is
+the old per-position path (``saveGPSLog``) for comparison.
+
+Positions come from the same simulated movement as ``perf.gps_load`` (real
+``Master_Routes`` legs), but for ``--drivers`` synthetic ``Master_Drivers``
+rows seeded for the run in their own branch, so no real driver's live
+position moves and no real branch's danger zones fire. Fix timestamps are
+pinned to :data:`SYNTHETIC_DAY`. The synthetic drivers, their ``gps_logs``
+and their ``driver_latest_locations`` rows are deleted at the end.
+
+A temporary ``Master_API_Keys`` entry is created for the run unless
+``--api-key`` (or ``TMS_API_KEY``) is given.
+
+    python -m perf.gps_ingest --drivers 200 --batch-points 1,50,500 --seconds 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from playwright.async_api import APIRequestContext, Error, async_playwright
+
+from runner.auth import BASE_URL
+
+from .gps_load import SimDriver, load_routes
+from .report import summarize, write_result
+from .supabase import SupabaseRest, read_env
+
+INGEST_PATH = "/api/external/v1/gps"
+SYNTHETIC_DAY = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+async def seed_drivers(rest: SupabaseRest, marker: str, count: int) -> list[str]:
+    """Insert ``count`` throwaway drivers in branch ``marker``; return their ids."""
+    ids = [f"{marker}-{i + 1:04d}" for i in range(count)]
+    created = await rest.insert("Master_Drivers", [{
+        "Driver_ID": driver_id,
+        "Driver_Name": f"{marker} {i + 1}",
+        "Role": "Driver",
+        "Active_Status": "Active",
+        "Branch_ID": marker,
+    } for i, driver_id in enumerate(ids)])
+    if not created.ok:
+        raise SystemExit(f"seeding Master_Drivers failed: {created.status} {created.body}")
+    return ids
+
+
+async def remove_drivers(rest: SupabaseRest, marker: str) -> None:
+    await rest.delete("gps_logs", {"driver_id": f"like.{marker}-*"})
+    await rest.delete("driver_latest_locations", {"driver_id": f"like.{marker}-*"})
+    await rest.delete("Master_Drivers", {"Branch_ID": f"eq.{marker}"})
+
+
+class PointSource:
+    """Round-robin fixes across the simulated fleet, stamped on SYNTHETIC_DAY."""
+
+    def __init__(self, sims: list[SimDriver], fix_interval: float) -> None:
+        self.sims = sims
+        self.fix_interval = fix_interval
+        self.taken = 0
+
+    def take(self, count: int) -> list[dict[str, Any]]:
+        points = []
+        for _ in range(count):
+            sim = self.sims[self.taken % len(self.sims)]
+            rounds = self.taken // len(self.sims)
+            self.taken += 1
+            sim.advance(self.fix_interval)
+            fix = sim.buffer.pop()
+            points.append({
+                "driver_id": fix["driver_id"],
+                "lat": fix["latitude"],
+                "lng": fix["longitude"],
+                "speed": fix["speed"],
+                "ts": (SYNTHETIC_DAY + timedelta(seconds=rounds * self.fix_interval)).isoformat(),
+            })
+        return points
+
+
+async def run_stage(
+    request: APIRequestContext,
+    api_key: str,
+    source: PointSource,
+    batch_points: int,
+    concurrency: int,
+    seconds: float,
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    accepted = 0
+    rejected = 0
+    errors: list[str] = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker() -> None:
+        nonlocal accepted, rejected
+        while time.perf_counter() < deadline:
+            points = source.take(batch_points)
+            started = time.perf_counter()
+            try:
+                response = await request.post(
+                    INGEST_PATH,
+                    data={"points": points},
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    fail_on_status_code=False,
+                )
+            except Error as exc:
+                errors.append(str(exc)[:200])
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.ok:
+                body = await response.json()
+                accepted += body.get("inserted", 0)
+                rejected += body.get("rejected", 0)
+            else:
+                errors.append(f"{response.status} {(await response.text())[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "batch_points": batch_points,
+        "seconds": round(elapsed, 1),
+        "requests": len(latencies),
+        "points": accepted,
+        "points_per_s": round(accepted / elapsed, 1) if elapsed else None,
+        "rejected": rejected,
+        "request_ms": summarize(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    marker = f"PERF-GPS-{time.strftime('%m%d%H%M%S')}"
+    async with async_playwright() as pw:
+        rest = await SupabaseRest.connect(pw, service=True)
+        request = await pw.request.new_context(base_url=BASE_URL)
+        api_key = args.api_key or read_env("TMS_API_KEY").get("TMS_API_KEY")
+        temporary_key = None
+        driver_ids: list[str] = []
+        stages = []
+        try:
+            if not api_key:
+                temporary_key = api_key = f"perf-gps-{secrets.token_hex(12)}"
+                created = await rest.insert("Master_API_Keys", [{
+                    "api_key": temporary_key, "client_name": "perf.gps_ingest", "is_active": True,
+                }])
+                if not created.ok:
+                    raise SystemExit(f"could not create a temporary API key: {created.status} {created.body}")
+
+            routes = await load_routes(rest)
+            if not routes:
+                raise SystemExit("need Master_Routes with coordinates")
+            driver_ids = await seed_drivers(rest, marker, args.drivers)
+            sims = [SimDriver(d, rng.choice(routes), args.speed * rng.uniform(0.7, 1.2), rng) for d in driver_ids]
+            source = PointSource(sims, args.fix_interval)
+
+            for batch_points in args.batch_points:
+                stage = await run_stage(request, api_key, source, batch_points, args.concurrency, args.seconds)
+                stages.append(stage)
+                print(
+                    f"batch {batch_points:>5}  {stage['points_per_s']:>9} pts/s  "
+                    f"req p50/p95 {stage['request_ms']['p50']}/{stage['request_ms']['p95']}ms  "
+                    f"errors {stage['errors']}"
+                )
+        finally:
+            await remove_drivers(rest, marker)
+            if temporary_key:
+                await rest.delete("Master_API_Keys", {"api_key": f"eq.{temporary_key}"})
+            await request.dispose()
+            await rest.close()
+
+    best = max(stages, key=lambda s: s["points_per_s"] or 0) if stages else None
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "api_key"},
+        "drivers": len(driver_ids),
+        "stages": stages,
+        "best_points_per_s": best["points_per_s"] if best else None,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.gps_ingest", description=__doc__.splitlines()[0])
+    parser.add_argument("--drivers", type=int, default=200, help="synthetic drivers seeded for the run")
+    parser.add_argument(
+        "--batch-points", type=lambda s: [int(x) for x in s.split(",")], default=[1, 50, 500],
+        help="comma-separated points per request, one stage each (default: 1,50,500)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight")
+    parser.add_argument("--seconds", type=float, default=60.0, help="duration of each stage")
+    parser.add_argument("--fix-interval", type=float, default=10.0, help="simulated seconds between fixes")
+    parser.add_argument("--speed", type=float, default=60.0, help="average speed in km/h")
+    parser.add_argument("--api-key", help="Master_API_Keys key to use (default: TMS_API_KEY or a temporary key)")
+    parser.add_argument("--min-points-per-s", type=float, help="fail when the best stage sustains less than this")
+    parser.add_argument("--seed", type=int, default=15)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("gps_ingest", result)
+    print(f"best {result['best_points_per_s']} pts/s over {result['drivers']} drivers; results: {path}")
+    best = result["best_points_per_s"] or 0
+    if args.min_points_per_s is not None and best < args.min_points_per_s:
+        print(f"FAIL {best} pts/s < {args.min_points_per_s}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
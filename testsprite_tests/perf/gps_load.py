@@ -0,0 +1,369 @@
+"""Synthetic GPS load against the live map, with an end-to-end latency observer.
+
+Simulated drivers report positions the way the driver app does today
+(``LocationTracker`` -> ``flushGpsBatch`` in ``src/lib/supabase/gps-direct.ts``):
+fixes are buffered on the "device" and bulk-inserted into ``gps_logs`` with the
+anon key every ``--flush-interval`` seconds or once ``--flush-max`` points are
+queued. ``saveGPSLog`` writes the same ``gps_logs`` rows server-side but no
+longer has a caller, so the direct path is the one that matters for load.
+
+Each driver drives a real ``Master_Routes`` origin -> destination leg back and
+forth at ``--speed`` km/h with a few metres of jitter.
+
+The observer reuses the TC013 scenario: a headless admin session on ``/gps``
+(which redirects to ``/monitoring``). ``MovingMarker`` in
+``src/components/maps/leaflet-map.tsx`` fires ``tms:marker-moved`` when a
+marker gets a new target; the observer matches it to the flush that sent that
+position and records send -> marker latency.
+
+Load ramps through ``--drivers`` stages. The run stops at the first stage where
+the map falls behind: p95 latency above ``--max-lag`` or fewer than
+``--min-coverage`` of the active drivers moving on the map.
+
+    python -m perf.gps_load --drivers 100,250,500,1000 --stage-seconds 90
+
+Driver IDs must exist in ``Master_Drivers`` (a DB trigger rejects unknown
+ids), so the number of simulated drivers is capped by what the table holds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from playwright.async_api import Error, Page, Playwright, async_playwright
+
+from runner.actions import Actions
+from runner.auth import BASE_URL, new_context
+from runner.pool import DEFAULT_LAUNCH_ARGS
+
+from .report import summarize, write_result
+from .supabase import SupabaseRest
+
+MARKER_MOVED_EVENT = "tms:marker-moved"
+
+# Positions are matched on 6 decimals (~0.1 m), the precision gps_logs keeps.
+COORD_DIGITS = 6
+
+EARTH_RADIUS_M = 6_371_000
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    origin: tuple[float, float]
+    destination: tuple[float, float]
+
+    @property
+    def length_m(self) -> float:
+        (lat1, lng1), (lat2, lng2) = self.origin, self.destination
+        p1, p2 = math.radians(lat1), math.radians(lat2)
+        dp, dl = p2 - p1, math.radians(lng2 - lng1)
+        a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+        return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+    def at(self, fraction: float) -> tuple[float, float]:
+        (lat1, lng1), (lat2, lng2) = self.origin, self.destination
+        return lat1 + (lat2 - lat1) * fraction, lng1 + (lng2 - lng1) * fraction
+
+
+async def load_routes(rest: SupabaseRest, limit: int = 1000) -> list[Route]:
+    rows = await rest.select("Master_Routes", {
+        "select": "Route_Name,Origin_Lat,Origin_Lon,Dest_Lat,Dest_Lon",
+        "Origin_Lat": "not.is.null",
+        "Dest_Lat": "not.is.null",
+        "limit": str(limit),
+    })
+    routes = []
+    for r in rows:
+        try:
+            route = Route(
+                r["Route_Name"],
+                (float(r["Origin_Lat"]), float(r["Origin_Lon"])),
+                (float(r["Dest_Lat"]), float(r["Dest_Lon"])),
+            )
+        except (TypeError, ValueError):
+            continue
+        # Skip zero-length legs and obviously bad coordinates.
+        if 100 < route.length_m < 2_000_000:
+            routes.append(route)
+    return routes
+
+
+async def load_driver_ids(rest: SupabaseRest, limit: int) -> list[str]:
+    rows = await rest.select("Master_Drivers", {"select": "Driver_ID", "limit": str(limit)})
+    return [r["Driver_ID"] for r in rows if r.get("Driver_ID")]
+
+
+def coord_key(lat: float, lng: float) -> tuple[float, float]:
+    return round(lat, COORD_DIGITS), round(lng, COORD_DIGITS)
+
+
+@dataclass
+class StageStats:
+    drivers: int
+    started: float = field(default_factory=time.perf_counter)
+    points: int = 0
+    flushes: list[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: list[str] = field(default_factory=list)
+    latencies: list[float] = field(default_factory=list)
+    moved: set[str] = field(default_factory=set)
+
+    def record_error(self, message: str) -> None:
+        self.errors += 1
+        if len(self.error_samples) < 5:
+            self.error_samples.append(message[:200])
+
+    def to_json(self) -> dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "drivers": self.drivers,
+            "seconds": round(elapsed, 1),
+            "points": self.points,
+            "points_per_s": round(self.points / elapsed, 1) if elapsed else None,
+            "flush_ms": summarize(self.flushes),
+            "errors": self.errors,
+            "error_samples": self.error_samples,
+            "marker_latency_s": summarize(self.latencies, digits=2),
+            "coverage": round(len(self.moved) / self.drivers, 3) if self.drivers else None,
+        }
+
+
+class LoadState:
+    """What has been sent per driver and position, and the stage being measured."""
+
+    def __init__(self) -> None:
+        self.sent: dict[str, dict[tuple[float, float], float]] = {}
+        self.stage: StageStats | None = None
+
+    def mark_sent(self, driver_id: str, points: list[dict[str, Any]], at: float) -> None:
+        pending = self.sent.setdefault(driver_id, {})
+        for p in points:
+            pending[coord_key(p["latitude"], p["longitude"])] = at
+
+    def on_marker(self, detail: dict[str, Any]) -> None:
+        received = time.perf_counter()
+        try:
+            driver_id = str(detail["id"])
+            key = coord_key(float(detail["lat"]), float(detail["lng"]))
+        except (KeyError, TypeError, ValueError):
+            return
+        pending = self.sent.get(driver_id)
+        sent_at = pending.pop(key, None) if pending else None
+        if sent_at is None:
+            return
+        # Anything sent before this position can no longer show up on the map.
+        for older in [k for k, t in pending.items() if t <= sent_at]:
+            del pending[older]
+        if self.stage is not None:
+            self.stage.latencies.append(received - sent_at)
+            self.stage.moved.add(driver_id)
+
+
+class SimDriver:
+    def __init__(self, driver_id: str, route: Route, speed_kmh: float, rng: random.Random) -> None:
+        self.driver_id = driver_id
+        self.route = route
+        self.speed_ms = speed_kmh / 3.6
+        self.rng = rng
+        self.fraction = rng.random()
+        self.direction = 1
+        self.buffer: list[dict[str, Any]] = []
+
+    def advance(self, seconds: float) -> None:
+        step = self.speed_ms * seconds / max(self.route.length_m, 1.0)
+        self.fraction += step * self.direction
+        if not 0 <= self.fraction <= 1:
+            self.direction *= -1
+            self.fraction = min(max(self.fraction, 0.0), 1.0)
+        lat, lng = self.route.at(self.fraction)
+        jitter = 5 / 111_320  # ~5 m
+        self.buffer.append({
+            "driver_id": self.driver_id,
+            "latitude": round(lat + self.rng.uniform(-jitter, jitter), COORD_DIGITS),
+            "longitude": round(lng + self.rng.uniform(-jitter, jitter), COORD_DIGITS),
+            "speed": round(self.speed_ms * self.rng.uniform(0.8, 1.1), 2),
+            "job_id": None,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        })
+
+    async def flush(self, rest: SupabaseRest, state: LoadState) -> None:
+        if not self.buffer:
+            return
+        batch, self.buffer = self.buffer, []
+        sent_at = time.perf_counter()
+        state.mark_sent(self.driver_id, batch, sent_at)
+        stage = state.stage
+        try:
+            result = await rest.insert("gps_logs", batch)
+        except Error as exc:
+            if stage:
+                stage.record_error(str(exc))
+            return
+        if stage:
+            stage.points += len(batch)
+            stage.flushes.append(result.elapsed_ms)
+            if not result.ok:
+                stage.record_error(f"{result.status} {result.body}")
+
+
+async def drive(
+    sim: SimDriver,
+    rest: SupabaseRest,
+    state: LoadState,
+    fix_interval: float,
+    flush_interval: float,
+    flush_max: int,
+) -> None:
+    # Spread flushes over the interval instead of firing them in lockstep.
+    await asyncio.sleep(sim.rng.uniform(0, flush_interval))
+    last_flush = time.perf_counter()
+    while True:
+        sim.advance(fix_interval)
+        now = time.perf_counter()
+        if len(sim.buffer) >= flush_max or now - last_flush >= flush_interval:
+            last_flush = now
+            await sim.flush(rest, state)
+        await asyncio.sleep(fix_interval)
+
+
+async def open_observer(pw: Playwright, state: LoadState) -> tuple[Any, Page]:
+    browser = await pw.chromium.launch(headless=True, args=DEFAULT_LAUNCH_ARGS)
+    context = await new_context(browser, "admin")
+    page = await context.new_page()
+    await page.expose_function("__tmsMarkerMoved", state.on_marker)
+    await page.add_init_script(
+        f"window.addEventListener('{MARKER_MOVED_EVENT}', (e) => window.__tmsMarkerMoved(e.detail))"
+    )
+    await Actions(page, navigation_timeout_ms=60000).goto(BASE_URL + "/gps")
+    return browser, page
+
+
+def falls_behind(stage: dict[str, Any], max_lag_s: float, min_coverage: float) -> str | None:
+    p95 = stage["marker_latency_s"]["p95"]
+    if p95 is None:
+        return "no marker updates observed"
+    if p95 > max_lag_s:
+        return f"p95 marker latency {p95:.1f}s > {max_lag_s:.0f}s"
+    if stage["coverage"] is not None and stage["coverage"] < min_coverage:
+        return f"only {stage['coverage']:.0%} of drivers moved on the map"
+    return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    async with async_playwright() as pw:
+        reader = await SupabaseRest.connect(pw, service=True)
+        writer = await SupabaseRest.connect(pw)
+        try:
+            routes = await load_routes(reader)
+            driver_ids = await load_driver_ids(reader, max(args.drivers))
+        finally:
+            await reader.close()
+        if not routes or not driver_ids:
+            raise SystemExit("need Master_Routes with coordinates and Master_Drivers rows")
+        if len(driver_ids) < max(args.drivers):
+            print(f"only {len(driver_ids)} drivers in Master_Drivers; stages are capped")
+
+        sims = [
+            SimDriver(d, rng.choice(routes), args.speed * rng.uniform(0.7, 1.2), rng)
+            for d in driver_ids
+        ]
+        state = LoadState()
+
+        # One position per driver up front, so every simulated truck is in the
+        # map's initial fleet list before the observer loads /gps.
+        slots = asyncio.Semaphore(50)
+
+        async def warm(sim: SimDriver) -> None:
+            async with slots:
+                sim.advance(0)
+                await sim.flush(writer, state)
+
+        await asyncio.gather(*(warm(s) for s in sims))
+        state.sent.clear()
+
+        browser, _page = await open_observer(pw, state)
+        tasks: list[asyncio.Task] = []
+        stages: list[dict[str, Any]] = []
+        verdict = None
+        try:
+            for target in args.drivers:
+                target = min(target, len(sims))
+                for sim in sims[len(tasks):target]:
+                    tasks.append(asyncio.create_task(drive(
+                        sim, writer, state, args.fix_interval, args.flush_interval, args.flush_max
+                    )))
+                state.stage = StageStats(len(tasks))
+                await asyncio.sleep(args.stage_seconds)
+                stage = state.stage.to_json()
+                stages.append(stage)
+                lat = stage["marker_latency_s"]
+                print(
+                    f"{stage['drivers']:>6} drivers  {stage['points_per_s']:>7} pts/s  "
+                    f"flush p95 {stage['flush_ms']['p95']}ms  errors {stage['errors']}  "
+                    f"marker p50/p95 {lat['p50']}/{lat['p95']}s  coverage {stage['coverage']}"
+                )
+                verdict = falls_behind(stage, args.max_lag, args.min_coverage)
+                if verdict:
+                    print(f"map falls behind at {stage['drivers']} drivers: {verdict}")
+                    break
+                if target >= len(sims):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser.close()
+            await writer.close()
+
+    handled = [s["drivers"] for s in stages if falls_behind(s, args.max_lag, args.min_coverage) is None]
+    return {
+        "config": {k: v for k, v in vars(args).items()},
+        "stages": stages,
+        "max_drivers_keeping_up": max(handled) if handled else 0,
+        "verdict": verdict,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.gps_load", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--drivers", type=lambda s: [int(x) for x in s.split(",")], default=[50, 100, 250, 500, 1000],
+        help="comma-separated driver counts, one stage each (default: 50,100,250,500,1000)",
+    )
+    parser.add_argument("--stage-seconds", type=float, default=90.0)
+    parser.add_argument("--fix-interval", type=float, default=2.0, help="seconds between fixes")
+    parser.add_argument(
+        "--flush-interval", type=float, default=30.0,
+        help="seconds between uploads, as FLUSH_INTERVAL in location-tracker.tsx",
+    )
+    parser.add_argument("--flush-max", type=int, default=50, help="upload early at this many points")
+    parser.add_argument("--speed", type=float, default=60.0, help="average speed in km/h")
+    parser.add_argument(
+        "--max-lag", type=float, default=30.0,
+        help="p95 send -> marker seconds tolerated (the map polls every 20s)",
+    )
+    parser.add_argument("--min-coverage", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=13)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("gps_load", result)
+    print(f"{result['max_drivers_keeping_up']} drivers kept up; results: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Job search latency against a large ``Jobs_Main`` (TC016's search box).
+
+Seeds a persistent fixture of synthetic jobs (tagged with :data:`SEED_NOTES`,
+``Branch_ID`` :data:`SEED_BRANCH`, plan dates in 2001) and times the
+``search_jobs`` RPC for a few query shapes: an exact job ID, a Thai customer
+substring, a route fragment and a miss. The fixture is reused across runs and
+only topped up when it has fewer rows than requested; pass ``--cleanup`` to
+remove it.
+
+    python -m perf.job_search --rows 500000 --repeat 20 --max-ms 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+from typing import Any
+
+from playwright.async_api import async_playwright
+
+from .report import summarize, write_result
+from .supabase import SupabaseRest
+
+SEED_NOTES = "perf-job-search-fixture"
+SEED_BRANCH = "PERF"
+SEED_BATCH = 5000
+
+CUSTOMERS = (
+    "บริษัท สยามโลจิสติกส์ จำกัด", "ห้างหุ้นส่วนจำกัด เชียงใหม่ขนส่ง", "บริษัท ไทยเฟรท จำกัด",
+    "Eastern Seaboard Trading", "Bangkok Cold Chain", "บริษัท อุดรพัสดุภัณฑ์ จำกัด",
+)
+ROUTES = (
+    "กรุงเทพ - ชลบุรี", "ลาดกระบัง - แหลมฉบัง", "นครราชสีมา - ขอนแก่น",
+    "BKK - CNX", "Rayong - Bangna", "สมุทรปราการ - อยุธยา",
+)
+
+# Query shapes timed by the CLI: (label, query)
+QUERIES = (
+    ("job_id", "SRCH-0123456"),
+    ("thai_customer", "เชียงใหม่ขนส่ง"),
+    ("route", "แหลมฉบัง"),
+    ("miss", "ไม่มีงานนี้แน่นอน"),
+)
+
+
+def seed_rows(start: int, stop: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed + start)
+    return [
+        {
+            "Job_ID": f"SRCH-{i:07d}",
+            "Plan_Date": f"2001-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "Customer_Name": rng.choice(CUSTOMERS),
+            "Route_Name": rng.choice(ROUTES),
+            "Job_Status": "Completed",
+            "Branch_ID": SEED_BRANCH,
+            "Notes": SEED_NOTES,
+        }
+        for i in range(start, stop)
+    ]
+
+
+async def ensure_seeded(rest: SupabaseRest, rows: int) -> int:
+    """Top the fixture up to ``rows`` jobs; returns how many were inserted."""
+    have = await rest.count("Jobs_Main", {"Notes": f"eq.{SEED_NOTES}"})
+    for start in range(have, rows, SEED_BATCH):
+        result = await rest.insert("Jobs_Main", seed_rows(start, min(start + SEED_BATCH, rows)))
+        if not result.ok:
+            raise RuntimeError(f"seeding Jobs_Main failed at row {start}: {result.status} {result.body}")
+    return max(rows - have, 0)
+
+
+async def time_query(rest: SupabaseRest, query: str, limit: int = 25) -> tuple[float, list[dict[str, Any]]]:
+    result = await rest.rpc("search_jobs", {"q": query, "page_limit": limit})
+    if not result.ok:
+        raise RuntimeError(f"search_jobs({query!r}): {result.status} {result.body}")
+    return result.elapsed_ms, result.body
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with async_playwright() as pw:
+        rest = await SupabaseRest.connect(pw, service=True)
+        try:
+            if args.cleanup:
+                await rest.delete("Jobs_Main", {"Notes": f"eq.{SEED_NOTES}"})
+                return {"cleanup": True}
+            inserted = await ensure_seeded(rest, args.rows)
+            timings: dict[str, Any] = {}
+            for label, query in QUERIES:
+                await time_query(rest, query)  # warm the plan cache
+                samples = [(await time_query(rest, query))[0] for _ in range(args.repeat)]
+                timings[label] = summarize(samples)
+        finally:
+            await rest.close()
+    return {"rows": args.rows, "inserted": inserted, "queries": timings}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.job_search", description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="fail when any query's p50 exceeds this")
+    parser.add_argument("--cleanup", action="store_true", help="delete the seeded fixture and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    if args.cleanup:
+        print("fixture removed")
+        return 0
+    path = write_result("job_search", result)
+    print(f"rows {result['rows']} (inserted {result['inserted']})")
+    for label, summary in result["queries"].items():
+        print(f"{label:<14} {summary}")
+    print(f"results: {path}")
+    slow = [
+        label for label, summary in result["queries"].items()
+        if args.max_ms is not None and (summary["p50"] or 0) > args.max_ms
+    ]
+    if slow:
+        print(f"FAIL p50 over {args.max_ms} ms: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Driver POD submission time over a throttled connection.
+
+Seeds one ``Arrived Dropoff`` job per run for the signed-in test driver, opens
+``/mobile/jobs/<id>/complete``, feeds ``--photos`` camera-sized JPEGs (about
+12 MP, several MB each) into the photo input, signs, and times the submit
+button -> the "ส่งงานสำเร็จ" screen while Chromium's network emulation holds
+the page to ``--profile`` bandwidth and latency.
+
+By default the page compresses photos in a worker and uploads them straight
+to storage, so the server action only gets URLs. ``--legacy`` fails the
+upload-target request so the page falls back to posting every file through
+the server action, which gives the before/after comparison:
+
+    python -m perf.pod_upload --profile 3g --runs 3
+    python -m perf.pod_upload --profile 3g --runs 3 --legacy
+
+Uploaded files stay in storage; the seeded jobs are deleted afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any
+from urllib.parse import unquote
+
+from playwright.async_api import BrowserContext, Page, Request, Route, async_playwright
+
+from runner.actions import Actions
+from runner.auth import BASE_URL, new_context
+from runner.pool import DEFAULT_LAUNCH_ARGS
+from runner.selectors import SelectorIndex
+
+from .report import summarize, write_result
+from .supabase import SupabaseRest
+
+# Chromium network emulation: (latency ms, download kbit/s, upload kbit/s)
+PROFILES = {
+    "3g": (300, 1600, 750),
+    "slow-4g": (150, 4000, 1500),
+    "4g": (60, 12000, 6000),
+}
+
+# Full-size camera-like JPEGs: blocky noise upscaled so they encode to a few MB
+PHOTOS_JS = """async ({ count, width, height }) => {
+  const input = document.querySelector('[data-testid="camera-input-gallery"]')
+  const transfer = new DataTransfer()
+  for (let i = 0; i < count; i++) {
+    const small = document.createElement('canvas')
+    small.width = width / 8
+    small.height = height / 8
+    const sctx = small.getContext('2d')
+    const noise = sctx.createImageData(small.width, small.height)
+    for (let p = 0; p < noise.data.length; p++) noise.data[p] = (p % 4 === 3) ? 255 : Math.random() * 255
+    sctx.putImageData(noise, 0, 0)
+    const canvas = document.createElement('canvas')
+    canvas.width = width
+    canvas.height = height
+    canvas.getContext('2d').drawImage(small, 0, 0, width, height)
+    const blob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.95))
+    transfer.items.add(new File([blob], `photo_${i}.jpg`, { type: 'image/jpeg' }))
+  }
+  input.files = transfer.files
+  input.dispatchEvent(new Event('change', { bubbles: true }))
+  return [...transfer.files].map(f => f.size)
+}"""
+
+PREVIEWS_JS = """(count) => {
+  const input = document.querySelector('[data-testid="camera-input-gallery"]')
+  return !!input && input.parentElement.querySelectorAll('img').length >= count
+}"""
+
+
+async def driver_id(context: BrowserContext) -> str:
+    for cookie in await context.cookies():
+        if cookie["name"] == "driver_session":
+            return json.loads(unquote(cookie["value"]))["driverId"]
+    raise SystemExit("driver session cookie not found - check TESTSPRITE_DRIVER_USER/PASSWORD")
+
+
+async def throttle(page: Page, profile: str) -> None:
+    latency, down, up = PROFILES[profile]
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": latency,
+        "downloadThroughput": down * 1000 / 8,
+        "uploadThroughput": up * 1000 / 8,
+    })
+
+
+async def force_legacy(route: Route) -> None:
+    """Abort the createPodUploadTargets server action so the page posts files itself."""
+    request = route.request
+    body = request.post_data_buffer or b""
+    if request.method == "POST" and "next-action" in request.headers and b'"contentType"' in body:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def submit_once(context: BrowserContext, job_id: str, args: argparse.Namespace) -> dict[str, Any]:
+    page = await context.new_page()
+    page.on("dialog", lambda dialog: asyncio.ensure_future(dialog.accept()))
+    if args.legacy:
+        await page.route("**/mobile/jobs/**", force_legacy)
+    act = Actions(page, navigation_timeout_ms=60000, settle_timeout_ms=30000)
+    pod = SelectorIndex(page)
+    try:
+        await act.goto(f"{BASE_URL}/mobile/jobs/{job_id}/complete")
+        sizes = await page.evaluate(PHOTOS_JS, {"count": args.photos, "width": 4000, "height": 3000})
+        await page.wait_for_function(PREVIEWS_JS, arg=args.photos, timeout=120000)
+
+        box = await pod["pod.signature"].bounding_box()
+        assert box, "signature pad is not visible"
+        await page.mouse.move(box["x"] + 40, box["y"] + 60)
+        await page.mouse.down()
+        for step in range(1, 12):
+            await page.mouse.move(box["x"] + 40 + step * 20, box["y"] + 60 + (step % 3) * 30)
+        await page.mouse.up()
+
+        sent = {"bytes": 0, "requests": 0, "storage": 0}
+
+        def on_request(request: Request) -> None:
+            body = request.post_data_buffer
+            if body:
+                sent["bytes"] += len(body)
+                sent["requests"] += 1
+            if "/storage/v1/object/upload/sign/" in request.url:
+                sent["storage"] += 1
+
+        await throttle(page, args.profile)
+        page.on("request", on_request)
+        started = time.perf_counter()
+        await act.click(pod["pod.submit"])
+        await pod["pod.completed"].wait_for(state="visible", timeout=args.timeout * 1000)
+        elapsed = (time.perf_counter() - started) * 1000
+        return {
+            "original_bytes": sum(sizes),
+            "sent_bytes": sent["bytes"],
+            "requests_with_body": sent["requests"],
+            "storage_uploads": sent["storage"],
+            "submit_ms": round(elapsed, 1),
+        }
+    finally:
+        await page.close()
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    marker = f"perf-pod-{time.strftime('%m%d%H%M%S')}"
+    async with async_playwright() as pw:
+        rest = await SupabaseRest.connect(pw, service=True)
+        browser = await pw.chromium.launch(headless=True, args=DEFAULT_LAUNCH_ARGS)
+        try:
+            context = await new_context(browser, "driver", viewport={"width": 390, "height": 844})
+            driver = await driver_id(context)
+            job_ids = [f"{marker}-{i + 1}" for i in range(args.runs)]
+            seeded = await rest.insert("Jobs_Main", [{
+                "Job_ID": job_id,
+                "Plan_Date": time.strftime("%Y-%m-%d"),
+                "Customer_Name": marker,
+                "Driver_ID": driver,
+                "Job_Status": "Arrived Dropoff",
+                "Notes": marker,
+            } for job_id in job_ids])
+            if not seeded.ok:
+                raise SystemExit(f"seeding Jobs_Main failed: {seeded.status} {seeded.body}")
+            runs = [await submit_once(context, job_id, args) for job_id in job_ids]
+        finally:
+            await browser.close()
+            await rest.delete("Jobs_Main", {"Notes": f"eq.{marker}"})
+            await rest.close()
+
+    def column(key: str) -> list[float]:
+        return [r[key] for r in runs]
+
+    return {
+        "mode": "legacy" if args.legacy else "direct",
+        "profile": args.profile,
+        "photos": args.photos,
+        "runs": runs,
+        "submit_ms": summarize(column("submit_ms")),
+        "sent_kib": summarize([b / 1024 for b in column("sent_bytes")], digits=0),
+        "original_kib": summarize([b / 1024 for b in column("original_bytes")], digits=0),
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.pod_upload", description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--profile", default="3g", choices=sorted(PROFILES))
+    parser.add_argument("--legacy", action="store_true", help="post files through the server action instead")
+    parser.add_argument("--timeout", type=int, default=600, help="seconds to wait for one submission")
+    parser.add_argument("--max-ms", type=float, help="fail when submit_ms p50 exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("pod_upload", result)
+    for key in ("submit_ms", "sent_kib", "original_kib"):
+        print(f"{key:<13} {result[key]}")
+    print(f"results: {path}")
+    p50 = result["submit_ms"]["p50"]
+    if args.max_ms is not None and (p50 is None or p50 > args.max_ms):
+        print(f"FAIL submit_ms p50 {p50} > {args.max_ms}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
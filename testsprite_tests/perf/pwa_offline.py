@@ -0,0 +1,152 @@
+"""Offline cold start of the driver PWA (``/mobile/jobs``) and its cache sizes.
+
+The service worker only runs in a production build (``next build && next
+start``); ``next dev`` unregisters it. One measurement:
+
+1. load ``/mobile/jobs`` online as the driver, wait for the service worker to
+   control the page and let the runtime caches fill,
+2. read every Cache Storage bucket (``precache`` is Workbox's install-time
+   precache, ``driver-pages`` / ``driver-rsc`` / ``next-static-hashed`` the
+   runtime caches from ``next.config.ts``),
+3. go offline, open ``/mobile/jobs`` in a fresh tab and time navigation start
+   -> ``<html data-hydrated="true">`` (the suite's hydration marker) as
+   time-to-interactive.
+
+    python -m perf.pwa_offline --loads 5 --max-tti-ms 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import Any
+
+from playwright.async_api import BrowserContext, async_playwright
+
+from runner.actions import HYDRATED_JS, Actions
+from runner.auth import BASE_URL, new_context
+from runner.pool import DEFAULT_LAUNCH_ARGS
+
+from .report import summarize, write_result
+
+# Admin-only public files that must not be in the driver's install precache
+ADMIN_ONLY_PREFIXES = ("/images/", "/templates/")
+
+CONTROLLED_JS = "() => !!navigator.serviceWorker && !!navigator.serviceWorker.controller"
+
+# Resolves once a worker is active, or false when none registers in time
+SW_READY_JS = """() => !navigator.serviceWorker ? false : Promise.race([
+  navigator.serviceWorker.ready.then(() => true),
+  new Promise(resolve => setTimeout(() => resolve(false), 15000)),
+])"""
+
+CACHE_SIZES_JS = """async () => {
+  const out = {}
+  for (const name of await caches.keys()) {
+    const cache = await caches.open(name)
+    const urls = []
+    let bytes = 0
+    for (const request of await cache.keys()) {
+      const response = await cache.match(request)
+      bytes += response ? (await response.clone().blob()).size : 0
+      urls.push(new URL(request.url).pathname)
+    }
+    out[name] = { entries: urls.length, bytes, urls }
+  }
+  return out
+}"""
+
+TTI_JS = "() => performance.now()"
+
+
+async def warm(context: BrowserContext) -> dict[str, Any]:
+    """Load the driver app online until the service worker controls it; return cache sizes."""
+    page = await context.new_page()
+    act = Actions(page, navigation_timeout_ms=60000, settle_timeout_ms=30000)
+    await act.goto(f"{BASE_URL}/mobile/jobs")
+    await page.evaluate(SW_READY_JS)
+    if not await page.evaluate(CONTROLLED_JS):
+        # First visit installs the worker; the reload is the first controlled load.
+        await page.reload()
+        await act.settle()
+    assert await page.evaluate(CONTROLLED_JS), (
+        "No service worker controls /mobile/jobs - run against a production build (next build && next start)"
+    )
+    # A second controlled load fills the runtime caches (document, RSC, chunks).
+    await page.reload()
+    await act.settle()
+    caches = await page.evaluate(CACHE_SIZES_JS)
+    await page.close()
+    return caches
+
+
+async def offline_load(context: BrowserContext) -> float:
+    """Time-to-interactive (ms) of ``/mobile/jobs`` opened in a new tab while offline."""
+    await context.set_offline(True)
+    page = await context.new_page()
+    try:
+        await page.goto(f"{BASE_URL}/mobile/jobs", wait_until="commit", timeout=30000)
+        await page.wait_for_function(HYDRATED_JS, timeout=30000)
+        return await page.evaluate(TTI_JS)
+    finally:
+        await page.close()
+        await context.set_offline(False)
+
+
+def precache_summary(caches: dict[str, Any]) -> dict[str, Any]:
+    precache = {"entries": 0, "bytes": 0, "urls": []}
+    for name, cache in caches.items():
+        if "precache" in name:
+            precache["entries"] += cache["entries"]
+            precache["bytes"] += cache["bytes"]
+            precache["urls"] += cache["urls"]
+    return {
+        "precache_entries": precache["entries"],
+        "precache_bytes": precache["bytes"],
+        "admin_only": sorted(u for u in precache["urls"] if u.startswith(ADMIN_ONLY_PREFIXES)),
+        "caches": {name: {"entries": c["entries"], "bytes": c["bytes"]} for name, c in caches.items()},
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True, args=DEFAULT_LAUNCH_ARGS)
+        try:
+            context = await new_context(browser, "driver", viewport={"width": 390, "height": 844})
+            caches = await warm(context)
+            tti = [await offline_load(context) for _ in range(args.loads)]
+        finally:
+            await browser.close()
+    return {**precache_summary(caches), "tti_ms": summarize(tti), "loads": [round(t, 1) for t in tti]}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="perf.pwa_offline", description=__doc__.splitlines()[0])
+    parser.add_argument("--loads", type=int, default=5)
+    parser.add_argument("--max-tti-ms", type=float, help="fail when offline time-to-interactive p50 exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    path = write_result("pwa_offline", result)
+    print(f"precache     {result['precache_entries']} entries, {result['precache_bytes'] / 1024:.0f} KiB")
+    print(f"tti_ms       {result['tti_ms']}")
+    for name, cache in result["caches"].items():
+        print(f"  {name:<40} {cache['entries']:>4} entries {cache['bytes'] / 1024:>8.0f} KiB")
+    print(f"results: {path}")
+    failed = False
+    if result["admin_only"]:
+        print(f"FAIL admin-only files in precache: {result['admin_only'][:5]}")
+        failed = True
+    p50 = result["tti_ms"]["p50"]
+    if args.max_tti_ms is not None and (p50 is None or p50 > args.max_tti_ms):
+        print(f"FAIL tti_ms p50 {p50} > {args.max_tti_ms}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
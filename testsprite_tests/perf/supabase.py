@@ -0,0 +1,125 @@
+"""Minimal Supabase REST client on top of Playwright's ``APIRequestContext``.
+
+The perf tools talk to PostgREST the same way the app's browser client does
+(``apikey`` + bearer token), without pulling in another HTTP library.
+
+Configuration comes from the environment, falling back to the repo's
+``.env.local`` / ``.env``:
+
+* ``NEXT_PUBLIC_SUPABASE_URL``
+* ``NEXT_PUBLIC_SUPABASE_ANON_KEY`` - used for writes, like the driver app
+* ``SUPABASE_SERVICE_ROLE_KEY`` - used to read master data behind RLS
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import APIRequestContext, Playwright
+
+from runner.discovery import TESTS_DIR
+
+REPO_DIR = TESTS_DIR.parent
+RESULTS_DIR = TESTS_DIR / "tmp" / "perf"
+
+
+def read_env(*names: str) -> dict[str, str]:
+    """Values for ``names`` from the environment or the repo's dotenv files."""
+    found = {n: os.environ[n] for n in names if os.environ.get(n)}
+    for filename in (".env.local", ".env"):
+        path = REPO_DIR / filename
+        if len(found) == len(names) or not path.exists():
+            continue
+        for line in path.read_text(encoding="utf-8").splitlines():
+            key, sep, value = line.strip().partition("=")
+            if sep and key in names and key not in found:
+                found[key] = value.strip().strip('"').strip("'")
+    return found
+
+
+@dataclass
+class Timed:
+    status: int
+    elapsed_ms: float
+    body: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class SupabaseRest:
+    """PostgREST calls against ``/rest/v1`` with timing on every request."""
+
+    def __init__(self, request: APIRequestContext, url: str, key: str) -> None:
+        self._request = request
+        self.base = url.rstrip("/") + "/rest/v1"
+        self.headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+
+    @classmethod
+    async def connect(cls, pw: Playwright, service: bool = False) -> "SupabaseRest":
+        key_name = "SUPABASE_SERVICE_ROLE_KEY" if service else "NEXT_PUBLIC_SUPABASE_ANON_KEY"
+        env = read_env("NEXT_PUBLIC_SUPABASE_URL", key_name)
+        missing = {"NEXT_PUBLIC_SUPABASE_URL", key_name} - env.keys()
+        if missing:
+            raise SystemExit(f"missing {', '.join(sorted(missing))} (env or .env.local)")
+        request = await pw.request.new_context()
+        return cls(request, env["NEXT_PUBLIC_SUPABASE_URL"], env[key_name])
+
+    async def close(self) -> None:
+        await self._request.dispose()
+
+    async def select(self, table: str, params: dict[str, str]) -> list[dict[str, Any]]:
+        response = await self._request.get(
+            f"{self.base}/{table}", params=params, headers=self.headers
+        )
+        if not response.ok:
+            raise RuntimeError(f"select {table}: {response.status} {await response.text()}")
+        return await response.json()
+
+    async def count(self, table: str, params: dict[str, str]) -> int:
+        """Exact row count for a filter, without fetching the rows."""
+        response = await self._request.head(
+            f"{self.base}/{table}", params=params, headers={**self.headers, "Prefer": "count=exact"}
+        )
+        if not response.ok:
+            raise RuntimeError(f"count {table}: {response.status}")
+        return int(response.headers["content-range"].rpartition("/")[2])
+
+    async def insert(self, table: str, rows: list[dict[str, Any]]) -> Timed:
+        started = time.perf_counter()
+        response = await self._request.post(
+            f"{self.base}/{table}",
+            data=json.dumps(rows),
+            headers={**self.headers, "Content-Type": "application/json", "Prefer": "return=minimal"},
+            fail_on_status_code=False,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        return Timed(response.status, elapsed, None if response.ok else await response.text())
+
+    async def rpc(self, function: str, args: dict[str, Any]) -> Timed:
+        started = time.perf_counter()
+        response = await self._request.post(
+            f"{self.base}/rpc/{function}",
+            data=json.dumps(args),
+            headers={**self.headers, "Content-Type": "application/json"},
+            fail_on_status_code=False,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        return Timed(response.status, elapsed, await response.json() if response.ok else await response.text())
+
+    async def delete(self, table: str, params: dict[str, str]) -> Timed:
+        started = time.perf_counter()
+        response = await self._request.delete(
+            f"{self.base}/{table}",
+            params=params,
+            headers={**self.headers, "Prefer": "return=minimal"},
+            fail_on_status_code=False,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        return Timed(response.status, elapsed, None if response.ok else await response.text())
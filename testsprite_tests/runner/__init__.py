@@ -0,0 +1,31 @@
+"""Parallel runner for the TestSprite end-to-end scripts.
+
+Each ``TC*.py`` script in ``testsprite_tests/`` defines an async ``run_test()``
+that starts its own Playwright driver and Chromium. The runner loads those
+coroutines without executing the trailing ``asyncio.run(run_test())``, then
+runs them concurrently on a small pool of long-lived browsers. Every test still
+gets its own isolated ``BrowserContext``.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m runner                 # run every TC*.py
+    python -m runner -k TC01 -w 6    # filter by name, 6 concurrent tests
+    python -m runner.trace tmp/traces/<run>.jsonl   # step latency per page
+"""
+
+from .actions import Actions
+from .discovery import TestCase, discover
+from .pool import BrowserPool
+from .report import TestResult, print_summary, write_json
+from .runner import run_suite
+
+__all__ = [
+    "Actions",
+    "BrowserPool",
+    "TestCase",
+    "TestResult",
+    "discover",
+    "print_summary",
+    "run_suite",
+    "write_json",
+]
@@ -0,0 +1,116 @@
+"""Command-line entry point: ``python -m runner`` from ``testsprite_tests/``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+from . import auth, gate
+from .discovery import TESTS_DIR, discover
+from .report import print_summary, write_json
+from .runner import run_suite
+from .trace import TRACE_DIR, TraceWriter
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    cpus = os.cpu_count() or 2
+    parser = argparse.ArgumentParser(
+        prog="runner", description="Run TestSprite TC*.py scripts in parallel."
+    )
+    parser.add_argument("-k", "--keyword", help="only run scripts whose name contains this")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=cpus,
+        help=f"tests in flight at once (default: {cpus})",
+    )
+    parser.add_argument(
+        "-b", "--browsers", type=int, default=max(1, cpus // 2),
+        help="long-lived browsers shared by the workers (default: cpus / 2)",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, default=300.0,
+        help="per-test timeout in seconds (default: 300)",
+    )
+    parser.add_argument("--headed", action="store_true", help="show the browsers")
+    parser.add_argument(
+        "--reset-auth", action="store_true",
+        help="discard cached login sessions (tmp/auth/*.json) before running",
+    )
+    parser.add_argument(
+        "--json", type=Path, default=TESTS_DIR / "tmp" / "runner_results.json",
+        help="where to write the per-test summary",
+    )
+    parser.add_argument(
+        "--trace-dir", type=Path, default=TRACE_DIR,
+        help="where to write the per-step JSONL trace (default: tmp/traces)",
+    )
+    parser.add_argument(
+        "--no-trace", action="store_true", help="skip per-step timing and Web Vitals"
+    )
+    parser.add_argument(
+        "--gate", action="store_true",
+        help="compare the trace with tmp/perf_baseline.json and exit 3 on a regression; "
+        "a clean run is rolled into the baseline",
+    )
+    parser.add_argument(
+        "--release", help="label stored in the trace header (default: $TESTSPRITE_RELEASE)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    # Scripts import shared helpers from testsprite_tests/ the same way they do
+    # when run directly as ``python TC010_....py``.
+    if str(TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(TESTS_DIR))
+
+    if args.reset_auth:
+        auth.cache.clear()
+
+    cases = discover(keyword=args.keyword)
+    if not cases:
+        print("no test scripts matched", file=sys.stderr)
+        return 2
+
+    print(f"running {len(cases)} tests, {args.workers} workers on {args.browsers} browsers")
+    trace = None if args.no_trace else TraceWriter(args.trace_dir, release=args.release)
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(
+            run_suite(
+                cases,
+                workers=args.workers,
+                browsers=args.browsers,
+                timeout_s=args.timeout,
+                headless=not args.headed,
+                trace=trace,
+            )
+        )
+    finally:
+        if trace:
+            trace.close()
+    wall = time.perf_counter() - started
+    print_summary(results, wall)
+    write_json(results, args.json, wall)
+    if trace:
+        print(f"trace: {trace.path}")
+    if not all(r.ok for r in results):
+        return 1
+    if args.gate and trace:
+        print()
+        baseline = gate.Baseline()
+        if not baseline:
+            baseline.record(trace.run_id, gate.collect(gate.load(trace.path)))
+            baseline.save()
+            print(f"seeded baseline {baseline.path}")
+        elif gate.check([trace.path], baseline, update=True):
+            return 3
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Readiness-aware page actions shared by the TC*.py scripts.
+
+The generated scripts paced every step with ``wait_for_timeout(3000)`` and
+ended with ``asyncio.sleep(5)``. :class:`Actions` waits on real conditions
+instead:
+
+* locator actionability (Playwright's own visible/stable/enabled checks),
+* the app's hydration marker (``<html data-hydrated="true">``, set by
+  ``ClientProviders`` once React has mounted),
+* no in-flight ``fetch``/``xhr``/document requests for a short quiet window,
+  which covers Next.js server actions (``POST`` with a ``Next-Action`` header)
+  and the Supabase REST calls they trigger.
+
+When the runner has installed a :class:`~runner.trace.Tracer`, each action is
+also recorded as a timed step (see ``runner/trace.py``).
+
+Example::
+
+    act = Actions(page)
+    await act.goto("http://localhost:3000/planning")
+    await act.click(page.get_by_role("button", name="สร้างงานใหม่"))
+    await act.fill(page.locator("input[name=customer]"), "Test Customer")
+    await act.settle()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from contextlib import nullcontext
+from typing import Iterable, Sequence
+
+from playwright.async_api import BrowserContext, Error, Locator, Page, Request
+
+from .trace import DEFAULT_IGNORED_URLS, TRACKED_RESOURCE_TYPES, Tracer, current_tracer
+
+HYDRATED_JS = "() => document.documentElement.dataset.hydrated === 'true'"
+
+
+class InflightTracker:
+    """Counts tracked requests in flight across every page of a context."""
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        ignored_urls: Iterable[re.Pattern[str]] = DEFAULT_IGNORED_URLS,
+    ) -> None:
+        self._pending: set[Request] = set()
+        self._ignored = tuple(ignored_urls)
+        self._changed = asyncio.Event()
+        self.last_activity = time.monotonic()
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    def _tracked(self, request: Request) -> bool:
+        if request.resource_type not in TRACKED_RESOURCE_TYPES:
+            return False
+        return not any(p.search(request.url) for p in self._ignored)
+
+    def _on_request(self, request: Request) -> None:
+        if self._tracked(request):
+            self._pending.add(request)
+            self.last_activity = time.monotonic()
+            self._changed.set()
+
+    def _on_done(self, request: Request) -> None:
+        if request in self._pending:
+            self._pending.discard(request)
+            self.last_activity = time.monotonic()
+            self._changed.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def wait_idle(self, quiet_ms: int, timeout_ms: int) -> bool:
+        """Wait until nothing is in flight for ``quiet_ms``. False on timeout."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        quiet_s = quiet_ms / 1000
+        while True:
+            now = time.monotonic()
+            if not self._pending and now - self.last_activity >= quiet_s:
+                return True
+            if now >= deadline:
+                return False
+            if self._pending:
+                wait_s = deadline - now
+            else:
+                wait_s = min(quiet_s - (now - self.last_activity), deadline - now)
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(wait_s, 0.01))
+            except asyncio.TimeoutError:
+                pass
+
+
+class Actions:
+    """Click/fill/navigate helpers that return once the page has settled."""
+
+    def __init__(
+        self,
+        page: Page,
+        *,
+        timeout_ms: int = 5000,
+        navigation_timeout_ms: int = 15000,
+        quiet_ms: int = 250,
+        settle_timeout_ms: int = 10000,
+        tracer: Tracer | None = None,
+    ) -> None:
+        self.page = page
+        self.timeout_ms = timeout_ms
+        self.navigation_timeout_ms = navigation_timeout_ms
+        self.quiet_ms = quiet_ms
+        self.settle_timeout_ms = settle_timeout_ms
+        self.tracker = InflightTracker(page.context)
+        # Set by the runner for each test; None when a script runs on its own.
+        self.tracer = tracer or current_tracer()
+
+    def _step(self, action: str, target: Locator | str):
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.step(self.page, action, target)
+
+    async def wait_hydrated(self, timeout_ms: int | None = None) -> bool:
+        """Wait for the hydration marker; False if the page never sets it.
+
+        Error pages and static documents render outside ``ClientProviders``,
+        so a missing marker is not treated as a failure.
+        """
+        try:
+            await self.page.wait_for_function(
+                HYDRATED_JS, timeout=timeout_ms or self.navigation_timeout_ms
+            )
+            return True
+        except Error:
+            return False
+
+    async def settle(self, timeout_ms: int | None = None) -> bool:
+        """Wait for in-flight server actions and data requests to finish."""
+        return await self.tracker.wait_idle(
+            self.quiet_ms, timeout_ms or self.settle_timeout_ms
+        )
+
+    async def goto(self, url: str) -> None:
+        async with self._step("goto", url):
+            await self.page.goto(
+                url, wait_until="domcontentloaded", timeout=self.navigation_timeout_ms
+            )
+            await self.wait_hydrated()
+            await self.settle()
+
+    async def click(self, locator: Locator, **kwargs) -> None:
+        async with self._step("click", locator):
+            await locator.click(timeout=kwargs.pop("timeout", self.timeout_ms), **kwargs)
+            await self.settle()
+
+    async def fill(self, locator: Locator, value: str, **kwargs) -> None:
+        async with self._step("fill", locator):
+            await locator.fill(value, timeout=kwargs.pop("timeout", self.timeout_ms), **kwargs)
+            await self.settle()
+
+    async def select(self, locator: Locator, value: str | Sequence[str]) -> None:
+        async with self._step("select", locator):
+            await locator.select_option(value, timeout=self.timeout_ms)
+            await self.settle()
+
+    async def upload(self, locator: Locator, files) -> None:
+        async with self._step("upload", locator):
+            await locator.set_input_files(files, timeout=self.timeout_ms)
+            await self.settle()
@@ -0,0 +1,182 @@
+"""Log in once per role and reuse the saved Playwright ``storage_state``.
+
+Most scripts only need *a* signed-in session before they reach the page under
+test. Instead of typing credentials into ``/login`` every time, a script asks
+for a pre-authenticated context::
+
+    from runner.auth import new_context
+
+    context = await new_context(browser, "admin")
+
+The first caller for a role performs the real login in a throwaway context and
+writes ``tmp/auth/<role>.json``. Later callers, including concurrent tests in
+the parallel runner, load that file until the session cookie expires or the
+file is older than ``max_age_s``.
+
+Credentials default to the ones in ``tmp/config.json`` and can be overridden
+with ``TESTSPRITE_<ROLE>_USER`` / ``TESTSPRITE_<ROLE>_PASSWORD``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import Browser, BrowserContext
+
+from .discovery import TESTS_DIR
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000")
+AUTH_DIR = TESTS_DIR / "tmp" / "auth"
+
+# Sessions are issued for 7 days (src/lib/session.ts); refresh well before that
+# so a long CI day never straddles an expiry.
+DEFAULT_MAX_AGE_S = 6 * 60 * 60
+
+# Treat a cookie as expired this long before its real expiry.
+EXPIRY_MARGIN_S = 5 * 60
+
+
+@dataclass(frozen=True)
+class Role:
+    name: str
+    login_path: str
+    user_field: str
+    password_field: str | None
+    default_user: str
+    default_password: str
+    success_url: str
+    session_cookie: str
+    reveal_form: str | None = None
+
+    @property
+    def user(self) -> str:
+        return os.environ.get(f"TESTSPRITE_{self.name.upper()}_USER", self.default_user)
+
+    @property
+    def password(self) -> str:
+        return os.environ.get(
+            f"TESTSPRITE_{self.name.upper()}_PASSWORD", self.default_password
+        )
+
+
+ROLES: dict[str, Role] = {
+    # ?type=staff skips the small-screen redirect to /mobile/login.
+    "admin": Role(
+        name="admin",
+        login_path="/login?type=staff",
+        reveal_form="text=Command Key",
+        user_field="#email",
+        password_field="#password",
+        default_user="admin",
+        default_password="123456",
+        success_url="**/dashboard**",
+        session_cookie="session",
+    ),
+    "driver": Role(
+        name="driver",
+        login_path="/mobile/login",
+        user_field="#identifier",
+        password_field="#password",
+        default_user="0812345678",
+        default_password="password123",
+        success_url="**/mobile/**",
+        session_cookie="driver_session",
+    ),
+    # The customer portal signs in with an email or access code only.
+    "customer": Role(
+        name="customer",
+        login_path="/portal/login",
+        user_field="input[name=access_code]",
+        password_field=None,
+        default_user="CUST-001",
+        default_password="",
+        success_url="**/portal/jobs**",
+        session_cookie="session",
+    ),
+}
+
+
+class StorageStateCache:
+    """On-disk ``storage_state`` per role, refreshed when it goes stale."""
+
+    def __init__(
+        self,
+        directory: Path = AUTH_DIR,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+        base_url: str = BASE_URL,
+    ) -> None:
+        self.directory = directory
+        self.max_age_s = max_age_s
+        self.base_url = base_url
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def path(self, role: str) -> Path:
+        return self.directory / f"{role}.json"
+
+    def is_fresh(self, role: Role) -> bool:
+        path = self.path(role.name)
+        try:
+            age = time.time() - path.stat().st_mtime
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if age > self.max_age_s:
+            return False
+        cookie = next(
+            (c for c in state.get("cookies", []) if c.get("name") == role.session_cookie),
+            None,
+        )
+        if cookie is None:
+            return False
+        expires = cookie.get("expires", -1)
+        # -1 marks a browser-session cookie; only max_age_s bounds those.
+        return expires < 0 or expires - EXPIRY_MARGIN_S > time.time()
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    async def _login(self, browser: Browser, role: Role) -> None:
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(self.base_url + role.login_path, wait_until="domcontentloaded")
+            if role.reveal_form:
+                await page.locator(role.reveal_form).first.click()
+            await page.locator(role.user_field).fill(role.user)
+            if role.password_field:
+                await page.locator(role.password_field).fill(role.password)
+            await page.locator("form button[type=submit]").first.click()
+            await page.wait_for_url(role.success_url, timeout=20000)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=str(self.path(role.name)))
+        finally:
+            await context.close()
+
+    async def ensure(self, browser: Browser, role_name: str) -> Path:
+        """Return a fresh storage-state file for ``role_name``, logging in if needed."""
+        role = ROLES[role_name]
+        lock = self._locks.setdefault(role_name, asyncio.Lock())
+        async with lock:
+            if not self.is_fresh(role):
+                await self._login(browser, role)
+        return self.path(role_name)
+
+
+cache = StorageStateCache()
+
+
+async def new_context(browser: Browser, role: str | None, **kwargs: Any) -> BrowserContext:
+    """``browser.new_context(**kwargs)`` already signed in as ``role``.
+
+    ``role=None`` returns a plain anonymous context.
+    """
+    if role is not None:
+        kwargs.setdefault("storage_state", str(await cache.ensure(browser, role)))
+    return await browser.new_context(**kwargs)
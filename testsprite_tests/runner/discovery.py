@@ -0,0 +1,87 @@
+"""Locate ``TC*.py`` scripts and load their ``run_test`` coroutine functions."""
+
+from __future__ import annotations
+
+import ast
+import re
+import types
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+_CODE_RE = re.compile(r"^(TC\d+)")
+
+
+@dataclass
+class TestCase:
+    """A discovered script. ``error`` is set when it could not be loaded."""
+
+    name: str
+    path: Path
+    module: types.ModuleType | None = None
+    error: str | None = None
+
+    @property
+    def code(self) -> str:
+        match = _CODE_RE.match(self.name)
+        return match.group(1) if match else self.name
+
+    @property
+    def run_test(self) -> Callable[[], Awaitable[None]] | None:
+        if self.module is None:
+            return None
+        return getattr(self.module, "run_test", None)
+
+
+def _is_entrypoint_call(node: ast.stmt) -> bool:
+    """True for the top-level ``asyncio.run(run_test())`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_script(path: Path) -> TestCase:
+    """Compile a script into a fresh module with its entrypoint call removed."""
+    case = TestCase(name=path.stem, path=path)
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except SyntaxError as exc:
+        case.error = f"SyntaxError: {exc.msg} (line {exc.lineno})"
+        return case
+
+    tree.body = [node for node in tree.body if not _is_entrypoint_call(node)]
+    module = types.ModuleType(f"testsprite_{path.stem}")
+    module.__file__ = str(path)
+    try:
+        exec(compile(tree, str(path), "exec"), module.__dict__)
+    except Exception as exc:  # noqa: BLE001 - report any import-time failure
+        case.error = f"{type(exc).__name__}: {exc}"
+        return case
+
+    if not callable(getattr(module, "run_test", None)):
+        case.error = "no run_test() coroutine defined"
+        return case
+    case.module = module
+    return case
+
+
+def discover(
+    root: Path = TESTS_DIR,
+    pattern: str = "TC*.py",
+    keyword: str | None = None,
+) -> list[TestCase]:
+    """Load every script under ``root`` matching ``pattern`` (and ``keyword``)."""
+    cases = []
+    for path in sorted(root.glob(pattern)):
+        if keyword and keyword.lower() not in path.stem.lower():
+            continue
+        cases.append(load_script(path))
+    return cases
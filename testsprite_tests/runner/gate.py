@@ -0,0 +1,257 @@
+"""Performance regression gate over the step traces in ``tmp/traces/``.
+
+The baseline keeps the last ``window`` passing samples of every metric:
+
+* ``<test> duration_ms`` - whole test wall time,
+* ``<test>/<step> <action> <target> duration_ms`` - one Actions step,
+* ``<test>/<step> <action> <target> bytes`` - response bytes the step loaded.
+
+``check`` pools the samples from one or more current traces (N repeated runs)
+and flags a metric when its p95 moved past the baseline p95 by more than the
+relative tolerance *and* an absolute floor. With at least ``MIN_SAMPLES`` on
+both sides the shift must also be significant under a one-sided Mann-Whitney
+U test, so one slow run on a noisy machine does not fail the gate.
+
+Typical use::
+
+    python -m runner.gate record tmp/traces/*.jsonl      # seed / roll baseline
+    python -m runner.gate check tmp/traces/<run>.jsonl   # exit 1 on regression
+    python -m runner --gate                              # run suite, then check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from .trace import TRACE_DIR, load
+
+BASELINE_PATH = TRACE_DIR.parent / "perf_baseline.json"
+
+DEFAULT_WINDOW = 10
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_ALPHA = 0.05
+MIN_SAMPLES = 5
+
+# Absolute floors below which a shift is never reported.
+MIN_DELTA = {"duration_ms": 150.0, "bytes": 4096.0}
+
+Samples = dict[str, list[float]]
+
+
+def collect(records: Iterable[dict[str, Any]]) -> Samples:
+    """Metric samples from one trace. Failed tests and steps are skipped."""
+    records = list(records)
+    passed = {r["test"] for r in records if r.get("type") == "test" and r["status"] == "passed"}
+    samples: Samples = {}
+    for r in records:
+        if r.get("test") not in passed:
+            continue
+        if r["type"] == "test":
+            samples.setdefault(f"{r['test']} duration_ms", []).append(r["duration_ms"])
+        elif r["type"] == "step" and r["ok"]:
+            step = f"{r['test']}/{r['index']:02d} {r['action']} {r['target']}"
+            samples.setdefault(f"{step} duration_ms", []).append(r["duration_ms"])
+            size = sum(q["bytes"] or 0 for q in r["requests"])
+            samples.setdefault(f"{step} bytes", []).append(float(size))
+    return samples
+
+
+def merge(runs: Iterable[Samples]) -> Samples:
+    merged: Samples = {}
+    for run in runs:
+        for key, values in run.items():
+            merged.setdefault(key, []).extend(values)
+    return merged
+
+
+def p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    rank = 0.95 * (len(ordered) - 1)
+    lo, hi = math.floor(rank), math.ceil(rank)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def mann_whitney_greater(current: list[float], baseline: list[float]) -> float:
+    """One-sided p-value that ``current`` tends to be larger than ``baseline``.
+
+    Normal approximation with tie correction; adequate for the 5-50 samples
+    the gate works with.
+    """
+    pooled = sorted((v, i < len(current)) for i, v in enumerate(current + baseline))
+    ranks: list[float] = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t**3 - t
+        i = j + 1
+
+    n1, n2 = len(current), len(baseline)
+    u = sum(r for r, (_, is_current) in zip(ranks, pooled) if is_current) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Finding:
+    metric: str
+    before: float
+    after: float
+    p_value: float | None
+
+    @property
+    def change(self) -> float:
+        return (self.after - self.before) / self.before if self.before else math.inf
+
+    def __str__(self) -> str:
+        unit = "ms" if self.metric.endswith("duration_ms") else "B"
+        sig = f", p={self.p_value:.3f}" if self.p_value is not None else ""
+        return (
+            f"  {self.metric}\n"
+            f"      p95 {self.before:,.0f}{unit} -> {self.after:,.0f}{unit}"
+            f" ({self.change:+.0%}{sig})"
+        )
+
+
+def compare(
+    baseline: Samples,
+    current: Samples,
+    tolerance: float = DEFAULT_TOLERANCE,
+    alpha: float = DEFAULT_ALPHA,
+) -> list[Finding]:
+    findings = []
+    for key, now in sorted(current.items()):
+        before = baseline.get(key)
+        if not before or not now:
+            continue
+        old, new = p95(before), p95(now)
+        floor = MIN_DELTA["bytes" if key.endswith(" bytes") else "duration_ms"]
+        if new - old < floor or new <= old * (1 + tolerance):
+            continue
+        p_value = None
+        if len(now) >= MIN_SAMPLES and len(before) >= MIN_SAMPLES:
+            p_value = mann_whitney_greater(now, before)
+            if p_value >= alpha:
+                continue
+        findings.append(Finding(key, old, new, p_value))
+    return findings
+
+
+class Baseline:
+    """Rolling window of samples per metric, stored as JSON."""
+
+    def __init__(self, path: Path = BASELINE_PATH, window: int = DEFAULT_WINDOW) -> None:
+        self.path = path
+        self.window = window
+        self.runs: list[str] = []
+        self.samples: Samples = {}
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+            self.runs = data.get("runs", [])
+            self.samples = data.get("samples", {})
+
+    def __bool__(self) -> bool:
+        return bool(self.samples)
+
+    def record(self, run_id: str, samples: Samples) -> None:
+        if run_id in self.runs:
+            return
+        self.runs = (self.runs + [run_id])[-self.window:]
+        for key, values in samples.items():
+            kept = self.samples.get(key, []) + values
+            self.samples[key] = kept[-self.window:]
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"window": self.window, "runs": self.runs, "samples": self.samples}
+        self.path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+
+
+def _run_id(records: list[dict[str, Any]], path: Path) -> str:
+    header = next((r for r in records if r.get("type") == "run"), None)
+    return header["run"] if header else path.stem
+
+
+def check(
+    traces: list[Path],
+    baseline: Baseline,
+    tolerance: float = DEFAULT_TOLERANCE,
+    alpha: float = DEFAULT_ALPHA,
+    update: bool = False,
+) -> int:
+    """Print regressions of ``traces`` against ``baseline``; 1 if any found."""
+    if not baseline:
+        print(f"no baseline at {baseline.path}; record one with `python -m runner.gate record`")
+        return 2
+    loaded = [(path, load(path)) for path in traces]
+    current = merge(collect(records) for _, records in loaded)
+    findings = compare(baseline.samples, current, tolerance, alpha)
+
+    checked = sum(1 for key in current if key in baseline.samples)
+    if findings:
+        print(f"{len(findings)} of {checked} metrics regressed (tolerance {tolerance:.0%}):")
+        for finding in findings:
+            print(finding)
+    else:
+        print(f"no regressions in {checked} metrics across {len(traces)} run(s)")
+
+    if update and not findings:
+        for path, records in loaded:
+            baseline.record(_run_id(records, path), collect(records))
+        baseline.save()
+    return 1 if findings else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="runner.gate", description="Compare step traces against a rolling baseline."
+    )
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("traces", type=Path, nargs="+", help="trace files (tmp/traces/*.jsonl)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--window", type=int, default=DEFAULT_WINDOW,
+        help=f"samples kept per metric (default: {DEFAULT_WINDOW})",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help=f"allowed relative p95 increase (default: {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--alpha", type=float, default=DEFAULT_ALPHA,
+        help=f"significance level for the U test (default: {DEFAULT_ALPHA})",
+    )
+    parser.add_argument(
+        "--update", action="store_true",
+        help="with check: roll the traces into the baseline when nothing regressed",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = Baseline(args.baseline, args.window)
+    if args.command == "record":
+        for path in args.traces:
+            records = load(path)
+            baseline.record(_run_id(records, path), collect(records))
+        baseline.save()
+        print(f"baseline: {len(baseline.runs)} runs, {len(baseline.samples)} metrics")
+        return 0
+    return check(args.traces, baseline, args.tolerance, args.alpha, args.update)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Page objects for the screens the TestSprite scripts drive.
+
+Each page object wraps one ``Page`` plus an :class:`~runner.actions.Actions`
+and resolves elements through :class:`~runner.selectors.SelectorIndex`, so the
+scripts describe user intent (``planning.new_job()``) rather than DOM paths.
+"""
+
+from .base import PageObject
+from .excel_import import ExcelImportDialog
+from .job_dialog import JobDialog
+from .planning import PlanningPage
+from .profile import ProfilePage
+from .sidebar import Sidebar
+
+__all__ = [
+    "ExcelImportDialog",
+    "JobDialog",
+    "PageObject",
+    "PlanningPage",
+    "ProfilePage",
+    "Sidebar",
+]
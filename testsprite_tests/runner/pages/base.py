@@ -0,0 +1,39 @@
+"""Shared plumbing for page objects."""
+
+from __future__ import annotations
+
+from urllib.parse import urlparse
+
+from playwright.async_api import Page
+
+from ..actions import Actions
+from ..auth import BASE_URL
+from ..selectors import SelectorIndex
+
+
+class PageObject:
+    """A screen of the app, bound to one ``Page`` and its selector index.
+
+    Page objects on the same page should share one :class:`Actions` so its
+    request tracker is registered only once.
+    """
+
+    path = "/"
+
+    def __init__(self, page: Page, act: Actions | None = None) -> None:
+        self.page = page
+        self.act = act or Actions(page)
+        self.sel = SelectorIndex(page)
+
+    @property
+    def current_path(self) -> str:
+        return urlparse(self.page.url).path
+
+    def is_current(self) -> bool:
+        return self.current_path == self.path
+
+    async def open(self) -> "PageObject":
+        """Navigate straight to :attr:`path` unless already there."""
+        if not self.is_current():
+            await self.act.goto(BASE_URL + self.path)
+        return self
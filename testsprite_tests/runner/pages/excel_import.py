@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from playwright.async_api import Locator
+
+from .base import PageObject
+
+
+class ExcelImportDialog(PageObject):
+    """Bulk import dialog (``src/components/ui/excel-import.tsx``)."""
+
+    @property
+    def root(self) -> Locator:
+        return self.sel["excel_import"]
+
+    async def wait_open(self) -> "ExcelImportDialog":
+        await self.root.wait_for(state="visible", timeout=self.act.timeout_ms)
+        return self
+
+    async def upload(self, path: str | Path) -> None:
+        # The file input is visually hidden; set_input_files does not need it
+        # to be actionable.
+        await self.act.upload(self.sel["excel_import.file"], str(path))
+
+    async def wait_parsed(self, timeout_ms: int | None = None) -> None:
+        """Wait until the sheet is parsed and the import button is enabled."""
+        await self.page.wait_for_function(
+            "() => { const b = document.querySelector('[data-testid=excel-import-submit]');"
+            " return !!b && !b.disabled }",
+            timeout=timeout_ms or self.act.settle_timeout_ms,
+        )
+
+    async def _set_checkbox(self, key: str, checked: bool) -> None:
+        box = self.sel[key]
+        if (await box.get_attribute("aria-checked")) != str(checked).lower():
+            await self.act.click(box)
+
+    async def set_grouping(self, checked: bool) -> None:
+        await self._set_checkbox("excel_import.group", checked)
+
+    async def set_draft(self, checked: bool) -> None:
+        await self._set_checkbox("excel_import.draft", checked)
+
+    async def submit(self, timeout_ms: int | None = None) -> None:
+        """Run the import and wait for the dialog to close on success."""
+        await self.act.click(self.sel["excel_import.submit"])
+        await self.root.wait_for(
+            state="hidden", timeout=timeout_ms or self.act.settle_timeout_ms
+        )
+
+    async def progress(self) -> tuple[int, int]:
+        """``(chunks done, chunks total)`` of a chunked import; (0, 0) before it starts."""
+        bar = self.sel["excel_import.progress"]
+        if not await bar.count():
+            return 0, 0
+        return int(await bar.get_attribute("data-done")), int(await bar.get_attribute("data-total"))
+
+    async def wait_progress(self, done: int, timeout_ms: int | None = None) -> None:
+        """Wait until at least ``done`` chunks have been acknowledged."""
+        await self.page.wait_for_function(
+            "n => { const p = document.querySelector('[data-testid=excel-import-progress]');"
+            " return !!p && Number(p.dataset.done) >= n }",
+            arg=done,
+            timeout=timeout_ms or self.act.settle_timeout_ms,
+        )
+
+    async def cancel(self) -> None:
+        await self.act.click(self.sel["excel_import.cancel"])
+        await self.root.wait_for(state="hidden", timeout=self.act.timeout_ms)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from playwright.async_api import Locator
+
+from ..selectors import SELECTORS
+from .base import PageObject
+
+
+class JobDialog(PageObject):
+    """Create/edit job dialog (``src/components/planning/job-dialog.tsx``)."""
+
+    @property
+    def root(self) -> Locator:
+        return self.sel["job_dialog"]
+
+    def tab(self, tab_id: str) -> Locator:
+        return self.root.get_by_test_id(f"job-dialog-tab-{tab_id}")
+
+    def origin(self, index: int = 0) -> Locator:
+        return self.root.get_by_test_id(f"job-dialog-origin-{index}")
+
+    def destination(self, index: int = 0) -> Locator:
+        return self.root.get_by_test_id(f"job-dialog-destination-{index}")
+
+    async def wait_open(self) -> "JobDialog":
+        await self.root.wait_for(state="visible", timeout=self.act.timeout_ms)
+        return self
+
+    async def show_tab(self, tab_id: str) -> None:
+        await self.act.click(self.tab(tab_id))
+
+    async def next(self) -> None:
+        await self.act.click(self.sel["job_dialog.next"])
+
+    async def job_id(self) -> str:
+        """The Job_ID the dialog pre-generates for a new job."""
+        return await self.sel["job_dialog.job_id"].input_value()
+
+    async def fill_job_id(self, job_id: str) -> None:
+        await self.act.fill(self.sel["job_dialog.job_id"], job_id)
+
+    async def fill_customer(self, name: str) -> None:
+        await self.act.fill(self.sel["job_dialog.customer"].locator("input").first, name)
+
+    async def fill_cargo_type(self, cargo: str) -> None:
+        await self.act.fill(self.sel["job_dialog.cargo_type"], cargo)
+
+    async def _fill_stop(self, row: Locator, name: str, lat: str, lng: str) -> None:
+        await self.act.fill(row.locator("input").first, name)
+        await self.act.fill(SELECTORS["job_dialog.lat"].resolve(row), lat)
+        await self.act.fill(SELECTORS["job_dialog.lng"].resolve(row), lng)
+
+    async def fill_origin(self, name: str, lat: str, lng: str, index: int = 0) -> None:
+        await self._fill_stop(self.origin(index), name, lat, lng)
+
+    async def fill_destination(self, name: str, lat: str, lng: str, index: int = 0) -> None:
+        await self._fill_stop(self.destination(index), name, lat, lng)
+
+    async def submit(self) -> None:
+        """Submit and wait for the dialog to close."""
+        await self.act.click(self.sel["job_dialog.submit"])
+        await self.root.wait_for(state="hidden", timeout=self.act.settle_timeout_ms)
+
+    async def save_draft(self) -> None:
+        await self.act.click(self.sel["job_dialog.save_draft"])
+        await self.root.wait_for(state="hidden", timeout=self.act.settle_timeout_ms)
+
+    async def cancel(self) -> None:
+        await self.act.click(self.sel["job_dialog.cancel"])
+        await self.root.wait_for(state="hidden", timeout=self.act.timeout_ms)
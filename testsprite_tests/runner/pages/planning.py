@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from playwright.async_api import Locator
+
+from .base import PageObject
+from .excel_import import ExcelImportDialog
+from .job_dialog import JobDialog
+
+
+class PlanningPage(PageObject):
+    """Planning board (``src/components/planning/planning-client.tsx``)."""
+
+    path = "/planning"
+
+    def job(self, job_id: str) -> Locator:
+        return self.page.get_by_text(job_id, exact=True).first
+
+    async def search(self, query: str) -> None:
+        await self.act.fill(self.sel["planning.search"], query)
+
+    async def set_date(self, iso_date: str) -> None:
+        await self.act.fill(self.sel["planning.date"], iso_date)
+
+    async def show(self, view: str) -> None:
+        """Switch between the ``list``, ``kanban`` and ``requests`` views."""
+        await self.act.click(self.sel[f"planning.view.{view}"])
+
+    async def new_job(self) -> JobDialog:
+        await self.act.click(self.sel["planning.new_job"])
+        return await JobDialog(self.page, self.act).wait_open()
+
+    async def open_import(self) -> ExcelImportDialog:
+        await self.act.click(self.sel["planning.import"])
+        return await ExcelImportDialog(self.page, self.act).wait_open()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from ..auth import BASE_URL
+from .base import PageObject
+from .sidebar import Sidebar
+
+
+class ProfilePage(PageObject):
+    """Profile settings (``src/app/settings/profile/page.tsx``)."""
+
+    path = "/settings/profile"
+
+    async def open_from_settings(self) -> "ProfilePage":
+        """Reach the profile through Sidebar -> Settings -> edit profile."""
+        if not self.page.url.startswith(BASE_URL):
+            await self.act.goto(BASE_URL + "/dashboard")
+        await Sidebar(self.page, self.act).navigate("/settings")
+        await self.act.click(self.sel["settings.edit_profile"])
+        await self.page.wait_for_url(f"**{self.path}", timeout=self.act.navigation_timeout_ms)
+        await self.act.wait_hydrated()
+        return self
+
+    async def fill(
+        self,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        email: str | None = None,
+    ) -> None:
+        """Fill the given fields; ``None`` leaves a field untouched."""
+        if first_name is not None:
+            await self.act.fill(self.sel["profile.first_name"], first_name)
+        if last_name is not None:
+            await self.act.fill(self.sel["profile.last_name"], last_name)
+        if email is not None:
+            await self.act.fill(self.sel["profile.email"], email)
+
+    async def save(self) -> None:
+        await self.act.click(self.sel["profile.save"])
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from playwright.async_api import Locator
+
+from .base import PageObject
+
+
+class Sidebar(PageObject):
+    """Left navigation (``src/components/layout/sidebar.tsx``)."""
+
+    def link(self, href: str) -> Locator:
+        return self.sel["sidebar"].locator(f'[data-testid="sidebar-link"][href="{href}"]')
+
+    async def navigate(self, href: str) -> None:
+        """Click the nav link for ``href`` once and wait for the route.
+
+        Skips the click when already on ``href``; a single click plus one URL
+        wait replaces the repeated clicks the generated scripts used.
+        """
+        if self.current_path == href:
+            return
+        await self.act.click(self.link(href))
+        await self.page.wait_for_url(f"**{href}", timeout=self.act.navigation_timeout_ms)
+        await self.act.wait_hydrated()
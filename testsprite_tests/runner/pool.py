@@ -0,0 +1,90 @@
+"""A bounded pool of long-lived Chromium browsers shared across tests."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+# Same flags the generated scripts use, minus ``--single-process``: one browser
+# process has to host several contexts at once, which single-process mode
+# does not handle reliably.
+DEFAULT_LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+
+class BrowserPool:
+    """Keeps ``size`` browsers warm and hands out the least-loaded one.
+
+    A browser may serve several leases at once; isolation between tests comes
+    from each test opening its own ``BrowserContext``. Browsers that crash are
+    relaunched on the next lease.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        headless: bool = True,
+        launch_args: list[str] | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("BrowserPool size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self._pw: Playwright | None = None
+        self._browsers: list[Browser] = []
+        self._load: list[int] = []
+        self._lock = asyncio.Lock()
+
+    async def _launch(self) -> Browser:
+        assert self._pw is not None
+        return await self._pw.chromium.launch(
+            headless=self.headless, args=self.launch_args
+        )
+
+    async def start(self) -> "BrowserPool":
+        self._pw = await async_playwright().start()
+        self._browsers = list(
+            await asyncio.gather(*(self._launch() for _ in range(self.size)))
+        )
+        self._load = [0] * self.size
+        return self
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(b.close() for b in self._browsers), return_exceptions=True
+        )
+        self._browsers = []
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    @property
+    def playwright(self) -> Playwright:
+        assert self._pw is not None, "BrowserPool.start() has not been called"
+        return self._pw
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Browser]:
+        async with self._lock:
+            slot = min(range(self.size), key=self._load.__getitem__)
+            if not self._browsers[slot].is_connected():
+                self._browsers[slot] = await self._launch()
+            self._load[slot] += 1
+            browser = self._browsers[slot]
+        try:
+            yield browser
+        finally:
+            self._load[slot] -= 1
@@ -0,0 +1,59 @@
+"""Per-test results and the summary printed at the end of a run."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+TIMEOUT = "timeout"
+
+
+@dataclass
+class TestResult:
+    name: str
+    code: str
+    status: str
+    duration_s: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PASSED
+
+
+def print_summary(results: list[TestResult], wall_s: float) -> None:
+    width = max((len(r.name) for r in results), default=10)
+    print()
+    for r in sorted(results, key=lambda r: r.name):
+        line = f"{r.status.upper():8} {r.duration_s:8.2f}s  {r.name:<{width}}"
+        if r.error and r.error.strip():
+            # Tracebacks end with the exception line, which is the useful part.
+            last = r.error.strip().splitlines()[-1]
+            line += f"  {last[:120]}"
+        print(line.rstrip())
+
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    serial = sum(r.duration_s for r in results)
+    slowest = max(results, key=lambda r: r.duration_s, default=None)
+    print()
+    print(
+        ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+        + f" in {wall_s:.2f}s wall ({serial:.2f}s summed)"
+    )
+    if slowest:
+        print(f"slowest: {slowest.name} ({slowest.duration_s:.2f}s)")
+
+
+def write_json(results: list[TestResult], path: Path, wall_s: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "wall_s": round(wall_s, 3),
+        "results": [asdict(r) for r in results],
+    }
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
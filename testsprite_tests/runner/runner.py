@@ -0,0 +1,69 @@
+"""Run discovered test cases concurrently on a :class:`BrowserPool`."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import traceback
+
+from .discovery import TestCase
+from .pool import BrowserPool
+from .report import ERROR, FAILED, PASSED, TIMEOUT, TestResult
+from .shim import LeasedBrowser, install
+from .trace import Tracer, TraceWriter
+
+
+async def run_case(
+    case: TestCase,
+    pool: BrowserPool,
+    slots: asyncio.Semaphore,
+    timeout_s: float,
+    trace: TraceWriter | None = None,
+) -> TestResult:
+    if case.run_test is None:
+        return TestResult(case.name, case.code, ERROR, 0.0, case.error)
+
+    async with slots, pool.lease() as browser:
+        leased = LeasedBrowser(browser)
+        install(case.module.__dict__, leased)
+        tracer = Tracer(case.name) if trace else None
+        token = tracer.activate() if tracer else None
+        started = time.perf_counter()
+        status, error = PASSED, None
+        try:
+            await asyncio.wait_for(case.run_test(), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            status, error = TIMEOUT, f"exceeded {timeout_s:.0f}s"
+        except AssertionError as exc:
+            status, error = FAILED, str(exc) or "assertion failed"
+        except Exception:  # noqa: BLE001 - any script error is a test error
+            status, error = ERROR, traceback.format_exc(limit=3)
+        finally:
+            if token is not None:
+                Tracer.deactivate(token)
+            await leased.close()
+        duration = time.perf_counter() - started
+    if trace and tracer:
+        trace.write_test(tracer, case.code, status, duration)
+    return TestResult(case.name, case.code, status, duration, error)
+
+
+async def run_suite(
+    cases: list[TestCase],
+    workers: int,
+    browsers: int,
+    timeout_s: float = 300.0,
+    headless: bool = True,
+    trace: TraceWriter | None = None,
+) -> list[TestResult]:
+    """Run ``cases`` with at most ``workers`` in flight across ``browsers``.
+
+    With ``trace`` set, every test's steps are appended to that trace file.
+    """
+    slots = asyncio.Semaphore(max(1, workers))
+    async with BrowserPool(max(1, min(browsers, workers)), headless=headless) as pool:
+        return list(
+            await asyncio.gather(
+                *(run_case(case, pool, slots, timeout_s, trace) for case in cases)
+            )
+        )
@@ -0,0 +1,126 @@
+"""Stable selector index for the page objects.
+
+Every element the suite touches is named here once, by ``data-testid`` or ARIA
+role, instead of by an absolute XPath such as
+``html/body/div[2]/aside/nav/div[2]/div/a[1]``. Test ids are matched with an
+attribute lookup rather than a full-document XPath walk, and they survive
+layout changes that shift ``div[n]`` positions.
+
+The ``data-testid`` attributes live in the components themselves (sidebar,
+daily-summary, planning-client, job-dialog, excel-import, settings/profile).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from playwright.async_api import Locator, Page
+
+
+@dataclass(frozen=True)
+class By:
+    kind: str
+    value: str
+    name: str | None = None
+
+    def resolve(self, root: Page | Locator) -> Locator:
+        if self.kind == "testid":
+            return root.get_by_test_id(self.value)
+        if self.kind == "role":
+            return root.get_by_role(self.value, name=self.name)  # type: ignore[arg-type]
+        if self.kind == "placeholder":
+            return root.get_by_placeholder(self.value, exact=True)
+        if self.kind == "css":
+            return root.locator(self.value)
+        raise ValueError(f"unknown selector kind: {self.kind}")
+
+
+def test_id(value: str) -> By:
+    return By("testid", value)
+
+
+def role(value: str, name: str) -> By:
+    return By("role", value, name)
+
+
+def placeholder(value: str) -> By:
+    return By("placeholder", value)
+
+
+def css(value: str) -> By:
+    return By("css", value)
+
+
+SELECTORS: dict[str, By] = {
+    # Sidebar (src/components/layout/sidebar.tsx)
+    "sidebar": test_id("sidebar"),
+    "sidebar.link": test_id("sidebar-link"),
+    # Dashboard daily summary (src/components/dashboard/daily-summary.tsx)
+    "daily_summary.total": test_id("daily-summary-total"),
+    "daily_summary.delivered": test_id("daily-summary-delivered"),
+    "daily_summary.in_progress": test_id("daily-summary-in-progress"),
+    "daily_summary.qty": test_id("daily-summary-qty"),
+    # Planning board (src/components/planning/planning-client.tsx)
+    "planning.search": test_id("planning-search"),
+    "planning.date": test_id("planning-date"),
+    "planning.view.list": test_id("planning-view-list"),
+    "planning.view.kanban": test_id("planning-view-kanban"),
+    "planning.view.requests": test_id("planning-view-requests"),
+    "planning.import": test_id("planning-import"),
+    "planning.new_job": test_id("planning-new-job"),
+    # Job dialog (src/components/planning/job-dialog.tsx)
+    "job_dialog": test_id("job-dialog"),
+    "job_dialog.job_id": test_id("job-dialog-job-id"),
+    "job_dialog.plan_date": test_id("job-dialog-plan-date"),
+    "job_dialog.customer": test_id("job-dialog-customer"),
+    "job_dialog.cargo_type": test_id("job-dialog-cargo-type"),
+    "job_dialog.next": test_id("job-dialog-next"),
+    "job_dialog.submit": test_id("job-dialog-submit"),
+    "job_dialog.save_draft": test_id("job-dialog-save-draft"),
+    "job_dialog.cancel": test_id("job-dialog-cancel"),
+    "job_dialog.optimize_route": test_id("job-dialog-optimize-route"),
+    "job_dialog.lat": placeholder("Lat"),
+    "job_dialog.lng": placeholder("Lng"),
+    # Excel import dialog (src/components/ui/excel-import.tsx)
+    "excel_import": test_id("excel-import"),
+    "excel_import.file": test_id("excel-import-file"),
+    "excel_import.group": test_id("excel-import-group"),
+    "excel_import.draft": test_id("excel-import-draft"),
+    "excel_import.submit": test_id("excel-import-submit"),
+    "excel_import.cancel": test_id("excel-import-cancel"),
+    # Driver PWA offline queue banner (src/components/mobile/sync-manager.tsx)
+    "offline_sync": test_id("offline-sync"),
+    # Driver POD submission (src/app/mobile/jobs/[id]/complete/page.tsx)
+    "pod.photos": test_id("camera-input-gallery"),
+    "pod.signature": test_id("signature-pad"),
+    "pod.submit": test_id("pod-submit"),
+    "pod.completed": test_id("pod-completed"),
+    "excel_import.progress": test_id("excel-import-progress"),
+    "excel_import.resume": test_id("excel-import-resume"),
+    # Settings and profile (src/app/settings/*)
+    "settings.edit_profile": test_id("settings-edit-profile"),
+    "profile.first_name": test_id("profile-first-name"),
+    "profile.last_name": test_id("profile-last-name"),
+    "profile.email": test_id("profile-email"),
+    "profile.save": test_id("profile-save"),
+}
+
+
+class SelectorIndex:
+    """Per-page cache of :data:`SELECTORS` resolved to ``Locator`` objects.
+
+    Each key is resolved once per page; page objects index into it instead of
+    rebuilding locators on every step.
+    """
+
+    def __init__(self, root: Page | Locator, selectors: dict[str, By] = SELECTORS) -> None:
+        self._root = root
+        self._selectors = selectors
+        self._resolved: dict[str, Locator] = {}
+
+    def __getitem__(self, key: str) -> Locator:
+        locator = self._resolved.get(key)
+        if locator is None:
+            locator = self._selectors[key].resolve(self._root)
+            self._resolved[key] = locator
+        return locator
@@ -0,0 +1,98 @@
+"""Stand-ins for ``playwright.async_api`` that route scripts onto the pool.
+
+The generated scripts do::
+
+    pw = await async_api.async_playwright().start()
+    browser = await pw.chromium.launch(...)
+    context = await browser.new_context()
+    ...
+    await context.close(); await browser.close(); await pw.stop()
+
+The shim keeps that code unchanged: ``launch`` returns the leased pool browser,
+``browser.close()`` only closes the contexts this test opened, and
+``pw.stop()`` does nothing.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext
+
+
+class LeasedBrowser:
+    """Proxy for a pooled browser that tracks the contexts a test opens."""
+
+    def __init__(self, browser: Browser, context_options: dict[str, Any] | None = None) -> None:
+        self._browser = browser
+        self._context_options = context_options or {}
+        self.contexts: list[BrowserContext] = []
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        context = await self._browser.new_context(**{**self._context_options, **kwargs})
+        self.contexts.append(context)
+        return context
+
+    async def new_page(self, **kwargs: Any):
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    async def close(self, **_: Any) -> None:
+        for context in self.contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self.contexts.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+class _PooledBrowserType:
+    def __init__(self, leased: LeasedBrowser) -> None:
+        self._leased = leased
+
+    async def launch(self, **_: Any) -> LeasedBrowser:
+        return self._leased
+
+
+class PooledPlaywright:
+    """What ``async_playwright()`` returns inside a pooled test."""
+
+    def __init__(self, leased: LeasedBrowser) -> None:
+        self.chromium = _PooledBrowserType(leased)
+
+    async def start(self) -> "PooledPlaywright":
+        return self
+
+    async def stop(self) -> None:
+        return None
+
+    async def __aenter__(self) -> "PooledPlaywright":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+
+class AsyncApiShim:
+    """Module-like object that replaces ``async_api`` in a script's globals."""
+
+    def __init__(self, leased: LeasedBrowser) -> None:
+        self._leased = leased
+
+    def async_playwright(self) -> PooledPlaywright:
+        return PooledPlaywright(self._leased)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+
+def install(module_globals: dict[str, Any], leased: LeasedBrowser) -> None:
+    """Point a loaded script at ``leased`` instead of a fresh browser."""
+    if "async_api" in module_globals:
+        module_globals["async_api"] = AsyncApiShim(leased)
+    if "async_playwright" in module_globals:
+        module_globals["async_playwright"] = lambda: PooledPlaywright(leased)
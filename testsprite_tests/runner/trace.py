@@ -0,0 +1,416 @@
+"""Per-step timing, request and Web Vitals trace for the E2E scripts.
+
+While the runner executes a test it installs a :class:`Tracer` in a context
+variable. Every :class:`~runner.actions.Actions` step (``goto``, ``click``,
+``fill``, ...) then records:
+
+* wall time from the start of the action until the page has settled,
+* each document/fetch/xhr request the step triggered, classified as a Next.js
+  server action (``Next-Action`` header), a Supabase REST call
+  (``/rest/v1/``), other Supabase endpoints, a document load or a plain fetch,
+  with status, latency and response body size,
+* LCP, CLS and INP of the current document, read from ``PerformanceObserver``
+  entries collected by an init script.
+
+Supabase queries issued *inside* a server action run on the Next.js server and
+are not visible to the browser; their cost shows up in the server action's
+latency.
+
+Tests can also attach their own measurements with :func:`record_metric`;
+they are written on the test's line under ``metrics``.
+
+A run writes one JSONL file under ``tmp/traces/``: a ``run`` header line, then
+``step`` lines and one ``test`` line per test. Scripts run directly with
+``python TC....py`` are not traced.
+
+Summarise a trace per page, or compare two runs::
+
+    python -m runner.trace tmp/traces/20261018-101500.jsonl
+    python -m runner.trace tmp/traces/<before>.jsonl tmp/traces/<after>.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Error, Locator, Page, Request
+
+# Request types that represent page work a user would wait on. Websockets
+# (Supabase realtime, HMR) are never reported as requests, so they cannot
+# hold a step open.
+TRACKED_RESOURCE_TYPES = frozenset({"document", "fetch", "xhr"})
+
+# Background polling that never goes quiet on its own.
+DEFAULT_IGNORED_URLS = (
+    re.compile(r"/_next/webpack-hmr"),
+    re.compile(r"/__nextjs_original-stack-frame"),
+    re.compile(r"/realtime/v1/"),
+)
+
+TRACE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "traces"
+
+SERVER_ACTION = "server_action"
+SUPABASE_REST = "supabase_rest"
+SUPABASE_OTHER = "supabase"
+DOCUMENT = "document"
+FETCH = "fetch"
+
+_SUPABASE_PATH = re.compile(r"/(auth|storage|functions)/v1/")
+
+# Collects LCP, CLS and INP into window.__tmsVitals. INP is approximated as the
+# slowest interaction seen on the document, which is what the metric reports
+# for sessions with fewer than 50 interactions.
+VITALS_JS = """
+(() => {
+  if (window.__tmsVitals) return;
+  const v = window.__tmsVitals = { lcp_ms: null, cls: 0, inp_ms: null };
+  const observe = (type, cb, opts) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(cb))
+        .observe({ type, buffered: true, ...opts });
+    } catch (e) {}
+  };
+  observe('largest-contentful-paint', (e) => { v.lcp_ms = e.startTime; });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) v.cls += e.value; });
+  observe('event', (e) => {
+    if (e.interactionId && (v.inp_ms === null || e.duration > v.inp_ms)) v.inp_ms = e.duration;
+  }, { durationThreshold: 16 });
+})()
+"""
+
+_current: contextvars.ContextVar["Tracer | None"] = contextvars.ContextVar(
+    "runner_tracer", default=None
+)
+
+
+def current_tracer() -> "Tracer | None":
+    return _current.get()
+
+
+def record_metric(name: str, value: float) -> None:
+    """Attach a measurement to the running test's trace; no-op when untraced."""
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.metrics[name] = value
+
+
+def classify(request: Request) -> str:
+    if request.resource_type == "document":
+        return DOCUMENT
+    if request.method == "POST" and "next-action" in request.headers:
+        return SERVER_ACTION
+    if "/rest/v1/" in request.url:
+        return SUPABASE_REST
+    if _SUPABASE_PATH.search(request.url):
+        return SUPABASE_OTHER
+    return FETCH
+
+
+def describe(target: Locator | str) -> str:
+    """Short, stable label for a step target: a URL or a locator's selector."""
+    if isinstance(target, str):
+        return target
+    match = re.search(r"selector='(.*)'>$", repr(target))
+    return match.group(1) if match else repr(target)
+
+
+@dataclass
+class RequestRecord:
+    kind: str
+    method: str
+    path: str
+    status: int | None = None
+    duration_ms: float | None = None
+    bytes: int | None = None
+    failed: bool = False
+
+
+@dataclass
+class StepRecord:
+    test: str
+    index: int
+    action: str
+    target: str
+    page: str
+    duration_ms: float = 0.0
+    ok: bool = True
+    requests: list[RequestRecord] = field(default_factory=list)
+    vitals: dict[str, float | None] | None = None
+
+    def to_json(self, run_id: str) -> dict[str, Any]:
+        data = asdict(self)
+        data.update(type="step", run=run_id, ms_by_kind=self.ms_by_kind())
+        return data
+
+    def ms_by_kind(self) -> dict[str, float]:
+        """Summed request latency per kind, for quick comparison across runs."""
+        totals: dict[str, float] = {}
+        for r in self.requests:
+            if r.duration_ms is not None:
+                totals[r.kind] = round(totals.get(r.kind, 0.0) + r.duration_ms, 1)
+        return totals
+
+
+class Tracer:
+    """Collects the steps of one test. Steps within a test run sequentially."""
+
+    def __init__(
+        self,
+        test: str,
+        ignored_urls: Iterable[re.Pattern[str]] = DEFAULT_IGNORED_URLS,
+    ) -> None:
+        self.test = test
+        self.steps: list[StepRecord] = []
+        self.metrics: dict[str, float] = {}
+        self._ignored = tuple(ignored_urls)
+        self._active: StepRecord | None = None
+        self._started: dict[Request, tuple[float, RequestRecord]] = {}
+        self._finishing: set[asyncio.Task] = set()
+        self._contexts: set[int] = set()
+        self._pages: set[int] = set()
+
+    def activate(self) -> contextvars.Token:
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token: contextvars.Token) -> None:
+        _current.reset(token)
+
+    async def attach(self, page: Page) -> None:
+        """Hook the page's context for requests and the page for vitals."""
+        context = page.context
+        if id(context) not in self._contexts:
+            self._contexts.add(id(context))
+            self._listen(context)
+        if id(page) not in self._pages:
+            self._pages.add(id(page))
+            await page.add_init_script(script=VITALS_JS)
+            if page.url != "about:blank":
+                try:
+                    await page.evaluate(VITALS_JS)
+                except Error:
+                    pass
+
+    def _listen(self, context: BrowserContext) -> None:
+        context.on("request", self._on_request)
+        context.on("requestfinished", lambda r: self._on_done(r, failed=False))
+        context.on("requestfailed", lambda r: self._on_done(r, failed=True))
+
+    def _on_request(self, request: Request) -> None:
+        if self._active is None or request.resource_type not in TRACKED_RESOURCE_TYPES:
+            return
+        if any(p.search(request.url) for p in self._ignored):
+            return
+        record = RequestRecord(classify(request), request.method, urlparse(request.url).path)
+        self._active.requests.append(record)
+        self._started[request] = (time.perf_counter(), record)
+
+    def _on_done(self, request: Request, failed: bool) -> None:
+        entry = self._started.pop(request, None)
+        if entry is None:
+            return
+        started, record = entry
+        record.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        record.failed = failed
+        if not failed:
+            task = asyncio.ensure_future(self._fill_response(request, record))
+            self._finishing.add(task)
+            task.add_done_callback(self._finishing.discard)
+
+    @staticmethod
+    async def _fill_response(request: Request, record: RequestRecord) -> None:
+        try:
+            response = await request.response()
+            if response is not None:
+                record.status = response.status
+            sizes = await request.sizes()
+            record.bytes = sizes.get("responseBodySize")
+        except Error:
+            pass
+
+    async def _vitals(self, page: Page) -> dict[str, float | None] | None:
+        try:
+            vitals = await page.evaluate("() => window.__tmsVitals || null")
+        except Error:
+            return None
+        if not vitals:
+            return None
+        return {k: (round(v, 4 if k == "cls" else 1) if v is not None else None)
+                for k, v in vitals.items()}
+
+    @asynccontextmanager
+    async def step(self, page: Page, action: str, target: Locator | str) -> AsyncIterator[StepRecord]:
+        await self.attach(page)
+        record = StepRecord(
+            self.test, len(self.steps), action, describe(target), urlparse(page.url).path
+        )
+        self.steps.append(record)
+        self._active = record
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.ok = False
+            raise
+        finally:
+            record.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            self._active = None
+            if action == "goto":
+                record.page = urlparse(page.url).path
+            if self._finishing:
+                await asyncio.gather(*self._finishing, return_exceptions=True)
+            record.vitals = await self._vitals(page)
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+class TraceWriter:
+    """Appends run, step and test records to ``<dir>/<run id>.jsonl``."""
+
+    def __init__(self, directory: Path = TRACE_DIR, release: str | None = None) -> None:
+        now = datetime.now(timezone.utc)
+        self.run_id = now.strftime("%Y%m%d-%H%M%S")
+        self.path = directory / f"{self.run_id}.jsonl"
+        directory.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._emit({
+            "type": "run",
+            "run": self.run_id,
+            "started_at": now.isoformat(),
+            "release": release or os.environ.get("TESTSPRITE_RELEASE"),
+            "git": git_revision(),
+        })
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_test(self, tracer: Tracer, code: str, status: str, duration_s: float) -> None:
+        for step in tracer.steps:
+            self._emit(step.to_json(self.run_id))
+        self._emit({
+            "type": "test",
+            "run": self.run_id,
+            "test": tracer.test,
+            "code": code,
+            "status": status,
+            "duration_ms": round(duration_s * 1000, 1),
+            "steps": len(tracer.steps),
+            **({"metrics": tracer.metrics} if tracer.metrics else {}),
+        })
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def load(path: Path) -> list[dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def page_summary(records: list[dict[str, Any]]) -> dict[str, dict[str, float | None]]:
+    """Step latency, server-action latency and worst vitals per page path."""
+    by_page: dict[str, list[dict[str, Any]]] = {}
+    for r in records:
+        if r.get("type") == "step":
+            # Collapse ids so /jobs/JOB-1 and /jobs/JOB-2 land in one bucket.
+            page = re.sub(r"/[^/]*\d[^/]*", "/:id", r["page"] or "/")
+            by_page.setdefault(page, []).append(r)
+
+    summary: dict[str, dict[str, float | None]] = {}
+    for page, steps in sorted(by_page.items()):
+        durations = [s["duration_ms"] for s in steps]
+        actions = [s["ms_by_kind"].get(SERVER_ACTION, 0.0) for s in steps]
+        vitals = [s["vitals"] or {} for s in steps]
+
+        def worst(key: str) -> float | None:
+            values = [v[key] for v in vitals if v.get(key) is not None]
+            return max(values) if values else None
+
+        summary[page] = {
+            "steps": len(steps),
+            "step_p50_ms": sorted(durations)[len(durations) // 2],
+            "step_p95_ms": _p95(durations),
+            "server_action_ms": round(sum(actions), 1),
+            "lcp_ms": worst("lcp_ms"),
+            "inp_ms": worst("inp_ms"),
+            "cls": worst("cls"),
+        }
+    return summary
+
+
+def test_metrics(records: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """Metrics recorded by each test, by test name."""
+    return {r["test"]: r["metrics"] for r in records if r.get("type") == "test" and r.get("metrics")}
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="runner.trace", description="Summarise step traces per page."
+    )
+    parser.add_argument("trace", type=Path, help="trace to summarise")
+    parser.add_argument("baseline", type=Path, nargs="?", help="earlier trace to compare with")
+    args = parser.parse_args(argv)
+
+    records = load(args.trace)
+    baseline = load(args.baseline) if args.baseline else []
+    current = page_summary(records)
+    before = page_summary(baseline)
+    columns = ("steps", "step_p50_ms", "step_p95_ms", "server_action_ms", "lcp_ms", "inp_ms", "cls")
+    width = max((len(p) for p in current), default=4)
+    print(f"{'page':<{width}}  " + "  ".join(f"{c:>16}" for c in columns))
+    for page, row in current.items():
+        cells = []
+        for c in columns:
+            cell = _fmt(row[c])
+            old = before.get(page, {}).get(c)
+            if old is not None and row[c] is not None and c != "steps":
+                cell += f" ({row[c] - old:+g})"
+            cells.append(f"{cell:>16}")
+        print(f"{page:<{width}}  " + "  ".join(cells))
+
+    metrics = test_metrics(records)
+    before_metrics = test_metrics(baseline)
+    for test, values in metrics.items():
+        cells = []
+        for name, value in values.items():
+            old = before_metrics.get(test, {}).get(name)
+            cells.append(f"{name}={value:g}" + (f" ({value - old:+g})" if old is not None else ""))
+        print(f"{test}: " + "  ".join(cells))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())